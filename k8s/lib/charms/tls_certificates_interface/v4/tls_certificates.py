@@ -17,15 +17,18 @@ Learn more on how-to use the TLS Certificates interface library by reading the d
 """  # noqa: D214, D405, D411, D416
 
 import copy
+import hashlib
 import ipaddress
 import json
 import logging
+import threading
 import uuid
+from collections import OrderedDict
 from contextlib import suppress
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import FrozenSet, List, MutableMapping, Optional, Tuple, Union
+from typing import Any, Callable, Dict, FrozenSet, List, MutableMapping, Optional, Tuple, Union
 
 import pydantic
 from cryptography import x509
@@ -52,7 +55,7 @@ LIBAPI = 4
 
 # Increment this PATCH version before using `charmcraft publish-lib` or reset
 # to 0 if you are raising the major API version
-LIBPATCH = 17
+LIBPATCH = 20
 
 PYDEPS = [
     "cryptography>=43.0.0",
@@ -252,6 +255,80 @@ class _RequirerData(_DatabagModel):
     certificate_signing_requests: List[_CertificateSigningRequest] = []
 
 
+class PEMParseCache:
+    """Bounded LRU cache of objects parsed from PEM text.
+
+    Entries are keyed by the kind of object and the SHA256 of the stripped PEM
+    text, so the same certificate, CSR or private key is only parsed once
+    while it stays among the `maxsize` most recently used entries. Only
+    immutable objects are cached, and parsing errors are never cached.
+    """
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, kind: str, pem: str, parse: Callable[[str], Any]) -> Any:
+        """Return the object parsed from the PEM text, parsing it on a miss.
+
+        Args:
+            kind: The kind of object, which keeps objects of different types
+                parsed from the same text apart.
+            pem: The PEM text.
+            parse: The function parsing the PEM text on a miss.
+        """
+        key = (kind, hashlib.sha256(pem.strip().encode()).hexdigest())
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+        value = parse(pem)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Remove all the entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+
+pem_parse_cache = PEMParseCache()
+"""The cache shared by the objects of this library."""
+
+
+def _load_pem_certificate(pem: str) -> x509.Certificate:
+    return pem_parse_cache.get(
+        "x509-certificate", pem, lambda data: x509.load_pem_x509_certificate(data.encode())
+    )
+
+
+def _load_pem_csr(pem: str) -> x509.CertificateSigningRequest:
+    return pem_parse_cache.get("x509-csr", pem, lambda data: x509.load_pem_x509_csr(data.encode()))
+
+
+def _load_pem_private_key(pem: str) -> Any:
+    return pem_parse_cache.get(
+        "private-key",
+        pem,
+        lambda data: serialization.load_pem_private_key(data.encode(), password=None),
+    )
+
+
 class Mode(Enum):
     """Enum representing the mode of the certificate request.
 
@@ -280,15 +357,12 @@ class PrivateKey:
     @classmethod
     def from_string(cls, private_key: str) -> "PrivateKey":
         """Create a PrivateKey object from a private key."""
-        return cls(raw=private_key.strip())
+        return pem_parse_cache.get(cls.__name__, private_key, lambda data: cls(raw=data.strip()))
 
     def is_valid(self) -> bool:
         """Validate that the private key is PEM-formatted, RSA, and at least 2048 bits."""
         try:
-            key = serialization.load_pem_private_key(
-                self.raw.encode(),
-                password=None,
-            )
+            key = _load_pem_private_key(self.raw)
 
             if not isinstance(key, rsa.RSAPrivateKey):
                 logger.warning("Private key is not an RSA key")
@@ -329,9 +403,16 @@ class Certificate:
 
     @classmethod
     def from_string(cls, certificate: str) -> "Certificate":
-        """Create a Certificate object from a certificate."""
+        """Create a Certificate object from a certificate.
+
+        Parsed certificates are cached, see `PEMParseCache`.
+        """
+        return pem_parse_cache.get(cls.__name__, certificate, cls._parse)
+
+    @classmethod
+    def _parse(cls, certificate: str) -> "Certificate":
         try:
-            certificate_object = x509.load_pem_x509_certificate(data=certificate.encode())
+            certificate_object = _load_pem_certificate(certificate)
         except ValueError as e:
             logger.error("Could not load certificate: %s", e)
             raise TLSCertificatesError("Could not load certificate")
@@ -407,10 +488,8 @@ class Certificate:
             bool: True if the certificate matches the private key, False otherwise.
         """
         try:
-            cert_object = x509.load_pem_x509_certificate(self.raw.encode())
-            key_object = serialization.load_pem_private_key(
-                private_key.raw.encode(), password=None
-            )
+            cert_object = _load_pem_certificate(self.raw)
+            key_object = _load_pem_private_key(private_key.raw)
 
             cert_public_key = cert_object.public_key()
             key_public_key = key_object.public_key()
@@ -458,9 +537,16 @@ class CertificateSigningRequest:
 
     @classmethod
     def from_string(cls, csr: str) -> "CertificateSigningRequest":
-        """Create a CertificateSigningRequest object from a CSR."""
+        """Create a CertificateSigningRequest object from a CSR.
+
+        Parsed CSRs are cached, see `PEMParseCache`.
+        """
+        return pem_parse_cache.get(cls.__name__, csr, cls._parse)
+
+    @classmethod
+    def _parse(cls, csr: str) -> "CertificateSigningRequest":
         try:
-            csr_object = x509.load_pem_x509_csr(csr.encode())
+            csr_object = _load_pem_csr(csr)
         except ValueError as e:
             logger.error("Could not load CSR: %s", e)
             raise TLSCertificatesError("Could not load CSR")
@@ -518,10 +604,8 @@ class CertificateSigningRequest:
             bool: True/False depending on whether the CSR matches the private key.
         """
         try:
-            csr_object = x509.load_pem_x509_csr(self.raw.encode("utf-8"))
-            key_object = serialization.load_pem_private_key(
-                data=key.raw.encode("utf-8"), password=None
-            )
+            csr_object = _load_pem_csr(self.raw)
+            key_object = _load_pem_private_key(key.raw)
             key_object_public_key = key_object.public_key()
             csr_object_public_key = csr_object.public_key()
             if not isinstance(key_object_public_key, rsa.RSAPublicKey):
@@ -549,8 +633,8 @@ class CertificateSigningRequest:
         Returns:
             bool: True/False depending on whether the CSR matches the certificate.
         """
-        csr_object = x509.load_pem_x509_csr(self.raw.encode("utf-8"))
-        cert_object = x509.load_pem_x509_certificate(certificate.raw.encode("utf-8"))
+        csr_object = _load_pem_csr(self.raw)
+        cert_object = _load_pem_certificate(certificate.raw)
         return csr_object.public_key() == cert_object.public_key()
 
     def get_sha256_hex(self) -> str:
@@ -756,8 +840,8 @@ def chain_has_valid_order(chain: List[str]) -> bool:
 
     try:
         for i in range(len(chain) - 1):
-            cert = x509.load_pem_x509_certificate(chain[i].encode())
-            issuer = x509.load_pem_x509_certificate(chain[i + 1].encode())
+            cert = _load_pem_certificate(chain[i])
+            issuer = _load_pem_certificate(chain[i + 1])
             cert.verify_directly_issued_by(issuer)
         return True
     except (ValueError, TypeError, InvalidSignature):
@@ -799,7 +883,7 @@ def generate_csr(  # noqa: C901
     Returns:
         CertificateSigningRequest: CSR
     """
-    signing_key = serialization.load_pem_private_key(str(private_key).encode(), password=None)
+    signing_key = _load_pem_private_key(str(private_key))
     subject_name = [x509.NameAttribute(x509.NameOID.COMMON_NAME, common_name)]
     if add_unique_id_to_subject_name:
         unique_identifier = uuid.uuid4()
@@ -871,9 +955,7 @@ def generate_ca(
     Returns:
         Certificate: CA Certificate.
     """
-    private_key_object = serialization.load_pem_private_key(
-        str(private_key).encode(), password=None
-    )
+    private_key_object = _load_pem_private_key(str(private_key))
     assert isinstance(private_key_object, rsa.RSAPrivateKey)
     subject_name = [x509.NameAttribute(x509.NameOID.COMMON_NAME, common_name)]
     if organization:
@@ -985,11 +1067,11 @@ def generate_certificate(
     Returns:
         Certificate: Certificate
     """
-    csr_object = x509.load_pem_x509_csr(str(csr).encode())
+    csr_object = _load_pem_csr(str(csr))
     subject = csr_object.subject
-    ca_pem = x509.load_pem_x509_certificate(str(ca).encode())
+    ca_pem = _load_pem_certificate(str(ca))
     issuer = ca_pem.issuer
-    private_key = serialization.load_pem_private_key(str(ca_private_key).encode(), password=None)
+    private_key = _load_pem_private_key(str(ca_private_key))
 
     certificate_builder = (
         x509.CertificateBuilder()
@@ -1721,11 +1803,12 @@ class TLSCertificatesProvidesV4(Object):
 
     def _remove_certificates_for_which_no_csr_exists(self) -> None:
         provider_certificates = self.get_provider_certificates()
-        requirer_csrs = [
-            request.certificate_signing_request for request in self.get_certificate_requests()
-        ]
+        requirer_csrs = self._index_certificate_requests(self.get_certificate_requests())
         for provider_certificate in provider_certificates:
-            if provider_certificate.certificate_signing_request not in requirer_csrs:
+            if (
+                provider_certificate.certificate_signing_request.get_sha256_hex()
+                not in requirer_csrs
+            ):
                 tls_relation = self._get_tls_relations(
                     relation_id=provider_certificate.relation_id
                 )
@@ -1781,6 +1864,16 @@ class TLSCertificatesProvidesV4(Object):
         relation: Relation,
         provider_certificate: ProviderCertificate,
     ) -> None:
+        new_certificate = self._to_relation_certificate(provider_certificate)
+        provider_certificates = self._load_provider_certificates(relation)
+        if new_certificate in provider_certificates:
+            logger.info("Certificate already in relation data - Doing nothing")
+            return
+        provider_certificates.append(new_certificate)
+        self._dump_provider_certificates(relation=relation, certificates=provider_certificates)
+
+    @staticmethod
+    def _to_relation_certificate(provider_certificate: ProviderCertificate) -> _Certificate:
         chain = [str(certificate) for certificate in provider_certificate.chain]
         if chain[0] != str(provider_certificate.certificate):
             logger.warning(
@@ -1791,18 +1884,12 @@ class TLSCertificatesProvidesV4(Object):
             logger.warning(
                 "The order of the chain from the TLS Certificates Provider is partially incorrect."
             )
-        new_certificate = _Certificate(
+        return _Certificate(
             certificate=str(provider_certificate.certificate),
             certificate_signing_request=str(provider_certificate.certificate_signing_request),
             ca=str(provider_certificate.ca),
             chain=chain,
         )
-        provider_certificates = self._load_provider_certificates(relation)
-        if new_certificate in provider_certificates:
-            logger.info("Certificate already in relation data - Doing nothing")
-            return
-        provider_certificates.append(new_certificate)
-        self._dump_provider_certificates(relation=relation, certificates=provider_certificates)
 
     def _load_provider_certificates(self, relation: Relation) -> List[_Certificate]:
         try:
@@ -1882,6 +1969,55 @@ class TLSCertificatesProvidesV4(Object):
             provider_certificate=provider_certificate,
         )
 
+    def set_relation_certificates(
+        self,
+        provider_certificates: List[ProviderCertificate],
+    ) -> None:
+        """Add many certificates to relation data.
+
+        The certificates are grouped by relation, and the relation data of
+        each relation is loaded and written once for the whole group, rather
+        than twice per certificate as with `set_relation_certificate`.
+
+        Args:
+            provider_certificates (List[ProviderCertificate]): ProviderCertificate objects
+
+        Returns:
+            None
+        """
+        if not self.model.unit.is_leader():
+            logger.warning("Unit is not a leader - will not set relation data")
+            return
+        certificates_by_relation: Dict[int, List[ProviderCertificate]] = {}
+        for provider_certificate in provider_certificates:
+            certificates_by_relation.setdefault(provider_certificate.relation_id, []).append(
+                provider_certificate
+            )
+        for relation_id, relation_certificates in certificates_by_relation.items():
+            certificates_relation = self.model.get_relation(
+                relation_name=self.relationship_name, relation_id=relation_id
+            )
+            if not certificates_relation:
+                raise TLSCertificatesError(f"Relation {self.relationship_name} does not exist")
+            new_certificates = [
+                self._to_relation_certificate(provider_certificate)
+                for provider_certificate in relation_certificates
+            ]
+            replaced_csrs = {
+                certificate.certificate_signing_request for certificate in new_certificates
+            }
+            certificates = [
+                certificate
+                for certificate in self._load_provider_certificates(certificates_relation)
+                if certificate.certificate_signing_request not in replaced_csrs
+            ]
+            for new_certificate in new_certificates:
+                if new_certificate not in certificates:
+                    certificates.append(new_certificate)
+            self._dump_provider_certificates(
+                relation=certificates_relation, certificates=certificates
+            )
+
     def get_issued_certificates(
         self, relation_id: Optional[int] = None
     ) -> List[ProviderCertificate]:
@@ -1919,10 +2055,11 @@ class TLSCertificatesProvidesV4(Object):
         """
         unsolicited_certificates: List[ProviderCertificate] = []
         provider_certificates = self.get_provider_certificates(relation_id=relation_id)
-        requirer_csrs = self.get_certificate_requests(relation_id=relation_id)
-        list_of_csrs = [csr.certificate_signing_request for csr in requirer_csrs]
+        requirer_csrs = self._index_certificate_requests(
+            self.get_certificate_requests(relation_id=relation_id)
+        )
         for certificate in provider_certificates:
-            if certificate.certificate_signing_request not in list_of_csrs:
+            if certificate.certificate_signing_request.get_sha256_hex() not in requirer_csrs:
                 unsolicited_certificates.append(certificate)
         return unsolicited_certificates
 
@@ -1938,21 +2075,48 @@ class TLSCertificatesProvidesV4(Object):
             list: List of RequirerCertificateRequest objects.
         """
         requirer_csrs = self.get_certificate_requests(relation_id=relation_id)
+        issued_certificates = self._index_issued_certificates(
+            self.get_issued_certificates(relation_id=relation_id)
+        )
         outstanding_csrs: List[RequirerCertificateRequest] = []
         for relation_csr in requirer_csrs:
             if not self._certificate_issued_for_csr(
                 csr=relation_csr.certificate_signing_request,
-                relation_id=relation_id,
+                issued_certificates=issued_certificates,
             ):
                 outstanding_csrs.append(relation_csr)
         return outstanding_csrs
 
+    @staticmethod
+    def _index_certificate_requests(
+        requests: List[RequirerCertificateRequest],
+    ) -> Dict[str, RequirerCertificateRequest]:
+        """Index certificate requests by the SHA256 of their CSR."""
+        index: Dict[str, RequirerCertificateRequest] = {}
+        for request in requests:
+            index.setdefault(request.certificate_signing_request.get_sha256_hex(), request)
+        return index
+
+    @staticmethod
+    def _index_issued_certificates(
+        certificates: List[ProviderCertificate],
+    ) -> Dict[str, ProviderCertificate]:
+        """Index provider certificates by the SHA256 of the CSR they were issued for.
+
+        When several certificates were issued for the same CSR, the first one wins.
+        """
+        index: Dict[str, ProviderCertificate] = {}
+        for certificate in certificates:
+            index.setdefault(certificate.certificate_signing_request.get_sha256_hex(), certificate)
+        return index
+
     def _certificate_issued_for_csr(
-        self, csr: CertificateSigningRequest, relation_id: Optional[int]
+        self,
+        csr: CertificateSigningRequest,
+        issued_certificates: Dict[str, ProviderCertificate],
     ) -> bool:
         """Check whether a certificate has been issued for a given CSR."""
-        issued_certificates_per_csr = self.get_issued_certificates(relation_id=relation_id)
-        for issued_certificate in issued_certificates_per_csr:
-            if issued_certificate.certificate_signing_request == csr:
-                return csr.matches_certificate(issued_certificate.certificate)
-        return False
+        issued_certificate = issued_certificates.get(csr.get_sha256_hex())
+        if issued_certificate is None:
+            return False
+        return csr.matches_certificate(issued_certificate.certificate)
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+# Licensed under the Apache2.0. See LICENSE file in charm source for details.
+
+"""Library for reconciling Vault with a declared desired state.
+
+Callers declare the secrets engines, auth methods, policies, approles and
+configuration entries they need, and the reconciler makes Vault match them.
+The current state is fetched in bulk (`sys/mounts`, `sys/auth`, `sys/policy`
+and the approle listing), each declared object is compared with its current
+counterpart by content hash, and only the objects that differ are written.
+Once Vault matches the desired state, reconciling it again makes no writes.
+
+Objects that are not declared are left untouched.
+
+## Usage
+
+    state = DesiredState(
+        mounts=[Mount("charm-kv", SecretsBackend.KV_V2)],
+        policies=[Policy("charm-kv-reader", 'path "charm-kv/*" { capabilities = ["read"] }')],
+        approles=[Approle("charm-kv-reader", policies=["charm-kv-reader"], token_ttl="1h")],
+    )
+    result = VaultReconciler(vault_client).reconcile(state)
+    role_id = result.role_ids["charm-kv-reader"]
+"""
+
+import hashlib
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, MutableMapping
+
+from vault.vault_client import SecretsBackend, VaultClient, VaultClientError
+
+
+class LogAdapter(logging.LoggerAdapter):
+    """Adapter for the logger to prepend a prefix to all log lines."""
+
+    prefix = "vault_reconciler"
+
+    def process(self, msg: str, kwargs: MutableMapping) -> tuple[str, MutableMapping]:
+        """Decides the format for the prepended text."""
+        return f"[{self.prefix}] {msg}", kwargs
+
+
+logger = LogAdapter(logging.getLogger(__name__), {})
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+@dataclass(frozen=True)
+class Mount:
+    """Class that represents a secrets engine enabled at a path."""
+
+    path: str
+    backend: SecretsBackend
+
+
+@dataclass(frozen=True)
+class AuthBackend:
+    """Class that represents an auth method enabled at a path."""
+
+    path: str
+    method_type: str
+
+
+@dataclass(frozen=True)
+class Policy:
+    """Class that represents an ACL policy."""
+
+    name: str
+    content: str
+
+
+@dataclass(frozen=True)
+class Approle:
+    """Class that represents an approle and the tokens it issues."""
+
+    name: str
+    policies: List[str] = field(default_factory=list)
+    cidrs: List[str] | None = None
+    token_ttl: str | None = None
+    token_max_ttl: str | None = None
+    token_period: str | None = None
+    token_type: str = "default"
+
+
+@dataclass(frozen=True)
+class ConfigEntry:
+    """Class that represents configuration written to a path.
+
+    Only the declared keys are compared with the current configuration, so
+    any other key returned by Vault when reading the path is ignored.
+    """
+
+    path: str
+    data: dict[str, Any]
+
+
+@dataclass
+class DesiredState:
+    """Class that represents the state Vault should be in.
+
+    Mounts and auth methods are reconciled first, then policies, approles and
+    configuration entries, so that objects can depend on the ones before them.
+    """
+
+    mounts: List[Mount] = field(default_factory=list)
+    auth_backends: List[AuthBackend] = field(default_factory=list)
+    policies: List[Policy] = field(default_factory=list)
+    approles: List[Approle] = field(default_factory=list)
+    config_entries: List[ConfigEntry] = field(default_factory=list)
+
+
+@dataclass
+class ReconcileResult:
+    """Class that represents the outcome of a reconciliation.
+
+    Attributes:
+        changes: A description of each write made to Vault.
+        role_ids: The role ID of each declared approle, keyed by name.
+    """
+
+    changes: List[str] = field(default_factory=list)
+    role_ids: dict[str, str] = field(default_factory=dict)
+
+
+class VaultReconciler:
+    """Makes Vault match a declared desired state with as few writes as possible."""
+
+    def __init__(self, vault_client: VaultClient):
+        self._vault_client = vault_client
+
+    def reconcile(self, desired_state: DesiredState) -> ReconcileResult:
+        """Apply the differences between the desired state and the current state of Vault.
+
+        Args:
+            desired_state: The objects Vault should have.
+
+        Returns:
+            The writes that were made and the role ID of each declared approle.
+
+        Raises:
+            VaultClientError: If the current state could not be read or a
+                change could not be applied.
+        """
+        result = ReconcileResult()
+        self._reconcile_mounts(desired_state.mounts, result)
+        self._reconcile_auth_backends(desired_state.auth_backends, result)
+        self._reconcile_policies(desired_state.policies, result)
+        self._reconcile_approles(desired_state.approles, result)
+        self._reconcile_config_entries(desired_state.config_entries, result)
+        if result.changes:
+            logger.info("Reconciled Vault: %s", ", ".join(result.changes))
+        else:
+            logger.debug("Vault already matches the desired state")
+        return result
+
+    def _reconcile_mounts(self, mounts: List[Mount], result: ReconcileResult) -> None:
+        if not mounts:
+            return
+        current_mounts = self._vault_client.get_mounts()
+        for mount in mounts:
+            current_type = current_mounts.get(mount.path)
+            if current_type == mount.backend.value:
+                continue
+            if current_type:
+                raise VaultClientError(
+                    f"Mount {mount.path} has type {current_type}, expected {mount.backend.value}"
+                )
+            self._vault_client.enable_secrets_engine(mount.backend, mount.path)
+            result.changes.append(f"enabled {mount.backend.value} at {mount.path}")
+
+    def _reconcile_auth_backends(
+        self, auth_backends: List[AuthBackend], result: ReconcileResult
+    ) -> None:
+        if not auth_backends:
+            return
+        current_auth_backends = self._vault_client.get_auth_methods()
+        for auth_backend in auth_backends:
+            current_type = current_auth_backends.get(auth_backend.path)
+            if current_type == auth_backend.method_type:
+                continue
+            if current_type:
+                raise VaultClientError(
+                    f"Auth method at {auth_backend.path} has type {current_type}, "
+                    f"expected {auth_backend.method_type}"
+                )
+            self._vault_client.enable_auth_method(auth_backend.method_type, auth_backend.path)
+            result.changes.append(
+                f"enabled {auth_backend.method_type} auth at {auth_backend.path}"
+            )
+
+    def _reconcile_policies(self, policies: List[Policy], result: ReconcileResult) -> None:
+        if not policies:
+            return
+        existing_policies = set(self._vault_client.list("sys/policy"))
+        for policy in policies:
+            if policy.name in existing_policies:
+                current_content = self._vault_client.read_policy(policy.name)
+                if current_content is not None and _hash(current_content) == _hash(policy.content):
+                    continue
+            self._vault_client.create_or_update_policy(policy.name, policy.content)
+            result.changes.append(f"wrote policy {policy.name}")
+
+    def _reconcile_approles(self, approles: List[Approle], result: ReconcileResult) -> None:
+        if not approles:
+            return
+        existing_approles = set(self._vault_client.list("auth/approle/role"))
+        for approle in approles:
+            if approle.name in existing_approles:
+                current_config = self._vault_client.read_approle(approle.name)
+                if current_config is not None and _hash(
+                    _normalize_approle_config(current_config)
+                ) == _hash(_get_approle_config(approle)):
+                    result.role_ids[approle.name] = self._vault_client.read_role_id(approle.name)
+                    continue
+            result.role_ids[approle.name] = self._vault_client.create_or_update_approle(
+                approle.name,
+                token_ttl=approle.token_ttl,
+                token_max_ttl=approle.token_max_ttl,
+                policies=approle.policies,
+                cidrs=approle.cidrs,
+                token_period=approle.token_period,
+                token_type=approle.token_type,
+            )
+            result.changes.append(f"wrote approle {approle.name}")
+
+    def _reconcile_config_entries(
+        self, config_entries: List[ConfigEntry], result: ReconcileResult
+    ) -> None:
+        for config_entry in config_entries:
+            current_data = self._vault_client.read(config_entry.path)
+            current_subset = {key: current_data.get(key) for key in config_entry.data}
+            if _hash(current_subset) == _hash(config_entry.data):
+                continue
+            if not self._vault_client.write(config_entry.path, config_entry.data):
+                raise VaultClientError(f"Failed to write configuration to {config_entry.path}")
+            result.changes.append(f"wrote {config_entry.path}")
+
+
+def _hash(content: Any) -> str:
+    """Return a hash of the content, independent of key order for dictionaries."""
+    serialized = json.dumps(content, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+def _parse_duration(duration: str | int | None) -> int:
+    """Return the number of seconds in a Vault duration such as "1h" or "60s"."""
+    if not duration:
+        return 0
+    if isinstance(duration, int):
+        return duration
+    total = 0
+    for amount, unit in re.findall(r"(\d+)([smhd]?)", duration):
+        total += int(amount) * _DURATION_UNITS.get(unit or "s", 1)
+    return total
+
+
+def _get_approle_config(approle: Approle) -> dict[str, Any]:
+    """Return the settings of the declared approle, in the form Vault returns them."""
+    return {
+        "token_policies": sorted(approle.policies),
+        "token_bound_cidrs": sorted(approle.cidrs or []),
+        "token_ttl": _parse_duration(approle.token_ttl),
+        "token_max_ttl": _parse_duration(approle.token_max_ttl),
+        "token_period": _parse_duration(approle.token_period),
+        "token_type": approle.token_type,
+    }
+
+
+def _normalize_approle_config(config: dict) -> dict[str, Any]:
+    """Return the settings of an approle read from Vault that the reconciler manages."""
+    return {
+        "token_policies": sorted(config.get("token_policies") or []),
+        "token_bound_cidrs": sorted(config.get("token_bound_cidrs") or []),
+        "token_ttl": _parse_duration(config.get("token_ttl")),
+        "token_max_ttl": _parse_duration(config.get("token_max_ttl")),
+        "token_period": _parse_duration(config.get("token_period")),
+        "token_type": config.get("token_type") or "default",
+    }
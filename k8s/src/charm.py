@@ -10,7 +10,10 @@ For more information on Vault, please visit https://www.vaultproject.io/.
 import json
 import logging
 import socket
-from typing import Any, List
+import time
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Dict, List
 
 from charms.data_platform_libs.v0.s3 import S3Requirer
 from charms.grafana_k8s.v0.grafana_dashboard import GrafanaDashboardProvider
@@ -27,6 +30,8 @@ from charms.tls_certificates_interface.v4.tls_certificates import (
 from charms.traefik_k8s.v1.ingress_per_unit import IngressPerUnitRequirer
 from charms.traefik_k8s.v2.ingress import IngressPerAppRequirer
 from charms.vault_k8s.v0.vault_kv import (
+    KVRequest,
+    NewVaultKvClientAttachedEvent,
     VaultKvClientDetachedEvent,
     VaultKvProvides,
 )
@@ -34,10 +39,14 @@ from ops import CharmBase, MaintenanceStatus, main, pebble
 from ops.charm import (
     ActionEvent,
     CollectStatusEvent,
+    ConfigChangedEvent,
     InstallEvent,
+    LeaderElectedEvent,
     RemoveEvent,
+    UpdateStatusEvent,
+    UpgradeCharmEvent,
 )
-from ops.framework import EventBase
+from ops.framework import EventBase, StoredState
 from ops.model import (
     ActiveStatus,
     BlockedStatus,
@@ -49,6 +58,7 @@ from ops.pebble import ChangeError, Layer, PathError
 from vault.juju_facade import (
     JujuFacade,
     NoSuchSecretError,
+    NoSuchStorageError,
     SecretRemovedError,
 )
 from vault.vault_autounseal import (
@@ -58,11 +68,16 @@ from vault.vault_autounseal import (
 from vault.vault_client import (
     AppRole,
     AuditDeviceType,
+    PeerCircuitBreaker,
+    PKIRoleFlags,
+    RequestBudget,
     SecretsBackend,
     Token,
     VaultClient,
     VaultClientError,
+    VaultReadCache,
 )
+from vault.vault_compression import DEFAULT_LEVEL as DEFAULT_COMPRESSION_LEVEL
 from vault.vault_helpers import (
     AutounsealConfiguration,
     common_name_config_is_valid,
@@ -74,6 +89,7 @@ from vault.vault_managers import (
     TLS_CERTIFICATES_ACME_RELATION_NAME,
     TLS_CERTIFICATES_PKI_RELATION_NAME,
     ACMEManager,
+    AppRoleTokenManager,
     AutounsealProviderManager,
     AutounsealRequirerManager,
     BackupManager,
@@ -82,9 +98,13 @@ from vault.vault_managers import (
     ManagerError,
     PKIManager,
     RaftManager,
+    TidyManager,
     TLSManager,
     VaultCertsError,
+    destroy_role_secret_ids,
 )
+from vault.vault_s3 import MiB
+from vault.vault_scheduler import ReconcileScheduler
 
 from container import Container
 
@@ -94,6 +114,8 @@ APPROLE_ROLE_NAME = "charm"
 AUTOUNSEAL_MOUNT_PATH = "charm-autounseal"
 AUTOUNSEAL_PROVIDES_RELATION_NAME = "vault-autounseal-provides"
 AUTOUNSEAL_REQUIRES_RELATION_NAME = "vault-autounseal-requires"
+# Storage mounted in the charm container too, which holds the restored backups
+BACKUP_SPOOL_STORAGE_NAME = "tmp"
 CHARM_POLICY_NAME = "charm-access"
 CHARM_POLICY_PATH = "src/templates/charm_policy.hcl"
 CONFIG_TEMPLATE_DIR_PATH = "src/templates/"
@@ -103,6 +125,7 @@ CONTAINER_TLS_FILE_DIRECTORY_PATH = "/vault/certs"
 KV_RELATION_NAME = "vault-kv"
 LOG_FORWARDING_RELATION_NAME = "logging"
 PEER_RELATION_NAME = "vault-peers"
+PKI_ROLE_FLAGS_KEY = "pki_role_flags"
 PKI_MOUNT = "charm-pki"
 ACME_MOUNT = "charm-acme"
 PKI_RELATION_NAME = "vault-pki"
@@ -112,6 +135,10 @@ PROMETHEUS_ALERT_RULES_PATH = "./src/prometheus_alert_rules"
 S3_RELATION_NAME = "s3-parameters"
 VAULT_CHARM_APPROLE_SECRET_LABEL = "vault-approle-auth-details"
 VAULT_CONFIG_FILE_PATH = "/vault/config/vault.hcl"
+# Interval between full syncs of every vault-kv relation, in seconds
+VAULT_KV_SWEEP_INTERVAL = 3600
+# Time budget for the requests sent to Vault in a single dispatch, in seconds
+VAULT_REQUEST_BUDGET = 180
 VAULT_STORAGE_PATH = "/vault/raft"
 INGRESS_PER_APP_RELATION_NAME = "ingress"
 INGRESS_PER_UNIT_RELATION_NAME = "ingress-per-unit"
@@ -125,12 +152,24 @@ INGRESS_PER_UNIT_RELATION_NAME = "ingress-per-unit"
 class VaultCharm(CharmBase):
     """Main class to handle Juju events for the vault-k8s charm."""
 
+    _stored = StoredState()
+
     VAULT_PORT = 8200
     VAULT_CLUSTER_PORT = 8201
 
     def __init__(self, *args: Any):
         super().__init__(*args)
         self.juju_facade = JujuFacade(self)
+        self._stored.set_default(
+            vault_peer_circuits={},
+            vault_kv_last_sweep=0.0,
+            vault_kv_pending_requests={},
+            vault_kv_verified_roles={},
+        )
+        PeerCircuitBreaker.load(self._stored.vault_peer_circuits, local_url=self._api_address)
+        RequestBudget.set(VAULT_REQUEST_BUDGET)
+        VaultReadCache.enable()
+        self.framework.observe(self.framework.on.pre_commit, self._on_pre_commit)
         self._service_name = self._container_name = CONTAINER_NAME
         self._container = Container(container=self.unit.get_container(self._container_name))
         self.unit.set_ports(self.VAULT_PORT)
@@ -212,6 +251,8 @@ class VaultCharm(CharmBase):
             self.on.update_status,
             self.on.vault_pebble_ready,
             self.on.config_changed,
+            self.on.leader_elected,
+            self.on.upgrade_charm,
             self.on[PEER_RELATION_NAME].relation_created,
             self.on[PEER_RELATION_NAME].relation_changed,
             self.on.vault_pki_relation_changed,
@@ -223,8 +264,9 @@ class VaultCharm(CharmBase):
             self.vault_autounseal_provides.on.vault_autounseal_requirer_relation_broken,
             self.vault_kv.on.new_vault_kv_client_attached,
         ]
-        for event in configure_events:
-            self.framework.observe(event, self._configure)
+        self.reconcile_scheduler = ReconcileScheduler(
+            self, events=configure_events, reconcile=self._configure
+        )
         self.framework.observe(self.on.install, self._on_install)
         self.framework.observe(self.on.collect_unit_status, self._on_collect_status)
         self.framework.observe(self.on.remove, self._on_remove)
@@ -236,10 +278,6 @@ class VaultCharm(CharmBase):
         self.framework.observe(
             self.vault_kv.on.vault_kv_client_detached, self._on_vault_kv_client_detached
         )
-        self.framework.observe(self.vault_pki.on.certificate_request, self._on_vault_pki_certificate_request)
-
-    def _on_vault_pki_certificate_request(self, event):
-        self._sync_vault_pki(self._get_active_vault_client())
 
     def _on_install(self, event: InstallEvent):
         """Handle the install charm event."""
@@ -248,6 +286,10 @@ class VaultCharm(CharmBase):
             return
         self._delete_vault_data()
 
+    def _on_pre_commit(self, _: EventBase) -> None:
+        """Keep the state of the Vault nodes' circuit breakers for the next dispatches."""
+        self._stored.vault_peer_circuits = PeerCircuitBreaker.dump()
+
     def _on_collect_status(self, event: CollectStatusEvent):  # noqa: C901
         """Handle the collect status event."""
         if self.juju_facade.relation_exists(
@@ -324,14 +366,18 @@ class VaultCharm(CharmBase):
         if not vault.is_active_or_standby():
             event.add_status(WaitingStatus("Waiting for vault to finish raft leader election"))
             return
-        event.add_status(ActiveStatus())
+        event.add_status(ActiveStatus(self._get_pki_role_flags_status_message()))
 
-    def _configure(self, _: EventBase) -> None:  # noqa: C901
-        """Handle config-changed event.
+    def _configure(self, triggers: List[EventBase]) -> None:  # noqa: C901
+        """Reconcile the unit, once per dispatch.
 
         Configures pebble layer, sets the unit address in the peer relation, starts the vault
         service, and unseals Vault.
+
+        Args:
+            triggers: The events of this dispatch that requested the reconcile.
         """
+        self._queue_vault_kv_requests(triggers)
         if not self._container.can_connect():
             return
         if not self.juju_facade.relation_exists(PEER_RELATION_NAME):
@@ -366,9 +412,11 @@ class VaultCharm(CharmBase):
             return
         self._configure_pki_secrets_engine(vault)
         self._configure_acme_server(vault)
+        self._record_pki_role_flags(vault)
         self._sync_vault_autounseal(vault)
-        self._sync_vault_kv(vault)
+        self._sync_vault_kv(vault, triggers)
         self._sync_vault_pki(vault)
+        self._tidy_vault(vault, triggers)
 
         if vault.is_active_or_standby() and not vault.is_raft_cluster_healthy():
             # Log if a raft node starts reporting unhealthy
@@ -403,7 +451,9 @@ class VaultCharm(CharmBase):
             vault.remove_raft_node(self._node_id)
 
     def _on_vault_kv_client_detached(self, event: VaultKvClientDetachedEvent):
-        KVManager.remove_unit_credentials(self.juju_facade, event.unit_name)
+        KVManager.remove_unit_credentials(
+            self.juju_facade, event.unit_name, self._stored.vault_kv_verified_roles
+        )
 
     def _configure_pki_secrets_engine(self, vault: VaultClient) -> None:
         common_name = self.juju_facade.get_string_config("common_name")
@@ -418,6 +468,8 @@ class VaultCharm(CharmBase):
             PKI_ROLE_NAME,
             self.vault_pki,
             tls_certificates_pki=self.tls_certificates_pki,
+            keep_issued_certificates=True,
+            role_flags=self._get_pki_role_flags(),
         )
         manager.configure()
 
@@ -433,6 +485,7 @@ class VaultCharm(CharmBase):
             tls_certificates_acme=self.tls_certificates_acme,
             certificate_request_attributes=self._get_certificate_request(common_name),
             role_name=ACME_ROLE_NAME,
+            role_flags=self._get_pki_role_flags(),
             vault_address=f"https://{self._ingress_address}:{self.VAULT_PORT}",
         )
         manager.configure()
@@ -443,6 +496,53 @@ class VaultCharm(CharmBase):
             is_ca=True,
         )
 
+    def _get_pki_role_flags(self) -> PKIRoleFlags:
+        return PKIRoleFlags(
+            no_store=bool(self.juju_facade.get_bool_config("pki_roles_no_store")),
+            generate_lease=bool(self.juju_facade.get_bool_config("pki_roles_generate_lease")),
+        )
+
+    def _record_pki_role_flags(self, vault: VaultClient) -> None:
+        """Record the non default settings of the PKI and ACME roles in the peer relation.
+
+        The settings are read back from the roles in Vault once the leader has
+        configured them, so that every unit can report them in its status
+        without querying Vault.
+        """
+        if not self.unit.is_leader():
+            return
+        enabled: list[str] = []
+        for relation_name, mount, role in (
+            (TLS_CERTIFICATES_PKI_RELATION_NAME, PKI_MOUNT, PKI_ROLE_NAME),
+            (TLS_CERTIFICATES_ACME_RELATION_NAME, ACME_MOUNT, ACME_ROLE_NAME),
+        ):
+            if not self.juju_facade.relation_exists(relation_name):
+                continue
+            try:
+                role_flags = vault.get_pki_role_flags(role=role, mount=mount)
+            except VaultClientError as e:
+                logger.warning("Failed to read the settings of the %s role: %s", role, e)
+                return
+            if not role_flags:
+                continue
+            enabled += [
+                name for name, value in asdict(role_flags).items() if value and name not in enabled
+            ]
+        recorded = self.juju_facade.get_app_relation_data(name=PEER_RELATION_NAME)
+        if recorded.get(PKI_ROLE_FLAGS_KEY, "") == ",".join(enabled):
+            return
+        self.juju_facade.set_app_relation_data(
+            data={PKI_ROLE_FLAGS_KEY: ",".join(enabled)},
+            name=PEER_RELATION_NAME,
+        )
+
+    def _get_pki_role_flags_status_message(self) -> str:
+        """Return the PKI and ACME role settings recorded by the leader, for the status message."""
+        recorded = self.juju_facade.get_app_relation_data(name=PEER_RELATION_NAME)
+        if not (enabled := recorded.get(PKI_ROLE_FLAGS_KEY, "")):
+            return ""
+        return f"PKI roles: {', '.join(enabled.split(','))}"
+
     def _sync_vault_autounseal(self, vault_client: VaultClient) -> None:
         """Sync the vault autounseal relation."""
         if not self.unit.is_leader():
@@ -483,11 +583,88 @@ class VaultCharm(CharmBase):
             PKI_ROLE_NAME,
             self.vault_pki,
             tls_certificates_pki=self.tls_certificates_pki,
+            keep_issued_certificates=True,
         )
         manager.sync()
 
-    def _sync_vault_kv(self, vault: VaultClient) -> None:
-        """Goes through all the vault-kv relations and sends necessary KV information."""
+    def _tidy_vault(self, vault: VaultClient, triggers: List[EventBase]) -> None:
+        """Clean up the expired secret IDs and tokens in Vault, when due.
+
+        The tidy is only considered on update-status, and is throttled by the
+        `TidyManager` through the peer relation.
+        """
+        if not any(isinstance(trigger, UpdateStatusEvent) for trigger in triggers):
+            return
+        if report := TidyManager(self, vault, PEER_RELATION_NAME).run():
+            logger.info("Vault tidy: %s", ", ".join(report))
+
+    def _queue_vault_kv_requests(self, triggers: List[EventBase]) -> None:
+        """Keep the vault-kv requests carried by the triggers until they are synced.
+
+        The requests are kept in the stored state, so that they are still synced
+        in a later dispatch if Vault can't be configured in this one.
+        """
+        if not self.juju_facade.is_leader:
+            return
+        for trigger in triggers:
+            if not isinstance(trigger, NewVaultKvClientAttachedEvent):
+                continue
+            self._stored.vault_kv_pending_requests[
+                f"{trigger.relation_id}/{trigger.unit_name}"
+            ] = {
+                "relation_id": trigger.relation_id,
+                "app_name": trigger.app_name,
+                "unit_name": trigger.unit_name,
+                "mount_suffix": trigger.mount_suffix,
+                "egress_subnets": trigger.egress_subnets,
+                "nonce": trigger.nonce,
+            }
+
+    def _get_pending_vault_kv_requests(self) -> List[KVRequest]:
+        """Return the queued vault-kv requests whose relation is still active."""
+        kv_requests = []
+        for pending in self._stored.vault_kv_pending_requests.values():
+            relation = self.juju_facade.get_active_relation(
+                KV_RELATION_NAME, pending["relation_id"]
+            )
+            if not relation:
+                continue
+            kv_requests.append(
+                KVRequest(
+                    relation=relation,
+                    app_name=pending["app_name"],
+                    unit_name=pending["unit_name"],
+                    mount_suffix=pending["mount_suffix"],
+                    egress_subnets=list(pending["egress_subnets"]),
+                    nonce=pending["nonce"],
+                )
+            )
+        return kv_requests
+
+    def _vault_kv_sweep_is_due(self, triggers: List[EventBase]) -> bool:
+        """Return whether all the vault-kv requests should be synced.
+
+        Only the units named by vault-kv events are synced, unless the sweep
+        interval has passed or the reconcile was triggered by an event that
+        may change the credentials of every requirer: a configuration change,
+        an upgrade, or this unit becoming the leader. Other events, such as
+        the peer relation changing, do not affect the vault-kv requirers.
+        """
+        if time.time() - self._stored.vault_kv_last_sweep >= VAULT_KV_SWEEP_INTERVAL:
+            return True
+        return any(
+            isinstance(trigger, (ConfigChangedEvent, LeaderElectedEvent, UpgradeCharmEvent))
+            for trigger in triggers
+        )
+
+    def _sync_vault_kv(self, vault: VaultClient, triggers: List[EventBase]) -> None:
+        """Send the necessary KV information to the vault-kv requirers.
+
+        The units named by the vault-kv events of the dispatch are synced, and
+        every unit of every vault-kv relation is synced when a sweep is due.
+        The queued requests of the relations that could not be synced are kept
+        for the next reconcile.
+        """
         if not self.juju_facade.is_leader:
             logger.debug("Only leader unit can handle a vault-kv request")
             return
@@ -495,22 +672,45 @@ class VaultCharm(CharmBase):
         if not ca_certificate:
             logger.debug("Vault CA certificate not available")
             return
-        manager = KVManager(self, vault, self.vault_kv, ca_certificate)
+        manager = KVManager(
+            self,
+            vault,
+            self.vault_kv,
+            ca_certificate,
+            verified_roles=self._stored.vault_kv_verified_roles,
+            shared_mount=bool(self.juju_facade.get_bool_config("kv_shared_mount")),
+            batch_tokens=bool(self.juju_facade.get_bool_config("kv_batch_tokens")),
+        )
 
-        kv_requests = self.vault_kv.get_kv_requests()
+        sweep = self._vault_kv_sweep_is_due(triggers)
+        if sweep:
+            kv_requests = self.vault_kv.get_kv_requests()
+        else:
+            kv_requests = self._get_pending_vault_kv_requests()
+        kv_requests_by_relation: Dict[int, List[KVRequest]] = {}
         for kv_request in kv_requests:
-            if not (vault_url := self._get_relation_api_address(kv_request.relation)):
-                logger.debug("Failed to get Vault URL for relation %s", kv_request.relation.id)
+            kv_requests_by_relation.setdefault(kv_request.relation.id, []).append(kv_request)
+        skipped_relation_ids = set()
+        for relation_kv_requests in kv_requests_by_relation.values():
+            relation = relation_kv_requests[0].relation
+            if not (vault_url := self._get_relation_api_address(relation)):
+                logger.debug("Failed to get Vault URL for relation %s", relation.id)
+                skipped_relation_ids.add(relation.id)
                 continue
-            manager.generate_credentials_for_requirer(
-                relation=kv_request.relation,
-                app_name=kv_request.app_name,
-                unit_name=kv_request.unit_name,
-                mount_suffix=kv_request.mount_suffix,
-                egress_subnets=kv_request.egress_subnets,
-                nonce=kv_request.nonce,
+            manager.generate_credentials_for_requirers(
+                relation=relation,
+                kv_requests=relation_kv_requests,
                 vault_url=vault_url,
             )
+        pending_requests = self._stored.vault_kv_pending_requests
+        for key in [
+            key
+            for key, pending in pending_requests.items()
+            if pending["relation_id"] not in skipped_relation_ids
+        ]:
+            del pending_requests[key]
+        if sweep:
+            self._stored.vault_kv_last_sweep = time.time()
 
     def _on_authorize_charm_action(self, event: ActionEvent) -> None:
         if not self.unit.is_leader():
@@ -550,13 +750,20 @@ class VaultCharm(CharmBase):
                 policies=[CHARM_POLICY_NAME, "default"],
                 token_ttl="1h",
                 token_max_ttl="1h",
+                token_type=(
+                    "batch"
+                    if self.juju_facade.get_bool_config("charm_batch_tokens")
+                    else "default"
+                ),
             )
+            superseded_accessors = vault.list_role_secret_id_accessors(APPROLE_ROLE_NAME)
             secret_id = vault.generate_role_secret_id(name=APPROLE_ROLE_NAME)
             self.juju_facade.set_app_secret_content(
                 content={"role-id": role_id, "secret-id": secret_id},
                 label=VAULT_CHARM_APPROLE_SECRET_LABEL,
                 description="The authentication details for the charm's access to vault.",
             )
+            destroy_role_secret_ids(vault, APPROLE_ROLE_NAME, superseded_accessors)
             event.set_results(
                 {"result": "Charm authorized successfully. You may now remove the secret."}
             )
@@ -588,6 +795,8 @@ class VaultCharm(CharmBase):
         Args:
             event: ActionEvent
         """
+        # Transferring the snapshot takes as long as its size requires
+        RequestBudget.set(None)
         try:
             vault_client = VaultClient(
                 url=self._api_address,
@@ -605,30 +814,81 @@ class VaultCharm(CharmBase):
             return
         try:
             manager = BackupManager(self, self.s3_requirer, S3_RELATION_NAME)
-            backup_key = manager.create_backup(vault_client)
+            report = manager.create_backup(
+                vault_client,
+                part_size=(self.juju_facade.get_int_config("backup_upload_part_size") or 0) * MiB,
+                max_concurrency=self.juju_facade.get_int_config("backup_upload_concurrency") or 1,
+                compress=bool(self.juju_facade.get_bool_config("backup_compression")),
+                compression_level=self.juju_facade.get_int_config("backup_compression_level")
+                or DEFAULT_COMPRESSION_LEVEL,
+                deduplicate=bool(self.juju_facade.get_bool_config("backup_deduplication")),
+            )
         except ManagerError as e:
             logger.error("Failed to create backup: %s", e)
             event.fail(message=f"Failed to create backup: {e}")
             return
-        event.set_results({"backup-id": backup_key})
+        event.set_results(
+            {
+                "backup-id": report.key,
+                "size": str(report.size),
+                "duration": f"{report.duration:.1f}s",
+                "throughput": f"{report.throughput / MiB:.1f} MiB/s",
+            }
+        )
 
     def _on_list_backups_action(self, event: ActionEvent) -> None:
         """Handle the list-backups action.
 
-        Lists all backups stored in S3 bucket.
+        Lists the backups stored in S3 bucket, from the backup catalog.
 
         Args:
             event: ActionEvent
         """
+        since = None
+        if since_param := event.params.get("since"):
+            try:
+                since = datetime.fromisoformat(since_param)
+            except ValueError:
+                event.fail(message=f"Invalid since parameter: {since_param}")
+                return
         try:
             manager = BackupManager(self, self.s3_requirer, S3_RELATION_NAME)
-            backup_ids = manager.list_backups()
+            backups = manager.list_backups(
+                limit=event.params.get("limit"),
+                since=since,
+                model=event.params.get("model"),
+                rebuild=event.params.get("rebuild-catalog", False),
+            )
         except ManagerError as e:
             logger.error("Failed to list backups: %s", e)
             event.fail(message=f"Failed to list backups: {e}")
             return
 
-        event.set_results({"backup-ids": json.dumps(backup_ids)})
+        event.set_results(
+            {
+                "backup-ids": json.dumps([backup.key for backup in backups]),
+                "backups": json.dumps(
+                    [
+                        {
+                            "id": backup.key,
+                            "size": backup.size,
+                            "original-size": backup.original_size,
+                            "compression": backup.compression,
+                            "deduplicated": backup.deduplicated,
+                            "created-at": (
+                                backup.created_at.isoformat() if backup.created_at else None
+                            ),
+                            "model": backup.model,
+                            "checksum": backup.checksum,
+                            "duration": backup.duration,
+                            "vault-version": backup.vault_version,
+                            "node": backup.node,
+                        }
+                        for backup in backups
+                    ]
+                ),
+            }
+        )
 
     def _on_restore_backup_action(self, event: ActionEvent) -> None:
         """Handle the restore-backup action.
@@ -638,6 +898,8 @@ class VaultCharm(CharmBase):
         Args:
             event: ActionEvent
         """
+        # Transferring the snapshot takes as long as its size requires
+        RequestBudget.set(None)
         vault_client = self._get_active_vault_client()
         if not vault_client:
             event.fail(message="Failed to initialize an active Vault client.")
@@ -646,16 +908,35 @@ class VaultCharm(CharmBase):
         # This should be enforced by Juju/charmcraft.yaml, but we assert here
         # to make the typechecker happy
         assert isinstance(key, str)
+        download_concurrency = self.juju_facade.get_int_config("backup_download_concurrency")
         try:
             manager = BackupManager(self, self.s3_requirer, S3_RELATION_NAME)
-            manager.restore_backup(vault_client, key)
+            manager.restore_backup(
+                vault_client,
+                key,
+                max_concurrency=download_concurrency or 1,
+                spool_dir=self._get_backup_spool_dir(),
+            )
         except ManagerError as e:
             logger.error("Failed to restore backup: %s", e)
             event.fail(message=f"Failed to restore backup: {e}")
             return
+        # Tokens issued before the restore are not in the restored storage
+        AppRoleTokenManager(self).invalidate()
 
         event.set_results({"restored": event.params.get("backup-id")})
 
+    def _get_backup_spool_dir(self) -> str | None:
+        """Return the directory of the charm's storage to spool restored backups in.
+
+        Snapshots can be larger than the default temporary directory, so they
+        are spooled on a storage sized for them when it is attached.
+        """
+        try:
+            return str(self.juju_facade.get_storage_location(BACKUP_SPOOL_STORAGE_NAME))
+        except NoSuchStorageError:
+            return None
+
     def _delete_vault_data(self) -> None:
         """Delete Vault's data."""
         try:
@@ -803,21 +1084,19 @@ class VaultCharm(CharmBase):
 
         This may not be the Vault service running on this unit.
         """
-        for address in self._get_peer_node_api_addresses():
-            try:
-                vault = VaultClient(
-                    address, ca_cert_path=self.tls.get_tls_file_path_in_charm(File.CA)
-                )
-            except VaultCertsError as e:
-                logger.warning("Failed to get Vault client: %s", e)
-                continue
-            if vault.is_active():
-                if not vault.is_api_available():
-                    return None
-                if not self._authenticate_vault_client(vault):
-                    return None
-                return vault
-        return None
+        try:
+            ca_cert_path = self.tls.get_tls_file_path_in_charm(File.CA)
+        except VaultCertsError as e:
+            logger.warning("Failed to get Vault client: %s", e)
+            return None
+        vault = VaultClient.find_active(self._get_peer_node_api_addresses(), ca_cert_path)
+        if not vault:
+            return None
+        if not vault.is_api_available():
+            return None
+        if not self._authenticate_vault_client(vault):
+            return None
+        return vault
 
     def _authenticate_vault_client(self, vault: VaultClient) -> bool:
         """Authenticate the Vault client.
@@ -827,9 +1106,7 @@ class VaultCharm(CharmBase):
         """
         if not (approle := self._get_approle_auth_secret()):
             return False
-        if not vault.authenticate(approle):
-            return False
-        return True
+        return AppRoleTokenManager(self).authenticate(vault, approle)
 
     @property
     def _vault_layer(self) -> Layer:
@@ -32,6 +32,14 @@ path "auth/approle/role/" {
   capabilities = ["list"]
 }
 
+# Allow cleaning up expired approle secret IDs and the leftovers of expired tokens
+path "auth/approle/tidy/secret-id" {
+  capabilities = ["update"]
+}
+path "auth/token/tidy" {
+  capabilities = ["update"]
+}
+
 # Allow charm- prefixes secrets backends to be mounted and managed
 # Allows enabling, reading, updating, deleting and listing secret engines
 # The wildcard path is required as the charm won't know the full path of the secret engine at the time of secret engine creation in the case of vault-kv
@@ -11,6 +11,7 @@ from vault.vault_client import (
 )
 from vault.vault_managers import (
     ACMEManager,
+    AppRoleTokenManager,
     AutounsealProviderManager,
     AutounsealRequirerManager,
     BackupManager,
@@ -50,8 +51,8 @@ class VaultCharmFixtures:
                 "charm.TLSCertificatesProvidesV4.get_outstanding_certificate_requests"
             ) as mock_pki_provider_get_outstanding_certificate_requests,
             patch(
-                "charm.TLSCertificatesProvidesV4.set_relation_certificate"
-            ) as mock_pki_provider_set_relation_certificate,
+                "charm.TLSCertificatesProvidesV4.set_relation_certificates"
+            ) as mock_pki_provider_set_relation_certificates,
             patch(
                 "charm.VaultAutounsealProvides.get_relations_without_credentials"
             ) as mock_autounseal_provides_get_relations_without_credentials,
@@ -69,6 +70,8 @@ class VaultCharmFixtures:
             # the mock
             self.mock_tls = mock_tls.return_value
             self.mock_vault = mock_vault.return_value
+            mock_vault.find_active.return_value = self.mock_vault
+            self.mock_vault.get_pki_role_flags.return_value = None
             self.mock_vault_autounseal_provider_manager = (
                 mock_autounseal_provider_manager.return_value
             )
@@ -88,8 +91,8 @@ class VaultCharmFixtures:
             self.mock_pki_provider_get_outstanding_certificate_requests = (
                 mock_pki_provider_get_outstanding_certificate_requests
             )
-            self.mock_pki_provider_set_relation_certificate = (
-                mock_pki_provider_set_relation_certificate
+            self.mock_pki_provider_set_relation_certificates = (
+                mock_pki_provider_set_relation_certificates
             )
             self.mock_autounseal_provides_get_relations_without_credentials = (
                 mock_autounseal_provides_get_relations_without_credentials
@@ -101,6 +104,18 @@ class VaultCharmFixtures:
             self.mock_get_binding = mock_get_binding
             yield
 
+    @pytest.fixture(autouse=True)
+    def approle_token_manager(self):
+        with patch(
+            "charm.AppRoleTokenManager", autospec=AppRoleTokenManager
+        ) as mock_approle_token_manager:
+            self.mock_approle_token_manager = mock_approle_token_manager.return_value
+            # Without a cached token, authentication falls through to the client
+            self.mock_approle_token_manager.authenticate.side_effect = lambda vault, approle: (
+                vault.authenticate(approle)
+            )
+            yield
+
     @pytest.fixture(autouse=True)
     def context(self):
         self.ctx = testing.Context(
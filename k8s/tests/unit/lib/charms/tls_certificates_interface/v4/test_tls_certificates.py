@@ -0,0 +1,266 @@
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, List
+from unittest.mock import patch
+
+import ops.testing as testing
+import pytest
+from charms.tls_certificates_interface.v4.tls_certificates import (
+    Certificate,
+    CertificateSigningRequest,
+    PEMParseCache,
+    ProviderCertificate,
+    TLSCertificatesError,
+    TLSCertificatesProvidesV4,
+    pem_parse_cache,
+)
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from ops.charm import CharmBase
+
+logger = logging.getLogger(__name__)
+
+RELATION_NAME = "certificates"
+BENCHMARK_CSR_COUNT = 1000
+
+
+class TLSProviderCharm(CharmBase):
+    def __init__(self, *args: Any):
+        super().__init__(*args)
+        self.certificates = TLSCertificatesProvidesV4(self, RELATION_NAME)
+
+
+METADATA = {
+    "name": "tls-provider",
+    "provides": {RELATION_NAME: {"interface": "tls-certificates"}},
+}
+
+
+class _CA:
+    """Signs certificates with keys loaded once.
+
+    The helpers of the library load the keys from PEM for every CSR and
+    certificate, which is too slow to generate thousands of them.
+    """
+
+    def __init__(self):
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "ca.example.com")])
+        self.certificate = self._sign(self.name, self.private_key.public_key())
+
+    def _sign(self, subject: x509.Name, public_key: Any) -> x509.Certificate:
+        now = datetime.now(timezone.utc)
+        return (
+            x509.CertificateBuilder()
+            .subject_name(subject)
+            .issuer_name(self.name)
+            .public_key(public_key)
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now)
+            .not_valid_after(now + timedelta(days=30))
+            .sign(self.private_key, hashes.SHA256())
+        )
+
+    def certificate_entry(self, csr: CertificateSigningRequest) -> dict:
+        csr_object = x509.load_pem_x509_csr(csr.raw.encode())
+        certificate = self._sign(csr_object.subject, csr_object.public_key())
+        certificate_pem = _to_pem(certificate)
+        ca_pem = _to_pem(self.certificate)
+        return {
+            "certificate": certificate_pem,
+            "certificate_signing_request": str(csr),
+            "ca": ca_pem,
+            "chain": [certificate_pem, ca_pem],
+        }
+
+
+def _to_pem(certificate: x509.Certificate) -> str:
+    return certificate.public_bytes(serialization.Encoding.PEM).decode().strip()
+
+
+@pytest.fixture(scope="module")
+def ca() -> _CA:
+    return _CA()
+
+
+def _generate_csrs(count: int) -> List[CertificateSigningRequest]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    csrs = []
+    for index in range(count):
+        csr = (
+            x509.CertificateSigningRequestBuilder()
+            .subject_name(
+                x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, f"unit-{index}.example.com")])
+            )
+            .sign(private_key, hashes.SHA256())
+        )
+        csrs.append(
+            CertificateSigningRequest.from_string(
+                csr.public_bytes(serialization.Encoding.PEM).decode()
+            )
+        )
+    return csrs
+
+
+def _relation(
+    requested: List[CertificateSigningRequest], certificates: List[dict]
+) -> testing.Relation:
+    return testing.Relation(
+        endpoint=RELATION_NAME,
+        interface="tls-certificates",
+        remote_app_name="requirer",
+        local_app_data={"certificates": json.dumps(certificates)},
+        remote_units_data={
+            0: {
+                "certificate_signing_requests": json.dumps(
+                    [{"certificate_signing_request": str(csr), "ca": False} for csr in requested]
+                )
+            }
+        },
+    )
+
+
+def test_given_issued_and_unsolicited_certificates_when_get_requests_then_indexes_match_csrs(
+    ca: _CA,
+):
+    issued_csr, outstanding_csr, unsolicited_csr = _generate_csrs(3)
+    relation = _relation(
+        requested=[issued_csr, outstanding_csr],
+        certificates=[ca.certificate_entry(issued_csr), ca.certificate_entry(unsolicited_csr)],
+    )
+    ctx = testing.Context(TLSProviderCharm, meta=METADATA)
+
+    with ctx(ctx.on.start(), testing.State(leader=True, relations=[relation])) as manager:
+        provider = manager.charm.certificates
+        outstanding = provider.get_outstanding_certificate_requests()
+        unsolicited = provider.get_unsolicited_certificates()
+
+    assert [request.certificate_signing_request for request in outstanding] == [outstanding_csr]
+    assert [certificate.certificate_signing_request for certificate in unsolicited] == [
+        unsolicited_csr
+    ]
+
+
+def test_given_many_csrs_when_get_outstanding_requests_then_provider_certificates_loaded_once(
+    ca: _CA,
+):
+    """Benchmark the lookup of outstanding requests among many CSRs.
+
+    Half of the CSRs have a certificate. The provider certificates must be
+    loaded from the relation once, rather than once per CSR.
+    """
+    csrs = _generate_csrs(BENCHMARK_CSR_COUNT)
+    issued_csrs = csrs[::2]
+    relation = _relation(
+        requested=csrs, certificates=[ca.certificate_entry(csr) for csr in issued_csrs]
+    )
+    ctx = testing.Context(TLSProviderCharm, meta=METADATA)
+
+    with ctx(ctx.on.start(), testing.State(leader=True, relations=[relation])) as manager:
+        provider = manager.charm.certificates
+        with patch.object(
+            TLSCertificatesProvidesV4,
+            "_load_provider_certificates",
+            autospec=True,
+            side_effect=TLSCertificatesProvidesV4._load_provider_certificates,
+        ) as load_provider_certificates:
+            start = time.perf_counter()
+            outstanding = provider.get_outstanding_certificate_requests()
+            elapsed = time.perf_counter() - start
+
+    logger.info(
+        "Found %d outstanding requests among %d CSRs in %.2fs",
+        len(outstanding),
+        BENCHMARK_CSR_COUNT,
+        elapsed,
+    )
+    assert load_provider_certificates.call_count == 1
+    assert {request.certificate_signing_request for request in outstanding} == set(csrs[1::2])
+
+
+def test_given_same_pem_when_from_string_twice_then_parsed_once_and_same_object_returned(
+    ca: _CA,
+):
+    pem = _to_pem(ca.certificate)
+    pem_parse_cache.clear()
+
+    first = Certificate.from_string(pem)
+    misses = pem_parse_cache.misses
+    second = Certificate.from_string(f"\n{pem}\n")
+
+    assert second is first
+    assert pem_parse_cache.hits == 1
+    assert pem_parse_cache.misses == misses
+
+
+def test_given_same_pem_when_parsed_as_other_type_then_cache_entries_kept_apart(ca: _CA):
+    [csr] = _generate_csrs(1)
+    pem_parse_cache.clear()
+
+    parsed_csr = CertificateSigningRequest.from_string(csr.raw)
+
+    assert parsed_csr == csr
+    with pytest.raises(TLSCertificatesError):
+        Certificate.from_string(csr.raw)
+    with pytest.raises(TLSCertificatesError):
+        Certificate.from_string(csr.raw)
+    assert pem_parse_cache.hits == 0
+
+
+def test_given_cache_full_when_get_then_least_recently_used_entry_evicted():
+    cache = PEMParseCache(maxsize=2)
+    cache.get("kind", "a", str.upper)
+    cache.get("kind", "b", str.upper)
+    cache.get("kind", "a", str.upper)
+
+    cache.get("kind", "c", str.upper)
+    cache.get("kind", "b", str.upper)
+
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_given_many_certificates_when_set_relation_certificates_then_relation_data_dumped_once(
+    ca: _CA,
+):
+    reissued_csr, *new_csrs = _generate_csrs(4)
+    stale_certificate = ca.certificate_entry(reissued_csr)
+    relation = _relation(requested=[reissued_csr, *new_csrs], certificates=[stale_certificate])
+    ctx = testing.Context(TLSProviderCharm, meta=METADATA)
+
+    with ctx(ctx.on.start(), testing.State(leader=True, relations=[relation])) as manager:
+        provider = manager.charm.certificates
+        provider_certificates = [
+            Certificate.from_string(ca.certificate_entry(csr)["certificate"])
+            for csr in [reissued_csr, *new_csrs]
+        ]
+        ca_certificate = Certificate.from_string(_to_pem(ca.certificate))
+        with patch.object(
+            TLSCertificatesProvidesV4,
+            "_dump_provider_certificates",
+            autospec=True,
+            side_effect=TLSCertificatesProvidesV4._dump_provider_certificates,
+        ) as dump_provider_certificates:
+            provider.set_relation_certificates(
+                [
+                    ProviderCertificate(
+                        relation_id=relation.id,
+                        certificate=certificate,
+                        certificate_signing_request=csr,
+                        ca=ca_certificate,
+                        chain=[certificate, ca_certificate],
+                    )
+                    for csr, certificate in zip([reissued_csr, *new_csrs], provider_certificates)
+                ]
+            )
+        issued = provider.get_issued_certificates(relation_id=relation.id)
+
+    assert dump_provider_certificates.call_count == 1
+    assert [certificate.certificate for certificate in issued] == provider_certificates
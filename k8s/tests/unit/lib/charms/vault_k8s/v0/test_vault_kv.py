@@ -33,6 +33,9 @@ class VaultKvProviderCharm(CharmBase):
             self.interface.on.vault_kv_client_detached, self._on_vault_kv_client_detached
         )
         self.framework.observe(self.on.set_kv_data_action, self._on_set_kv_data_action)
+        self.framework.observe(
+            self.on.set_kv_data_for_units_action, self._on_set_kv_data_for_units_action
+        )
         self.framework.observe(
             self.on.get_kv_requests_action,
             self._on_get_kv_requests_action,
@@ -67,6 +70,20 @@ class VaultKvProviderCharm(CharmBase):
             ca_certificate=ca_certificate,
         )
 
+    def _on_set_kv_data_for_units_action(self, event: ActionEvent):
+        relation = self.model.get_relation(
+            relation_name=VAULT_KV_RELATION_NAME,
+            relation_id=int(event.params["relation-id"]),
+        )
+        assert relation
+        self.interface.set_kv_data_for_units(
+            relation=relation,
+            mount=event.params["mount"],
+            ca_certificate=event.params["ca-certificate"],
+            vault_url=event.params["url"],
+            credentials=json.loads(event.params["credentials"]),
+        )
+
     def _on_get_kv_requests_action(self, event: ActionEvent):
         kv_requests = self.interface.get_kv_requests()
         event.set_results(
@@ -149,6 +166,16 @@ class TestVaultKvProvides(unittest.TestCase):
                         },
                     },
                 },
+                "set-kv-data-for-units": {
+                    "description": "Set the vault data for many units",
+                    "params": {
+                        "url": {"type": "string"},
+                        "relation-id": {"type": "string"},
+                        "mount": {"type": "string"},
+                        "ca-certificate": {"type": "string"},
+                        "credentials": {"type": "string"},
+                    },
+                },
                 "get-outstanding-kv-requests": {
                     "description": "Get the outstanding kv requests",
                 },
@@ -180,6 +207,33 @@ class TestVaultKvProvides(unittest.TestCase):
         assert self.ctx.emitted_events[1].mount_suffix == suffix
         assert self.ctx.emitted_events[1].nonce == "abcd"
 
+    def test_given_many_units_when_one_unit_changed_then_new_client_attached_fired_for_that_unit(
+        self,
+    ):
+        vault_kv_relation = testing.Relation(
+            endpoint="vault-kv",
+            interface="vault-kv",
+            remote_app_data={"mount_suffix": "dummy"},
+            remote_units_data={
+                0: {"nonce": "abcd", "egress_subnet": "10.0.0.1/32"},
+                1: {"nonce": "efgh", "egress_subnet": "10.0.0.2/32"},
+                2: {"nonce": "ijkl", "egress_subnet": "10.0.0.3/32"},
+            },
+        )
+        state_in = testing.State(
+            relations=[vault_kv_relation],
+        )
+
+        self.ctx.run(self.ctx.on.relation_changed(vault_kv_relation, remote_unit=1), state_in)
+
+        attached_events = [
+            event
+            for event in self.ctx.emitted_events
+            if isinstance(event, NewVaultKvClientAttachedEvent)
+        ]
+        assert len(attached_events) == 1
+        assert attached_events[0].nonce == "efgh"
+
     def test_given_unit_joined_when_missing_data_then_new_client_attached_is_never_fired(
         self,
     ):
@@ -270,6 +324,50 @@ class TestVaultKvProvides(unittest.TestCase):
             "credentials": json.dumps({nonce: secret_id}),
         }
 
+    def test_given_existing_credentials_when_setting_data_for_units_then_credentials_merged(
+        self,
+    ):
+        vault_url = "https://vault.example.com"
+        mount = "charm-vault-kv-requires-dummy"
+        vault_kv_relation = testing.Relation(
+            endpoint="vault-kv",
+            interface="vault-kv",
+            remote_app_data={},
+            remote_units_data={0: {}, 1: {}, 2: {}},
+            local_app_data={
+                "mount": mount,
+                "ca_certificate": "random certificate",
+                "vault_url": vault_url,
+                "credentials": json.dumps({"abcd": "secret-0"}),
+            },
+        )
+        state_in = testing.State(
+            relations=[vault_kv_relation],
+            leader=True,
+        )
+        state_out = self.ctx.run(
+            self.ctx.on.action(
+                "set-kv-data-for-units",
+                params={
+                    "url": vault_url,
+                    "mount": mount,
+                    "relation-id": str(vault_kv_relation.id),
+                    "ca-certificate": "random certificate",
+                    "credentials": json.dumps({"efgh": "secret-1", "ijkl": "secret-2"}),
+                },
+            ),
+            state_in,
+        )
+
+        assert state_out.get_relation(vault_kv_relation.id).local_app_data == {
+            "mount": mount,
+            "ca_certificate": "random certificate",
+            "vault_url": vault_url,
+            "credentials": json.dumps(
+                {"abcd": "secret-0", "efgh": "secret-1", "ijkl": "secret-2"}, sort_keys=True
+            ),
+        }
+
     def test_given_no_request_when_get_kv_requests_then_empty_list_is_returned(self):
         vault_kv_relation = testing.Relation(
             endpoint="vault-kv",
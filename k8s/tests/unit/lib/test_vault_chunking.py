@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import gzip
+import hashlib
+import io
+import random
+import unittest
+from unittest.mock import MagicMock
+
+from urllib3.exceptions import ProtocolError
+from vault.vault_chunking import (
+    MAX_CHUNK_SIZE,
+    MIN_CHUNK_SIZE,
+    ChunkingError,
+    ChunkReference,
+    ChunkStore,
+    Manifest,
+    chunk_key,
+    iter_chunks,
+)
+from vault.vault_s3 import S3
+
+
+def _snapshot(size: int, seed: int = 0) -> bytes:
+    return random.Random(seed).randbytes(size)
+
+
+class FakeBucket:
+    """Keeps the objects put by a mocked S3 in memory."""
+
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+        self.s3 = MagicMock(spec=S3)
+        self.s3.object_exists.side_effect = lambda bucket_name, object_key: (
+            object_key in self.objects
+        )
+        self.s3.put_bytes.side_effect = self._put_bytes
+        self.s3.get_bytes.side_effect = lambda bucket_name, object_key: self.objects[object_key]
+
+    def _put_bytes(self, bucket_name: str, key: str, content: bytes):
+        self.objects[key] = content
+
+
+class TestChunking(unittest.TestCase):
+    def test_given_snapshot_when_iter_chunks_then_chunks_within_bounds_and_cover_snapshot(self):
+        snapshot = _snapshot(16 * 1024 * 1024)
+
+        chunks = list(iter_chunks(io.BytesIO(snapshot)))
+
+        self.assertEqual(b"".join(chunks), snapshot)
+        self.assertTrue(
+            all(MIN_CHUNK_SIZE <= len(chunk) <= MAX_CHUNK_SIZE for chunk in chunks[:-1])
+        )
+        self.assertGreater(len(chunks), 1)
+
+    def test_given_bytes_inserted_in_snapshot_when_iter_chunks_then_chunks_after_insertion_shared(
+        self,
+    ):
+        snapshot = _snapshot(16 * 1024 * 1024)
+        modified = snapshot[: 5 * 1024 * 1024] + b"new secret" + snapshot[5 * 1024 * 1024 :]
+
+        chunks = set(iter_chunks(io.BytesIO(snapshot)))
+        modified_chunks = list(iter_chunks(io.BytesIO(modified)))
+
+        self.assertLessEqual(len([chunk for chunk in modified_chunks if chunk not in chunks]), 2)
+
+    def test_given_invalid_manifest_when_loads_then_error_raised(self):
+        for content in [
+            b"not json",
+            b'{"version": 2, "compression": null, "size": 0, "chunks": []}',
+            b'{"version": 1, "compression": null, "size": 5, "chunks": [["digest", 4]]}',
+        ]:
+            with self.assertRaises(ChunkingError):
+                Manifest.loads(content)
+
+    def test_given_manifest_when_dumps_and_loads_then_same_manifest_returned(self):
+        manifest = Manifest(chunks=[ChunkReference(digest="abc", size=4)], compression="gzip")
+
+        self.assertEqual(Manifest.loads(manifest.dumps()), manifest)
+
+
+class TestChunkStore(unittest.TestCase):
+    def test_given_snapshot_uploaded_when_upload_again_then_no_chunk_uploaded(self):
+        bucket = FakeBucket()
+        store = ChunkStore(bucket.s3, "my-bucket", max_concurrency=2)
+        snapshot = _snapshot(8 * 1024 * 1024)
+
+        first = store.upload(io.BytesIO(snapshot))
+        second = store.upload(io.BytesIO(snapshot))
+
+        self.assertEqual(first.uploaded_chunks, len(first.manifest.chunks))
+        self.assertEqual(first.uploaded_size, len(snapshot))
+        self.assertEqual((second.uploaded_chunks, second.uploaded_size), (0, 0))
+        self.assertEqual(second.manifest, first.manifest)
+        bucket.s3.get_object_key_list.assert_not_called()
+
+    def test_given_snapshot_fails_after_first_chunk_when_upload_then_chunking_error_raised(self):
+        bucket = FakeBucket()
+        content = MagicMock()
+        content.read.side_effect = [_snapshot(MAX_CHUNK_SIZE), ProtocolError("Connection broken")]
+
+        with self.assertRaises(ChunkingError):
+            ChunkStore(bucket.s3, "bucket").upload(content)
+
+    def test_given_compressed_chunks_when_download_to_spool_then_snapshot_reassembled(self):
+        bucket = FakeBucket()
+        store = ChunkStore(bucket.s3, "my-bucket", max_concurrency=3)
+        snapshot = b"".join(_snapshot(1024 * 1024, seed) * 3 for seed in range(4))
+
+        upload = store.upload(io.BytesIO(snapshot), compression="gzip")
+        spool = store.download_to_spool(upload.manifest)
+
+        self.assertEqual(spool.read(), snapshot)
+        first_chunk = upload.manifest.chunks[0]
+        stored = bucket.objects[chunk_key(first_chunk.digest, "gzip")]
+        self.assertEqual(hashlib.sha256(gzip.decompress(stored)).hexdigest(), first_chunk.digest)
+
+    def test_given_chunk_corrupted_when_download_to_spool_then_error_raised(self):
+        bucket = FakeBucket()
+        store = ChunkStore(bucket.s3, "my-bucket")
+        upload = store.upload(io.BytesIO(_snapshot(1024 * 1024)))
+        bucket.objects[chunk_key(upload.manifest.chunks[0].digest, None)] = b"corrupted"
+
+        with self.assertRaises(ChunkingError):
+            store.download_to_spool(upload.manifest)
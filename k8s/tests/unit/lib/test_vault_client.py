@@ -2,24 +2,54 @@
 # Copyright 2023 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+import asyncio
+import io
+import json
+import os
+import threading
+import time
 from contextlib import nullcontext as does_not_raise
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import ContextManager
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
 import pytest
 import requests
+from charms.tls_certificates_interface.v4.tls_certificates import (
+    generate_ca,
+    generate_private_key,
+)
 from hvac.exceptions import Forbidden, InternalServerError
 from vault.vault_client import (
     AppRole,
+    AsyncVaultClient,
     AuditDeviceType,
+    CircuitState,
+    PeerCircuitBreaker,
+    PKIRoleFlags,
+    RequestBudget,
     SecretsBackend,
     Token,
+    TokenDetails,
     VaultClient,
+    VaultClientError,
+    VaultReadCache,
+    VaultSessionPool,
+    VaultStatus,
 )
 
 TEST_PATH = "./tests/unit/lib"
 
 
+def _json_response(status_code: int, body: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode()
+    return response
+
+
 @patch("hvac.api.auth_methods.token.Token.lookup_self")
 def test_given_token_as_auth_details_when_authenticate_then_token_is_set(_):
     vault = VaultClient(url="http://whatever-url", ca_cert_path="whatever path")
@@ -37,6 +67,149 @@ def test_given_valid_token_as_auth_details_when_authenticate_then_authentication
     assert vault.authenticate(Token("some token"))
 
 
+@patch("hvac.api.auth_methods.token.Token.lookup_self")
+def test_given_token_lookup_when_authenticate_then_token_details_are_recorded(
+    patch_lookup: MagicMock,
+):
+    patch_lookup.return_value = {
+        "data": {"accessor": "some accessor", "ttl": 3600, "renewable": True}
+    }
+    vault = VaultClient(url="http://whatever-url", ca_cert_path="whatever path")
+
+    assert vault.authenticate(Token("some token"))
+
+    assert vault.token_details
+    assert vault.token_details.token == "some token"
+    assert vault.token_details.accessor == "some accessor"
+    assert vault.token_details.renewable
+    assert not vault.token_details.expires_within(timedelta(minutes=50))
+    assert vault.token_details.expires_within(timedelta(minutes=70))
+
+
+@patch("hvac.api.auth_methods.token.Token.lookup_self")
+def test_given_token_details_when_use_token_then_token_is_set_without_lookup(
+    patch_lookup: MagicMock,
+):
+    token_details = TokenDetails(
+        token="cached token",
+        accessor="some accessor",
+        expiry=datetime.now(timezone.utc) + timedelta(hours=1),
+        renewable=False,
+    )
+    vault = VaultClient(url="http://whatever-url", ca_cert_path="whatever path")
+
+    vault.use_token(token_details)
+
+    assert vault.token == "cached token"
+    assert vault.token_details == token_details
+    patch_lookup.assert_not_called()
+
+
+@pytest.mark.usefixtures("reset_circuits_and_budget")
+def test_given_token_rejected_when_request_then_on_rejected_called_and_request_retried():
+    token_details = TokenDetails(
+        token="revoked token",
+        accessor="some accessor",
+        expiry=datetime.now(timezone.utc) + timedelta(hours=1),
+        renewable=False,
+    )
+    vault = VaultClient(url="http://vault-0:8200", ca_cert_path=None)
+
+    def on_rejected() -> bool:
+        vault.use_token(replace(token_details, token="new token"))
+        return True
+
+    vault.use_token(token_details, on_rejected=on_rejected)
+    responses = [
+        _json_response(403, {"errors": ["permission denied"]}),
+        _json_response(403, {"errors": ["permission denied"]}),
+        _json_response(200, {"data": {"key": "value"}}),
+    ]
+
+    with patch("requests.adapters.HTTPAdapter.send") as patch_send:
+        patch_send.side_effect = lambda *args, **kwargs: responses.pop(0)
+        assert vault.read("charm-kv/some/path") == {"key": "value"}
+
+    assert patch_send.call_args.args[0].headers["X-Vault-Token"] == "new token"
+
+
+@pytest.mark.usefixtures("reset_circuits_and_budget")
+def test_given_request_denied_by_policy_when_request_then_on_rejected_not_called():
+    token_details = TokenDetails(
+        token="valid token",
+        accessor="some accessor",
+        expiry=datetime.now(timezone.utc) + timedelta(hours=1),
+        renewable=False,
+    )
+    on_rejected = MagicMock(return_value=True)
+    vault = VaultClient(url="http://vault-0:8200", ca_cert_path=None)
+    vault.use_token(token_details, on_rejected=on_rejected)
+    responses = [
+        _json_response(403, {"errors": ["permission denied"]}),
+        _json_response(200, {"data": {"accessor": "some accessor"}}),
+    ]
+
+    with patch("requests.adapters.HTTPAdapter.send") as patch_send:
+        patch_send.side_effect = lambda *args, **kwargs: responses.pop(0)
+        assert vault.read("charm-kv/some/path") == {}
+
+    on_rejected.assert_not_called()
+
+
+@patch("hvac.api.auth_methods.token.Token.renew_self")
+def test_given_renewable_token_when_renew_token_then_token_details_are_updated(
+    patch_renew: MagicMock,
+):
+    patch_renew.return_value = {
+        "auth": {
+            "client_token": "some token",
+            "accessor": "some accessor",
+            "lease_duration": 3600,
+            "renewable": True,
+        }
+    }
+    vault = VaultClient(url="http://whatever-url", ca_cert_path="whatever path")
+    vault.use_token(
+        TokenDetails(
+            token="some token",
+            accessor="some accessor",
+            expiry=datetime.now(timezone.utc) + timedelta(minutes=1),
+            renewable=True,
+        )
+    )
+
+    renewed = vault.renew_token()
+
+    assert renewed
+    assert renewed.token == "some token"
+    assert not renewed.expires_within(timedelta(minutes=50))
+    assert vault.token_details == renewed
+
+
+@patch("hvac.api.auth_methods.token.Token.renew_self")
+@patch("hvac.api.auth_methods.token.Token.lookup_self")
+def test_given_batch_token_when_renew_token_then_vault_not_called(
+    patch_lookup: MagicMock, patch_renew: MagicMock
+):
+    patch_lookup.return_value = {
+        "data": {"accessor": "", "ttl": 3600, "renewable": False, "type": "batch"}
+    }
+    vault = VaultClient(url="http://whatever-url", ca_cert_path="whatever path")
+    assert vault.authenticate(Token("some token"))
+
+    assert vault.token_details and vault.token_details.batch
+    assert vault.renew_token() is None
+    patch_renew.assert_not_called()
+
+
+@patch("hvac.api.auth_methods.token.Token.renew_self")
+def test_given_renew_fails_when_renew_token_then_none_is_returned(patch_renew: MagicMock):
+    patch_renew.side_effect = Forbidden()
+    vault = VaultClient(url="http://whatever-url", ca_cert_path="whatever path")
+
+    assert vault.renew_token() is None
+
+
 @patch("hvac.api.auth_methods.token.Token.lookup_self")
 def test_given_invalid_token_as_auth_details_when_authenticate_then_authentication_fails(
     patch_lookup: MagicMock,
@@ -188,6 +361,20 @@ def test_given_policy_without_mount_when_configure_policy_then_policy_created_co
         )
 
 
+@patch("hvac.adapters.JSONAdapter.post")
+def test_when_tidy_then_tidy_endpoints_called_and_warnings_returned(patch_post: MagicMock):
+    patch_post.return_value = {"warnings": ["Tidy operation successfully started."]}
+    vault = VaultClient(url="http://whatever-url", ca_cert_path="whatever path")
+
+    assert vault.tidy_approle_secret_ids() == ["Tidy operation successfully started."]
+    assert vault.tidy_tokens() == ["Tidy operation successfully started."]
+
+    assert patch_post.call_args_list == [
+        call("/v1/auth/approle/tidy/secret-id"),
+        call("/v1/auth/token/tidy"),
+    ]
+
+
 @patch("hvac.api.auth_methods.approle.AppRole.read_role_id")
 @patch("hvac.api.auth_methods.approle.AppRole.create_or_update_approle")
 def test_given_approle_with_valid_params_when_configure_approle_then_approle_created(
@@ -211,6 +398,7 @@ def test_given_approle_with_valid_params_when_configure_approle_then_approle_cre
         token_policies=["root", "default"],
         token_bound_cidrs=["192.168.1.0/24"],
         token_period=None,
+        token_type="default",
     )
     patch_read_role_id.assert_called_once()
 
@@ -359,3 +547,619 @@ def test_list(patch_list: MagicMock):
     result = vault.list("some/path")
     assert result == ["key1", "key2"]
     patch_list.assert_called_once_with("some/path")
+
+
+@patch("hvac.api.system_backend.seal.Seal.read_seal_status")
+@patch("hvac.api.system_backend.health.Health.read_health_status")
+def test_given_vault_sealed_when_status_then_snapshot_read_from_health_status(
+    patch_health_status: MagicMock, patch_seal_status: MagicMock
+):
+    patch_health_status.return_value = _json_response(
+        503, {"initialized": True, "sealed": True, "standby": True, "version": "1.17.6"}
+    )
+    vault = VaultClient(url="http://whatever-url", ca_cert_path="whatever path")
+
+    status = vault.status()
+
+    assert status.reachable
+    assert status.health_code == 503
+    assert status.initialized
+    assert status.sealed
+    assert status.version == "1.17.6"
+    assert not status.active_or_standby
+    assert not status.has_seal_details
+    patch_seal_status.assert_not_called()
+
+
+@patch("hvac.api.system_backend.health.Health.read_health_status")
+def test_given_status_predicates_called_when_status_cached_then_health_status_read_once(
+    patch_health_status: MagicMock,
+):
+    patch_health_status.return_value = _json_response(
+        429, {"initialized": True, "sealed": False, "standby": True}
+    )
+    vault = VaultClient(url="http://whatever-url", ca_cert_path="whatever path")
+
+    assert vault.is_api_available()
+    assert vault.is_initialized()
+    assert not vault.is_sealed()
+    assert vault.is_available_initialized_and_unsealed()
+    assert vault.is_active_or_standby()
+    assert not vault.is_active()
+
+    patch_health_status.assert_called_once()
+
+
+@patch("hvac.api.system_backend.health.Health.read_health_status")
+def test_given_refresh_when_status_then_health_status_read_again(
+    patch_health_status: MagicMock,
+):
+    patch_health_status.side_effect = [
+        _json_response(503, {"initialized": True, "sealed": True}),
+        {"initialized": True, "sealed": False, "standby": False},
+    ]
+    vault = VaultClient(url="http://whatever-url", ca_cert_path="whatever path")
+
+    assert vault.is_sealed()
+    assert not vault.status(refresh=True).sealed
+    assert vault.is_active()
+
+
+@patch("hvac.api.system_backend.seal.Seal.read_seal_status")
+@patch("hvac.api.system_backend.health.Health.read_health_status")
+def test_given_seal_details_needed_when_status_cached_then_seal_status_read_once(
+    patch_health_status: MagicMock, patch_seal_status: MagicMock
+):
+    patch_health_status.return_value = _json_response(501, {"initialized": False, "sealed": True})
+    patch_seal_status.return_value = {
+        "initialized": False,
+        "sealed": True,
+        "type": "transit",
+        "migration": False,
+    }
+    vault = VaultClient(url="http://whatever-url", ca_cert_path="whatever path")
+
+    assert not vault.is_initialized()
+    assert vault.is_seal_type_transit()
+    assert not vault.needs_migration()
+    assert vault.status().seal_type == "transit"
+
+    patch_health_status.assert_called_once()
+    patch_seal_status.assert_called_once()
+
+
+@patch("hvac.api.system_backend.seal.Seal.read_seal_status")
+@patch("hvac.api.system_backend.health.Health.read_health_status")
+def test_given_seal_status_unavailable_when_is_sealed_then_vault_client_error_raised(
+    patch_health_status: MagicMock, patch_seal_status: MagicMock
+):
+    patch_health_status.return_value = _json_response(
+        500, {"errors": ["barrier reports initialized but no seal configuration found"]}
+    )
+    patch_seal_status.side_effect = InternalServerError()
+    vault = VaultClient(url="http://whatever-url", ca_cert_path="whatever path")
+
+    with pytest.raises(VaultClientError):
+        vault.is_sealed()
+
+
+def _write_ca_certificate(path: Path) -> str:
+    ca_private_key = generate_private_key()
+    ca_certificate = generate_ca(
+        private_key=ca_private_key, common_name="vault-ca", validity=timedelta(days=1)
+    )
+    path.write_text(str(ca_certificate))
+    return str(path)
+
+
+def test_given_same_url_and_ca_when_creating_clients_then_session_is_shared(tmp_path: Path):
+    VaultSessionPool.clear()
+    ca_cert_path = _write_ca_certificate(tmp_path / "ca.pem")
+
+    vault_1 = VaultClient(url="https://vault-0:8200", ca_cert_path=ca_cert_path)
+    vault_2 = VaultClient(url="https://vault-0:8200", ca_cert_path=ca_cert_path)
+    vault_3 = VaultClient(url="https://vault-1:8200", ca_cert_path=ca_cert_path)
+
+    assert vault_1._client.adapter.session is vault_2._client.adapter.session
+    assert vault_1._client.adapter.session is not vault_3._client.adapter.session
+    assert vault_1._client.adapter.session.verify == ca_cert_path
+
+
+def test_given_same_ca_when_creating_clients_then_ssl_context_is_shared(tmp_path: Path):
+    VaultSessionPool.clear()
+    ca_cert_path = _write_ca_certificate(tmp_path / "ca.pem")
+
+    vault_1 = VaultClient(url="https://vault-0:8200", ca_cert_path=ca_cert_path)
+    vault_2 = VaultClient(url="https://vault-1:8200", ca_cert_path=ca_cert_path)
+
+    adapter_1 = vault_1._client.adapter.session.get_adapter("https://vault-0:8200")
+    adapter_2 = vault_2._client.adapter.session.get_adapter("https://vault-1:8200")
+    assert adapter_1._ssl_context is adapter_2._ssl_context
+
+
+def test_given_ca_file_changed_when_creating_client_then_new_session_is_created(
+    tmp_path: Path,
+):
+    VaultSessionPool.clear()
+    ca_cert_path = _write_ca_certificate(tmp_path / "ca.pem")
+    vault_1 = VaultClient(url="https://vault-0:8200", ca_cert_path=ca_cert_path)
+
+    _write_ca_certificate(tmp_path / "ca.pem")
+    stat = os.stat(ca_cert_path)
+    os.utime(ca_cert_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    vault_2 = VaultClient(url="https://vault-0:8200", ca_cert_path=ca_cert_path)
+
+    assert vault_1._client.adapter.session is not vault_2._client.adapter.session
+
+
+def test_given_no_ca_when_creating_client_then_verification_is_disabled():
+    VaultSessionPool.clear()
+
+    vault = VaultClient(url="https://vault-0:8200", ca_cert_path=None)
+
+    assert vault._client.adapter.session.verify is False
+
+
+@patch.object(VaultClient, "is_active", autospec=True)
+@patch.object(VaultClient, "get_leader_address", autospec=True)
+def test_given_leader_known_when_find_active_then_client_for_leader_returned(
+    patch_get_leader_address: MagicMock, patch_is_active: MagicMock
+):
+    patch_get_leader_address.side_effect = lambda vault: (
+        "https://vault-1:8200" if vault.url == "https://vault-2:8200" else None
+    )
+    patch_is_active.side_effect = lambda vault: vault.url == "https://vault-1:8200"
+
+    vault = VaultClient.find_active(
+        ["https://vault-0:8200", "https://vault-1:8200", "https://vault-2:8200"], None
+    )
+
+    assert vault
+    assert vault.url == "https://vault-1:8200"
+    assert patch_is_active.call_count == 1
+
+
+@patch.object(VaultClient, "is_active", autospec=True)
+@patch.object(VaultClient, "get_leader_address", autospec=True)
+def test_given_leader_unknown_when_find_active_then_first_active_node_returned(
+    patch_get_leader_address: MagicMock, patch_is_active: MagicMock
+):
+    patch_get_leader_address.return_value = None
+    patch_is_active.side_effect = lambda vault: vault.url == "https://vault-2:8200"
+
+    vault = VaultClient.find_active(
+        ["https://vault-0:8200", "https://vault-1:8200", "https://vault-2:8200"], None
+    )
+
+    assert vault
+    assert vault.url == "https://vault-2:8200"
+
+
+@patch.object(VaultClient, "is_active", autospec=True)
+@patch.object(VaultClient, "get_leader_address", autospec=True)
+def test_given_unresponsive_node_when_find_active_then_lookup_bounded_by_deadline(
+    patch_get_leader_address: MagicMock, patch_is_active: MagicMock
+):
+    def get_leader_address(vault: VaultClient) -> str | None:
+        if vault.url == "https://vault-0:8200":
+            time.sleep(2)
+        return None
+
+    patch_get_leader_address.side_effect = get_leader_address
+    patch_is_active.return_value = False
+
+    start = time.monotonic()
+    vault = VaultClient.find_active(
+        ["https://vault-0:8200", "https://vault-1:8200"], None, deadline=0.2
+    )
+
+    assert vault is None
+    assert time.monotonic() - start < 1
+
+
+@patch("hvac.api.system_backend.leader.Leader.read_leader_status")
+def test_given_node_knows_leader_when_get_leader_address_then_address_returned(
+    patch_read_leader_status: MagicMock,
+):
+    patch_read_leader_status.return_value = {
+        "ha_enabled": True,
+        "is_self": False,
+        "leader_address": "https://vault-1:8200",
+    }
+    vault = VaultClient(url="http://whatever-url", ca_cert_path=None)
+
+    assert vault.get_leader_address() == "https://vault-1:8200"
+
+
+@patch("hvac.api.system_backend.leader.Leader.read_leader_status")
+def test_given_node_sealed_when_get_leader_address_then_none_returned(
+    patch_read_leader_status: MagicMock,
+):
+    patch_read_leader_status.side_effect = InternalServerError()
+    vault = VaultClient(url="http://whatever-url", ca_cert_path=None)
+
+    assert vault.get_leader_address() is None
+
+
+@patch("hvac.api.system_backend.mount.Mount.list_mounted_secrets_engines")
+def test_when_get_mounts_then_types_keyed_by_path_and_kv_version_reported(
+    patch_list_mounted_secrets_engines: MagicMock,
+):
+    patch_list_mounted_secrets_engines.return_value = {
+        "request_id": "1234",
+        "data": {
+            "secret/": {"type": "kv", "options": {"version": "1"}},
+            "charm-kv/": {"type": "kv", "options": {"version": "2"}},
+            "charm-pki/": {"type": "pki", "options": None},
+        },
+    }
+    vault = VaultClient(url="http://whatever-url", ca_cert_path=None)
+
+    assert vault.get_mounts() == {"secret": "kv", "charm-kv": "kv-v2", "charm-pki": "pki"}
+
+
+@pytest.fixture
+def reset_circuits_and_budget():
+    PeerCircuitBreaker.load({})
+    RequestBudget.set(None)
+    yield
+    PeerCircuitBreaker.load({})
+    RequestBudget.set(None)
+
+
+@pytest.mark.usefixtures("reset_circuits_and_budget")
+def test_given_consecutive_failures_when_get_state_then_circuit_opens():
+    PeerCircuitBreaker.record_failure("https://vault-1:8200/v1/sys/health")
+    assert PeerCircuitBreaker.get_state("https://vault-1:8200") == CircuitState.CLOSED
+
+    PeerCircuitBreaker.record_failure("https://vault-1:8200/v1/sys/leader")
+
+    assert PeerCircuitBreaker.get_state("https://vault-1:8200") == CircuitState.OPEN
+    assert not PeerCircuitBreaker.allow_request("https://vault-1:8200/v1/sys/health")
+    assert PeerCircuitBreaker.allow_request("https://vault-0:8200/v1/sys/health")
+
+
+@pytest.mark.usefixtures("reset_circuits_and_budget")
+def test_given_circuit_opened_long_ago_when_allow_request_then_single_trial_allowed():
+    PeerCircuitBreaker.load(
+        {"https://vault-1:8200": {"failures": 2, "opened-at": time.time() - 3600}}
+    )
+
+    assert PeerCircuitBreaker.get_state("https://vault-1:8200") == CircuitState.HALF_OPEN
+    assert PeerCircuitBreaker.allow_request("https://vault-1:8200/v1/sys/health")
+    assert not PeerCircuitBreaker.allow_request("https://vault-1:8200/v1/sys/health")
+
+
+@pytest.mark.usefixtures("reset_circuits_and_budget")
+def test_given_half_open_circuit_when_trial_fails_then_circuit_reopens():
+    PeerCircuitBreaker.load(
+        {"https://vault-1:8200": {"failures": 2, "opened-at": time.time() - 3600}}
+    )
+    assert PeerCircuitBreaker.allow_request("https://vault-1:8200/v1/sys/health")
+
+    PeerCircuitBreaker.record_failure("https://vault-1:8200/v1/sys/health")
+
+    assert PeerCircuitBreaker.get_state("https://vault-1:8200") == CircuitState.OPEN
+
+
+@pytest.mark.usefixtures("reset_circuits_and_budget")
+def test_given_half_open_circuit_when_trial_succeeds_then_circuit_closes():
+    PeerCircuitBreaker.load(
+        {"https://vault-1:8200": {"failures": 2, "opened-at": time.time() - 3600}}
+    )
+    assert PeerCircuitBreaker.allow_request("https://vault-1:8200/v1/sys/health")
+
+    PeerCircuitBreaker.record_success("https://vault-1:8200/v1/sys/health")
+
+    assert PeerCircuitBreaker.get_state("https://vault-1:8200") == CircuitState.CLOSED
+    assert PeerCircuitBreaker.dump() == {}
+
+
+@pytest.mark.usefixtures("reset_circuits_and_budget")
+def test_given_open_circuit_when_dump_and_load_then_state_is_kept():
+    PeerCircuitBreaker.record_failure("https://vault-1:8200")
+    PeerCircuitBreaker.record_failure("https://vault-1:8200")
+    dumped = PeerCircuitBreaker.dump()
+    PeerCircuitBreaker.load({})
+
+    PeerCircuitBreaker.load(dumped)
+
+    assert PeerCircuitBreaker.get_state("https://vault-1:8200") == CircuitState.OPEN
+
+
+@pytest.mark.usefixtures("reset_circuits_and_budget")
+def test_given_local_node_when_failures_recorded_then_circuit_stays_closed():
+    PeerCircuitBreaker.load({}, local_url="https://vault-0:8200")
+
+    PeerCircuitBreaker.record_failure("https://vault-0:8200/v1/sys/health")
+    PeerCircuitBreaker.record_failure("https://vault-0:8200/v1/sys/health")
+
+    assert PeerCircuitBreaker.get_state("https://vault-0:8200") == CircuitState.CLOSED
+    assert PeerCircuitBreaker.allow_request("https://vault-0:8200/v1/sys/health")
+
+
+@pytest.mark.usefixtures("reset_circuits_and_budget")
+def test_given_dumped_open_circuit_of_local_node_when_load_then_circuit_closed():
+    PeerCircuitBreaker.record_failure("https://vault-0:8200")
+    PeerCircuitBreaker.record_failure("https://vault-0:8200")
+    dumped = PeerCircuitBreaker.dump()
+
+    PeerCircuitBreaker.load(dumped, local_url="https://vault-0:8200")
+
+    assert PeerCircuitBreaker.get_state("https://vault-0:8200") == CircuitState.CLOSED
+
+
+@pytest.mark.usefixtures("reset_circuits_and_budget")
+def test_given_unreachable_node_when_requests_fail_then_next_request_fails_fast():
+    # Nothing listens on the discard port, so the connection is refused
+    vault = VaultClient(url="http://127.0.0.1:9", ca_cert_path=None)
+    assert not vault.status(refresh=True).reachable
+    assert not vault.status(refresh=True).reachable
+
+    with patch("requests.adapters.HTTPAdapter.send") as patch_send:
+        assert not vault.status(refresh=True).reachable
+        patch_send.assert_not_called()
+
+
+@pytest.mark.usefixtures("reset_circuits_and_budget")
+def test_given_budget_exhausted_when_request_then_request_not_sent():
+    RequestBudget.set(0)
+    vault = VaultClient(url="http://127.0.0.1:9", ca_cert_path=None)
+
+    with patch("requests.adapters.HTTPAdapter.send") as patch_send:
+        assert not vault.status().reachable
+        patch_send.assert_not_called()
+
+
+@pytest.mark.usefixtures("reset_circuits_and_budget")
+def test_given_budget_when_request_then_timeout_capped_by_remaining_budget():
+    RequestBudget.set(2)
+    vault = VaultClient(url="http://127.0.0.1:9", ca_cert_path=None)
+
+    with patch("requests.adapters.HTTPAdapter.send") as patch_send:
+        patch_send.return_value = _json_response(200, {"initialized": True, "sealed": False})
+        vault.status()
+
+    connect_timeout, read_timeout = patch_send.call_args.kwargs["timeout"]
+    assert connect_timeout <= 2
+    assert read_timeout <= 2
+
+
+@pytest.mark.usefixtures("reset_circuits_and_budget")
+def test_given_budget_elapsed_when_restore_snapshot_then_snapshot_sent_without_read_timeout():
+    RequestBudget.set(0)
+    vault = VaultClient(url="http://vault-0:8200", ca_cert_path=None)
+
+    with patch("requests.adapters.HTTPAdapter.send") as patch_send:
+        patch_send.return_value = _json_response(204, {})
+        vault.restore_snapshot(io.BytesIO(b"snapshot"))
+
+    assert (
+        patch_send.call_args.args[0].url
+        == "http://vault-0:8200/v1/sys/storage/raft/snapshot-force"
+    )
+    assert patch_send.call_args.kwargs["timeout"] == (5, None)
+
+
+@pytest.mark.usefixtures("reset_circuits_and_budget")
+def test_given_snapshot_request_times_out_when_restore_snapshot_then_error_raised_and_circuit_closed():
+    vault = VaultClient(url="http://vault-0:8200", ca_cert_path=None)
+
+    with patch("requests.adapters.HTTPAdapter.send") as patch_send:
+        patch_send.side_effect = requests.Timeout("read timed out")
+        with pytest.raises(VaultClientError):
+            vault.restore_snapshot(io.BytesIO(b"snapshot"))
+        with pytest.raises(VaultClientError):
+            vault.restore_snapshot(io.BytesIO(b"snapshot"))
+
+    assert PeerCircuitBreaker.get_state("http://vault-0:8200") == CircuitState.CLOSED
+
+
+def test_given_async_client_when_read_then_call_delegated_to_vault_client():
+    vault = MagicMock(spec=VaultClient)
+    vault.read.return_value = {"key": "value"}
+    async_vault = AsyncVaultClient(vault)
+
+    assert asyncio.run(async_vault.read("some/path")) == {"key": "value"}
+    vault.read.assert_called_once_with("some/path")
+
+
+def test_given_many_calls_when_gathered_then_concurrency_is_bounded():
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def read(path: str) -> dict:
+        nonlocal in_flight, max_in_flight
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return {"path": path}
+
+    vault = MagicMock(spec=VaultClient)
+    vault.read.side_effect = read
+    async_vault = AsyncVaultClient(vault, max_concurrency=3)
+
+    async def read_all() -> list[dict]:
+        return await asyncio.gather(*(async_vault.read(f"path-{i}") for i in range(10)))
+
+    results = asyncio.run(read_all())
+
+    assert results == [{"path": f"path-{i}"} for i in range(10)]
+    assert 1 < max_in_flight <= 3
+
+
+@patch.object(VaultClient, "status", autospec=True)
+def test_given_addresses_when_get_statuses_then_status_of_every_node_returned(
+    patch_status: MagicMock,
+):
+    patch_status.side_effect = lambda vault, refresh=False: VaultStatus(
+        reachable=vault.url != "https://vault-1:8200"
+    )
+
+    statuses = asyncio.run(
+        AsyncVaultClient.get_statuses(["https://vault-0:8200", "https://vault-1:8200"], None)
+    )
+
+    assert statuses == {
+        "https://vault-0:8200": VaultStatus(reachable=True),
+        "https://vault-1:8200": VaultStatus(reachable=False),
+    }
+
+
+@pytest.fixture
+def read_cache():
+    VaultReadCache.enable()
+    yield
+    VaultReadCache.disable()
+
+
+@pytest.mark.usefixtures("read_cache", "reset_circuits_and_budget")
+def test_given_read_cache_when_pki_role_read_twice_then_role_fetched_once():
+    vault = VaultClient(url="http://vault-0:8200", ca_cert_path=None)
+
+    with patch("requests.adapters.HTTPAdapter.send") as patch_send:
+        patch_send.side_effect = lambda *args, **kwargs: _json_response(
+            200, {"data": {"allowed_domains": ["example.com"], "max_ttl": 3600}}
+        )
+        assert vault.is_common_name_allowed_in_pki_role("charm", "charm-pki", "example.com")
+        assert vault.get_role_max_ttl("charm", "charm-pki") == 3600
+
+    assert patch_send.call_count == 1
+
+
+@pytest.mark.usefixtures("read_cache", "reset_circuits_and_budget")
+def test_given_cached_read_when_write_to_same_mount_then_next_read_fetched_again():
+    vault = VaultClient(url="http://vault-0:8200", ca_cert_path=None)
+
+    with patch("requests.adapters.HTTPAdapter.send") as patch_send:
+        patch_send.side_effect = lambda *args, **kwargs: _json_response(
+            200, {"data": {"allowed_domains": ["example.com"], "max_ttl": 3600}}
+        )
+        vault.get_role_max_ttl("charm", "charm-pki")
+        vault.create_or_update_pki_charm_role("charm", "example.com", "7200s", "charm-pki")
+        vault.get_role_max_ttl("charm", "charm-pki")
+
+    assert [call.args[0].method for call in patch_send.call_args_list] == [
+        "GET",
+        "POST",
+        "GET",
+    ]
+
+
+@pytest.mark.usefixtures("read_cache", "reset_circuits_and_budget")
+def test_given_cached_read_when_write_to_other_mount_then_read_still_cached():
+    vault = VaultClient(url="http://vault-0:8200", ca_cert_path=None)
+
+    with patch("requests.adapters.HTTPAdapter.send") as patch_send:
+        patch_send.side_effect = lambda *args, **kwargs: _json_response(
+            200, {"data": {"keys": ["charm-access"]}}
+        )
+        vault.list("sys/policy")
+        vault.write("charm-kv/data/secret", {"key": "value"})
+        vault.list("sys/policy")
+
+    assert patch_send.call_count == 2
+
+
+@pytest.mark.usefixtures("read_cache", "reset_circuits_and_budget")
+def test_given_cached_read_when_same_path_read_on_other_node_then_fetched_again():
+    vault_0 = VaultClient(url="http://vault-0:8200", ca_cert_path=None)
+    vault_1 = VaultClient(url="http://vault-1:8200", ca_cert_path=None)
+
+    with patch("requests.adapters.HTTPAdapter.send") as patch_send:
+        patch_send.side_effect = lambda *args, **kwargs: _json_response(
+            200, {"data": {"keys": ["charm-access"]}}
+        )
+        vault_0.authenticate(Token("token"))
+        vault_1.authenticate(Token("token"))
+        vault_0.list("sys/policy")
+        vault_1.list("sys/policy")
+        vault_0.list("sys/policy")
+
+    assert [
+        call.args[0].url for call in patch_send.call_args_list if "sys/policy" in call.args[0].url
+    ] == [
+        "http://vault-0:8200/v1/sys/policy?list=True",
+        "http://vault-1:8200/v1/sys/policy?list=True",
+    ]
+
+
+@pytest.mark.usefixtures("read_cache", "reset_circuits_and_budget")
+def test_given_cached_read_when_same_path_read_with_other_token_then_fetched_again():
+    vault = VaultClient(url="http://vault-0:8200", ca_cert_path=None)
+
+    with patch("requests.adapters.HTTPAdapter.send") as patch_send:
+        patch_send.side_effect = lambda *args, **kwargs: _json_response(
+            200, {"data": {"keys": ["charm-access"]}}
+        )
+        vault.authenticate(Token("token-a"))
+        vault.list("sys/policy")
+        vault.authenticate(Token("token-b"))
+        vault.list("sys/policy")
+        vault.authenticate(Token("token-a"))
+        vault.list("sys/policy")
+
+    assert [
+        call.args[0].headers["X-Vault-Token"]
+        for call in patch_send.call_args_list
+        if "sys/policy" in call.args[0].url
+    ] == ["token-a", "token-b"]
+
+
+@pytest.mark.usefixtures("reset_circuits_and_budget")
+def test_given_read_cache_disabled_when_read_twice_then_fetched_twice():
+    vault = VaultClient(url="http://vault-0:8200", ca_cert_path=None)
+
+    with patch("requests.adapters.HTTPAdapter.send") as patch_send:
+        patch_send.side_effect = lambda *args, **kwargs: _json_response(
+            200, {"data": {"keys": ["charm-access"]}}
+        )
+        vault.list("sys/policy")
+        vault.list("sys/policy")
+
+    assert patch_send.call_count == 2
+
+
+@pytest.mark.usefixtures("read_cache", "reset_circuits_and_budget")
+def test_given_read_cache_when_health_read_twice_then_not_cached():
+    vault = VaultClient(url="http://vault-0:8200", ca_cert_path=None)
+
+    with patch("requests.adapters.HTTPAdapter.send") as patch_send:
+        patch_send.side_effect = lambda *args, **kwargs: _json_response(
+            200, {"initialized": True, "sealed": False}
+        )
+        vault.status(refresh=True)
+        vault.status(refresh=True)
+
+    assert patch_send.call_count == 2
+
+
+@pytest.mark.usefixtures("reset_circuits_and_budget")
+def test_given_role_flags_when_create_or_update_acme_role_then_flags_sent():
+    vault = VaultClient(url="http://vault-0:8200", ca_cert_path=None)
+
+    with patch("requests.adapters.HTTPAdapter.send") as patch_send:
+        patch_send.return_value = _json_response(204, {})
+        vault.create_or_update_acme_role(
+            "charm", "charm-acme", "3600s", role_flags=PKIRoleFlags(no_store=True)
+        )
+
+    body = json.loads(patch_send.call_args.args[0].body)
+    assert (body["no_store"], body["generate_lease"]) == (True, False)
+
+
+@pytest.mark.usefixtures("reset_circuits_and_budget")
+def test_given_role_when_get_pki_role_flags_then_flags_returned():
+    vault = VaultClient(url="http://vault-0:8200", ca_cert_path=None)
+
+    with patch("requests.adapters.HTTPAdapter.send") as patch_send:
+        patch_send.return_value = _json_response(
+            200, {"data": {"no_store": True, "generate_lease": True, "max_ttl": 3600}}
+        )
+        role_flags = vault.get_pki_role_flags("charm", "charm-pki")
+
+    assert role_flags == PKIRoleFlags(no_store=True, generate_lease=True)
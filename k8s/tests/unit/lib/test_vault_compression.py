@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+import gzip
+import io
+import unittest
+
+from vault.vault_compression import (
+    GZIP,
+    CompressingReader,
+    CompressionError,
+    DecompressingReader,
+)
+
+
+class TestCompression(unittest.TestCase):
+    def test_given_content_when_compressing_reader_read_in_parts_then_gzip_content_produced(self):
+        content = b"snapshot content " * 100_000
+        reader = CompressingReader(io.BytesIO(content), GZIP, level=1)
+
+        parts = iter(lambda: reader.read(1024), b"")
+        compressed = b"".join(parts)
+
+        self.assertEqual(gzip.decompress(compressed), content)
+        self.assertLess(len(compressed), len(content))
+        self.assertEqual(reader.original_size, len(content))
+
+    def test_given_level_out_of_range_when_compressing_reader_created_then_level_clamped(self):
+        reader = CompressingReader(io.BytesIO(b"content"), GZIP, level=42)
+
+        self.assertEqual(gzip.decompress(reader.read()), b"content")
+
+    def test_given_compressed_content_when_decompressing_reader_read_then_content_returned(self):
+        compressed = io.BytesIO(gzip.compress(b"snapshot content"))
+        reader = DecompressingReader(compressed, GZIP)
+
+        self.assertEqual(reader.read(), b"snapshot content")
+        reader.close()
+        self.assertTrue(compressed.closed)
+
+    def test_given_corrupted_content_when_decompressing_reader_read_then_error_raised(self):
+        reader = DecompressingReader(io.BytesIO(b"not gzip content"), GZIP)
+
+        with self.assertRaises(CompressionError):
+            reader.read()
+
+    def test_given_unknown_codec_when_reader_created_then_error_raised(self):
+        with self.assertRaises(CompressionError):
+            CompressingReader(io.BytesIO(b"content"), "lz4")
+        with self.assertRaises(CompressionError):
+            DecompressingReader(io.BytesIO(b"content"), "lz4")
@@ -1,35 +1,53 @@
-from datetime import timedelta
-from unittest.mock import MagicMock, call, patch
+import gzip
+import hashlib
+import io
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import ANY, MagicMock, call, patch
 
 import pytest
 from charms.data_platform_libs.v0.s3 import S3Requirer
 from vault.juju_facade import NoSuchSecretError, SecretRemovedError
 from vault.vault_autounseal import AutounsealDetails
+from vault.vault_chunking import Manifest
 from vault.vault_client import (
+    AppRole,
     AuthMethod,
+    PKIRoleFlags,
     SecretsBackend,
+    TokenDetails,
     VaultClient,
     VaultClientError,
 )
 from vault.vault_client import Certificate as VaultClientCertificate
+from vault.vault_compression import CompressingReader
 from vault.vault_managers import (
     AUTOUNSEAL_POLICY,
+    KV_SHARED_POLICY,
     ACMEManager,
+    AppRoleTokenManager,
     AutounsealProviderManager,
     AutounsealRequirerManager,
+    BackupDetails,
     BackupManager,
+    Certificate,
     CertificateRequestAttributes,
     KVManager,
+    KVRequest,
     ManagerError,
     PKIManager,
     PrivateKey,
     ProviderCertificate,
     RaftManager,
+    RequirerCertificateRequest,
+    TidyManager,
     TLSCertificatesProvidesV4,
     TLSCertificatesRequiresV4,
     VaultKvProvides,
 )
-from vault.vault_s3 import S3Error
+from vault.vault_s3 import DownloadedObject, ObjectDetails, S3Error, UploadReport
 
 from charm import AUTOUNSEAL_MOUNT_PATH, VaultCharm
 from container import Container
@@ -98,6 +116,133 @@ class TestAutounsealRequirerManager:
         assert returned_token == expected_token
 
 
+class TestAppRoleTokenManager:
+    @pytest.fixture(autouse=True)
+    @patch("vault.vault_managers.JujuFacade")
+    def setup(self, juju_facade_mock: MagicMock):
+        self.juju_facade = juju_facade_mock.return_value
+        self.vault_client = MagicMock(spec=VaultClient)
+        self.approle = AppRole("role id", "secret id")
+        self.manager = AppRoleTokenManager(MagicMock())
+
+    def _cached_token_content(self, expires_in: timedelta, renewable: bool) -> dict[str, str]:
+        return {
+            "token": "cached token",
+            "accessor": "cached accessor",
+            "expiry": (datetime.now(timezone.utc) + expires_in).isoformat(),
+            "renewable": "true" if renewable else "false",
+            "approle-fingerprint": AppRoleTokenManager._get_approle_fingerprint(self.approle),
+        }
+
+    def test_given_no_cached_token_when_authenticate_then_login_and_token_cached(self):
+        self.juju_facade.get_latest_secret_content.side_effect = NoSuchSecretError()
+        token_details = TokenDetails(
+            token="new token",
+            accessor="new accessor",
+            expiry=datetime.now(timezone.utc) + timedelta(hours=1),
+            renewable=True,
+        )
+        self.vault_client.authenticate.return_value = True
+        self.vault_client.token_details = token_details
+
+        assert self.manager.authenticate(self.vault_client, self.approle)
+
+        self.vault_client.authenticate.assert_called_once_with(self.approle)
+        self.juju_facade.set_unit_secret_content.assert_called_once_with(
+            {
+                "token": "new token",
+                "accessor": "new accessor",
+                "expiry": token_details.expiry.isoformat(),
+                "renewable": "true",
+                "approle-fingerprint": AppRoleTokenManager._get_approle_fingerprint(self.approle),
+            },
+            label=AppRoleTokenManager.TOKEN_SECRET_LABEL,
+        )
+
+    def test_given_valid_cached_token_when_authenticate_then_token_reused_without_login(self):
+        self.juju_facade.get_latest_secret_content.return_value = self._cached_token_content(
+            timedelta(minutes=45), renewable=False
+        )
+
+        assert self.manager.authenticate(self.vault_client, self.approle)
+
+        self.vault_client.use_token.assert_called_once()
+        assert self.vault_client.use_token.call_args.args[0].token == "cached token"
+        self.vault_client.authenticate.assert_not_called()
+        self.vault_client.renew_token.assert_not_called()
+        self.juju_facade.set_unit_secret_content.assert_not_called()
+
+    def test_given_cached_token_rejected_when_request_then_login_and_token_cached(self):
+        self.juju_facade.get_latest_secret_content.return_value = self._cached_token_content(
+            timedelta(minutes=45), renewable=False
+        )
+        self.vault_client.authenticate.return_value = True
+        self.vault_client.token_details = TokenDetails(
+            token="new token",
+            accessor="new accessor",
+            expiry=datetime.now(timezone.utc) + timedelta(hours=1),
+            renewable=True,
+        )
+        assert self.manager.authenticate(self.vault_client, self.approle)
+        on_rejected = self.vault_client.use_token.call_args.kwargs["on_rejected"]
+
+        assert on_rejected()
+
+        self.vault_client.authenticate.assert_called_once_with(self.approle)
+        assert self.juju_facade.set_unit_secret_content.call_args.args[0]["token"] == "new token"
+
+    def test_given_renewable_cached_token_close_to_expiry_when_authenticate_then_token_renewed(
+        self,
+    ):
+        self.juju_facade.get_latest_secret_content.return_value = self._cached_token_content(
+            timedelta(minutes=5), renewable=True
+        )
+        self.vault_client.renew_token.return_value = TokenDetails(
+            token="cached token",
+            accessor="cached accessor",
+            expiry=datetime.now(timezone.utc) + timedelta(hours=1),
+            renewable=True,
+        )
+
+        assert self.manager.authenticate(self.vault_client, self.approle)
+
+        self.vault_client.renew_token.assert_called_once()
+        self.vault_client.authenticate.assert_not_called()
+        self.juju_facade.set_unit_secret_content.assert_called_once()
+
+    def test_given_cached_token_close_to_expiry_and_not_renewable_when_authenticate_then_login(
+        self,
+    ):
+        self.juju_facade.get_latest_secret_content.return_value = self._cached_token_content(
+            timedelta(minutes=5), renewable=False
+        )
+        self.vault_client.authenticate.return_value = True
+
+        assert self.manager.authenticate(self.vault_client, self.approle)
+
+        self.vault_client.renew_token.assert_not_called()
+        self.vault_client.authenticate.assert_called_once_with(self.approle)
+
+    def test_given_approle_changed_when_authenticate_then_cached_token_ignored(self):
+        self.juju_facade.get_latest_secret_content.return_value = self._cached_token_content(
+            timedelta(minutes=45), renewable=False
+        )
+        self.vault_client.authenticate.return_value = True
+
+        assert self.manager.authenticate(self.vault_client, AppRole("role id", "new secret id"))
+
+        self.vault_client.use_token.assert_not_called()
+        self.vault_client.authenticate.assert_called_once()
+
+    def test_given_login_fails_when_authenticate_then_token_not_cached(self):
+        self.juju_facade.get_latest_secret_content.side_effect = NoSuchSecretError()
+        self.vault_client.authenticate.return_value = False
+
+        assert not self.manager.authenticate(self.vault_client, self.approle)
+
+        self.juju_facade.set_unit_secret_content.assert_not_called()
+
+
 class TestAutounsealProviderManager:
     def test_when_create_credentials_then_vault_client_called_and_key_name_and_credentials_are_returned(
         self,
@@ -113,6 +258,7 @@ class TestAutounsealProviderManager:
         expected_policy_name = "charm-autounseal-1"
         vault_client.create_or_update_approle.return_value = "role_id"
         vault_client.generate_role_secret_id.return_value = "secret_id"
+        vault_client.list_role_secret_id_accessors.return_value = ["superseded-accessor"]
 
         autounseal = AutounsealProviderManager(
             charm, vault_client, provides, "ca_cert", AUTOUNSEAL_MOUNT_PATH
@@ -130,6 +276,9 @@ class TestAutounsealProviderManager:
             expected_approle_name, policies=[expected_policy_name], token_period="60s"
         )
         vault_client.generate_role_secret_id.assert_called_once_with(expected_approle_name)
+        vault_client.destroy_role_secret_id_accessor.assert_called_once_with(
+            expected_approle_name, "superseded-accessor"
+        )
         assert key_name == str(relation_id)
         assert role_id == "role_id"
         assert secret_id == "secret_id"
@@ -169,6 +318,8 @@ class TestKVManager:
         self.juju_facade = juju_facade_mock.return_value
         self.charm = MagicMock(spec=VaultCharm)
         self.vault_client = MagicMock(spec=VaultClient)
+        self.vault_client.get_mounts.return_value = {}
+        self.vault_client.list.return_value = []
         self.vault_kv = MagicMock(spec=VaultKvProvides)
         self.ca_cert = "some cert"
 
@@ -220,7 +371,7 @@ path "sys/internal/ui/mounts/charm-myapp-mymount" {
             policy,
         )
         self.vault_client.generate_role_secret_id.assert_called_once_with(
-            "charm-myapp-mymount-myapp-0", egress_subnets
+            "charm-myapp-mymount-myapp-0", egress_subnets, token_bound_cidrs=None
         )
 
         self.vault_client.create_or_update_approle.assert_called_once_with(
@@ -229,18 +380,20 @@ path "sys/internal/ui/mounts/charm-myapp-mymount" {
             cidrs=egress_subnets,
             token_ttl="1h",
             token_max_ttl="1h",
+            token_period=None,
+            token_type="default",
         )
         self.juju_facade.set_app_secret_content.assert_called_once_with(
             content={"role-id": "my-role-id", "role-secret-id": "my-role-secret-id"},
             label="vault-kv-myapp-0",
         )
-        self.vault_kv.set_kv_data.assert_called_once_with(
+        self.vault_kv.set_kv_data_for_units.assert_called_once_with(
             relation=relation,
             mount="charm-myapp-mymount",
             ca_certificate=self.ca_cert,
             vault_url=vault_url,
-            nonce=nonce,
-            credentials_juju_secret_id="my-secret-id",
+            credentials={nonce: "my-secret-id"},
+            path_prefix=None,
         )
 
     def test_given_egress_changed_when_generate_kv_for_requirer_then_relation_data_is_set_and_secret_content_updated(
@@ -292,7 +445,7 @@ path "sys/internal/ui/mounts/charm-myapp-mymount" {
             policy,
         )
         self.vault_client.generate_role_secret_id.assert_called_once_with(
-            "charm-myapp-mymount-myapp-0", egress_subnets
+            "charm-myapp-mymount-myapp-0", egress_subnets, token_bound_cidrs=None
         )
 
         self.vault_client.create_or_update_approle.assert_called_once_with(
@@ -301,18 +454,20 @@ path "sys/internal/ui/mounts/charm-myapp-mymount" {
             cidrs=egress_subnets,
             token_ttl="1h",
             token_max_ttl="1h",
+            token_period=None,
+            token_type="default",
         )
         self.juju_facade.set_app_secret_content.assert_called_once_with(
             content={"role-id": "my-role-id", "role-secret-id": "my-role-secret-id"},
             label="vault-kv-myapp-0",
         )
-        self.vault_kv.set_kv_data.assert_called_once_with(
+        self.vault_kv.set_kv_data_for_units.assert_called_once_with(
             relation=relation,
             mount="charm-myapp-mymount",
             ca_certificate=self.ca_cert,
             vault_url=vault_url,
-            nonce=nonce,
-            credentials_juju_secret_id="my-secret-id",
+            credentials={nonce: "my-secret-id"},
+            path_prefix=None,
         )
 
     def test_given_role_exists_and_unchanged_when_generate_kv_for_requirer_then_relation_data_not_set(
@@ -353,12 +508,400 @@ path "sys/internal/ui/mounts/charm-myapp-mymount" {
         self.vault_client.generate_role_secret_id.assert_not_called()
         self.juju_facade.set_app_secret_content.assert_not_called()
 
+    def _generate_credentials_with_verified_roles(
+        self,
+        verified_roles: dict,
+        egress_subnets: list[str],
+        role_secret_id: str = "my-role-secret-id",
+    ) -> None:
+        with patch("vault.vault_managers.JujuFacade", return_value=self.juju_facade):
+            manager = KVManager(
+                self.charm,
+                self.vault_client,
+                self.vault_kv,
+                self.ca_cert,
+                verified_roles=verified_roles,
+            )
+        self.vault_kv.get_credentials.return_value = {"123123": "my-secret-id"}
+        self.juju_facade.get_latest_secret_content.return_value = {
+            "role-secret-id": role_secret_id
+        }
+        self.vault_client.read_role_secret.return_value = {
+            "cidr_list": ["1.2.3.4/32"],
+            "secret_id_accessor": "my-accessor",
+        }
+        manager.generate_credentials_for_requirer(
+            MagicMock(), "myapp", "myapp/0", "mymount", egress_subnets, "123123", "https://vault"
+        )
+
+    def test_given_no_verification_when_generate_kv_for_requirer_then_role_secret_read_and_verification_recorded(
+        self,
+    ):
+        verified_roles = {}
+
+        self._generate_credentials_with_verified_roles(verified_roles, ["1.2.3.4/32"])
+
+        self.vault_client.read_role_secret.assert_called_once_with(
+            "charm-myapp-mymount-myapp-0", "my-role-secret-id"
+        )
+        assert "fingerprint" in verified_roles["vault-kv-myapp-0"]
+        assert "my-role-secret-id" not in str(verified_roles)
+        self.vault_client.generate_role_secret_id.assert_not_called()
+
+    def test_given_recent_verification_when_generate_kv_for_requirer_then_role_secret_not_read(
+        self,
+    ):
+        verified_roles = {}
+        self._generate_credentials_with_verified_roles(verified_roles, ["1.2.3.4/32"])
+        self.vault_client.read_role_secret.reset_mock()
+
+        self._generate_credentials_with_verified_roles(verified_roles, ["1.2.3.4/32"])
+
+        self.vault_client.read_role_secret.assert_not_called()
+        self.vault_client.generate_role_secret_id.assert_not_called()
+
+    def test_given_role_secret_id_replaced_since_verification_when_generate_kv_for_requirer_then_role_secret_read(
+        self,
+    ):
+        verified_roles = {}
+        self._generate_credentials_with_verified_roles(verified_roles, ["1.2.3.4/32"])
+        self.vault_client.read_role_secret.reset_mock()
+
+        self._generate_credentials_with_verified_roles(
+            verified_roles, ["1.2.3.4/32"], role_secret_id="new-role-secret-id"
+        )
+
+        self.vault_client.read_role_secret.assert_called_once_with(
+            "charm-myapp-mymount-myapp-0", "new-role-secret-id"
+        )
+
+    def test_given_egress_changed_since_verification_when_generate_kv_for_requirer_then_credentials_regenerated(
+        self,
+    ):
+        verified_roles = {}
+        self._generate_credentials_with_verified_roles(verified_roles, ["1.2.3.4/32"])
+        self.vault_client.read_role_secret.reset_mock()
+        self.vault_client.create_or_update_approle.return_value = "my-role-id"
+        self.vault_client.generate_role_secret_id.return_value = "new-role-secret-id"
+
+        self._generate_credentials_with_verified_roles(verified_roles, ["5.6.7.8/32"])
+
+        self.vault_client.read_role_secret.assert_called_once()
+        self.vault_client.generate_role_secret_id.assert_called_once_with(
+            "charm-myapp-mymount-myapp-0", ["5.6.7.8/32"], token_bound_cidrs=None
+        )
+        assert "vault-kv-myapp-0" not in verified_roles
+
+    def test_given_verification_expired_when_generate_kv_for_requirer_then_role_secret_read(
+        self,
+    ):
+        verified_roles = {}
+        self._generate_credentials_with_verified_roles(verified_roles, ["1.2.3.4/32"])
+        self.vault_client.read_role_secret.reset_mock()
+        verified_roles["vault-kv-myapp-0"]["verified-at"] -= (
+            KVManager.ROLE_VERIFICATION_INTERVAL.total_seconds() + 1
+        )
+
+        self._generate_credentials_with_verified_roles(verified_roles, ["1.2.3.4/32"])
+
+        self.vault_client.read_role_secret.assert_called_once()
+
+    def test_given_many_units_when_generate_kv_for_requirers_then_only_changed_units_written_once(
+        self,
+    ):
+        relation = MagicMock()
+        vault_url = "https://vault:8200"
+        kv_requests = [
+            KVRequest(
+                relation=relation,
+                app_name="myapp",
+                unit_name=f"myapp/{unit}",
+                mount_suffix="mymount",
+                egress_subnets=[f"1.2.3.{unit}/32"],
+                nonce=f"nonce-{unit}",
+            )
+            for unit in range(3)
+        ]
+        self.vault_kv.get_credentials.return_value = {"nonce-0": "secret-0"}
+        self.juju_facade.get_latest_secret_content.side_effect = lambda label, id: (
+            {"role-secret-id": "role-secret-0"} if label == "vault-kv-myapp-0" else {}
+        )
+        self.vault_client.read_role_secret.return_value = {"cidr_list": ["1.2.3.0/32"]}
+        self.vault_client.generate_role_secret_id.return_value = "new-role-secret-id"
+        self.juju_facade.set_app_secret_content.side_effect = lambda content, label: MagicMock(
+            id=f"secret-for-{label}"
+        )
+
+        self.manager.generate_credentials_for_requirers(relation, kv_requests, vault_url)
+
+        assert self.vault_client.list.call_count == 2
+        assert self.vault_client.create_or_update_policy.call_count == 2
+        assert self.vault_client.create_or_update_approle.call_count == 2
+        assert self.vault_client.generate_role_secret_id.call_args_list == [
+            call("charm-myapp-mymount-myapp-1", ["1.2.3.1/32"], token_bound_cidrs=None),
+            call("charm-myapp-mymount-myapp-2", ["1.2.3.2/32"], token_bound_cidrs=None),
+        ]
+        self.vault_kv.set_kv_data_for_units.assert_called_once_with(
+            relation=relation,
+            mount="charm-myapp-mymount",
+            ca_certificate=self.ca_cert,
+            vault_url=vault_url,
+            credentials={
+                "nonce-0": "secret-0",
+                "nonce-1": "secret-for-vault-kv-myapp-1",
+                "nonce-2": "secret-for-vault-kv-myapp-2",
+            },
+            path_prefix=None,
+        )
+
+    def test_given_egress_changed_when_generate_kv_for_requirer_then_superseded_secret_id_destroyed(
+        self,
+    ):
+        self.vault_kv.get_credentials.return_value = {"123123": "my-secret-id"}
+        self.juju_facade.get_latest_secret_content.return_value = {
+            "role-secret-id": "old-role-secret-id"
+        }
+        self.vault_client.read_role_secret.return_value = {
+            "cidr_list": ["4.3.2.1/32"],
+            "secret_id_accessor": "old-accessor",
+        }
+        self.vault_client.create_or_update_approle.return_value = "my-role-id"
+        self.vault_client.generate_role_secret_id.return_value = "new-role-secret-id"
+        self.juju_facade.set_app_secret_content.return_value = MagicMock(id="my-secret-id")
+
+        self.manager.generate_credentials_for_requirer(
+            MagicMock(), "myapp", "myapp/0", "mymount", ["1.2.3.4/32"], "123123", "https://vault"
+        )
+
+        self.vault_client.destroy_role_secret_id_accessor.assert_called_once_with(
+            "charm-myapp-mymount-myapp-0", "old-accessor"
+        )
+
+    def _shared_mount_manager(self) -> KVManager:
+        with patch("vault.vault_managers.JujuFacade", return_value=self.juju_facade):
+            return KVManager(
+                self.charm, self.vault_client, self.vault_kv, self.ca_cert, shared_mount=True
+            )
+
+    def test_given_shared_mount_and_new_relation_when_generate_kv_for_requirers_then_app_role_and_unit_bound_secret_ids_created(
+        self,
+    ):
+        relation = MagicMock()
+        vault_url = "https://vault:8200"
+        kv_requests = [
+            KVRequest(
+                relation=relation,
+                app_name="myapp",
+                unit_name=f"myapp/{unit}",
+                mount_suffix="mymount",
+                egress_subnets=[f"1.2.3.{unit}/32"],
+                nonce=f"nonce-{unit}",
+            )
+            for unit in range(2)
+        ]
+        self.vault_kv.get_credentials.return_value = {}
+        self.juju_facade.get_latest_secret_content.side_effect = NoSuchSecretError()
+        self.vault_client.create_or_update_approle.return_value = "app-role-id"
+        self.vault_client.generate_role_secret_id.return_value = "new-role-secret-id"
+        self.juju_facade.set_app_secret_content.side_effect = lambda content, label: MagicMock(
+            id=f"secret-for-{label}"
+        )
+
+        self._shared_mount_manager().generate_credentials_for_requirers(
+            relation, kv_requests, vault_url
+        )
+
+        self.vault_client.enable_secrets_engine.assert_called_once_with(
+            SecretsBackend.KV_V2, "charm-kv"
+        )
+        self.vault_client.create_or_update_policy.assert_called_once_with(
+            "charm-kv-myapp-mymount",
+            KV_SHARED_POLICY.format(mount="charm-kv", prefix="myapp-mymount"),
+        )
+        self.vault_client.create_or_update_approle.assert_called_once_with(
+            "charm-kv-myapp-mymount",
+            policies=["charm-kv-myapp-mymount"],
+            cidrs=None,
+            token_ttl="1h",
+            token_max_ttl="1h",
+            token_period=None,
+            token_type="default",
+        )
+        assert self.vault_client.generate_role_secret_id.call_args_list == [
+            call("charm-kv-myapp-mymount", ["1.2.3.0/32"], token_bound_cidrs=["1.2.3.0/32"]),
+            call("charm-kv-myapp-mymount", ["1.2.3.1/32"], token_bound_cidrs=["1.2.3.1/32"]),
+        ]
+        self.vault_kv.set_kv_data_for_units.assert_called_once_with(
+            relation=relation,
+            mount="charm-kv",
+            ca_certificate=self.ca_cert,
+            vault_url=vault_url,
+            credentials={
+                "nonce-0": "secret-for-vault-kv-myapp-0",
+                "nonce-1": "secret-for-vault-kv-myapp-1",
+            },
+            path_prefix="myapp-mymount",
+        )
+
+    def test_given_shared_mount_and_relation_served_from_own_mount_when_generate_kv_for_requirer_then_own_mount_kept(
+        self,
+    ):
+        relation = MagicMock()
+        self.vault_kv.get_credentials.return_value = {"123123": "my-secret-id"}
+        self.vault_kv.get_mount.return_value = "charm-myapp-mymount"
+        self.vault_kv.get_path_prefix.return_value = None
+        self.juju_facade.get_latest_secret_content.return_value = {
+            "role-secret-id": "my-role-secret-id"
+        }
+        self.vault_client.read_role_secret.return_value = {"cidr_list": ["1.2.3.4/32"]}
+
+        self._shared_mount_manager().generate_credentials_for_requirer(
+            relation, "myapp", "myapp/0", "mymount", ["1.2.3.4/32"], "123123", "https://vault"
+        )
+
+        self.vault_client.enable_secrets_engine.assert_called_once_with(
+            SecretsBackend.KV_V2, "charm-myapp-mymount"
+        )
+        self.vault_client.read_role_secret.assert_called_once_with(
+            "charm-myapp-mymount-myapp-0", "my-role-secret-id"
+        )
+        self.vault_client.generate_role_secret_id.assert_not_called()
+        self.vault_kv.set_kv_data_for_units.assert_called_once_with(
+            relation=relation,
+            mount="charm-myapp-mymount",
+            ca_certificate=self.ca_cert,
+            vault_url="https://vault",
+            credentials={"123123": "my-secret-id"},
+            path_prefix=None,
+        )
+
+    def test_given_batch_tokens_when_generate_kv_for_requirer_then_approle_issues_batch_tokens(
+        self,
+    ):
+        with patch("vault.vault_managers.JujuFacade", return_value=self.juju_facade):
+            manager = KVManager(
+                self.charm, self.vault_client, self.vault_kv, self.ca_cert, batch_tokens=True
+            )
+        self.vault_kv.get_credentials.return_value = {}
+        self.juju_facade.get_latest_secret_content.side_effect = NoSuchSecretError()
+        self.vault_client.create_or_update_approle.return_value = "my-role-id"
+        self.vault_client.generate_role_secret_id.return_value = "my-role-secret-id"
+
+        manager.generate_credentials_for_requirer(
+            MagicMock(), "myapp", "myapp/0", "mymount", ["1.2.3.4/32"], "123123", "https://vault"
+        )
+
+        self.vault_client.create_or_update_approle.assert_called_once_with(
+            "charm-myapp-mymount-myapp-0",
+            policies=["charm-myapp-mymount-myapp-0"],
+            cidrs=["1.2.3.4/32"],
+            token_ttl="1h",
+            token_max_ttl="1h",
+            token_period=None,
+            token_type="batch",
+        )
+
+    def test_given_relation_served_from_shared_mount_when_shared_mount_disabled_then_shared_mount_kept(
+        self,
+    ):
+        relation = MagicMock()
+        self.vault_kv.get_credentials.return_value = {"123123": "my-secret-id"}
+        self.vault_kv.get_mount.return_value = "charm-kv"
+        self.vault_kv.get_path_prefix.return_value = "myapp-mymount"
+        self.juju_facade.get_latest_secret_content.return_value = {
+            "role-secret-id": "my-role-secret-id"
+        }
+        self.vault_client.read_role_secret.return_value = {"cidr_list": ["1.2.3.4/32"]}
+
+        self.manager.generate_credentials_for_requirer(
+            relation, "myapp", "myapp/0", "mymount", ["1.2.3.4/32"], "123123", "https://vault"
+        )
+
+        self.vault_client.read_role_secret.assert_called_once_with(
+            "charm-kv-myapp-mymount", "my-role-secret-id"
+        )
+        assert self.vault_kv.set_kv_data_for_units.call_args.kwargs["mount"] == "charm-kv"
+        assert (
+            self.vault_kv.set_kv_data_for_units.call_args.kwargs["path_prefix"] == "myapp-mymount"
+        )
+
+
+class TestTidyManager:
+    @pytest.fixture(autouse=True)
+    @patch("vault.vault_managers.JujuFacade")
+    def setup(self, juju_facade_mock: MagicMock):
+        self.juju_facade = juju_facade_mock.return_value
+        self.juju_facade.is_leader = True
+        self.vault_client = MagicMock(spec=VaultClient)
+        self.vault_client.tidy_approle_secret_ids.return_value = []
+        self.vault_client.tidy_tokens.return_value = []
+        self.vault_client.list.return_value = ["charm", "charm-kv-app-0", "charm-autounseal-1"]
+        self.vault_client.list_role_secret_id_accessors.side_effect = lambda role: {
+            "charm-kv-app-0": ["a", "b"],
+            "charm-autounseal-1": ["c"],
+        }[role]
+        self.manager = TidyManager(MagicMock(spec=VaultCharm), self.vault_client, "vault-peers")
+
+    def test_given_never_tidied_when_run_then_tidy_started_and_time_recorded(self):
+        self.juju_facade.get_app_relation_data.return_value = {}
+
+        report = self.manager.run()
+
+        assert report == [
+            "3 approle secret IDs",
+            "tidied expired approle secret IDs",
+            "tidied expired tokens",
+        ]
+        self.vault_client.tidy_approle_secret_ids.assert_called_once()
+        self.vault_client.tidy_tokens.assert_called_once()
+        [data], kwargs = self.juju_facade.set_app_relation_data.call_args
+        assert kwargs == {"name": "vault-peers"}
+        assert float(data["last-tidy"]) == pytest.approx(datetime.now().timestamp(), abs=60)
+        assert data["tidy-secret-ids"] == "3"
+
+    def test_given_previous_tidy_counted_when_run_then_removed_secret_ids_reported(self):
+        self.juju_facade.get_app_relation_data.return_value = {
+            "last-tidy": str(datetime.now().timestamp() - 2 * 24 * 3600),
+            "tidy-secret-ids": "10",
+        }
+
+        report = self.manager.run()
+
+        assert report[0] == "3 approle secret IDs, 7 fewer than at the last tidy"
+
+    def test_given_recent_tidy_when_run_then_vault_not_called(self):
+        self.juju_facade.get_app_relation_data.return_value = {
+            "last-tidy": str(datetime.now().timestamp() - 60)
+        }
+
+        assert self.manager.run() == []
+
+        self.vault_client.tidy_approle_secret_ids.assert_not_called()
+        self.vault_client.tidy_tokens.assert_not_called()
+        self.juju_facade.set_app_relation_data.assert_not_called()
+
+    def test_given_tidy_fails_when_run_then_other_tidy_reported(self):
+        self.juju_facade.get_app_relation_data.return_value = {}
+        self.vault_client.tidy_approle_secret_ids.side_effect = VaultClientError("forbidden")
+
+        assert self.manager.run() == ["3 approle secret IDs", "tidied expired tokens"]
+
+        self.juju_facade.set_app_relation_data.assert_called_once()
+
+    def test_given_not_leader_when_run_then_vault_not_called(self):
+        self.juju_facade.is_leader = False
+
+        assert self.manager.run() == []
+
+        self.vault_client.tidy_approle_secret_ids.assert_not_called()
+
 
 class TestPKIManager:
     @pytest.fixture(autouse=True)
     def setup(self):
         self.charm = MagicMock(spec=VaultCharm)
         self.vault = MagicMock(spec=VaultClient)
+        self.vault.get_mounts.return_value = {}
         self.certificate_request_attributes = CertificateRequestAttributes(
             common_name="common_name",
             is_ca=True,
@@ -367,6 +910,7 @@ class TestPKIManager:
         self.role_name = "role_name"
         self.vault_pki = MagicMock(spec=TLSCertificatesProvidesV4)
         self.tls_certificates_pki = MagicMock(spec=TLSCertificatesRequiresV4)
+        self.vault.get_pki_role_flags.return_value = PKIRoleFlags()
 
         self.pki_manager = PKIManager(
             self.charm,
@@ -456,6 +1000,58 @@ class TestPKIManager:
         )
         self.tls_certificates_pki.renew_certificate.assert_called_once_with(provider_certificate)
 
+    def test_given_ca_already_set_and_role_flags_changed_when_configure_then_role_updated(
+        self, assigned_certificate_and_key: tuple[ProviderCertificate, PrivateKey]
+    ):
+        provider_certificate, _ = assigned_certificate_and_key
+        self.vault.get_intermediate_ca.return_value = str(provider_certificate.certificate)
+        self.vault.get_role_max_ttl.return_value = 25 * SECONDS_IN_HOUR
+        pki_manager = PKIManager(
+            self.charm,
+            self.vault,
+            self.certificate_request_attributes,
+            self.mount_point,
+            self.role_name,
+            self.vault_pki,
+            self.tls_certificates_pki,
+            role_flags=PKIRoleFlags(no_store=True, generate_lease=False),
+        )
+
+        pki_manager.configure()
+
+        self.vault_pki.revoke_all_certificates.assert_not_called()
+        self.vault.create_or_update_pki_charm_role.assert_called_once_with(
+            allowed_domains=self.certificate_request_attributes.common_name,
+            mount=self.mount_point,
+            role=self.role_name,
+            max_ttl=f"{25 * SECONDS_IN_HOUR}s",
+            role_flags=PKIRoleFlags(no_store=True, generate_lease=False),
+        )
+
+    def test_given_ca_already_set_and_role_flags_unchanged_when_configure_then_role_not_updated(
+        self, assigned_certificate_and_key: tuple[ProviderCertificate, PrivateKey]
+    ):
+        provider_certificate, _ = assigned_certificate_and_key
+        self.vault.get_intermediate_ca.return_value = str(provider_certificate.certificate)
+        self.vault.get_role_max_ttl.return_value = 25 * SECONDS_IN_HOUR
+
+        self.pki_manager.configure()
+
+        self.vault.create_or_update_pki_charm_role.assert_not_called()
+
+    def test_given_mount_has_other_type_when_configure_then_error_logged(
+        self,
+        caplog: pytest.LogCaptureFixture,
+        assigned_certificate_and_key: tuple[ProviderCertificate, PrivateKey],
+    ):
+        self.vault.get_mounts.return_value = {self.mount_point: "kv"}
+
+        self.pki_manager.configure()
+
+        assert is_error_logged(caplog, "Failed to enable the PKI backend")
+        self.vault.enable_secrets_engine.assert_not_called()
+        self.vault.create_or_update_pki_charm_role.assert_not_called()
+
     def test_given_new_certificate_issued_when_configure_then_certificates_replaced(
         self, assigned_certificate_and_key: tuple[ProviderCertificate, PrivateKey]
     ):
@@ -480,6 +1076,7 @@ class TestPKIManager:
             mount=self.mount_point,
             role=self.role_name,
             max_ttl=f"{12 * SECONDS_IN_HOUR}s",
+            role_flags=PKIRoleFlags(),
         )
 
     def test_given_outstanding_requests_when_sync_then_certificates_issued(
@@ -512,22 +1109,298 @@ class TestPKIManager:
             ttl=f"{12 * SECONDS_IN_HOUR}s",
         )
 
-        self.vault_pki.set_relation_certificate.assert_called_once_with(
-            provider_certificate=ProviderCertificate(
-                relation_id=1,
-                certificate=signed_certificate,
-                certificate_signing_request=csr.certificate_signing_request,
-                ca=provider_certificate.certificate,
-                chain=provider_certificate.chain,
+        self.vault_pki.set_relation_certificates.assert_called_once_with(
+            [
+                ProviderCertificate(
+                    relation_id=1,
+                    certificate=signed_certificate,
+                    certificate_signing_request=csr.certificate_signing_request,
+                    ca=provider_certificate.certificate,
+                    chain=provider_certificate.chain,
+                )
+            ]
+        )
+
+    def test_given_many_outstanding_requests_when_sync_then_all_signed_and_role_checked_once(
+        self, assigned_certificate_and_key: tuple[ProviderCertificate, PrivateKey]
+    ):
+        provider_certificate, private_key = assigned_certificate_and_key
+        self.vault.is_pki_role_created.return_value = True
+        csrs = [
+            generate_example_requirer_csr(f"common-name-{i}.example.com", i) for i in range(1, 4)
+        ]
+        self.vault_pki.get_outstanding_certificate_requests.return_value = csrs
+
+        def sign(mount: str, role: str, csr: str, common_name: str, ttl: str):
+            requirer_csr = next(c for c in csrs if str(c.certificate_signing_request) == csr)
+            signed_certificate = sign_certificate(
+                provider_certificate.certificate,
+                private_key,
+                requirer_csr.certificate_signing_request,
             )
+            return VaultClientCertificate(
+                certificate=str(signed_certificate),
+                ca=str(provider_certificate.certificate),
+                chain=[str(cert) for cert in provider_certificate.chain],
+            )
+
+        self.vault.sign_pki_certificate_signing_request.side_effect = sign
+
+        self.pki_manager.sync()
+
+        self.vault.is_pki_role_created.assert_called_once()
+        assert self.vault.sign_pki_certificate_signing_request.call_count == 3
+        self.vault_pki.set_relation_certificates.assert_called_once()
+        [issued] = self.vault_pki.set_relation_certificates.call_args.args
+        assert [certificate.relation_id for certificate in issued] == [1, 2, 3]
+        assert [str(certificate.certificate_signing_request) for certificate in issued] == [
+            str(csr.certificate_signing_request) for csr in csrs
+        ]
+
+    def test_given_max_concurrent_signings_when_sync_then_signing_requests_bounded(
+        self, assigned_certificate_and_key: tuple[ProviderCertificate, PrivateKey]
+    ):
+        provider_certificate, private_key = assigned_certificate_and_key
+        self.vault.is_pki_role_created.return_value = True
+        csrs = [
+            generate_example_requirer_csr(f"common-name-{i}.example.com", i) for i in range(1, 7)
+        ]
+        self.vault_pki.get_outstanding_certificate_requests.return_value = csrs
+        lock = threading.Lock()
+        in_flight = 0
+        max_in_flight = 0
+
+        def sign(mount: str, role: str, csr: str, common_name: str, ttl: str):
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            return None
+
+        self.vault.sign_pki_certificate_signing_request.side_effect = sign
+        pki_manager = PKIManager(
+            self.charm,
+            self.vault,
+            self.certificate_request_attributes,
+            self.mount_point,
+            self.role_name,
+            self.vault_pki,
+            self.tls_certificates_pki,
+            max_concurrent_signings=2,
+        )
+
+        pki_manager.sync()
+
+        assert self.vault.sign_pki_certificate_signing_request.call_count == 6
+        assert max_in_flight == 2
+        self.vault_pki.set_relation_certificates.assert_not_called()
+
+    @pytest.fixture
+    def pki_manager_with_index(self):
+        with patch("vault.vault_managers.JujuFacade") as juju_facade_mock:
+            self.juju_facade = juju_facade_mock.return_value
+            self.juju_facade.is_leader = True
+            self.juju_facade.relation_exists.return_value = True
+            self.index_secret: dict[str, str] = {}
+            self.juju_facade.get_latest_secret_content.return_value = self.index_secret
+            self.juju_facade.set_app_secret_content.side_effect = lambda content, label: (
+                self.index_secret.update(content)
+            )
+            yield PKIManager(
+                self.charm,
+                self.vault,
+                self.certificate_request_attributes,
+                self.mount_point,
+                self.role_name,
+                self.vault_pki,
+                self.tls_certificates_pki,
+                keep_issued_certificates=True,
+            )
+
+    def _sign(
+        self,
+        requirer_csr: RequirerCertificateRequest,
+        assigned_certificate_and_key: tuple[ProviderCertificate, PrivateKey],
+    ) -> VaultClientCertificate:
+        provider_certificate, private_key = assigned_certificate_and_key
+        return VaultClientCertificate(
+            certificate=str(
+                sign_certificate(
+                    provider_certificate.certificate,
+                    private_key,
+                    requirer_csr.certificate_signing_request,
+                )
+            ),
+            ca=str(provider_certificate.certificate),
+            chain=[str(cert) for cert in provider_certificate.chain],
+            serial_number="01:02:03",
         )
 
+    def test_given_certificate_signed_when_sync_then_certificate_recorded_in_index(
+        self,
+        assigned_certificate_and_key: tuple[ProviderCertificate, PrivateKey],
+        pki_manager_with_index: PKIManager,
+    ):
+        self.vault.is_pki_role_created.return_value = True
+        csr = generate_example_requirer_csr(self.certificate_request_attributes.common_name, 1)
+        self.vault_pki.get_outstanding_certificate_requests.return_value = [csr]
+        self.vault_pki.get_certificate_requests.return_value = [csr]
+        certificate = self._sign(csr, assigned_certificate_and_key)
+        self.vault.sign_pki_certificate_signing_request.return_value = certificate
+
+        pki_manager_with_index.sync()
+
+        assert self.juju_facade.set_app_secret_content.call_args.kwargs["label"] == (
+            f"pki-issued-certificates-{self.mount_point}"
+        )
+        index = json.loads(self.index_secret["index"])
+        entry = index["certificates"][csr.certificate_signing_request.get_sha256_hex()]
+        assert entry["serial"] == "01:02:03"
+        assert entry["certificate"] == certificate.certificate
+        assert entry["expiry"] == (
+            Certificate.from_string(certificate.certificate).expiry_time.timestamp()
+        )
+        assert index["issuers"][entry["issuer"]]["ca"] == certificate.ca
+
+    def test_given_certificate_in_index_when_sync_then_certificate_published_without_signing(
+        self,
+        assigned_certificate_and_key: tuple[ProviderCertificate, PrivateKey],
+        pki_manager_with_index: PKIManager,
+    ):
+        self.vault.is_pki_role_created.return_value = True
+        csr = generate_example_requirer_csr(self.certificate_request_attributes.common_name, 1)
+        self.vault_pki.get_outstanding_certificate_requests.return_value = [csr]
+        self.vault_pki.get_certificate_requests.return_value = [csr]
+        certificate = self._sign(csr, assigned_certificate_and_key)
+        self.vault.sign_pki_certificate_signing_request.return_value = certificate
+        pki_manager_with_index.sync()
+        self.vault.reset_mock()
+        self.vault_pki.reset_mock()
+        self.juju_facade.set_app_secret_content.reset_mock()
+
+        pki_manager_with_index.sync()
+
+        self.vault.sign_pki_certificate_signing_request.assert_not_called()
+        self.vault.is_pki_role_created.assert_not_called()
+        [published] = self.vault_pki.set_relation_certificates.call_args.args
+        assert [str(certificate.certificate) for certificate in published] == [
+            str(Certificate.from_string(certificate.certificate))
+        ]
+        self.juju_facade.set_app_secret_content.assert_not_called()
+
+    def test_given_expired_certificate_in_index_when_sync_then_certificate_signed_again(
+        self,
+        assigned_certificate_and_key: tuple[ProviderCertificate, PrivateKey],
+        pki_manager_with_index: PKIManager,
+    ):
+        self.vault.is_pki_role_created.return_value = True
+        csr = generate_example_requirer_csr(self.certificate_request_attributes.common_name, 1)
+        self.vault_pki.get_outstanding_certificate_requests.return_value = [csr]
+        self.vault_pki.get_certificate_requests.return_value = [csr]
+        self.vault.sign_pki_certificate_signing_request.return_value = self._sign(
+            csr, assigned_certificate_and_key
+        )
+        pki_manager_with_index.sync()
+        index = json.loads(self.index_secret["index"])
+        for entry in index["certificates"].values():
+            entry["expiry"] = datetime.now().timestamp() - 1
+        self.index_secret["index"] = json.dumps(index)
+
+        pki_manager_with_index.sync()
+
+        assert self.vault.sign_pki_certificate_signing_request.call_count == 2
+
+    def test_given_csr_no_longer_requested_when_sync_then_certificate_dropped_from_index(
+        self,
+        assigned_certificate_and_key: tuple[ProviderCertificate, PrivateKey],
+        pki_manager_with_index: PKIManager,
+    ):
+        self.vault.is_pki_role_created.return_value = True
+        csr = generate_example_requirer_csr(self.certificate_request_attributes.common_name, 1)
+        self.vault_pki.get_outstanding_certificate_requests.return_value = [csr]
+        self.vault_pki.get_certificate_requests.return_value = [csr]
+        self.vault.sign_pki_certificate_signing_request.return_value = self._sign(
+            csr, assigned_certificate_and_key
+        )
+        pki_manager_with_index.sync()
+        self.vault_pki.get_outstanding_certificate_requests.return_value = []
+        self.vault_pki.get_certificate_requests.return_value = []
+
+        pki_manager_with_index.sync()
+
+        assert json.loads(self.index_secret["index"]) == {
+            "issuers": {},
+            "certificates": {},
+        }
+
+    def test_given_index_over_limit_when_sync_then_certificates_expiring_last_kept(
+        self,
+        assigned_certificate_and_key: tuple[ProviderCertificate, PrivateKey],
+        pki_manager_with_index: PKIManager,
+    ):
+        self.vault.is_pki_role_created.return_value = True
+        csrs = [
+            generate_example_requirer_csr(self.certificate_request_attributes.common_name, 1)
+            for _ in range(3)
+        ]
+        self.vault_pki.get_outstanding_certificate_requests.return_value = csrs
+        self.vault_pki.get_certificate_requests.return_value = csrs
+        self.vault.sign_pki_certificate_signing_request.side_effect = [
+            self._sign(csr, assigned_certificate_and_key) for csr in csrs
+        ]
+        now = datetime.now().timestamp()
+        self.index_secret["index"] = json.dumps(
+            {
+                "issuers": {},
+                "certificates": {
+                    csrs[0].certificate_signing_request.get_sha256_hex(): {
+                        "serial": "01",
+                        "expiry": now + 10,
+                        "certificate": "",
+                        "issuer": "unknown",
+                    }
+                },
+            }
+        )
+
+        with patch("vault.vault_managers._IssuedCertificateIndex.MAX_CERTIFICATES", 2):
+            pki_manager_with_index.sync()
+
+        index = json.loads(self.index_secret["index"])
+        assert len(index["certificates"]) == 2
+        assert all(entry["expiry"] > now + 10 for entry in index["certificates"].values())
+
+    def test_given_new_intermediate_ca_when_configure_then_index_cleared(
+        self,
+        assigned_certificate_and_key: tuple[ProviderCertificate, PrivateKey],
+        pki_manager_with_index: PKIManager,
+    ):
+        self.index_secret["index"] = json.dumps(
+            {"issuers": {"a": {"ca": "ca", "chain": []}}, "certificates": {"b": {}}}
+        )
+        self.vault.get_intermediate_ca.return_value = None
+        self.vault.is_common_name_allowed_in_pki_role.return_value = True
+        self.vault.get_role_max_ttl.return_value = 12 * SECONDS_IN_HOUR
+
+        pki_manager_with_index.configure()
+
+        self.vault_pki.revoke_all_certificates.assert_called_once()
+        assert json.loads(self.index_secret["index"]) == {
+            "issuers": {},
+            "certificates": {},
+        }
+
 
 class TestACMEManager:
     @pytest.fixture(autouse=True)
     def setup(self):
         self.charm = MagicMock(spec=VaultCharm)
         self.vault = MagicMock(spec=VaultClient)
+        self.vault.get_mounts.return_value = {}
+        self.vault.get_pki_role_flags.return_value = PKIRoleFlags()
         self.mount_point = "acme-charm"
         self.tls_certificates_acme = MagicMock(spec=TLSCertificatesRequiresV4)
         self.certificate_request_attributes = CertificateRequestAttributes(
@@ -646,6 +1519,19 @@ class TestACMEManager:
             mount=self.mount_point,
         )
 
+    def test_given_mount_has_other_type_when_configure_then_error_logged(
+        self,
+        caplog: pytest.LogCaptureFixture,
+        assigned_certificate_and_key: tuple[ProviderCertificate, PrivateKey],
+    ):
+        self.vault.get_mounts.return_value = {self.mount_point: "kv"}
+
+        self.acme_manager.configure()
+
+        assert is_error_logged(caplog, "Failed to enable the ACME backend")
+        self.vault.enable_secrets_engine.assert_not_called()
+        self.vault.create_or_update_acme_role.assert_not_called()
+
     def test_given_intermediate_certificate_when_configure_then_role_created(
         self, assigned_certificate_and_key: tuple[ProviderCertificate, PrivateKey]
     ):
@@ -671,6 +1557,34 @@ class TestACMEManager:
             mount=self.mount_point,
             role=self.role_name,
             max_ttl=f"{max_ttl}s",
+            role_flags=PKIRoleFlags(),
+        )
+
+    def test_given_ca_already_set_and_role_flags_changed_when_configure_then_role_updated(
+        self, assigned_certificate_and_key: tuple[ProviderCertificate, PrivateKey]
+    ):
+        provider_certificate, _ = assigned_certificate_and_key
+        self.vault.get_intermediate_ca.return_value = str(provider_certificate.certificate)
+        self.vault.get_role_max_ttl.return_value = 12 * SECONDS_IN_HOUR
+        acme_manager = ACMEManager(
+            charm=self.charm,
+            vault_client=self.vault,
+            mount_point=self.mount_point,
+            tls_certificates_acme=self.tls_certificates_acme,
+            certificate_request_attributes=self.certificate_request_attributes,
+            role_name=self.role_name,
+            vault_address=self.vault_address,
+            role_flags=PKIRoleFlags(no_store=True),
+        )
+
+        acme_manager.configure()
+
+        self.vault.import_ca_certificate_and_key.assert_not_called()
+        self.vault.create_or_update_acme_role.assert_called_once_with(
+            mount=self.mount_point,
+            role=self.role_name,
+            max_ttl=f"{12 * SECONDS_IN_HOUR}s",
+            role_flags=PKIRoleFlags(no_store=True),
         )
 
     def test_given_intermediate_certificate_when_configure_then_backend_configured(
@@ -685,20 +1599,56 @@ class TestACMEManager:
 
         expected_write_calls = [
             call.write(
-                path=f"{self.mount_point}/config/cluster",
-                data={"path": f"{self.vault_address}/v1/{self.mount_point}"},
+                f"sys/mounts/{self.mount_point}/tune",
+                {"allowed_response_headers": ["Location", "Replay-Nonce", "Link"]},
+            ),
+            call.write(
+                f"{self.mount_point}/config/urls",
+                {
+                    "issuing_certificates": [f"{self.vault_address}/v1/pki/ca"],
+                    "crl_distribution_points": [f"{self.vault_address}/v1/pki/crl"],
+                },
             ),
-            call.write(path=f"{self.mount_point}/config/acme", data={"enabled": True}),
+            call.write(
+                f"{self.mount_point}/config/cluster",
+                {"path": f"{self.vault_address}/v1/{self.mount_point}"},
+            ),
+            call.write(f"{self.mount_point}/config/acme", {"enabled": True}),
         ]
         self.vault.write.assert_has_calls(expected_write_calls, any_order=True)
 
-        self.vault.allow_acme_headers.assert_called_once_with(mount=self.mount_point)
-
-        self.vault.set_urls.assert_called_once_with(
-            mount=self.mount_point,
-            issuing_certificates=[f"{self.vault_address}/v1/pki/ca"],
-            crl_distribution_points=[f"{self.vault_address}/v1/pki/crl"],
+    def test_given_backend_already_configured_when_configure_then_configuration_not_rewritten(
+        self, assigned_certificate_and_key: tuple[ProviderCertificate, PrivateKey]
+    ):
+        vault_certificate, _ = generate_example_provider_certificate(
+            self.certificate_request_attributes.common_name, 1, validity=timedelta(hours=24)
         )
+        self.vault.get_intermediate_ca.return_value = str(vault_certificate.certificate)
+        self.vault.get_mounts.return_value = {self.mount_point: "pki"}
+        self.vault.list_pki_issuers.return_value = ["issuer"]
+        self.vault.read.side_effect = lambda path: {
+            f"sys/mounts/{self.mount_point}/tune": {
+                "allowed_response_headers": ["Location", "Replay-Nonce", "Link"],
+                "default_lease_ttl": 2764800,
+            },
+            f"{self.mount_point}/config/urls": {
+                "issuing_certificates": [f"{self.vault_address}/v1/pki/ca"],
+                "crl_distribution_points": [f"{self.vault_address}/v1/pki/crl"],
+            },
+            f"{self.mount_point}/config/cluster": {
+                "path": f"{self.vault_address}/v1/{self.mount_point}",
+            },
+            f"{self.mount_point}/config/acme": {"enabled": True, "eab_policy": "always"},
+            f"{self.mount_point}/config/issuers": {
+                "default_follows_latest_issuer": True,
+                "default": "issuer",
+            },
+        }[path]
+
+        self.acme_manager.configure()
+
+        self.vault.enable_secrets_engine.assert_not_called()
+        self.vault.write.assert_not_called()
 
 
 class TestBackupManager:
@@ -716,14 +1666,24 @@ class TestBackupManager:
         monkeypatch.setattr("vault.vault_managers.S3", self.s3_class)
         self.s3 = self.s3_class.return_value
         self.s3.get_object_key_list.return_value = [
-            "vault-backup-my-model-1",
-            "vault-backup-my-model-2",
+            "vault-backup-my-model-2025-01-01-00-00-00",
+            "vault-backup-my-model-2025-01-02-00-00-00",
         ]
-        self.s3.get_content.return_value = "snapshot content"
+        self.s3.get_bytes_and_etag.return_value = None
+        self.s3.put_bytes_if_match.return_value = True
+        self.s3.get_object_details.side_effect = lambda bucket_name, object_key: ObjectDetails(
+            key=object_key, size=1024, metadata={}, tags={}
+        )
+        self.snapshot = io.BytesIO(b"snapshot content")
+        self.s3.download_to_spool.return_value = DownloadedObject(
+            content=self.snapshot, size=16, metadata={}
+        )
 
         self.charm = MagicMock(spec=VaultCharm)
         self.charm.model.name = "my-model"
+        self.charm.unit.name = "vault/0"
         self.vault_client = MagicMock(spec=VaultClient)
+        self.vault_client.status.return_value.version = "1.17.2"
         self.s3_requirer = MagicMock(spec=S3Requirer)
         self.s3_requirer.get_s3_connection_info.return_value = {
             "bucket": "my-bucket",
@@ -778,18 +1738,129 @@ class TestBackupManager:
 
     def test_given_failed_to_upload_backup_when_create_backup_then_error_raised(self):
         self.s3.create_bucket.return_value = True
-        self.s3.upload_content.return_value = False
+        self.s3.upload_stream.side_effect = S3Error("part upload failed")
         with pytest.raises(ManagerError) as e:
             self.manager.create_backup(self.vault_client)
         assert str(e.value) == "Failed to upload backup to S3 bucket"
+        self.vault_client.create_snapshot.return_value.close.assert_called_once()
 
     def test_given_s3_available_when_create_backup_then_backup_created(self):
-        key = self.manager.create_backup(self.vault_client)
+        self.s3.upload_stream.side_effect = lambda content, bucket_name, key, **kwargs: (
+            UploadReport(key=key, size=1024, parts=1, duration=0.5)
+        )
+
+        report = self.manager.create_backup(
+            self.vault_client, part_size=16 * 1024 * 1024, max_concurrency=8
+        )
 
         self.vault_client.create_snapshot.assert_called_once()
-        self.s3.upload_content.assert_called_once()
+        self.s3.upload_stream.assert_called_once_with(
+            content=ANY,
+            bucket_name="my-bucket",
+            key=report.key,
+            part_size=16 * 1024 * 1024,
+            max_concurrency=8,
+            metadata={},
+        )
+        self.s3.set_object_tags.assert_not_called()
+        assert report.key.startswith("vault-backup-my-model-")
+        assert report.throughput == 2048
 
-        assert key.startswith("vault-backup-my-model-")
+    @patch("vault.vault_managers.preferred_codec", new=lambda: "gzip")
+    def test_given_compression_when_create_backup_then_compressed_snapshot_uploaded_and_tagged(
+        self,
+    ):
+        self.vault_client.create_snapshot.return_value.raw = io.BytesIO(b"snapshot " * 100)
+        uploaded = {}
+
+        def upload_stream(content, bucket_name, key, metadata, **kwargs):
+            assert isinstance(content, CompressingReader)
+            uploaded["content"] = content.read()
+            uploaded["metadata"] = metadata
+            return UploadReport(key=key, size=len(uploaded["content"]), parts=1, duration=0.5)
+
+        self.s3.upload_stream.side_effect = upload_stream
+
+        report = self.manager.create_backup(self.vault_client, compress=True)
+
+        assert gzip.decompress(uploaded["content"]) == b"snapshot " * 100
+        assert uploaded["metadata"] == {"compression": "gzip"}
+        self.s3.set_object_tags.assert_called_once_with(
+            bucket_name="my-bucket", object_key=report.key, tags={"original-size": "900"}
+        )
+
+    def test_given_deduplication_when_create_backup_then_new_chunks_and_manifest_uploaded(self):
+        snapshot = b"snapshot " * 100
+        self.vault_client.create_snapshot.return_value.raw = io.BytesIO(snapshot)
+        uploaded = {}
+        self.s3.object_exists.return_value = False
+        self.s3.put_bytes.side_effect = lambda bucket_name, key, content, **kwargs: (
+            uploaded.update({key: (content, kwargs)})
+        )
+
+        report = self.manager.create_backup(self.vault_client, deduplicate=True)
+
+        manifest_content, manifest_kwargs = uploaded.pop(report.key)
+        manifest = Manifest.loads(manifest_content)
+        assert manifest.size == len(snapshot)
+        assert manifest_kwargs == {"metadata": {"format": "chunked"}}
+        assert [content for content, _ in uploaded.values()] == [snapshot]
+        assert (report.parts, report.size) == (2, len(snapshot) + len(manifest_content))
+        self.s3.upload_stream.assert_not_called()
+        self.s3.set_object_tags.assert_called_once_with(
+            bucket_name="my-bucket", object_key=report.key, tags={"original-size": "900"}
+        )
+
+    def test_given_backup_uploaded_when_create_backup_then_backup_added_to_catalog(self):
+        snapshot = b"snapshot content"
+        self.vault_client.create_snapshot.return_value.raw = io.BytesIO(snapshot)
+
+        def upload_stream(content, bucket_name, key, **kwargs):
+            return UploadReport(key=key, size=len(content.read()), parts=1, duration=0.5)
+
+        self.s3.upload_stream.side_effect = upload_stream
+        existing = {
+            "key": "vault-backup-my-model-2025-01-01-00-00-00",
+            "size": 1024,
+            "original_size": 1024,
+            "compression": None,
+            "deduplicated": False,
+            "created_at": "2025-01-01T00:00:00+00:00",
+            "model": "my-model",
+            "checksum": None,
+            "duration": None,
+            "vault_version": None,
+            "node": None,
+        }
+        self.s3.get_bytes_and_etag.return_value = (
+            json.dumps({"version": 1, "backups": [existing]}).encode(),
+            '"etag"',
+        )
+
+        report = self.manager.create_backup(self.vault_client)
+
+        bucket_name, key, content, etag = self.s3.put_bytes_if_match.call_args.args
+        assert (bucket_name, key, etag) == ("my-bucket", "vault-catalog.json", '"etag"')
+        first, added = json.loads(content)["backups"]
+        assert first == existing
+        assert added["key"] == report.key
+        assert added["model"] == "my-model"
+        assert added["checksum"] == hashlib.sha256(snapshot).hexdigest()
+        assert (added["duration"], added["vault_version"], added["node"]) == (
+            0.5,
+            "1.17.2",
+            "vault/0",
+        )
+
+    def test_given_catalog_update_fails_when_create_backup_then_backup_still_created(self):
+        self.s3.upload_stream.side_effect = lambda content, bucket_name, key, **kwargs: (
+            UploadReport(key=key, size=1024, parts=1, duration=0.5)
+        )
+        self.s3.put_bytes_if_match.side_effect = S3Error("access denied")
+
+        report = self.manager.create_backup(self.vault_client)
+
+        assert report.key.startswith("vault-backup-my-model-")
 
     # List backups
     def test_given_non_leader_when_list_backups_then_error_raised(self):
@@ -836,9 +1907,121 @@ class TestBackupManager:
             self.manager.list_backups()
         assert str(e.value) == "Failed to list backups in S3 bucket: some error message"
 
-    def test_given_s3_available_when_list_backups_then_backups_listed(self):
+    def test_given_no_catalog_when_list_backups_then_catalog_rebuilt_and_backups_listed(self):
+        backups = self.manager.list_backups()
+
+        assert backups == [
+            BackupDetails(
+                key=f"vault-backup-my-model-2025-01-0{day}-00-00-00",
+                size=1024,
+                original_size=1024,
+                compression=None,
+                created_at=datetime(2025, 1, day).astimezone(timezone.utc),
+                model="my-model",
+            )
+            for day in (2, 1)
+        ]
+        bucket_name, key, content, etag = self.s3.put_bytes_if_match.call_args.args
+        assert (bucket_name, key, etag) == ("my-bucket", "vault-catalog.json", None)
+        assert [entry["key"] for entry in json.loads(content)["backups"]] == [
+            "vault-backup-my-model-2025-01-01-00-00-00",
+            "vault-backup-my-model-2025-01-02-00-00-00",
+        ]
+
+    def test_given_catalog_when_list_backups_then_backups_read_from_catalog_and_filtered(self):
+        catalog = {
+            "version": 1,
+            "backups": [
+                {
+                    "key": f"vault-backup-{model}-2025-01-0{day}-00-00-00",
+                    "size": 1024,
+                    "original_size": 4096,
+                    "compression": "gzip",
+                    "deduplicated": False,
+                    "created_at": f"2025-01-0{day}T00:00:00+00:00",
+                    "model": model,
+                    "checksum": "abc",
+                    "duration": 1.5,
+                    "vault_version": "1.17.2",
+                    "node": "vault/0",
+                }
+                for day, model in [(1, "my-model"), (2, "other-model"), (3, "my-model")]
+            ],
+        }
+        self.s3.get_bytes_and_etag.return_value = (json.dumps(catalog).encode(), '"etag"')
+
+        backups = self.manager.list_backups(
+            limit=1, since=datetime(2025, 1, 1, 12), model="my-model"
+        )
+        all_backups = self.manager.list_backups()
+
+        assert [backup.key for backup in backups] == ["vault-backup-my-model-2025-01-03-00-00-00"]
+        assert backups[0].checksum == "abc"
+        assert len(all_backups) == 3
+        self.s3.get_object_key_list.assert_not_called()
+        self.s3.put_bytes_if_match.assert_not_called()
+
+    def test_given_catalog_changed_while_rebuilt_when_list_backups_then_update_retried(self):
+        self.s3.put_bytes_if_match.side_effect = [False, True]
+
+        backups = self.manager.list_backups(rebuild=True)
+
+        assert len(backups) == 2
+        assert self.s3.put_bytes_if_match.call_count == 2
+
+    def test_given_catalog_keeps_changing_when_list_backups_then_error_raised(self):
+        self.s3.put_bytes_if_match.return_value = False
+
+        with pytest.raises(ManagerError) as e:
+            self.manager.list_backups()
+
+        assert str(e.value) == (
+            "Failed to list backups in S3 bucket: "
+            "The backup catalog kept changing while it was updated"
+        )
+
+    def test_given_compressed_backups_when_list_backups_then_original_size_read_from_tag(self):
+        self.s3.get_object_details.side_effect = [
+            ObjectDetails(
+                key="vault-backup-my-model-1",
+                size=256,
+                metadata={"compression": "zstd"},
+                tags={"original-size": "1024"},
+            ),
+            ObjectDetails(
+                key="vault-backup-my-model-2", size=256, metadata={"compression": "gzip"}, tags={}
+            ),
+        ]
+
+        backups = self.manager.list_backups()
+
+        assert [(backup.original_size, backup.compression) for backup in backups] == [
+            (None, "gzip"),
+            (1024, "zstd"),
+        ]
+
+    def test_given_deduplicated_backup_when_list_backups_then_original_size_read_from_tag(self):
+        self.s3.get_object_details.side_effect = [
+            ObjectDetails(
+                key="vault-backup-my-model-1",
+                size=256,
+                metadata={"format": "chunked"},
+                tags={"original-size": "1024"},
+            ),
+            None,
+        ]
+
         backups = self.manager.list_backups()
-        assert backups == ["vault-backup-my-model-1", "vault-backup-my-model-2"]
+
+        assert backups == [
+            BackupDetails(
+                key="vault-backup-my-model-1",
+                size=256,
+                original_size=1024,
+                compression=None,
+                deduplicated=True,
+            )
+        ]
 
     # Restore backup
     def test_given_non_leader_when_restore_backup_then_error_raised(self):
@@ -880,13 +2063,13 @@ class TestBackupManager:
         assert str(e.value) == "Failed to create S3 session"
 
     def test_given_s3_error_during_download_when_restore_backup_then_error_raised(self):
-        self.s3.get_content.side_effect = S3Error("some error message")
+        self.s3.download_to_spool.side_effect = S3Error("some error message")
         with pytest.raises(ManagerError) as e:
             self.manager.restore_backup(self.vault_client, "vault-backup-my-model-1")
         assert str(e.value) == "Failed to retrieve snapshot from S3: some error message"
 
     def test_given_s3_content_not_found_when_restore_backup_then_error_raised(self):
-        self.s3.get_content.return_value = None
+        self.s3.download_to_spool.return_value = None
         with pytest.raises(ManagerError) as e:
             self.manager.restore_backup(self.vault_client, "vault-backup-my-model-1")
         assert str(e.value) == "Snapshot not found in S3 bucket"
@@ -902,8 +2085,94 @@ class TestBackupManager:
     def test_given_s3_content_and_vault_client_available_when_restore_backup_then_backup_restored(
         self,
     ):
+        self.manager.restore_backup(
+            self.vault_client, "vault-backup-my-model-1", max_concurrency=8, spool_dir="/spool"
+        )
+
+        self.s3.download_to_spool.assert_called_once_with(
+            bucket_name="my-bucket",
+            object_key="vault-backup-my-model-1",
+            max_concurrency=8,
+            spool_dir="/spool",
+        )
+        self.vault_client.restore_snapshot.assert_called_once_with(snapshot=self.snapshot)
+        assert self.snapshot.closed
+
+    def test_given_compressed_backup_when_restore_backup_then_decompressed_snapshot_restored(
+        self,
+    ):
+        compressed = io.BytesIO(gzip.compress(b"snapshot content"))
+        self.s3.download_to_spool.return_value = DownloadedObject(
+            content=compressed, size=len(compressed.getvalue()), metadata={"compression": "gzip"}
+        )
+        restored = []
+        self.vault_client.restore_snapshot.side_effect = lambda snapshot: restored.append(
+            snapshot.read()
+        )
+
         self.manager.restore_backup(self.vault_client, "vault-backup-my-model-1")
-        self.vault_client.restore_snapshot.assert_called_once_with(snapshot="snapshot content")
+
+        assert restored == [b"snapshot content"]
+        assert compressed.closed
+
+    def test_given_deduplicated_backup_when_restore_backup_then_chunks_reassembled_and_restored(
+        self,
+    ):
+        manifest = io.BytesIO(b"manifest")
+        self.s3.download_to_spool.return_value = DownloadedObject(
+            content=manifest, size=8, metadata={"format": "chunked"}
+        )
+        chunk_store = MagicMock()
+        chunk_store.return_value.download_to_spool.return_value = io.BytesIO(b"snapshot content")
+        restored = []
+        self.vault_client.restore_snapshot.side_effect = lambda snapshot: restored.append(
+            snapshot.read()
+        )
+
+        with (
+            patch("vault.vault_managers.Manifest") as manifest_class,
+            patch("vault.vault_managers.ChunkStore", chunk_store),
+        ):
+            self.manager.restore_backup(
+                self.vault_client, "vault-backup-my-model-1", max_concurrency=8, spool_dir="/spool"
+            )
+
+        manifest_class.loads.assert_called_once_with(b"manifest")
+        chunk_store.assert_called_once_with(self.s3, "my-bucket", 8)
+        chunk_store.return_value.download_to_spool.assert_called_once_with(
+            manifest_class.loads.return_value, spool_dir="/spool"
+        )
+        assert restored == [b"snapshot content"]
+        assert manifest.closed
+
+    def test_given_deduplicated_backup_with_invalid_manifest_when_restore_backup_then_error_raised(
+        self,
+    ):
+        self.s3.download_to_spool.return_value = DownloadedObject(
+            content=io.BytesIO(b"not a manifest"), size=14, metadata={"format": "chunked"}
+        )
+
+        with pytest.raises(ManagerError) as e:
+            self.manager.restore_backup(self.vault_client, "vault-backup-my-model-1")
+
+        assert str(e.value).startswith("Failed to retrieve snapshot from S3: Invalid manifest")
+        self.vault_client.restore_snapshot.assert_not_called()
+
+    def test_given_backup_compressed_with_unsupported_codec_when_restore_backup_then_error_raised(
+        self,
+    ):
+        self.s3.download_to_spool.return_value = DownloadedObject(
+            content=self.snapshot, size=16, metadata={"compression": "lz4"}
+        )
+
+        with pytest.raises(ManagerError) as e:
+            self.manager.restore_backup(self.vault_client, "vault-backup-my-model-1")
+
+        assert (
+            str(e.value) == "Failed to decompress snapshot: Compression codec lz4 is not supported"
+        )
+        self.vault_client.restore_snapshot.assert_not_called()
+        assert self.snapshot.closed
 
 
 class TestRaftManager:
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from unittest.mock import MagicMock
+
+import pytest
+from vault.vault_client import SecretsBackend, VaultClient, VaultClientError
+from vault.vault_reconciler import (
+    Approle,
+    AuthBackend,
+    ConfigEntry,
+    DesiredState,
+    Mount,
+    Policy,
+    VaultReconciler,
+)
+
+POLICY_CONTENT = 'path "charm-kv/*" {\n  capabilities = ["read"]\n}\n'
+
+
+class TestVaultReconciler:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.vault_client = MagicMock(spec=VaultClient)
+        self.vault_client.get_mounts.return_value = {"secret": "kv", "charm-kv": "kv-v2"}
+        self.vault_client.get_auth_methods.return_value = {"token": "token", "approle": "approle"}
+        self.vault_client.list.side_effect = lambda path: {
+            "sys/policy": ["default", "root", "charm-kv"],
+            "auth/approle/role": ["charm-kv"],
+        }[path]
+        self.vault_client.read_policy.return_value = POLICY_CONTENT
+        self.vault_client.read_approle.return_value = {
+            "token_policies": ["charm-kv"],
+            "token_bound_cidrs": ["10.0.0.2/32", "10.0.0.1/32"],
+            "token_ttl": 3600,
+            "token_max_ttl": 3600,
+            "token_period": 0,
+            "secret_id_ttl": 0,
+        }
+        self.vault_client.read_role_id.return_value = "existing-role-id"
+        self.vault_client.create_or_update_approle.return_value = "new-role-id"
+        self.vault_client.read.return_value = {"enabled": True, "eab_policy": "not-required"}
+        self.vault_client.write.return_value = True
+        self.reconciler = VaultReconciler(self.vault_client)
+
+    def desired_state(self, **overrides) -> DesiredState:
+        approle = Approle(
+            "charm-kv",
+            policies=["charm-kv"],
+            cidrs=["10.0.0.1/32", "10.0.0.2/32"],
+            token_ttl="1h",
+            token_max_ttl="60m",
+        )
+        state = DesiredState(
+            mounts=[Mount("charm-kv", SecretsBackend.KV_V2)],
+            auth_backends=[AuthBackend("approle", "approle")],
+            policies=[Policy("charm-kv", POLICY_CONTENT)],
+            approles=[approle],
+            config_entries=[ConfigEntry("charm-kv/config/acme", {"enabled": True})],
+        )
+        for name, value in overrides.items():
+            setattr(state, name, value)
+        return state
+
+    def test_given_vault_matches_desired_state_when_reconcile_then_nothing_written(self):
+        result = self.reconciler.reconcile(self.desired_state())
+
+        assert result.changes == []
+        assert result.role_ids == {"charm-kv": "existing-role-id"}
+        self.vault_client.enable_secrets_engine.assert_not_called()
+        self.vault_client.enable_auth_method.assert_not_called()
+        self.vault_client.create_or_update_policy.assert_not_called()
+        self.vault_client.create_or_update_approle.assert_not_called()
+        self.vault_client.write.assert_not_called()
+
+    def test_given_empty_vault_when_reconcile_then_everything_created_without_reading_objects(
+        self,
+    ):
+        self.vault_client.get_mounts.return_value = {}
+        self.vault_client.get_auth_methods.return_value = {}
+        self.vault_client.list.side_effect = None
+        self.vault_client.list.return_value = []
+        self.vault_client.read.return_value = {}
+
+        result = self.reconciler.reconcile(self.desired_state())
+
+        assert len(result.changes) == 5
+        assert result.role_ids == {"charm-kv": "new-role-id"}
+        self.vault_client.enable_secrets_engine.assert_called_once_with(
+            SecretsBackend.KV_V2, "charm-kv"
+        )
+        self.vault_client.enable_auth_method.assert_called_once_with("approle", "approle")
+        self.vault_client.create_or_update_policy.assert_called_once_with(
+            "charm-kv", POLICY_CONTENT
+        )
+        self.vault_client.write.assert_called_once_with("charm-kv/config/acme", {"enabled": True})
+        self.vault_client.read_policy.assert_not_called()
+        self.vault_client.read_approle.assert_not_called()
+
+    def test_given_policy_content_changed_when_reconcile_then_only_policy_written(self):
+        self.vault_client.read_policy.return_value = 'path "charm-kv/*" {}'
+
+        result = self.reconciler.reconcile(self.desired_state())
+
+        assert result.changes == ["wrote policy charm-kv"]
+        self.vault_client.create_or_update_policy.assert_called_once_with(
+            "charm-kv", POLICY_CONTENT
+        )
+        self.vault_client.create_or_update_approle.assert_not_called()
+
+    def test_given_approle_cidrs_changed_when_reconcile_then_approle_written(self):
+        approle = Approle(
+            "charm-kv",
+            policies=["charm-kv"],
+            cidrs=["10.0.0.3/32"],
+            token_ttl="1h",
+            token_max_ttl="1h",
+        )
+
+        result = self.reconciler.reconcile(self.desired_state(approles=[approle]))
+
+        assert result.changes == ["wrote approle charm-kv"]
+        assert result.role_ids == {"charm-kv": "new-role-id"}
+        self.vault_client.create_or_update_approle.assert_called_once_with(
+            "charm-kv",
+            token_ttl="1h",
+            token_max_ttl="1h",
+            policies=["charm-kv"],
+            cidrs=["10.0.0.3/32"],
+            token_period=None,
+            token_type="default",
+        )
+
+    def test_given_approle_token_type_changed_when_reconcile_then_approle_written(self):
+        approle = Approle(
+            "charm-kv",
+            policies=["charm-kv"],
+            cidrs=["10.0.0.1/32", "10.0.0.2/32"],
+            token_ttl="1h",
+            token_max_ttl="1h",
+            token_type="batch",
+        )
+
+        result = self.reconciler.reconcile(self.desired_state(approles=[approle]))
+
+        assert result.changes == ["wrote approle charm-kv"]
+        assert self.vault_client.create_or_update_approle.call_args.kwargs["token_type"] == "batch"
+
+    def test_given_config_entry_differs_when_reconcile_then_entry_written(self):
+        self.vault_client.read.return_value = {"enabled": False}
+
+        result = self.reconciler.reconcile(self.desired_state())
+
+        assert result.changes == ["wrote charm-kv/config/acme"]
+        self.vault_client.write.assert_called_once_with("charm-kv/config/acme", {"enabled": True})
+
+    def test_given_mount_with_other_type_when_reconcile_then_error_raised(self):
+        self.vault_client.get_mounts.return_value = {"charm-kv": "pki"}
+
+        with pytest.raises(VaultClientError):
+            self.reconciler.reconcile(self.desired_state())
+
+        self.vault_client.enable_secrets_engine.assert_not_called()
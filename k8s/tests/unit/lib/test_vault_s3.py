@@ -2,6 +2,7 @@
 # Copyright 2024 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+import hashlib
 import io
 import unittest
 from unittest.mock import MagicMock, Mock, patch
@@ -9,7 +10,8 @@ from unittest.mock import MagicMock, Mock, patch
 import boto3
 from botocore.exceptions import ClientError
 from botocore.response import StreamingBody
-from vault.vault_s3 import S3, S3Error
+from urllib3.exceptions import ProtocolError
+from vault.vault_s3 import MIN_PART_SIZE, S3, ObjectDetails, S3Error
 
 
 class TestS3(unittest.TestCase):
@@ -350,3 +352,326 @@ class TestS3(unittest.TestCase):
         streaming_body = s3.get_content(bucket_name="whatever-bucket", object_key="whatever-key")
         assert streaming_body
         self.assertEqual(streaming_body.read(), streaming_body_content)
+
+    def _s3_with_client(self, patch_session: MagicMock) -> tuple[S3, Mock]:
+        mock_client = Mock()
+        patch_session.return_value.resource.return_value.meta.client = mock_client
+        s3 = S3(
+            access_key=self.VALID_S3_PARAMETERS["access-key"],
+            secret_key=self.VALID_S3_PARAMETERS["secret-key"],
+            region=self.VALID_S3_PARAMETERS["region"],
+            endpoint=self.VALID_S3_PARAMETERS["endpoint"],
+        )
+        return s3, mock_client
+
+    @patch("boto3.session.Session")
+    def test_given_content_smaller_than_part_when_upload_stream_then_content_put_at_once(
+        self, patch_session: MagicMock
+    ):
+        s3, mock_client = self._s3_with_client(patch_session)
+
+        report = s3.upload_stream(
+            content=io.BytesIO(b"whatever content"), bucket_name="whatever-bucket", key="key"
+        )
+
+        mock_client.put_object.assert_called_once_with(
+            Bucket="whatever-bucket", Key="key", Body=b"whatever content", Metadata={}
+        )
+        mock_client.create_multipart_upload.assert_not_called()
+        self.assertEqual((report.key, report.size, report.parts), ("key", 16, 1))
+
+    @patch("boto3.session.Session")
+    def test_given_content_larger_than_part_when_upload_stream_then_parts_uploaded_and_completed(
+        self, patch_session: MagicMock
+    ):
+        s3, mock_client = self._s3_with_client(patch_session)
+        mock_client.create_multipart_upload.return_value = {"UploadId": "upload-id"}
+        mock_client.upload_part.side_effect = lambda **kwargs: {
+            "ETag": f"etag-{kwargs['PartNumber']}"
+        }
+        content = b"a" * MIN_PART_SIZE * 2 + b"b"
+
+        report = s3.upload_stream(
+            content=io.BytesIO(content),
+            bucket_name="whatever-bucket",
+            key="key",
+            part_size=MIN_PART_SIZE,
+            max_concurrency=2,
+            metadata={"compression": "gzip"},
+        )
+
+        uploaded = {
+            call.kwargs["PartNumber"]: call.kwargs["Body"]
+            for call in mock_client.upload_part.call_args_list
+        }
+        self.assertEqual(b"".join(uploaded[number] for number in sorted(uploaded)), content)
+        mock_client.create_multipart_upload.assert_called_once_with(
+            Bucket="whatever-bucket",
+            Key="key",
+            Metadata={"compression": "gzip", "part-size": str(MIN_PART_SIZE)},
+        )
+        mock_client.complete_multipart_upload.assert_called_once_with(
+            Bucket="whatever-bucket",
+            Key="key",
+            UploadId="upload-id",
+            MultipartUpload={
+                "Parts": [
+                    {"PartNumber": 1, "ETag": "etag-1"},
+                    {"PartNumber": 2, "ETag": "etag-2"},
+                    {"PartNumber": 3, "ETag": "etag-3"},
+                ]
+            },
+        )
+        self.assertEqual((report.size, report.parts), (len(content), 3))
+
+    @patch("vault.vault_s3.PART_BACKOFF", new=0)
+    @patch("boto3.session.Session")
+    def test_given_part_fails_once_when_upload_stream_then_part_retried(
+        self, patch_session: MagicMock
+    ):
+        s3, mock_client = self._s3_with_client(patch_session)
+        mock_client.create_multipart_upload.return_value = {"UploadId": "upload-id"}
+        mock_client.upload_part.side_effect = [
+            ClientError(operation_name="UploadPart", error_response={"Error": {}}),
+            {"ETag": "etag-1"},
+            {"ETag": "etag-2"},
+        ]
+
+        s3.upload_stream(
+            content=io.BytesIO(b"a" * MIN_PART_SIZE + b"b"),
+            bucket_name="whatever-bucket",
+            key="key",
+            part_size=MIN_PART_SIZE,
+            max_concurrency=1,
+        )
+
+        self.assertEqual(mock_client.upload_part.call_count, 3)
+        mock_client.complete_multipart_upload.assert_called_once()
+        mock_client.abort_multipart_upload.assert_not_called()
+
+    @patch("vault.vault_s3.PART_BACKOFF", new=0)
+    @patch("boto3.session.Session")
+    def test_given_part_keeps_failing_when_upload_stream_then_upload_aborted(
+        self, patch_session: MagicMock
+    ):
+        s3, mock_client = self._s3_with_client(patch_session)
+        mock_client.create_multipart_upload.return_value = {"UploadId": "upload-id"}
+        mock_client.upload_part.side_effect = ClientError(
+            operation_name="UploadPart", error_response={"Error": {}}
+        )
+
+        with self.assertRaises(S3Error):
+            s3.upload_stream(
+                content=io.BytesIO(b"a" * MIN_PART_SIZE + b"b"),
+                bucket_name="whatever-bucket",
+                key="key",
+                part_size=MIN_PART_SIZE,
+            )
+
+        mock_client.abort_multipart_upload.assert_called_once_with(
+            Bucket="whatever-bucket", Key="key", UploadId="upload-id"
+        )
+        mock_client.complete_multipart_upload.assert_not_called()
+
+    @patch("boto3.session.Session")
+    def test_given_content_fails_after_first_part_when_upload_stream_then_upload_aborted(
+        self, patch_session: MagicMock
+    ):
+        s3, mock_client = self._s3_with_client(patch_session)
+        mock_client.create_multipart_upload.return_value = {"UploadId": "upload-id"}
+        mock_client.upload_part.return_value = {"ETag": "etag"}
+        content = MagicMock()
+        content.read.side_effect = [b"a" * MIN_PART_SIZE, ProtocolError("Connection broken")]
+
+        with self.assertRaises(S3Error):
+            s3.upload_stream(
+                content=content,
+                bucket_name="whatever-bucket",
+                key="key",
+                part_size=MIN_PART_SIZE,
+            )
+
+        mock_client.abort_multipart_upload.assert_called_once_with(
+            Bucket="whatever-bucket", Key="key", UploadId="upload-id"
+        )
+        mock_client.complete_multipart_upload.assert_not_called()
+
+    def _serve_object(self, mock_client: Mock, content: bytes, etag: str, metadata: dict):
+        mock_client.head_object.return_value = {
+            "ContentLength": len(content),
+            "ETag": f'"{etag}"',
+            "Metadata": metadata,
+        }
+
+        def get_object(**kwargs: str):
+            byte_range = kwargs["Range"].removeprefix("bytes=")
+            start, end = (int(bound) for bound in byte_range.split("-"))
+            return {"Body": io.BytesIO(content[start : end + 1])}
+
+        mock_client.get_object.side_effect = get_object
+
+    @patch("boto3.session.Session")
+    def test_given_object_uploaded_in_parts_when_download_to_spool_then_ranges_downloaded_and_verified(
+        self, patch_session: MagicMock
+    ):
+        s3, mock_client = self._s3_with_client(patch_session)
+        content = b"a" * MIN_PART_SIZE + b"b" * MIN_PART_SIZE + b"c"
+        part_digests = b"".join(
+            hashlib.md5(content[start : start + MIN_PART_SIZE]).digest()
+            for start in range(0, len(content), MIN_PART_SIZE)
+        )
+        self._serve_object(
+            mock_client,
+            content,
+            etag=f"{hashlib.md5(part_digests).hexdigest()}-3",
+            metadata={"part-size": str(MIN_PART_SIZE)},
+        )
+
+        downloaded = s3.download_to_spool(
+            bucket_name="whatever-bucket", object_key="key", max_concurrency=2
+        )
+
+        assert downloaded
+        self.assertEqual(downloaded.content.read(), content)
+        self.assertEqual(downloaded.metadata, {"part-size": str(MIN_PART_SIZE)})
+        self.assertEqual(mock_client.get_object.call_count, 3)
+
+    @patch("boto3.session.Session")
+    def test_given_content_does_not_match_etag_when_download_to_spool_then_error_raised(
+        self, patch_session: MagicMock
+    ):
+        s3, mock_client = self._s3_with_client(patch_session)
+        self._serve_object(
+            mock_client,
+            b"corrupted content",
+            etag=hashlib.md5(b"content").hexdigest(),
+            metadata={},
+        )
+
+        with self.assertRaises(S3Error):
+            s3.download_to_spool(bucket_name="whatever-bucket", object_key="key")
+
+    @patch("vault.vault_s3.PART_BACKOFF", new=0)
+    @patch("boto3.session.Session")
+    def test_given_range_fails_once_when_download_to_spool_then_range_retried(
+        self, patch_session: MagicMock
+    ):
+        s3, mock_client = self._s3_with_client(patch_session)
+        self._serve_object(
+            mock_client, b"content", etag=hashlib.md5(b"content").hexdigest(), metadata={}
+        )
+        get_object = mock_client.get_object.side_effect
+        mock_client.get_object.side_effect = [
+            ClientError(operation_name="GetObject", error_response={"Error": {}}),
+            get_object(Bucket="whatever-bucket", Key="key", Range="bytes=0-6"),
+        ]
+
+        downloaded = s3.download_to_spool(bucket_name="whatever-bucket", object_key="key")
+
+        assert downloaded
+        self.assertEqual(downloaded.content.read(), b"content")
+
+    @patch("boto3.session.Session")
+    def test_given_object_does_not_exist_when_download_to_spool_then_none_returned(
+        self, patch_session: MagicMock
+    ):
+        s3, mock_client = self._s3_with_client(patch_session)
+        mock_client.head_object.side_effect = ClientError(
+            operation_name="HeadObject", error_response={"Error": {"Code": "404"}}
+        )
+
+        self.assertIsNone(s3.download_to_spool(bucket_name="whatever-bucket", object_key="key"))
+
+    @patch("boto3.session.Session")
+    def test_given_tags_when_set_object_tags_then_tag_set_put(self, patch_session: MagicMock):
+        s3, mock_client = self._s3_with_client(patch_session)
+
+        s3.set_object_tags(
+            bucket_name="whatever-bucket", object_key="key", tags={"original-size": "1024"}
+        )
+
+        mock_client.put_object_tagging.assert_called_once_with(
+            Bucket="whatever-bucket",
+            Key="key",
+            Tagging={"TagSet": [{"Key": "original-size", "Value": "1024"}]},
+        )
+
+    @patch("boto3.session.Session")
+    def test_given_tagging_not_supported_when_get_object_details_then_details_without_tags(
+        self, patch_session: MagicMock
+    ):
+        s3, mock_client = self._s3_with_client(patch_session)
+        mock_client.head_object.return_value = {
+            "ContentLength": 256,
+            "Metadata": {"compression": "gzip"},
+        }
+        mock_client.get_object_tagging.side_effect = ClientError(
+            operation_name="GetObjectTagging", error_response={"Error": {"Code": "NotImplemented"}}
+        )
+
+        details = s3.get_object_details(bucket_name="whatever-bucket", object_key="key")
+
+        self.assertEqual(
+            details, ObjectDetails(key="key", size=256, metadata={"compression": "gzip"}, tags={})
+        )
+
+    @patch("boto3.session.Session")
+    def test_given_object_does_not_exist_when_object_exists_then_false_returned(
+        self, patch_session: MagicMock
+    ):
+        s3, mock_client = self._s3_with_client(patch_session)
+        mock_client.head_object.side_effect = ClientError(
+            operation_name="HeadObject", error_response={"Error": {"Code": "404"}}
+        )
+
+        self.assertFalse(s3.object_exists(bucket_name="whatever-bucket", object_key="key"))
+        mock_client.head_object.assert_called_once_with(Bucket="whatever-bucket", Key="key")
+
+    @patch("boto3.session.Session")
+    def test_given_object_does_not_exist_when_get_bytes_and_etag_then_none_returned(
+        self, patch_session: MagicMock
+    ):
+        s3, mock_client = self._s3_with_client(patch_session)
+        mock_client.get_object.side_effect = ClientError(
+            operation_name="GetObject", error_response={"Error": {"Code": "NoSuchKey"}}
+        )
+
+        self.assertIsNone(s3.get_bytes_and_etag(bucket_name="whatever-bucket", object_key="key"))
+
+    @patch("boto3.session.Session")
+    def test_given_object_changed_when_put_bytes_if_match_then_false_returned(
+        self, patch_session: MagicMock
+    ):
+        s3, mock_client = self._s3_with_client(patch_session)
+        mock_client.put_object.side_effect = ClientError(
+            operation_name="PutObject", error_response={"Error": {"Code": "PreconditionFailed"}}
+        )
+
+        written = s3.put_bytes_if_match(
+            bucket_name="whatever-bucket", key="key", content=b"content", etag='"etag"'
+        )
+
+        self.assertFalse(written)
+        mock_client.put_object.assert_called_once_with(
+            Bucket="whatever-bucket", Key="key", Body=b"content", IfMatch='"etag"'
+        )
+
+    @patch("boto3.session.Session")
+    def test_given_conditional_writes_not_supported_when_put_bytes_if_match_then_object_replaced(
+        self, patch_session: MagicMock
+    ):
+        s3, mock_client = self._s3_with_client(patch_session)
+        mock_client.put_object.side_effect = [
+            ClientError(
+                operation_name="PutObject", error_response={"Error": {"Code": "NotImplemented"}}
+            ),
+            {},
+        ]
+
+        written = s3.put_bytes_if_match(
+            bucket_name="whatever-bucket", key="key", content=b"content", etag=None
+        )
+
+        self.assertTrue(written)
+        self.assertEqual(mock_client.put_object.call_args_list[0].kwargs["IfNoneMatch"], "*")
+        self.assertNotIn("IfNoneMatch", mock_client.put_object.call_args_list[1].kwargs)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+# See LICENSE file for licensing details.
+
+from typing import List
+
+import ops
+from ops import testing
+from vault.vault_scheduler import ReconcileScheduler
+
+
+class ReconcilingCharm(ops.CharmBase):
+    def __init__(self, framework: ops.Framework):
+        super().__init__(framework)
+        self.reconciles: List[List[str]] = []
+        self.reconcile_scheduler = ReconcileScheduler(
+            self,
+            events=[self.on.config_changed, self.on.update_status],
+            reconcile=self._reconcile,
+        )
+        self.framework.observe(self.on.collect_unit_status, self._on_collect_status)
+
+    def _reconcile(self, triggers: List[ops.EventBase]) -> None:
+        self.reconciles.append([trigger.handle.kind for trigger in triggers])
+
+    def _on_collect_status(self, event: ops.CollectStatusEvent) -> None:
+        event.add_status(ops.ActiveStatus(f"reconciled {len(self.reconciles)} time(s)"))
+
+
+class TestReconcileScheduler:
+    def setup_method(self):
+        self.ctx = testing.Context(ReconcilingCharm, meta={"name": "reconciling"})
+
+    def test_given_deferred_trigger_when_trigger_event_then_reconciled_once_with_both_triggers(
+        self,
+    ):
+        deferred_config_changed = testing.DeferredEvent(
+            handle_path="ReconcilingCharm/on/config_changed[1]",
+            owner="ReconcilingCharm/ReconcileScheduler[reconcile-scheduler]",
+            observer="_on_trigger",
+        )
+        state_in = testing.State(deferred=[deferred_config_changed])
+
+        with self.ctx(self.ctx.on.update_status(), state_in) as manager:
+            state_out = manager.run()
+
+            assert manager.charm.reconciles == [["config_changed", "update_status"]]
+        assert state_out.unit_status == ops.ActiveStatus("reconciled 1 time(s)")
+        assert state_out.deferred == []
+
+    def test_given_event_not_a_trigger_when_event_then_not_reconciled(self):
+        with self.ctx(self.ctx.on.start(), testing.State()) as manager:
+            manager.run()
+
+            assert manager.charm.reconciles == []
+            assert not manager.charm.reconcile_scheduler.is_dirty
@@ -141,6 +141,7 @@ class TestCharmAuthorizeAction(VaultCharmFixtures):
                 "authenticate.return_value": True,
                 "create_or_update_approle.return_value": "my-role-id",
                 "generate_role_secret_id.return_value": "my-secret-id",
+                "list_role_secret_id_accessors.return_value": ["superseded-accessor"],
             },
         )
         self.mock_get_binding.return_value = MockBinding(
@@ -181,6 +182,7 @@ class TestCharmAuthorizeAction(VaultCharmFixtures):
             policies=["charm-access", "default"],
             token_ttl="1h",
             token_max_ttl="1h",
+            token_type="default",
         )
         assert self.ctx.action_results == {
             "result": "Charm authorized successfully. You may now remove the secret."
@@ -189,3 +191,38 @@ class TestCharmAuthorizeAction(VaultCharmFixtures):
             "role-id": "my-role-id",
             "secret-id": "my-secret-id",
         }
+        self.mock_vault.destroy_role_secret_id_accessor.assert_called_once_with(
+            "charm", "superseded-accessor"
+        )
+
+    def test_given_charm_batch_tokens_when_authorize_charm_then_approle_issues_batch_tokens(
+        self,
+    ):
+        self.mock_vault.configure_mock(
+            **{
+                "authenticate.return_value": True,
+                "create_or_update_approle.return_value": "my-role-id",
+                "generate_role_secret_id.return_value": "my-secret-id",
+            },
+        )
+        self.mock_get_binding.return_value = MockBinding(
+            bind_address="1.2.3.4",
+            ingress_address="1.2.3.4",
+        )
+        user_provided_secret = testing.Secret(
+            tracked_content={"token": "my token"},
+        )
+        state_in = testing.State(
+            containers=[testing.Container(name="vault", can_connect=True)],
+            leader=True,
+            secrets=[user_provided_secret],
+            relations=[testing.PeerRelation(endpoint="vault-peers")],
+            config={"charm_batch_tokens": True},
+        )
+
+        self.ctx.run(
+            self.ctx.on.action("authorize-charm", params={"secret-id": user_provided_secret.id}),
+            state=state_in,
+        )
+
+        assert self.mock_vault.create_or_update_approle.call_args.kwargs["token_type"] == "batch"
@@ -504,3 +504,59 @@ class TestCharmCollectUnitStatus(VaultCharmFixtures):
         state_out = self.ctx.run(self.ctx.on.collect_unit_status(), state_in)
 
         assert state_out.unit_status == ActiveStatus()
+
+    def _run_collect_status_with_recorded_pki_role_flags(self, recorded: dict[str, str]):
+        self.mock_tls.configure_mock(
+            **{
+                "tls_file_available_in_charm.return_value": True,
+                "ca_certificate_secret_exists.return_value": True,
+                "tls_file_pushed_to_workload.return_value": True,
+            },
+        )
+        self.mock_vault.configure_mock(
+            **{
+                "is_api_available.return_value": True,
+                "is_initialized.return_value": True,
+                "is_sealed.return_value": False,
+                "needs_migration.return_value": False,
+                "is_active_or_standby.return_value": True,
+            },
+        )
+        approle_secret = testing.Secret(
+            label="vault-approle-auth-details",
+            tracked_content={"role-id": "role id", "secret-id": "secret id"},
+        )
+        container = testing.Container(
+            name="vault",
+            can_connect=True,
+        )
+        peer_relation = testing.PeerRelation(
+            endpoint="vault-peers",
+            local_app_data=recorded,
+        )
+        state_in = testing.State(
+            containers=[container],
+            relations=[peer_relation],
+            secrets=[approle_secret],
+            config={"common_name": "example.com", "pki_roles_no_store": True},
+        )
+
+        return self.ctx.run(self.ctx.on.collect_unit_status(), state_in)
+
+    def test_given_pki_role_flags_recorded_when_collect_unit_status_then_flags_in_status_message(
+        self,
+    ):
+        state_out = self._run_collect_status_with_recorded_pki_role_flags(
+            {"pki_role_flags": "no_store,generate_lease"}
+        )
+
+        assert state_out.unit_status == ActiveStatus("PKI roles: no_store, generate_lease")
+        self.mock_vault.get_pki_role_flags.assert_not_called()
+
+    def test_given_pki_role_flags_not_recorded_when_collect_unit_status_then_flags_not_in_status_message(
+        self,
+    ):
+        state_out = self._run_collect_status_with_recorded_pki_role_flags({})
+
+        assert state_out.unit_status == ActiveStatus()
+        self.mock_vault.get_pki_role_flags.assert_not_called()
@@ -4,8 +4,11 @@
 
 
 import tempfile
+import time
 from datetime import timedelta
 from pathlib import Path
+from typing import Any, Callable
+from unittest.mock import patch
 
 import hcl
 import ops.testing as testing
@@ -13,8 +16,10 @@ from ops.pebble import Layer
 from vault.vault_autounseal import AutounsealDetails
 from vault.vault_client import (
     AppRole,
+    PKIRoleFlags,
 )
 
+from charm import VAULT_KV_SWEEP_INTERVAL, VaultCharm
 from tests.unit.certificates import (
     generate_example_provider_certificate,
 )
@@ -173,6 +178,63 @@ class TestCharmConfigure(VaultCharmFixtures):
 
             self.mock_pki_manager.configure.assert_called_once()
 
+    def test_given_pki_role_configured_when_configure_then_role_flags_recorded_in_peer_relation(
+        self,
+    ):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.mock_vault.configure_mock(
+                **{
+                    "is_api_available.return_value": True,
+                    "authenticate.return_value": True,
+                    "is_initialized.return_value": True,
+                    "is_sealed.return_value": False,
+                    "is_active_or_standby.return_value": True,
+                    "get_pki_role_flags.return_value": PKIRoleFlags(
+                        no_store=True, generate_lease=False
+                    ),
+                },
+            )
+            self.mock_autounseal_requires_get_details.return_value = None
+            vault_config_mount = testing.Mount(
+                location="/vault/config",
+                source=temp_dir,
+            )
+            container = testing.Container(
+                name="vault",
+                can_connect=True,
+                mounts={
+                    "vault-config": vault_config_mount,
+                },
+            )
+            peer_relation = testing.PeerRelation(
+                endpoint="vault-peers",
+            )
+            pki_relation = testing.Relation(
+                endpoint="tls-certificates-pki",
+                interface="tls-certificates",
+            )
+            approle_secret = testing.Secret(
+                label="vault-approle-auth-details",
+                tracked_content={"role-id": "role id", "secret-id": "secret id"},
+            )
+            state_in = testing.State(
+                containers=[container],
+                leader=True,
+                secrets=[approle_secret],
+                relations=[peer_relation, pki_relation],
+                config={
+                    "common_name": "myhostname.com",
+                    "pki_roles_no_store": True,
+                },
+            )
+
+            state_out = self.ctx.run(self.ctx.on.pebble_ready(container), state_in)
+
+            self.mock_vault.get_pki_role_flags.assert_called_with(role="charm", mount="charm-pki")
+            assert state_out.get_relation(peer_relation.id).local_app_data == {
+                "pki_role_flags": "no_store"
+            }
+
     # Test ACME
 
     def test_given_certificate_available_when_configure_then_acme_server_is_configured(
@@ -384,7 +446,7 @@ class TestCharmConfigure(VaultCharmFixtures):
 
     # Test KV
 
-    def test_given_kv_request_when_configure_then_generate_credentials_for_requirer_is_called(
+    def test_given_kv_request_when_configure_then_generate_credentials_for_requirers_is_called(
         self,
     ):
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -443,13 +505,161 @@ class TestCharmConfigure(VaultCharmFixtures):
             self.mock_get_binding.return_value = MockBinding("vault", "vault")
             self.ctx.run(self.ctx.on.pebble_ready(container), state_in)
 
-            kwargs = self.mock_kv_manager.generate_credentials_for_requirer.call_args_list[
+            kwargs = self.mock_kv_manager.generate_credentials_for_requirers.call_args_list[
                 0
             ].kwargs
             assert kwargs["relation"].id == kv_relation.id
-            assert kwargs["app_name"] == "vault-kv"
-            assert kwargs["unit_name"] == "vault-kv/0"
-            assert kwargs["mount_suffix"] == "remote-suffix"
-            assert kwargs["egress_subnets"] == ["2.2.2.0/24"]
-            assert kwargs["nonce"] == "123123"
             assert kwargs["vault_url"] == "https://vault:8200"
+            [kv_request] = kwargs["kv_requests"]
+            assert kv_request.app_name == "vault-kv"
+            assert kv_request.unit_name == "vault-kv/0"
+            assert kv_request.mount_suffix == "remote-suffix"
+            assert kv_request.egress_subnets == ["2.2.2.0/24"]
+            assert kv_request.nonce == "123123"
+
+    def _run_kv_configure(
+        self,
+        last_sweep: float,
+        event_factory: Callable[[testing.Relation, testing.PeerRelation], Any],
+    ) -> testing.State:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.mock_vault.configure_mock(
+                **{
+                    "token": "some token",
+                    "is_api_available.return_value": True,
+                    "authenticate.return_value": True,
+                    "is_initialized.return_value": True,
+                    "is_sealed.return_value": False,
+                },
+            )
+            self.mock_autounseal_requires_get_details.return_value = None
+            peer_relation = testing.PeerRelation(
+                endpoint="vault-peers",
+            )
+            kv_relation = testing.Relation(
+                endpoint="vault-kv",
+                interface="vault-kv",
+                remote_app_name="vault-kv",
+                remote_app_data={
+                    "mount_suffix": "remote-suffix",
+                },
+                remote_units_data={
+                    0: {"nonce": "123123", "egress_subnet": "2.2.2.0/24"},
+                    1: {"nonce": "456456", "egress_subnet": "2.2.3.0/24"},
+                    2: {"nonce": "789789", "egress_subnet": "2.2.4.0/24"},
+                },
+            )
+            vault_config_mount = testing.Mount(
+                location="/vault/config",
+                source=temp_dir,
+            )
+            container = testing.Container(
+                name="vault",
+                can_connect=True,
+                mounts={
+                    "vault-config": vault_config_mount,
+                },
+            )
+            approle_secret = testing.Secret(
+                label="vault-approle-auth-details",
+                tracked_content={"role-id": "role id", "secret-id": "secret id"},
+            )
+            stored_state = testing.StoredState(
+                owner_path="VaultCharm",
+                content={
+                    "vault_peer_circuits": {},
+                    "vault_kv_last_sweep": last_sweep,
+                    "vault_kv_pending_requests": {},
+                },
+            )
+            state_in = testing.State(
+                containers=[container],
+                leader=True,
+                relations=[peer_relation, kv_relation],
+                secrets=[approle_secret],
+                stored_states=[stored_state],
+            )
+            self.mock_kv_provides_get_credentials.return_value = {}
+
+            self.mock_get_binding.return_value = MockBinding("vault", "vault")
+            return self.ctx.run(event_factory(kv_relation, peer_relation), state_in)
+
+    def test_given_recent_sweep_when_kv_unit_changed_then_credentials_generated_for_that_unit_only(
+        self,
+    ):
+        self._run_kv_configure(
+            last_sweep=time.time(),
+            event_factory=lambda relation, _: self.ctx.on.relation_changed(
+                relation, remote_unit=1
+            ),
+        )
+
+        self.mock_kv_manager.generate_credentials_for_requirers.assert_called_once()
+        [kv_request] = self.mock_kv_manager.generate_credentials_for_requirers.call_args.kwargs[
+            "kv_requests"
+        ]
+        assert kv_request.unit_name == "vault-kv/1"
+        assert kv_request.nonce == "456456"
+        assert kv_request.egress_subnets == ["2.2.3.0/24"]
+
+    def test_given_relation_address_unavailable_when_kv_unit_changed_then_request_kept_queued(
+        self,
+    ):
+        with patch.object(VaultCharm, "_get_relation_api_address", return_value=None):
+            state_out = self._run_kv_configure(
+                last_sweep=time.time(),
+                event_factory=lambda relation, _: self.ctx.on.relation_changed(
+                    relation, remote_unit=1
+                ),
+            )
+
+        self.mock_kv_manager.generate_credentials_for_requirers.assert_not_called()
+        pending_requests = state_out.get_stored_state("_stored", owner_path="VaultCharm").content[
+            "vault_kv_pending_requests"
+        ]
+        assert [pending["unit_name"] for pending in pending_requests.values()] == ["vault-kv/1"]
+
+    def test_given_recent_sweep_when_update_status_then_credentials_not_generated(self):
+        self._run_kv_configure(
+            last_sweep=time.time(),
+            event_factory=lambda *_: self.ctx.on.update_status(),
+        )
+
+        self.mock_kv_manager.generate_credentials_for_requirers.assert_not_called()
+
+    def test_given_recent_sweep_when_peer_relation_changed_then_credentials_not_generated(self):
+        self._run_kv_configure(
+            last_sweep=time.time(),
+            event_factory=lambda _, peer_relation: self.ctx.on.relation_changed(peer_relation),
+        )
+
+        self.mock_kv_manager.generate_credentials_for_requirers.assert_not_called()
+
+    def test_given_recent_sweep_when_config_changed_then_credentials_generated_for_every_unit(
+        self,
+    ):
+        self._run_kv_configure(
+            last_sweep=time.time(),
+            event_factory=lambda *_: self.ctx.on.config_changed(),
+        )
+
+        kv_requests = self.mock_kv_manager.generate_credentials_for_requirers.call_args.kwargs[
+            "kv_requests"
+        ]
+        assert len(kv_requests) == 3
+
+    def test_given_sweep_due_when_update_status_then_credentials_generated_for_every_unit(self):
+        self._run_kv_configure(
+            last_sweep=time.time() - 2 * VAULT_KV_SWEEP_INTERVAL,
+            event_factory=lambda *_: self.ctx.on.update_status(),
+        )
+
+        self.mock_kv_manager.generate_credentials_for_requirers.assert_called_once()
+        kv_requests = self.mock_kv_manager.generate_credentials_for_requirers.call_args.kwargs[
+            "kv_requests"
+        ]
+        assert sorted(kv_request.unit_name for kv_request in kv_requests) == [
+            "vault-kv/0",
+            "vault-kv/1",
+            "vault-kv/2",
+        ]
@@ -6,6 +6,7 @@
 import ops.testing as testing
 import pytest
 from vault.vault_managers import ManagerError
+from vault.vault_s3 import UploadReport
 
 from tests.unit.fixtures import VaultCharmFixtures
 
@@ -80,3 +81,56 @@ class TestCharmCreateBackupAction(VaultCharmFixtures):
         with pytest.raises(testing.ActionFailed) as e:
             self.ctx.run(self.ctx.on.action("create-backup"), state_in)
         assert e.value.message == "Failed to create backup: some error message"
+
+    def test_given_backup_uploaded_when_create_backup_then_upload_reported(self):
+        self.mock_backup_manager.create_backup.return_value = UploadReport(
+            key="vault-backup-my-model-1", size=64 * 1024 * 1024, parts=1, duration=2.0
+        )
+        self.mock_vault.configure_mock(
+            **{
+                "is_api_available.return_value": True,
+                "is_active_or_standby.return_value": True,
+            },
+        )
+        approle_secret = testing.Secret(
+            label="vault-approle-auth-details",
+            tracked_content={"role-id": "role id", "secret-id": "secret id"},
+        )
+        container = testing.Container(
+            name="vault",
+            can_connect=True,
+        )
+        s3_relation = testing.Relation(
+            endpoint="s3-parameters",
+            interface="s3",
+        )
+        state_in = testing.State(
+            containers=[container],
+            leader=True,
+            relations=[s3_relation],
+            secrets=[approle_secret],
+            config={
+                "backup_upload_part_size": 16,
+                "backup_upload_concurrency": 8,
+                "backup_compression": True,
+                "backup_compression_level": 9,
+                "backup_deduplication": True,
+            },
+        )
+
+        self.ctx.run(self.ctx.on.action("create-backup"), state_in)
+
+        _, kwargs = self.mock_backup_manager.create_backup.call_args
+        assert kwargs == {
+            "part_size": 16 * 1024 * 1024,
+            "max_concurrency": 8,
+            "compress": True,
+            "compression_level": 9,
+            "deduplicate": True,
+        }
+        assert self.ctx.action_results == {
+            "backup-id": "vault-backup-my-model-1",
+            "size": str(64 * 1024 * 1024),
+            "duration": "2.0s",
+            "throughput": "32.0 MiB/s",
+        }
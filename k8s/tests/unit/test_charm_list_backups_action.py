@@ -3,9 +3,12 @@
 # See LICENSE file for licensing details.
 
 
+import json
+from datetime import datetime, timezone
+
 import ops.testing as testing
 import pytest
-from vault.vault_managers import ManagerError
+from vault.vault_managers import BackupDetails, ManagerError
 
 from tests.unit.fixtures import VaultCharmFixtures
 
@@ -46,3 +49,125 @@ class TestCharmListBackupAction(VaultCharmFixtures):
         with pytest.raises(testing.ActionFailed) as e:
             self.ctx.run(self.ctx.on.action("list-backups"), state_in)
         assert e.value.message == "Failed to list backups: some error message"
+
+    def test_given_backups_when_list_backups_then_sizes_returned(self):
+        self.mock_backup_manager.list_backups.return_value = [
+            BackupDetails(
+                key="vault-backup-my-model-1",
+                size=256,
+                original_size=1024,
+                compression="zstd",
+                deduplicated=True,
+            ),
+            BackupDetails(
+                key="vault-backup-my-model-2",
+                size=1024,
+                original_size=1024,
+                compression=None,
+                created_at=datetime(2025, 1, 2, tzinfo=timezone.utc),
+                model="my-model",
+                checksum="abc",
+                duration=1.5,
+                vault_version="1.17.2",
+                node="vault/0",
+            ),
+        ]
+        s3_relation = testing.Relation(
+            endpoint="s3-parameters",
+            interface="s3",
+        )
+        state_in = testing.State(
+            containers=[testing.Container(name="vault", can_connect=True)],
+            leader=True,
+            relations=[s3_relation],
+        )
+
+        self.ctx.run(self.ctx.on.action("list-backups"), state_in)
+
+        assert self.ctx.action_results
+        assert json.loads(self.ctx.action_results["backup-ids"]) == [
+            "vault-backup-my-model-1",
+            "vault-backup-my-model-2",
+        ]
+        assert json.loads(self.ctx.action_results["backups"]) == [
+            {
+                "id": "vault-backup-my-model-1",
+                "size": 256,
+                "original-size": 1024,
+                "compression": "zstd",
+                "deduplicated": True,
+                "created-at": None,
+                "model": None,
+                "checksum": None,
+                "duration": None,
+                "vault-version": None,
+                "node": None,
+            },
+            {
+                "id": "vault-backup-my-model-2",
+                "size": 1024,
+                "original-size": 1024,
+                "compression": None,
+                "deduplicated": False,
+                "created-at": "2025-01-02T00:00:00+00:00",
+                "model": "my-model",
+                "checksum": "abc",
+                "duration": 1.5,
+                "vault-version": "1.17.2",
+                "node": "vault/0",
+            },
+        ]
+        self.mock_backup_manager.list_backups.assert_called_once_with(
+            limit=None, since=None, model=None, rebuild=False
+        )
+
+    def test_given_filters_when_list_backups_then_filters_passed_to_manager(self):
+        self.mock_backup_manager.list_backups.return_value = []
+        s3_relation = testing.Relation(
+            endpoint="s3-parameters",
+            interface="s3",
+        )
+        state_in = testing.State(
+            containers=[testing.Container(name="vault", can_connect=True)],
+            leader=True,
+            relations=[s3_relation],
+        )
+
+        self.ctx.run(
+            self.ctx.on.action(
+                "list-backups",
+                params={
+                    "limit": 5,
+                    "since": "2025-01-01T00:00:00+00:00",
+                    "model": "my-model",
+                    "rebuild-catalog": True,
+                },
+            ),
+            state_in,
+        )
+
+        self.mock_backup_manager.list_backups.assert_called_once_with(
+            limit=5,
+            since=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            model="my-model",
+            rebuild=True,
+        )
+
+    def test_given_invalid_since_when_list_backups_then_action_fails(self):
+        s3_relation = testing.Relation(
+            endpoint="s3-parameters",
+            interface="s3",
+        )
+        state_in = testing.State(
+            containers=[testing.Container(name="vault", can_connect=True)],
+            leader=True,
+            relations=[s3_relation],
+        )
+
+        with pytest.raises(testing.ActionFailed) as e:
+            self.ctx.run(
+                self.ctx.on.action("list-backups", params={"since": "yesterday"}), state_in
+            )
+
+        assert e.value.message == "Invalid since parameter: yesterday"
+        self.mock_backup_manager.list_backups.assert_not_called()
@@ -3,9 +3,12 @@
 # See LICENSE file for licensing details.
 
 
+from unittest.mock import patch
+
 import ops.testing as testing
 import pytest
 import requests
+from vault.vault_client import RequestBudget
 from vault.vault_managers import ManagerError
 
 from tests.unit.fixtures import VaultCharmFixtures
@@ -58,3 +61,67 @@ class TestCharmRestoreBackupAction(VaultCharmFixtures):
         with pytest.raises(testing.ActionFailed) as e:
             self.ctx.run(self.ctx.on.action("list-backups"), state_in)
         assert e.value.message == "Failed to list backups: some error message"
+
+    def test_given_request_budget_elapsed_when_restore_backup_then_budget_not_applied(self):
+        budgets_during_restore = []
+        self.mock_backup_manager.restore_backup.side_effect = lambda *args, **kwargs: (
+            budgets_during_restore.append(RequestBudget.remaining())
+        )
+        approle_secret = testing.Secret(
+            label="vault-approle-auth-details",
+            tracked_content={"role-id": "role id", "secret-id": "secret id"},
+        )
+        container = testing.Container(
+            name="vault",
+            can_connect=True,
+        )
+        s3_relation = testing.Relation(
+            endpoint="s3-parameters",
+            interface="s3",
+        )
+        state_in = testing.State(
+            containers=[container],
+            leader=True,
+            relations=[s3_relation],
+            secrets=[approle_secret],
+        )
+
+        with patch("charm.VAULT_REQUEST_BUDGET", 0):
+            self.ctx.run(
+                self.ctx.on.action("restore-backup", params={"backup-id": "my-backup-id"}),
+                state_in,
+            )
+
+        assert self.ctx.action_results == {"restored": "my-backup-id"}
+        assert budgets_during_restore == [None]
+
+    def test_given_tmp_storage_when_restore_backup_then_backup_spooled_on_storage(self):
+        approle_secret = testing.Secret(
+            label="vault-approle-auth-details",
+            tracked_content={"role-id": "role id", "secret-id": "secret id"},
+        )
+        container = testing.Container(
+            name="vault",
+            can_connect=True,
+        )
+        s3_relation = testing.Relation(
+            endpoint="s3-parameters",
+            interface="s3",
+        )
+        tmp_storage = testing.Storage(name="tmp")
+        state_in = testing.State(
+            containers=[container],
+            leader=True,
+            relations=[s3_relation],
+            secrets=[approle_secret],
+            storages=[tmp_storage],
+        )
+
+        self.ctx.run(
+            self.ctx.on.action("restore-backup", params={"backup-id": "my-backup-id"}),
+            state_in,
+        )
+
+        assert self.mock_backup_manager.restore_backup.call_args.kwargs["spool_dir"] == str(
+            tmp_storage.get_filesystem(self.ctx)
+        )
@@ -65,6 +65,9 @@ class ExampleRequirerCharm(CharmBase):
         vault_url = self.interface.get_vault_url(relation)
         ca_certificate = self.interface.get_ca_certificate(relation)
         mount = self.interface.get_mount(relation)
+        # When Vault serves many applications from a shared KV mount, the
+        # secrets of this application must be stored under this path prefix.
+        path_prefix = self.interface.get_path_prefix(relation)
 
         unit_credentials = self.interface.get_unit_credentials(relation)
         # unit_credentials is a juju secret id
@@ -73,7 +76,7 @@ class ExampleRequirerCharm(CharmBase):
         role_id = secret_content["role-id"]
         role_secret_id = secret_content["role-secret-id"]
 
-        self._configure(vault_url, ca_certificate, mount, role_id, role_secret_id)
+        self._configure(vault_url, ca_certificate, mount, path_prefix, role_id, role_secret_id)
 
         self.unit.status = ActiveStatus()
 
@@ -85,6 +88,7 @@ class ExampleRequirerCharm(CharmBase):
         vault_url: str,
         ca_certificate: str,
         mount: str,
+        path_prefix: str | None,
         role_id: str,
         role_secret_id: str,
     ):
@@ -135,7 +139,7 @@ LIBAPI = 0
 
 # Increment this PATCH version before using `charmcraft publish-lib` or reset
 # to 0 if you are raising the major API version
-LIBPATCH = 16
+LIBPATCH = 19
 
 PYDEPS = ["pydantic", "pytest-interface-tester"]
 
@@ -160,9 +164,18 @@ class VaultKvProviderSchema(BaseModel):
     mount: str = Field(
         description=(
             "The KV mount available for the requirer application, "
-            "respecting the pattern 'charm-<requirer app>-<user provided suffix>'."
+            "respecting the pattern 'charm-<requirer app>-<user provided suffix>', "
+            "or the KV mount shared by many requirer applications if `path_prefix` is set."
         )
     )
+    path_prefix: str | None = Field(
+        default=None,
+        description=(
+            "The path prefix under which the requirer application stores its secrets "
+            "in the shared KV mount, respecting the pattern "
+            "'<requirer app>-<user provided suffix>'. Unset when the mount is not shared."
+        ),
+    )
     ca_certificate: str = Field(
         description="The CA certificate to use when validating the Vault server's certificate."
     )
@@ -355,13 +368,15 @@ class VaultKvProvides(ops.Object):
         """Handle client changed relation.
 
         This handler will emit a new_vault_kv_client_attached event for each requiring unit
-        with valid relation data.
+        with valid relation data. When the change comes from a unit databag, only that unit
+        is considered, since the data of the other units has not changed.
         """
         if event.app is None:
             logger.debug("No remote application yet")
             return
         app_data = event.relation.data[event.app]
-        for unit in event.relation.units:
+        units = [event.unit] if event.unit else event.relation.units
+        for unit in units:
             if not is_requirer_data_valid(app_data, event.relation.data[unit]):
                 logger.debug("Invalid data from unit %r", unit.name)
                 continue
@@ -400,6 +415,14 @@ class VaultKvProvides(ops.Object):
         """Get the unit credentials from the app relation data and load it as a dict."""
         return json.loads(relation.data[self.charm.app].get("credentials", "{}"))
 
+    def get_mount(self, relation: ops.Relation) -> str | None:
+        """Return the mount published to the requirer, if any."""
+        return relation.data[self.charm.app].get("mount")
+
+    def get_path_prefix(self, relation: ops.Relation) -> str | None:
+        """Return the path prefix published to the requirer, if any."""
+        return relation.data[self.charm.app].get("path_prefix")
+
     def get_kv_requests(self, relation_id: int | None = None) -> List[KVRequest]:
         """Get all KV requests for the relation."""
         kv_requests: List[KVRequest] = []
@@ -455,6 +478,47 @@ class VaultKvProvides(ops.Object):
         relation.data[self.charm.app]["ca_certificate"] = ca_certificate
         relation.data[self.charm.app]["mount"] = mount
 
+    def set_kv_data_for_units(
+        self,
+        relation: ops.Relation,
+        mount: str,
+        ca_certificate: str,
+        vault_url: str,
+        credentials: Mapping[str, str],
+        path_prefix: str | None = None,
+    ):
+        """Set the kv data on the relation for many units at once.
+
+        The credentials of the given nonces are added to the existing ones, and
+        only the fields whose value changes are written to the relation.
+
+        Args:
+            relation: The relation to set the data on
+            mount: The KV mount of the relation
+            ca_certificate: The CA certificate of Vault
+            vault_url: The URL of Vault
+            credentials: The Juju secret ID of the credentials of each unit, keyed by nonce
+            path_prefix: The path prefix of the requirer when the mount is shared
+        """
+        if not self.charm.unit.is_leader():
+            return
+        if not relation.active:
+            logger.warning("Relation is not active")
+            return
+        app_data = relation.data[self.charm.app]
+        all_credentials = self.get_credentials(relation)
+        all_credentials.update(credentials)
+        data = {
+            "credentials": json.dumps(all_credentials, sort_keys=True),
+            "vault_url": vault_url,
+            "ca_certificate": ca_certificate,
+            "mount": mount,
+            "path_prefix": path_prefix or "",
+        }
+        for key, value in data.items():
+            if app_data.get(key, "") != value:
+                app_data[key] = value
+
 
 class VaultKvBaseEvent(ops.RelationEvent):
     """Base class for VaultKV requirer events."""
@@ -605,6 +669,10 @@ class VaultKvRequires(ops.Object):
         """Return the mount from the relation."""
         return relation.data[relation.app].get("mount")
 
+    def get_path_prefix(self, relation: ops.Relation) -> str | None:
+        """Return the path prefix of the secrets in the mount, if the mount is shared."""
+        return relation.data[relation.app].get("path_prefix")
+
     def get_unit_credentials(self, relation: ops.Relation) -> str | None:
         """Return the unit credentials from the relation.
 
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+# Licensed under the Apache2.0. See LICENSE file in charm source for details.
+
+"""Deduplicated storage of the snapshots backed up by Vault charms.
+
+A snapshot is split into chunks whose boundaries depend on their content,
+so that an insertion or a deletion in a snapshot only changes the chunks
+around it. Each chunk is stored once in the bucket, under the SHA-256 digest
+of its content, and a backup is a manifest listing the chunks of its
+snapshot. Consecutive snapshots sharing most of their content thus share
+most of their chunks, which are uploaded and stored once.
+
+A boundary is placed after the first run of `ANCHOR_LENGTH` bytes that all
+belong to a fixed set of a quarter of the byte values, at least
+`MIN_CHUNK_SIZE` bytes into the chunk, or at `MAX_CHUNK_SIZE` bytes. Unlike a
+rolling hash computed for every byte, the runs are found with `bytes.translate`
+and `bytes.find`, which run in C. In random content such a run occurs every
+4 ** `ANCHOR_LENGTH` bytes, that is every MiB. The anchor bytes and the chunk
+sizes determine where boundaries fall, so changing them prevents new backups
+from sharing chunks with older ones, but not restoring the older ones.
+
+Chunks are shared by all the backups using them, and are never deleted, so
+the `vault-chunks/` prefix must be excluded from the lifecycle rules of the
+bucket: expiring a chunk breaks every backup that lists it. Chunks can be
+left unreferenced, for instance when the manifest of a backup fails to
+upload after its chunks, and are then only wasted space.
+"""
+
+import hashlib
+import json
+import logging
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import IO, Iterator, MutableMapping, cast
+
+from vault.vault_compression import DEFAULT_LEVEL, compress, decompress
+from vault.vault_s3 import (
+    DEFAULT_TRANSFER_CONCURRENCY,
+    MAX_TRANSFER_CONCURRENCY,
+    S3,
+    SPOOL_MAX_MEMORY,
+    MiB,
+)
+
+
+class LogAdapter(logging.LoggerAdapter):
+    """Adapter for the logger to prepend a prefix to all log lines."""
+
+    prefix = "vault_chunking"
+
+    def process(self, msg: str, kwargs: MutableMapping) -> tuple[str, MutableMapping]:
+        """Decides the format for the prepended text."""
+        return f"[{self.prefix}] {msg}", kwargs
+
+
+logger = LogAdapter(logging.getLogger(__name__), {})
+
+# Chunks must not share the prefix of the backups, or they would be listed as backups
+CHUNK_KEY_PREFIX = "vault-chunks/"
+MIN_CHUNK_SIZE = 256 * 1024
+MAX_CHUNK_SIZE = 4 * MiB
+ANCHOR_LENGTH = 10
+MANIFEST_VERSION = 1
+
+_ANCHOR_BYTES = sorted(range(256), key=lambda value: hashlib.sha256(bytes([value])).digest())[:64]
+_ANCHOR_TABLE = bytes(1 if value in _ANCHOR_BYTES else 0 for value in range(256))
+_ANCHOR = b"\x01" * ANCHOR_LENGTH
+
+
+class ChunkingError(Exception):
+    """Raised when a chunked backup cannot be read or is invalid."""
+
+    pass
+
+
+def find_boundary(data: bytes | bytearray, min_size: int, max_size: int) -> int:
+    """Return the size of the chunk at the start of the data.
+
+    Data shorter than `min_size` is a chunk on its own.
+    """
+    if len(data) <= min_size:
+        return len(data)
+    start = min_size - ANCHOR_LENGTH
+    window = data[start:max_size].translate(_ANCHOR_TABLE)
+    position = window.find(_ANCHOR)
+    if position == -1:
+        return min(len(data), max_size)
+    return start + position + ANCHOR_LENGTH
+
+
+def iter_chunks(
+    content: IO[bytes],
+    min_size: int = MIN_CHUNK_SIZE,
+    max_size: int = MAX_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Split a stream into content-defined chunks, holding at most two chunks in memory."""
+    buffer = bytearray()
+    end_of_content = False
+    while True:
+        while len(buffer) < max_size and not end_of_content:
+            try:
+                block = content.read(max_size)
+            except Exception as e:
+                # Reading the content can fail with any error of its source
+                raise ChunkingError(f"Error reading the content: {e}") from e
+            if block:
+                buffer += block
+            else:
+                end_of_content = True
+        if not buffer:
+            return
+        size = find_boundary(buffer, min_size, max_size)
+        yield bytes(buffer[:size])
+        del buffer[:size]
+
+
+def chunk_key(digest: str, compression: str | None) -> str:
+    """Return the S3 key of a chunk.
+
+    The chunks are spread under the first two characters of their digest, and
+    the chunks compressed with different codecs are stored apart.
+    """
+    suffix = f".{compression}" if compression else ""
+    return f"{CHUNK_KEY_PREFIX}{digest[:2]}/{digest}{suffix}"
+
+
+@dataclass(frozen=True)
+class ChunkReference:
+    """A chunk of a snapshot.
+
+    Attributes:
+        digest: The SHA-256 digest of the content of the chunk, in hexadecimal.
+        size: The size of the chunk before compression, in bytes.
+    """
+
+    digest: str
+    size: int
+
+
+@dataclass(frozen=True)
+class Manifest:
+    """The list of the chunks of a snapshot.
+
+    Attributes:
+        chunks: The chunks, in the order of the snapshot.
+        compression: The codec the chunks are compressed with, or None.
+    """
+
+    chunks: list[ChunkReference]
+    compression: str | None
+
+    @property
+    def size(self) -> int:
+        """The size of the snapshot, in bytes."""
+        return sum(chunk.size for chunk in self.chunks)
+
+    def dumps(self) -> bytes:
+        """Serialize the manifest to JSON."""
+        return json.dumps(
+            {
+                "version": MANIFEST_VERSION,
+                "compression": self.compression,
+                "size": self.size,
+                "chunks": [[chunk.digest, chunk.size] for chunk in self.chunks],
+            }
+        ).encode()
+
+    @classmethod
+    def loads(cls, content: bytes) -> "Manifest":
+        """Deserialize a manifest from JSON.
+
+        Raises:
+            ChunkingError: If the content is not a manifest of a supported version.
+        """
+        try:
+            data = json.loads(content)
+            if data["version"] != MANIFEST_VERSION:
+                raise ChunkingError(f"Manifest version {data['version']} is not supported")
+            manifest = cls(
+                chunks=[
+                    ChunkReference(digest=digest, size=size) for digest, size in data["chunks"]
+                ],
+                compression=data["compression"],
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            raise ChunkingError(f"Invalid manifest: {e}")
+        if manifest.size != data["size"]:
+            raise ChunkingError("Invalid manifest: the chunks do not add up to its size")
+        return manifest
+
+
+@dataclass(frozen=True)
+class ChunkedUpload:
+    """The result of the upload of a snapshot in chunks.
+
+    Attributes:
+        manifest: The manifest of the snapshot.
+        uploaded_chunks: The number of chunks that were not already in the bucket.
+        uploaded_size: The number of bytes uploaded, after compression.
+    """
+
+    manifest: Manifest
+    uploaded_chunks: int
+    uploaded_size: int
+
+
+class ChunkStore:
+    """Stores the chunks of snapshots in an S3 bucket, once per content."""
+
+    def __init__(
+        self,
+        s3: S3,
+        bucket_name: str,
+        max_concurrency: int = DEFAULT_TRANSFER_CONCURRENCY,
+    ):
+        self._s3 = s3
+        self._bucket_name = bucket_name
+        self._max_concurrency = min(max(max_concurrency, 1), MAX_TRANSFER_CONCURRENCY)
+
+    def upload(
+        self,
+        content: IO[bytes],
+        compression: str | None = None,
+        level: int = DEFAULT_LEVEL,
+    ) -> ChunkedUpload:
+        """Split a snapshot into chunks and upload those not already in the bucket.
+
+        Each distinct chunk of the snapshot is looked up with a HEAD request,
+        so the cost of a backup does not grow with the number of chunks in the
+        bucket, and at most `max_concurrency` chunks are looked up or uploaded
+        at the same time.
+
+        Args:
+            content: The snapshot.
+            compression: The codec to compress the chunks with, or None.
+            level: The compression level.
+
+        Returns:
+            The manifest of the snapshot, and the number and size of the chunks uploaded.
+
+        Raises:
+            S3Error: If the chunks could not be looked up or uploaded.
+            CompressionError: If the chunks could not be compressed.
+            ChunkingError: If the snapshot could not be read.
+        """
+        chunks = []
+        seen: set[str] = set()
+        stored_sizes: list[int | None] = []
+        with ThreadPoolExecutor(max_workers=self._max_concurrency) as executor:
+            in_flight: set[Future[int | None]] = set()
+            try:
+                for chunk in iter_chunks(content):
+                    digest = hashlib.sha256(chunk).hexdigest()
+                    chunks.append(ChunkReference(digest=digest, size=len(chunk)))
+                    key = chunk_key(digest, compression)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    if len(in_flight) >= self._max_concurrency:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        stored_sizes.extend(future.result() for future in done)
+                    in_flight.add(
+                        executor.submit(self._store_chunk, key, chunk, compression, level)
+                    )
+                stored_sizes.extend(future.result() for future in in_flight)
+            except BaseException:
+                for future in in_flight:
+                    future.cancel()
+                raise
+        uploaded_sizes = [size for size in stored_sizes if size is not None]
+        logger.info("Uploaded %d new chunks of %d", len(uploaded_sizes), len(chunks))
+        return ChunkedUpload(
+            manifest=Manifest(chunks=chunks, compression=compression),
+            uploaded_chunks=len(uploaded_sizes),
+            uploaded_size=sum(uploaded_sizes),
+        )
+
+    def _store_chunk(
+        self, key: str, chunk: bytes, compression: str | None, level: int
+    ) -> int | None:
+        """Upload a chunk unless it is already in the bucket.
+
+        Returns:
+            The stored size of the chunk, compressed with the codec if any,
+            or None if it was already in the bucket.
+        """
+        if self._s3.object_exists(bucket_name=self._bucket_name, object_key=key):
+            return None
+        data = compress(chunk, compression, level) if compression else chunk
+        self._s3.put_bytes(bucket_name=self._bucket_name, key=key, content=data)
+        return len(data)
+
+    def download_to_spool(self, manifest: Manifest, spool_dir: str | None = None) -> IO[bytes]:
+        """Download the chunks of a snapshot concurrently and reassemble it in a spool.
+
+        At most `max_concurrency` chunks are downloaded at the same time. Each
+        chunk is checked against its digest before it is written at its
+        offset. The spool is kept in memory up to `SPOOL_MAX_MEMORY` bytes,
+        and in a temporary file in `spool_dir` beyond.
+
+        Returns:
+            The spool, positioned at its start.
+
+        Raises:
+            S3Error: If a chunk could not be downloaded.
+            CompressionError: If a chunk could not be decompressed.
+            ChunkingError: If a chunk does not match its digest.
+        """
+        spool = cast(
+            IO[bytes], tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY, dir=spool_dir)
+        )
+        try:
+            self._download_chunks(manifest, spool)
+        except BaseException:
+            spool.close()
+            raise
+        spool.seek(0)
+        return spool
+
+    def _download_chunks(self, manifest: Manifest, spool: IO[bytes]) -> None:
+        """Download the chunks concurrently and write each at its offset in the spool."""
+        offset = 0
+        with ThreadPoolExecutor(max_workers=self._max_concurrency) as executor:
+            in_flight: dict[Future[bytes], int] = {}
+            try:
+                for chunk in manifest.chunks:
+                    if len(in_flight) >= self._max_concurrency:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._write_chunk(spool, in_flight.pop(future), future)
+                    future = executor.submit(self._download_chunk, chunk, manifest.compression)
+                    in_flight[future] = offset
+                    offset += chunk.size
+                for future, chunk_offset in in_flight.items():
+                    self._write_chunk(spool, chunk_offset, future)
+            except BaseException:
+                for future in in_flight:
+                    future.cancel()
+                raise
+
+    def _download_chunk(self, chunk: ChunkReference, compression: str | None) -> bytes:
+        """Download a chunk, decompress it, and check it against its digest."""
+        data = self._s3.get_bytes(
+            bucket_name=self._bucket_name, object_key=chunk_key(chunk.digest, compression)
+        )
+        if compression:
+            data = decompress(data, compression)
+        if len(data) != chunk.size or hashlib.sha256(data).hexdigest() != chunk.digest:
+            raise ChunkingError(f"Chunk {chunk.digest} does not match its digest")
+        return data
+
+    @staticmethod
+    def _write_chunk(spool: IO[bytes], offset: int, future: Future[bytes]) -> None:
+        """Write a downloaded chunk at its offset in the spool."""
+        spool.seek(offset)
+        spool.write(future.result())
@@ -8,15 +8,28 @@ This library shares operations that interact with Vault through its API. It is
 intended to be used by charms that need to manage a Vault cluster.
 """
 
+import asyncio
+import copy
+import hashlib
+import json
 import logging
+import os
+import re
+import ssl
+import threading
+import time
 from abc import abstractmethod
-from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from io import IOBase
-from typing import List, MutableMapping, Protocol
+from typing import Any, Callable, Iterable, List, Mapping, MutableMapping, Protocol, TypeVar
+from urllib.parse import urlsplit
 
 import hvac
 import requests
+from hvac.adapters import JSONAdapter
 from hvac.exceptions import (
     Forbidden,
     InternalServerError,
@@ -24,9 +37,25 @@ from hvac.exceptions import (
     InvalidRequest,
     VaultError,
 )
-from requests.exceptions import ConnectionError, RequestException
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, RequestException, SSLError, Timeout
 
 RAFT_STATE_ENDPOINT = "v1/sys/storage/raft/autopilot/state"
+# Connect and read timeouts of the requests sent to Vault, in seconds.
+DEFAULT_REQUEST_TIMEOUT = (5, 30)
+# Connect and read timeouts of the requests taking and restoring raft
+# snapshots, which last as long as the snapshot takes to transfer.
+SNAPSHOT_REQUEST_TIMEOUT = (5, None)
+SNAPSHOT_PATHS = ("sys/storage/raft/snapshot", "sys/storage/raft/snapshot-force")
+# Timeout of the requests used to look for the active node, and the time budget
+# for each of the lookup steps, in seconds.
+ACTIVE_NODE_PROBE_TIMEOUT = 5
+ACTIVE_NODE_LOOKUP_DEADLINE = 10
+# Maximum number of calls in flight at once through an `AsyncVaultClient`.
+DEFAULT_MAX_CONCURRENCY = 8
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
 
 
 class LogAdapter(logging.LoggerAdapter):
@@ -87,6 +116,81 @@ class Certificate:
     certificate: str
     ca: str
     chain: List[str]
+    serial_number: str = ""
+
+
+@dataclass(frozen=True)
+class PKIRoleFlags:
+    """Settings of a PKI role that trade features for storage.
+
+    Attributes:
+        no_store: Do not store the issued certificates in Vault. They can
+            then not be listed, looked up or revoked by serial number.
+        generate_lease: Attach a lease to each issued certificate, which
+            is stored in Vault until it expires.
+    """
+
+    no_store: bool = False
+    generate_lease: bool = False
+
+
+@dataclass(frozen=True)
+class VaultStatus:
+    """Class that represents a point-in-time snapshot of a Vault node's state.
+
+    The snapshot is built from a single `sys/health` request. The seal details
+    (`seal_type` and `migration`) are only available once they have been read
+    from `sys/seal-status`, and are `None` until then.
+    """
+
+    reachable: bool
+    health_code: int | None = None
+    initialized: bool | None = None
+    sealed: bool | None = None
+    standby: bool = False
+    version: str | None = None
+    seal_type: str | None = None
+    migration: bool | None = None
+
+    @property
+    def active(self) -> bool:
+        """Whether the node is initialized, unsealed and active."""
+        return self.health_code == 200
+
+    @property
+    def active_or_standby(self) -> bool:
+        """Whether the node is initialized, unsealed and either active or standby."""
+        return self.health_code in (200, 429)
+
+    @property
+    def has_seal_details(self) -> bool:
+        """Whether the seal details have been read from `sys/seal-status`."""
+        return self.seal_type is not None
+
+
+@dataclass(frozen=True)
+class TokenDetails:
+    """Class that represents a token issued by Vault along with its lease details."""
+
+    token: str
+    accessor: str
+    expiry: datetime
+    renewable: bool
+    batch: bool = False
+
+    def expires_within(self, margin: timedelta) -> bool:
+        """Whether the token expires within the given margin from now."""
+        return self.expiry - datetime.now(timezone.utc) <= margin
+
+
+def _token_expiry(ttl: int) -> datetime:
+    """Return the expiry of a token with the given TTL, in seconds.
+
+    A TTL of 0 means the token never expires.
+    """
+    if not ttl:
+        return datetime.max.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) + timedelta(seconds=ttl)
 
 
 class AuditDeviceType(Enum):
@@ -109,11 +213,568 @@ class VaultClientError(Exception):
     """Base class for exceptions raised by the Vault client."""
 
 
+class CircuitState(Enum):
+    """Class that represents the state of the circuit breaker of a Vault node."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+
+@dataclass
+class _Circuit:
+    failures: int = 0
+    opened_at: float | None = None
+
+
+class PeerCircuitBreaker:
+    """Process-wide circuit breaker for each Vault node, keyed by URL.
+
+    A node whose connections fail `FAILURE_THRESHOLD` times in a row is
+    considered dead, and requests to it fail immediately instead of waiting
+    for a timeout. After `RESET_TIMEOUT` seconds, the circuit is half-open: a
+    single request is let through, and closes the circuit if it succeeds or
+    opens it again if it fails.
+
+    The state is kept in memory, and can be dumped and loaded so that the
+    charm carries it over between dispatches. The local node, given when
+    loading the state, is never skipped: the charm manages it, and it is
+    expected back as soon as its restart or unseal completes.
+    """
+
+    FAILURE_THRESHOLD = 2
+    RESET_TIMEOUT = 300
+
+    _circuits: dict[str, _Circuit] = {}
+    _local_node: str | None = None
+    _trials: set[str] = set()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_state(cls, url: str) -> CircuitState:
+        """Return the state of the circuit for the node at the given URL."""
+        with cls._lock:
+            return cls._get_state(_get_node_url(url))
+
+    @classmethod
+    def allow_request(cls, url: str) -> bool:
+        """Return whether a request to the node at the given URL may be sent.
+
+        When the circuit is half-open, only the first request is allowed until
+        its outcome is recorded.
+        """
+        node = _get_node_url(url)
+        with cls._lock:
+            state = cls._get_state(node)
+            if state == CircuitState.CLOSED:
+                return True
+            if state == CircuitState.HALF_OPEN and node not in cls._trials:
+                cls._trials.add(node)
+                return True
+            return False
+
+    @classmethod
+    def record_success(cls, url: str) -> None:
+        """Close the circuit of the node at the given URL."""
+        node = _get_node_url(url)
+        with cls._lock:
+            cls._trials.discard(node)
+            if node in cls._circuits:
+                logger.info("Vault node %s is reachable again", node)
+                del cls._circuits[node]
+
+    @classmethod
+    def record_failure(cls, url: str) -> None:
+        """Record a failed connection to the node at the given URL."""
+        node = _get_node_url(url)
+        with cls._lock:
+            if node == cls._local_node:
+                return
+            circuit = cls._circuits.setdefault(node, _Circuit())
+            circuit.failures += 1
+            if node in cls._trials or circuit.failures >= cls.FAILURE_THRESHOLD:
+                if circuit.opened_at is None or node in cls._trials:
+                    logger.warning("Vault node %s is unreachable, skipping it for now", node)
+                circuit.opened_at = time.time()
+            cls._trials.discard(node)
+
+    @classmethod
+    def dump(cls) -> dict[str, dict[str, float | int]]:
+        """Return the state of the circuits that are not closed."""
+        with cls._lock:
+            return {
+                node: {"failures": circuit.failures, "opened-at": circuit.opened_at or 0}
+                for node, circuit in cls._circuits.items()
+            }
+
+    @classmethod
+    def load(
+        cls, data: Mapping[str, Mapping[str, float | int]], local_url: str | None = None
+    ) -> None:
+        """Replace the state of the circuits with a previously dumped one.
+
+        Args:
+            data: The state returned by `dump`
+            local_url: The URL of the local node, whose circuit is never opened
+        """
+        with cls._lock:
+            cls._trials.clear()
+            cls._local_node = _get_node_url(local_url) if local_url else None
+            cls._circuits = {
+                node: _Circuit(
+                    failures=int(circuit.get("failures", 0)),
+                    opened_at=float(circuit["opened-at"]) if circuit.get("opened-at") else None,
+                )
+                for node, circuit in data.items()
+                if node != cls._local_node
+            }
+
+    @classmethod
+    def _get_state(cls, node: str) -> CircuitState:
+        circuit = cls._circuits.get(node)
+        if not circuit or circuit.opened_at is None:
+            return CircuitState.CLOSED
+        if time.time() - circuit.opened_at >= cls.RESET_TIMEOUT:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
+
+
+class RequestBudget:
+    """Process-wide time budget for the requests sent to Vault in a dispatch.
+
+    Once set, the timeout of every request is capped by the time left in the
+    budget, and requests fail immediately once it is exhausted. This bounds
+    the time a single dispatch can spend waiting for Vault.
+    """
+
+    _deadline: float | None = None
+
+    @classmethod
+    def set(cls, seconds: float | None) -> None:
+        """Start a budget of the given number of seconds, or remove it if None."""
+        cls._deadline = time.monotonic() + seconds if seconds is not None else None
+
+    @classmethod
+    def remaining(cls) -> float | None:
+        """Return the number of seconds left in the budget, or None if there is no budget."""
+        if cls._deadline is None:
+            return None
+        return max(cls._deadline - time.monotonic(), 0)
+
+
+def _get_node_url(url: str) -> str:
+    """Return the scheme, host and port part of a URL."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _cap_timeout(timeout: Any, cap: float) -> Any:
+    """Cap a requests timeout, either a number or a (connect, read) tuple."""
+    if isinstance(timeout, tuple):
+        return tuple(cap if t is None else min(t, cap) for t in timeout)
+    return cap if timeout is None else min(timeout, cap)
+
+
+class _VaultHTTPAdapter(HTTPAdapter):
+    """HTTP adapter for the connections to Vault.
+
+    Requests go through the node's circuit breaker and are bounded by the
+    dispatch's request budget, except for the snapshot requests, which are
+    only bounded by `SNAPSHOT_REQUEST_TIMEOUT`: their duration depends on the
+    size of the snapshot, not on the health of the node. When an SSL context
+    is given, the server
+    certificates are verified with it, so the CA certificate is not loaded
+    again for every new connection.
+    """
+
+    def __init__(self, ssl_context: ssl.SSLContext | None = None):
+        self._ssl_context = ssl_context
+        super().__init__()
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        """Create the connection pool manager with the shared SSL context."""
+        if self._ssl_context:
+            kwargs["ssl_context"] = self._ssl_context
+        super().init_poolmanager(*args, **kwargs)
+
+    def cert_verify(self, conn: Any, url: str, verify: Any, cert: Any) -> None:
+        """Require certificate verification without reloading the CA certificate."""
+        super().cert_verify(conn, url, verify, cert)
+        if self._ssl_context:
+            conn.ca_certs = None
+            conn.ca_cert_dir = None
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        """Send the request unless the node's circuit is open or the budget is exhausted."""
+        url = request.url or ""
+        if _get_api_path(url) in SNAPSHOT_PATHS:
+            return super().send(request, **{**kwargs, "timeout": SNAPSHOT_REQUEST_TIMEOUT})
+        remaining = RequestBudget.remaining()
+        if remaining is not None:
+            if remaining <= 0:
+                raise Timeout(f"Vault request budget exhausted, not sending request to {url}")
+            kwargs["timeout"] = _cap_timeout(kwargs.get("timeout"), remaining)
+        if not PeerCircuitBreaker.allow_request(url):
+            raise ConnectionError(f"Circuit open for Vault node {_get_node_url(url)}")
+        try:
+            response = super().send(request, **kwargs)
+        except SSLError:
+            # The node is reachable, it's the certificate that is not trusted
+            raise
+        except (ConnectionError, Timeout):
+            PeerCircuitBreaker.record_failure(url)
+            raise
+        PeerCircuitBreaker.record_success(url)
+        return response
+
+
+class VaultReadCache:
+    """Process-wide cache of the responses to read-mostly Vault endpoints.
+
+    The cache is opt-in, and lives as long as the process, i.e. one charm
+    dispatch. Only the endpoints in `CACHEABLE_PATHS` are cached, keyed by
+    Vault node, token and path, so that a response is only served again to
+    requests sent to the same node with the same token. Tokens are only kept
+    as their SHA-256 digest. Any write invalidates the cached entries of the same mount (or of
+    the same `sys/` or `auth/` backend), so reads after a write always see
+    its effect. Writes are never cached, and invalidate the cache even when
+    caching is disabled.
+    """
+
+    CACHEABLE_PATHS = [
+        re.compile(pattern)
+        for pattern in (
+            r"^[^/]+/roles(/[^/]+)?$",
+            r"^[^/]+/issuers$",
+            r"^[^/]+/config/issuers$",
+            r"^sys/storage/raft/configuration$",
+            r"^sys/storage/raft/autopilot/state$",
+            r"^sys/policy(/[^/]+)?$",
+            r"^sys/mounts$",
+            r"^sys/auth$",
+            r"^auth/approle/role(/[^/]+)?$",
+            r"^auth/approle/role/[^/]+/role-id$",
+        )
+    ]
+
+    _enabled = False
+    _entries: dict[tuple[str, str, str, str, str], dict] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def enable(cls) -> None:
+        """Start caching the responses of the cacheable endpoints."""
+        cls._enabled = True
+
+    @classmethod
+    def disable(cls) -> None:
+        """Stop caching, and drop the cached responses."""
+        cls._enabled = False
+        cls.clear()
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop all the cached responses."""
+        with cls._lock:
+            cls._entries.clear()
+
+    @classmethod
+    def get(
+        cls, url: str, token: str | None, method: str, path: str, arguments: str
+    ) -> dict | None:
+        """Return a copy of the cached response to the read, if any."""
+        if not cls._enabled:
+            return None
+        with cls._lock:
+            response = cls._entries.get(cls._get_key(url, token, method, path, arguments))
+        return copy.deepcopy(response) if response is not None else None
+
+    @classmethod
+    def set(
+        cls, url: str, token: str | None, method: str, path: str, arguments: str, response: dict
+    ) -> None:
+        """Cache the response to the read, if its endpoint is cacheable."""
+        if not cls._enabled or not cls.is_cacheable(path):
+            return
+        with cls._lock:
+            cls._entries[cls._get_key(url, token, method, path, arguments)] = copy.deepcopy(
+                response
+            )
+
+    @staticmethod
+    def _get_key(
+        url: str, token: str | None, method: str, path: str, arguments: str
+    ) -> tuple[str, str, str, str, str]:
+        token_digest = hashlib.sha256(token.encode()).hexdigest() if token else ""
+        return (_get_node_url(url), token_digest, method, path, arguments)
+
+    @classmethod
+    def is_cacheable(cls, path: str) -> bool:
+        """Return whether responses from the given path may be cached."""
+        return any(pattern.match(path) for pattern in cls.CACHEABLE_PATHS)
+
+    @classmethod
+    def invalidate(cls, path: str) -> None:
+        """Drop the cached responses that a write to the given path may change.
+
+        The responses are dropped for every node and token, as the write is
+        replicated to the whole cluster.
+        """
+        prefixes = {_get_backend_prefix(path)}
+        if path.startswith("sys/mounts/"):
+            # Enabling, tuning or disabling a mount changes what is under it
+            prefixes.add(_get_backend_prefix(path.removeprefix("sys/mounts/")))
+        with cls._lock:
+            for key in list(cls._entries):
+                if _get_backend_prefix(key[3]) in prefixes:
+                    del cls._entries[key]
+
+
+def _get_backend_types(response: dict) -> dict[str, str]:
+    """Return the types of the backends listed in a `sys/mounts` or `sys/auth` response.
+
+    Version 2 of the KV secrets engine is reported as `kv-v2`, matching how it
+    is enabled, rather than as `kv` with a version option.
+    """
+    backends = response.get("data", response)
+    types = {}
+    for path, backend in backends.items():
+        if not isinstance(backend, dict) or "type" not in backend:
+            continue
+        backend_type = backend["type"]
+        if backend_type == "kv" and (backend.get("options") or {}).get("version") == "2":
+            backend_type = SecretsBackend.KV_V2.value
+        types[path.rstrip("/")] = backend_type
+    return types
+
+
+def _get_api_path(url: str) -> str:
+    """Return the Vault API path of a URL, without the `v1` prefix and slashes."""
+    path = urlsplit(url).path.strip("/")
+    return path.removeprefix("v1/")
+
+
+def _get_backend_prefix(path: str) -> str:
+    """Return the part of an API path identifying the mount or backend it belongs to.
+
+    For example `charm-pki` for `charm-pki/roles/charm`, `sys/policy` for
+    `sys/policy/charm-access` and `auth/approle` for `auth/approle/role`.
+    """
+    parts = path.split("/")
+    if parts[0] in ("sys", "auth"):
+        return "/".join(parts[:2])
+    return parts[0]
+
+
+class _CachingJSONAdapter(JSONAdapter):
+    """hvac adapter serving cacheable reads from `VaultReadCache`.
+
+    Every other request is sent as usual, and writes invalidate the cache.
+    When Vault denies a request and `token_rejected_handler` replaces the
+    token, the request is sent again with the new token.
+    """
+
+    token_rejected_handler: Callable[[], bool] | None = None
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> Any:
+        """Send the request, or return the cached response of the read."""
+        try:
+            return self._request(method, url, *args, **kwargs)
+        except Forbidden:
+            if not self.token_rejected_handler or not self.token_rejected_handler():
+                raise
+        return self._request(method, url, *args, **kwargs)
+
+    def _request(self, method: str, url: str, *args: Any, **kwargs: Any) -> Any:
+        path = _get_api_path(url)
+        method = method.upper()
+        if method not in ("GET", "LIST", "HEAD"):
+            VaultReadCache.invalidate(path)
+            return super().request(method, url, *args, **kwargs)
+        arguments = json.dumps(kwargs, sort_keys=True, default=str)
+        if (
+            cached := VaultReadCache.get(self.base_uri, self.token, method, path, arguments)
+        ) is not None:
+            return cached
+        response = super().request(method, url, *args, **kwargs)
+        if isinstance(response, dict):
+            VaultReadCache.set(self.base_uri, self.token, method, path, arguments, response)
+        return response
+
+
+class VaultSessionPool:
+    """Process-wide pool of the HTTP sessions used to reach Vault.
+
+    Every `VaultClient` created for the same URL and CA certificate shares
+    one `requests.Session`. Connections are kept alive, so the TLS handshake
+    only happens once per Vault node in a dispatch, and the CA certificate is
+    loaded once into an `ssl.SSLContext` shared by the sessions.
+
+    The sessions are recreated if the CA certificate file changes.
+    """
+
+    _sessions: dict[tuple[str, str | None], tuple[int | None, requests.Session]] = {}
+    _ssl_contexts: dict[tuple[str, int], ssl.SSLContext] = {}
+
+    @classmethod
+    def get_session(cls, url: str, ca_cert_path: str | None) -> requests.Session:
+        """Return the session for the given URL and CA certificate, creating it if needed."""
+        key = (url, ca_cert_path)
+        ca_cert_version = cls._get_ca_cert_version(ca_cert_path)
+        if key in cls._sessions:
+            version, session = cls._sessions[key]
+            if version == ca_cert_version:
+                return session
+            session.close()
+        session = requests.Session()
+        session.verify = ca_cert_path if ca_cert_path else False
+        ssl_context = None
+        if ca_cert_path and ca_cert_version is not None:
+            ssl_context = cls._get_ssl_context(ca_cert_path, ca_cert_version)
+        session.mount("https://", _VaultHTTPAdapter(ssl_context))
+        session.mount("http://", _VaultHTTPAdapter())
+        cls._sessions[key] = (ca_cert_version, session)
+        return session
+
+    @classmethod
+    def clear(cls) -> None:
+        """Close all the pooled sessions."""
+        for _, session in cls._sessions.values():
+            session.close()
+        cls._sessions.clear()
+        cls._ssl_contexts.clear()
+
+    @staticmethod
+    def _get_ca_cert_version(ca_cert_path: str | None) -> int | None:
+        """Return the modification time of the CA certificate file, if it exists."""
+        if not ca_cert_path:
+            return None
+        try:
+            return os.stat(ca_cert_path).st_mtime_ns
+        except OSError:
+            return None
+
+    @classmethod
+    def _get_ssl_context(cls, ca_cert_path: str, ca_cert_version: int) -> ssl.SSLContext | None:
+        key = (ca_cert_path, ca_cert_version)
+        if key not in cls._ssl_contexts:
+            try:
+                cls._ssl_contexts[key] = ssl.create_default_context(cafile=ca_cert_path)
+            except (OSError, ssl.SSLError) as e:
+                logger.warning("Failed to load CA certificate %s: %s", ca_cert_path, e)
+                return None
+        return cls._ssl_contexts[key]
+
+
+def _first_result(
+    function: Callable[[_T], _R | None], items: Iterable[_T], deadline: float
+) -> _R | None:
+    """Run the function on all the items concurrently and return the first truthy result.
+
+    The worker threads of calls that are still running after the deadline are
+    left to finish in the background, their results are discarded.
+    """
+    items = list(items)
+    executor = ThreadPoolExecutor(max_workers=len(items))
+    pending = {executor.submit(function, item) for item in items}
+    end = time.monotonic() + deadline
+    try:
+        while pending and (remaining := end - time.monotonic()) > 0:
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None and (result := future.result()):
+                    return result
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return None
+
+
 class VaultClient:
     """Class to interact with Vault through its API."""
 
-    def __init__(self, url: str, ca_cert_path: str | None):
-        self._client = hvac.Client(url=url, verify=ca_cert_path if ca_cert_path else False)
+    def __init__(
+        self,
+        url: str,
+        ca_cert_path: str | None,
+        timeout: float | tuple[float, float] = DEFAULT_REQUEST_TIMEOUT,
+    ):
+        self._url = url
+        self._client = hvac.Client(
+            url=url,
+            verify=ca_cert_path if ca_cert_path else False,
+            timeout=timeout,
+            session=VaultSessionPool.get_session(url, ca_cert_path),
+            adapter=_CachingJSONAdapter,
+        )
+        self._client.adapter.token_rejected_handler = self._handle_token_rejected
+        self._status: VaultStatus | None = None
+        self._token_details: TokenDetails | None = None
+        self._on_token_rejected: Callable[[], bool] | None = None
+        self._token_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """Return the URL of the Vault node this client talks to."""
+        return self._url
+
+    @classmethod
+    def find_active(
+        cls,
+        addresses: List[str],
+        ca_cert_path: str | None,
+        deadline: float = ACTIVE_NODE_LOOKUP_DEADLINE,
+    ) -> "VaultClient | None":
+        """Return a client for the active node of the cluster.
+
+        All the nodes are asked concurrently for the leader through
+        `sys/leader`, and the first node to answer gives the active node's
+        address. If no node knows the leader, all the nodes are probed
+        concurrently through `sys/health`, and the first active one is used.
+        Each step is bounded by `deadline` seconds, so unreachable nodes do not
+        hold up the caller.
+
+        Args:
+            addresses: The API addresses of the nodes of the cluster.
+            ca_cert_path: The path to the CA certificate to validate the nodes.
+            deadline: The time budget for each of the lookup steps, in seconds.
+
+        Returns:
+            A client for the active node, or None if it could not be found.
+        """
+        if not addresses:
+            return None
+        probes = [
+            cls(address, ca_cert_path, timeout=ACTIVE_NODE_PROBE_TIMEOUT) for address in addresses
+        ]
+        leader_address = _first_result(VaultClient.get_leader_address, probes, deadline)
+        if leader_address:
+            leader = cls(leader_address, ca_cert_path)
+            if leader.is_active():
+                return leader
+            logger.warning("Leader %s reported by sys/leader is not active", leader_address)
+        active_probe = _first_result(
+            lambda probe: probe if probe.is_active() else None, probes, deadline
+        )
+        if not active_probe:
+            logger.warning("No active Vault node found among %s", ", ".join(addresses))
+            return None
+        return cls(active_probe.url, ca_cert_path)
+
+    def get_leader_address(self) -> str | None:
+        """Return the API address of the cluster's active node, as known by this node.
+
+        Returns:
+            The leader's API address, or None if the node does not know it or
+            could not be reached.
+        """
+        try:
+            response = self._client.sys.read_leader_status()
+        except (VaultError, RequestException) as e:
+            logger.debug("Failed to read leader status from %s: %s", self._url, e)
+            return None
+        if not isinstance(response, dict):
+            return None
+        return response.get("leader_address") or None
 
     def authenticate(self, auth_details: AuthMethod) -> bool:
         """Find and use the token related with the given auth method.
@@ -123,35 +784,155 @@ class VaultClient:
         """
         try:
             auth_details.login(self._client)
-            self._client.auth.token.lookup_self()
+            response = self._client.auth.token.lookup_self()
         except (VaultError, ConnectionError, Forbidden) as e:
             logger.warning("Failed login to Vault: %s", e)
             return False
+        data = response.get("data") if isinstance(response, dict) else None
+        if not isinstance(data, dict):
+            data = {}
+        self._token_details = TokenDetails(
+            token=self._client.token,
+            accessor=data.get("accessor", ""),
+            expiry=_token_expiry(data.get("ttl", 0)),
+            renewable=bool(data.get("renewable", False)),
+            batch=data.get("type") == "batch",
+        )
         return True
 
+    def use_token(
+        self, token_details: TokenDetails, on_rejected: Callable[[], bool] | None = None
+    ) -> None:
+        """Use a previously issued token without validating it against Vault.
+
+        The caller is responsible for only passing tokens that are expected to
+        still be valid, for instance because they were issued recently and
+        their TTL has not elapsed. A token can still be revoked before its
+        TTL elapses: if Vault denies a request and no longer accepts the
+        token, `on_rejected` is called once to authenticate again, and the
+        request is sent again if it returns True.
+        """
+        self._client.token = token_details.token
+        self._token_details = token_details
+        with self._token_lock:
+            self._on_token_rejected = on_rejected
+
+    def _handle_token_rejected(self) -> bool:
+        """Authenticate again if Vault denied a request because it no longer accepts the token.
+
+        Returns:
+            Whether a new token is in use, and the request should be sent again.
+        """
+        with self._token_lock:
+            on_rejected, self._on_token_rejected = self._on_token_rejected, None
+        if not on_rejected:
+            return False
+        try:
+            self._client.auth.token.lookup_self()
+        except Forbidden:
+            logger.info("Vault no longer accepts the token in use, authenticating again")
+            return on_rejected()
+        except (VaultError, RequestException) as e:
+            logger.warning("Failed to look up the token in use: %s", e)
+        # The token is valid, so the request was denied by its policies
+        with self._token_lock:
+            self._on_token_rejected = on_rejected
+        return False
+
+    def renew_token(self) -> TokenDetails | None:
+        """Renew the token currently in use.
+
+        Batch tokens cannot be renewed, so Vault is not called for them.
+
+        Returns:
+            The details of the renewed token, or None if it could not be renewed.
+        """
+        if self._token_details and self._token_details.batch:
+            logger.debug("Not renewing batch token")
+            return None
+        try:
+            response = self._client.auth.token.renew_self()
+        except (VaultError, RequestException) as e:
+            logger.warning("Failed to renew Vault token: %s", e)
+            return None
+        auth = response.get("auth", {}) if isinstance(response, dict) else {}
+        if not auth:
+            return None
+        self._token_details = TokenDetails(
+            token=auth.get("client_token", self._client.token),
+            accessor=auth.get("accessor", ""),
+            expiry=_token_expiry(auth.get("lease_duration", 0)),
+            renewable=bool(auth.get("renewable", False)),
+        )
+        self._client.token = self._token_details.token
+        return self._token_details
+
     @property
     def token(self) -> str:
         """Return the token used to authenticate with Vault."""
         return self._client.token
 
-    def is_api_available(self) -> bool:
-        """Return whether Vault is available."""
+    @property
+    def token_details(self) -> TokenDetails | None:
+        """Return the details of the token used to authenticate with Vault, if known."""
+        return self._token_details
+
+    def status(self, refresh: bool = False) -> VaultStatus:
+        """Return a snapshot of the Vault node's state.
+
+        The snapshot is read once from `sys/health` and reused by all the
+        status predicates of this client (`is_api_available`, `is_sealed`,
+        `is_active`, ...) until it is refreshed.
+
+        Args:
+            refresh: Whether to discard the current snapshot and read a new one.
+        """
+        if self._status is None or refresh:
+            self._status = self._read_health_status()
+        return self._status
+
+    def _read_health_status(self) -> VaultStatus:
+        """Build a `VaultStatus` from a single `sys/health` request."""
         try:
-            self._client.sys.read_health_status(standby_ok=True)
-            return True
+            response = self._client.sys.read_health_status(method="GET")
         except (VaultError, RequestException) as e:
             logger.error("Error while checking Vault health status: %s", e)
-            return False
+            return VaultStatus(reachable=False)
+        if isinstance(response, requests.Response):
+            health_code = response.status_code
+            try:
+                health = response.json()
+            except ValueError:
+                health = {}
+        else:
+            # The hvac JSON adapter only decodes the body of 200 responses
+            health_code = 200
+            health = response
+        if not isinstance(health, dict):
+            health = {}
+        return VaultStatus(
+            reachable=True,
+            health_code=health_code,
+            initialized=health.get("initialized"),
+            sealed=health.get("sealed"),
+            standby=health.get("standby", False),
+            version=health.get("version"),
+        )
 
-    def is_initialized(self) -> bool:
-        """Return whether Vault is initialized."""
-        return self._client.sys.is_initialized()
+    def _status_with_seal_details(self) -> VaultStatus:
+        """Return the current snapshot, completed with the details from `sys/seal-status`.
 
-    def is_sealed(self) -> bool:
-        """Return whether Vault is sealed."""
+        The seal status is only requested the first time it is needed.
+
+        Raises:
+            VaultClientError: If the seal status could not be read.
+        """
+        status = self.status()
+        if status.has_seal_details:
+            return status
         try:
-            return self._client.sys.is_sealed()
-        except VaultError as e:
+            seal_status = self._client.sys.read_seal_status()
+        except (VaultError, RequestException) as e:
             # This seems to happen if the seal status is checked immediately
             # after initializing the vault when autounseal is enabled.
             # There is a short period of time where the vault is initialized,
@@ -163,6 +944,33 @@ class VaultClient:
             # core: barrier reports initialized but no seal configuration found
             logger.error("Error while checking Vault seal status: %s", e)
             raise VaultClientError(e) from e
+        self._status = replace(
+            status,
+            initialized=seal_status.get("initialized", status.initialized),
+            sealed=seal_status.get("sealed", status.sealed),
+            seal_type=seal_status.get("type", ""),
+            migration=seal_status.get("migration", False),
+        )
+        return self._status
+
+    def is_api_available(self) -> bool:
+        """Return whether Vault is available."""
+        return self.status().reachable
+
+    def is_initialized(self) -> bool:
+        """Return whether Vault is initialized."""
+        return bool(self.status().initialized)
+
+    def is_sealed(self) -> bool:
+        """Return whether Vault is sealed."""
+        status = self.status()
+        if status.sealed is None:
+            # The health status does not report the seal state when Vault
+            # returns an error, fall back to the seal status endpoint.
+            status = self._status_with_seal_details()
+        if status.sealed is None:
+            raise VaultClientError("Vault did not report its seal status")
+        return status.sealed
 
     def is_available_initialized_and_unsealed(self) -> bool:
         """Return whether Vault is available, initialized and unsealed.
@@ -216,11 +1024,11 @@ class VaultClient:
 
     def needs_migration(self) -> bool:
         """Return true if the vault needs to be migrated, false otherwise."""
-        return self._client.seal_status["migration"]  # type: ignore -- bad type hint in stubs
+        return bool(self._status_with_seal_details().migration)
 
     def get_seal_type(self) -> str:
         """Return the seal type of the Vault."""
-        return self._client.seal_status["type"]  # type: ignore -- bad type hint in stubs
+        return self._status_with_seal_details().seal_type or ""
 
     def is_seal_type_transit(self) -> bool:
         """Return whether Vault is sealed by the transit backend."""
@@ -232,12 +1040,7 @@ class VaultClient:
         Returns:
             True if initialized, unsealed and active, False otherwise.
         """
-        try:
-            health_status = self._client.sys.read_health_status()
-            return health_status.status_code == 200
-        except (VaultError, RequestException) as e:
-            logger.error("Error while checking Vault health status: %s", e)
-            return False
+        return self.status().active
 
     def is_active_or_standby(self) -> bool:
         """Return the health status of Vault.
@@ -245,12 +1048,7 @@ class VaultClient:
         Returns:
             True if initialized, unsealed and active or standby, False otherwise.
         """
-        try:
-            health_status = self._client.sys.read_health_status()
-            return health_status.status_code == 200 or health_status.status_code == 429
-        except (VaultError, RequestException) as e:
-            logger.error("Error while checking Vault health status: %s", e)
-            return False
+        return self.status().active_or_standby
 
     def enable_audit_device(self, device_type: AuditDeviceType, path: str) -> None:
         """Enable a new audit device at the supplied path if it isn't already enabled.
@@ -292,6 +1090,45 @@ class VaultClient:
         except VaultError as e:
             raise VaultClientError(e) from e
 
+    def enable_auth_method(self, method_type: str, path: str | None = None) -> None:
+        """Enable the auth method at the given path, defaulting to the method type.
+
+        Args:
+            method_type: The type of the auth method, e.g. "approle"
+            path: The path to enable the auth method at
+        """
+        try:
+            self._client.sys.enable_auth_method(method_type, path=path)
+            logger.info("Enabled %s auth method at %s", method_type, path or method_type)
+        except VaultError as e:
+            raise VaultClientError(e) from e
+
+    def get_mounts(self) -> dict[str, str]:
+        """Return the type of every enabled secrets engine, keyed by mount path."""
+        try:
+            response = self._client.sys.list_mounted_secrets_engines()
+        except VaultError as e:
+            raise VaultClientError(e) from e
+        return _get_backend_types(response)
+
+    def get_auth_methods(self) -> dict[str, str]:
+        """Return the type of every enabled auth method, keyed by path."""
+        try:
+            response = self._client.sys.list_auth_methods()
+        except VaultError as e:
+            raise VaultClientError(e) from e
+        return _get_backend_types(response)
+
+    def read_policy(self, name: str) -> str | None:
+        """Return the content of the policy, or None if it does not exist."""
+        try:
+            response = self._client.sys.read_policy(name)
+        except InvalidPath:
+            return None
+        except VaultError as e:
+            raise VaultClientError(e) from e
+        return response.get("data", response).get("rules")
+
     def create_or_update_policy_from_file(
         self, name: str, path: str, **formatting_args: str
     ) -> None:
@@ -335,6 +1172,7 @@ class VaultClient:
         policies: List[str] | None = None,
         cidrs: List[str] | None = None,
         token_period: str | None = None,
+        token_type: str = "default",
     ) -> str:
         """Create/update a role within vault associating the supplied policies.
 
@@ -345,6 +1183,9 @@ class VaultClient:
             token_max_ttl: Maximum lifetime for generated tokens, provided as a duration string such as "5m"
             token_period: The period within which the token must be renewed. See Vault documentation for more information.
             cidrs: The list of IP networks that are allowed to authenticate
+            token_type: The type of the tokens issued by the role, "service",
+                "batch" or "default". Batch tokens are not persisted by Vault,
+                but cannot be renewed, revoked or periodic.
         """
         self._client.auth.approle.create_or_update_approle(
             name,
@@ -354,13 +1195,43 @@ class VaultClient:
             token_policies=policies,
             token_bound_cidrs=cidrs,
             token_period=token_period,
+            token_type=token_type,
         )
+        return self.read_role_id(name)
+
+    def read_approle(self, name: str) -> dict | None:
+        """Return the configuration of the approle, or None if it does not exist."""
+        try:
+            response = self._client.auth.approle.read_role(name)
+        except InvalidPath:
+            return None
+        except VaultError as e:
+            raise VaultClientError(e) from e
+        return response["data"]
+
+    def read_role_id(self, name: str) -> str:
+        """Return the role ID of the approle."""
         response = self._client.auth.approle.read_role_id(name)
         return response["data"]["role_id"]
 
-    def generate_role_secret_id(self, name: str, cidrs: List[str] | None = None) -> str:
-        """Generate a new secret tied to an AppRole."""
-        response = self._client.auth.approle.generate_secret_id(name, cidr_list=cidrs)
+    def generate_role_secret_id(
+        self,
+        name: str,
+        cidrs: List[str] | None = None,
+        token_bound_cidrs: List[str] | None = None,
+    ) -> str:
+        """Generate a new secret tied to an AppRole.
+
+        Args:
+            name: Name of the approle
+            cidrs: The list of IP networks that are allowed to log in with the secret
+            token_bound_cidrs: The list of IP networks that are allowed to use
+                the tokens issued with the secret, when it should be narrower
+                than what the approle allows
+        """
+        response = self._client.auth.approle.generate_secret_id(
+            name, cidr_list=cidrs, token_bound_cidrs=token_bound_cidrs
+        )
         return response["data"]["secret_id"]
 
     def read_role_secret(self, name: str, id: str) -> dict:
@@ -368,6 +1239,43 @@ class VaultClient:
         response = self._client.auth.approle.read_secret_id(name, id)
         return response["data"]
 
+    def list_role_secret_id_accessors(self, name: str) -> List[str]:
+        """List the accessors of the secrets tied to an AppRole."""
+        return self.list(f"auth/approle/role/{name}/secret-id")
+
+    def destroy_role_secret_id_accessor(self, name: str, accessor: str) -> None:
+        """Destroy the secret tied to an AppRole that has the given accessor."""
+        try:
+            self._client.auth.approle.destroy_secret_id_accessor(name, accessor)
+        except VaultError as e:
+            raise VaultClientError(e) from e
+        logger.info("Destroyed secret ID with accessor %s of AppRole %s", accessor, name)
+
+    def tidy_approle_secret_ids(self) -> List[str]:
+        """Start cleaning up the expired secret IDs and accessors of the approle backend.
+
+        Returns:
+            The warnings of Vault, which runs the operation in the background.
+        """
+        return self._tidy("auth/approle/tidy/secret-id")
+
+    def tidy_tokens(self) -> List[str]:
+        """Start cleaning up the leftovers of expired tokens in the token store.
+
+        Returns:
+            The warnings of Vault, which runs the operation in the background.
+        """
+        return self._tidy("auth/token/tidy")
+
+    def _tidy(self, path: str) -> List[str]:
+        try:
+            response = self._client.adapter.post(f"/v1/{path}")
+        except VaultError as e:
+            raise VaultClientError(e) from e
+        if isinstance(response, requests.Response):
+            response = response.json() if response.content else {}
+        return list(response.get("warnings") or []) if isinstance(response, dict) else []
+
     def enable_secrets_engine(self, backend_type: SecretsBackend, path: str) -> None:
         """Enable given secret engine on the given path."""
         try:
@@ -442,13 +1350,19 @@ class VaultClient:
                 certificate=response["data"]["certificate"],
                 ca=response["data"]["issuing_ca"],
                 chain=response["data"]["ca_chain"],
+                serial_number=response["data"].get("serial_number", ""),
             )
         except InvalidRequest as e:
             logger.warning("Error while signing PKI certificate: %s", e)
             return None
 
     def create_or_update_pki_charm_role(
-        self, role: str, allowed_domains: str, max_ttl: str, mount: str
+        self,
+        role: str,
+        allowed_domains: str,
+        max_ttl: str,
+        mount: str,
+        role_flags: PKIRoleFlags = PKIRoleFlags(),
     ) -> None:
         """Create a role for the PKI backend or update it if it already exists.
 
@@ -460,6 +1374,7 @@ class VaultClient:
                 Should be a string in the format of a number with a unit such as
                 "120m", "10h" or "90d".
             mount: The mount point of the PKI backend for which the role will be created.
+            role_flags: Whether the issued certificates are stored and leased.
         """
         self._client.secrets.pki.create_or_update_role(
             name=role,
@@ -468,16 +1383,21 @@ class VaultClient:
                 "allowed_domains": allowed_domains,
                 "allow_subdomains": True,
                 "max_ttl": max_ttl,
+                "no_store": role_flags.no_store,
+                "generate_lease": role_flags.generate_lease,
             },
         )
         logger.info(
-            "Created or updated PKI role `%s` with `allowed_domains=%s` and `max_ttl=%s`",
+            "Created or updated PKI role `%s` with `allowed_domains=%s`, `max_ttl=%s` and %s",
             role,
             allowed_domains,
             max_ttl,
+            role_flags,
         )
 
-    def create_or_update_acme_role(self, role: str, mount: str, max_ttl: str) -> None:
+    def create_or_update_acme_role(
+        self, role: str, mount: str, max_ttl: str, role_flags: PKIRoleFlags = PKIRoleFlags()
+    ) -> None:
         """Create a role for the ACME backend or update it if it already exists."""
         self._client.secrets.pki.create_or_update_role(
             name=role,
@@ -486,6 +1406,8 @@ class VaultClient:
                 "allow_any_name": True,
                 "allow_subdomains": True,
                 "max_ttl": max_ttl,
+                "no_store": role_flags.no_store,
+                "generate_lease": role_flags.generate_lease,
             },
         )
 
@@ -499,7 +1421,10 @@ class VaultClient:
 
     def create_snapshot(self) -> requests.Response:
         """Create a snapshot of the Vault data."""
-        return self._client.sys.take_raft_snapshot()
+        try:
+            return self._client.sys.take_raft_snapshot()
+        except (VaultError, RequestException) as e:
+            raise VaultClientError(f"Error while creating snapshot: {e}") from e
 
     def restore_snapshot(self, snapshot: IOBase) -> None:
         """Restore a snapshot of the Vault data.
@@ -507,7 +1432,13 @@ class VaultClient:
         Uses force_restore_raft_snapshot to restore the snapshot
         even if the unseal key used at backup time is different from the current one.
         """
-        response = self._client.sys.force_restore_raft_snapshot(snapshot)
+        try:
+            response = self._client.sys.force_restore_raft_snapshot(snapshot)
+        except (VaultError, RequestException) as e:
+            raise VaultClientError(f"Error while restoring snapshot: {e}") from e
+        finally:
+            self._status = None
+            VaultReadCache.clear()
         if not 200 <= response.status_code < 300:
             logger.warning("Error while restoring snapshot: %s", response.text)
             raise VaultClientError(f"Error while restoring snapshot: {response.text}")
@@ -573,6 +1504,20 @@ class VaultClient:
             logger.warning("Role does not exist on the specified path.")
             return None
 
+    def get_pki_role_flags(self, role: str, mount: str) -> PKIRoleFlags | None:
+        """Get the storage settings of the specified PKI role, None if it does not exist."""
+        try:
+            data = self._client.secrets.pki.read_role(name=role, mount_point=mount).get("data", {})
+        except InvalidPath:
+            logger.warning("Role does not exist on the specified path.")
+            return None
+        except VaultError as e:
+            raise VaultClientError(e) from e
+        return PKIRoleFlags(
+            no_store=bool(data.get("no_store", False)),
+            generate_lease=bool(data.get("generate_lease", False)),
+        )
+
     def list_pki_issuers(self, mount: str) -> List[str]:
         """Get the list of issuers for the PKI backend.
 
@@ -613,13 +1558,145 @@ class VaultClient:
             },
         )
 
-    def allow_acme_headers(self, mount: str) -> None:
-        """Allow the ACME headers to be returned by the Vault server."""
-        self._client.sys.tune_mount_configuration(
-            path=mount, **{"allowed_response_headers": ["Location", "Replay-Nonce", "Link"]}
-        )
-
 
 def generate_pem_bundle(certificate: str, private_key: str) -> str:
     """Generate a PEM bundle from a certificate and private key."""
     return f"{certificate}\n{private_key}"
+
+
+class AsyncVaultClient:
+    """Asyncio interface to Vault, to run independent calls concurrently.
+
+    Every call is run by the wrapped `VaultClient` in a worker thread, over the
+    pooled HTTP sessions, so that concurrent calls share the same connections
+    and the same authentication. At most `max_concurrency` calls are in flight
+    at any time.
+
+    Example:
+        async_client = AsyncVaultClient(vault_client)
+        results = await asyncio.gather(*(async_client.read(path) for path in paths))
+    """
+
+    def __init__(self, vault_client: VaultClient, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self._vault_client = vault_client
+        self._max_concurrency = max_concurrency
+        self._semaphores: dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+
+    @property
+    def vault_client(self) -> VaultClient:
+        """Return the synchronous client the calls are run with."""
+        return self._vault_client
+
+    async def _run(self, function: Callable[..., _R], *args: Any, **kwargs: Any) -> _R:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.setdefault(loop, asyncio.Semaphore(self._max_concurrency))
+        async with semaphore:
+            return await asyncio.to_thread(function, *args, **kwargs)
+
+    @classmethod
+    async def get_statuses(
+        cls, addresses: List[str], ca_cert_path: str | None
+    ) -> dict[str, VaultStatus]:
+        """Return the status of every node, read concurrently.
+
+        Args:
+            addresses: The API addresses of the nodes.
+            ca_cert_path: The path to the CA certificate to validate the nodes.
+
+        Returns:
+            The status of each node, keyed by address.
+        """
+        clients = [cls(VaultClient(address, ca_cert_path)) for address in addresses]
+        statuses = await asyncio.gather(*(client.status() for client in clients))
+        return dict(zip(addresses, statuses))
+
+    async def authenticate(self, auth_details: AuthMethod) -> bool:
+        """Asynchronous version of `VaultClient.authenticate`."""
+        return await self._run(self._vault_client.authenticate, auth_details)
+
+    async def status(self, refresh: bool = False) -> VaultStatus:
+        """Asynchronous version of `VaultClient.status`."""
+        return await self._run(self._vault_client.status, refresh)
+
+    async def is_active(self) -> bool:
+        """Asynchronous version of `VaultClient.is_active`."""
+        return (await self.status()).active
+
+    async def is_active_or_standby(self) -> bool:
+        """Asynchronous version of `VaultClient.is_active_or_standby`."""
+        return (await self.status()).active_or_standby
+
+    async def read(self, path: str) -> dict:
+        """Asynchronous version of `VaultClient.read`."""
+        return await self._run(self._vault_client.read, path)
+
+    async def write(self, path: str, data: dict) -> bool:
+        """Asynchronous version of `VaultClient.write`."""
+        return await self._run(self._vault_client.write, path, data)
+
+    async def list(self, path: str) -> List[str]:
+        """Asynchronous version of `VaultClient.list`."""
+        return await self._run(self._vault_client.list, path)
+
+    async def create_or_update_policy(self, name: str, content: str) -> None:
+        """Asynchronous version of `VaultClient.create_or_update_policy`."""
+        await self._run(self._vault_client.create_or_update_policy, name, content)
+
+    async def create_or_update_approle(
+        self,
+        name: str,
+        token_ttl: str | None = None,
+        token_max_ttl: str | None = None,
+        policies: List[str] | None = None,
+        cidrs: List[str] | None = None,
+        token_period: str | None = None,
+        token_type: str = "default",
+    ) -> str:
+        """Asynchronous version of `VaultClient.create_or_update_approle`."""
+        return await self._run(
+            self._vault_client.create_or_update_approle,
+            name,
+            token_ttl=token_ttl,
+            token_max_ttl=token_max_ttl,
+            policies=policies,
+            cidrs=cidrs,
+            token_period=token_period,
+            token_type=token_type,
+        )
+
+    async def generate_role_secret_id(
+        self,
+        name: str,
+        cidrs: List[str] | None = None,
+        token_bound_cidrs: List[str] | None = None,
+    ) -> str:
+        """Asynchronous version of `VaultClient.generate_role_secret_id`."""
+        return await self._run(
+            self._vault_client.generate_role_secret_id, name, cidrs, token_bound_cidrs
+        )
+
+    async def read_role_secret(self, name: str, id: str) -> dict:
+        """Asynchronous version of `VaultClient.read_role_secret`."""
+        return await self._run(self._vault_client.read_role_secret, name, id)
+
+    async def sign_pki_certificate_signing_request(
+        self,
+        mount: str,
+        role: str,
+        csr: str,
+        common_name: str,
+        ttl: str,
+    ) -> Certificate | None:
+        """Asynchronous version of `VaultClient.sign_pki_certificate_signing_request`."""
+        return await self._run(
+            self._vault_client.sign_pki_certificate_signing_request,
+            mount=mount,
+            role=role,
+            csr=csr,
+            common_name=common_name,
+            ttl=ttl,
+        )
+
+    async def get_raft_cluster_state(self) -> dict:
+        """Asynchronous version of `VaultClient.get_raft_cluster_state`."""
+        return await self._run(self._vault_client.get_raft_cluster_state)
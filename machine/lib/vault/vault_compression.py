@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+# Licensed under the Apache2.0. See LICENSE file in charm source for details.
+
+"""Streaming compression of the snapshots backed up by Vault charms.
+
+Snapshots are compressed with zstd when the `zstandard` package is
+installed, and with gzip otherwise. Backups are decompressed with the codec
+they were compressed with, so a backup compressed with zstd can only be
+restored where `zstandard` is installed.
+
+## Usage
+To compress with zstd, add the following dependency to the charm's
+requirements.txt file:
+
+    ```
+    zstandard
+    ```
+
+"""
+
+import gzip
+import io
+import logging
+import zlib
+from typing import IO, Any, MutableMapping
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class LogAdapter(logging.LoggerAdapter):
+    """Adapter for the logger to prepend a prefix to all log lines."""
+
+    prefix = "vault_compression"
+
+    def process(self, msg: str, kwargs: MutableMapping) -> tuple[str, MutableMapping]:
+        """Decides the format for the prepended text."""
+        return f"[{self.prefix}] {msg}", kwargs
+
+
+logger = LogAdapter(logging.getLogger(__name__), {})
+
+ZSTD = "zstd"
+GZIP = "gzip"
+# The range of compression levels of each codec
+LEVELS = {ZSTD: (1, 22), GZIP: (1, 9)}
+DEFAULT_LEVEL = 3
+# The size of the chunks read from the content being compressed
+CHUNK_SIZE = 1024 * 1024
+
+_DECOMPRESSION_ERRORS: tuple[type[Exception], ...] = (OSError, EOFError, zlib.error)
+if zstandard:
+    _DECOMPRESSION_ERRORS += (zstandard.ZstdError,)
+
+
+class CompressionError(Exception):
+    """Raised when content cannot be compressed or decompressed."""
+
+    pass
+
+
+def preferred_codec() -> str:
+    """Return the codec snapshots are compressed with: zstd if available, gzip otherwise."""
+    return ZSTD if zstandard else GZIP
+
+
+def is_supported(codec: str) -> bool:
+    """Return whether content compressed with the codec can be decompressed here."""
+    return codec == GZIP or (codec == ZSTD and zstandard is not None)
+
+
+def _compressor(codec: str, level: int) -> Any:
+    """Create an object with the `compress` and `flush` methods of `zlib.compressobj`."""
+    if not is_supported(codec):
+        raise CompressionError(f"Compression codec {codec} is not supported")
+    minimum, maximum = LEVELS[codec]
+    if not minimum <= level <= maximum:
+        clamped = min(max(level, minimum), maximum)
+        logger.warning(
+            "Compression level %d is out of range for %s, using %d", level, codec, clamped
+        )
+        level = clamped
+    if codec == ZSTD:
+        return zstandard.ZstdCompressor(level=level).compressobj()  # type: ignore[reportOptionalMemberAccess]
+    # A window of 16 + 15 bits produces the gzip format rather than raw zlib
+    return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+class CompressingReader(io.RawIOBase):
+    """A read-only stream of the compressed content of another stream.
+
+    The content is read and compressed as the stream is read, so that only
+    the compressed bytes requested, and one chunk of the content, are held
+    in memory.
+    """
+
+    def __init__(self, content: IO[bytes], codec: str, level: int = DEFAULT_LEVEL):
+        self.codec = codec
+        self.original_size = 0
+        self._content = content
+        self._compressor = _compressor(codec, level)
+        self._buffer = bytearray()
+        self._flushed = False
+
+    def readable(self) -> bool:
+        """Return True, the stream is readable."""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """Read compressed bytes into the buffer and return their number, 0 at the end."""
+        while len(self._buffer) < len(buffer) and not self._flushed:
+            chunk = self._content.read(CHUNK_SIZE)
+            if chunk:
+                self.original_size += len(chunk)
+                self._buffer += self._compressor.compress(chunk)
+            else:
+                self._buffer += self._compressor.flush()
+                self._flushed = True
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        del self._buffer[:size]
+        return size
+
+
+class DecompressingReader(io.RawIOBase):
+    """A read-only stream of the decompressed content of another stream.
+
+    Closing the stream closes the compressed stream.
+    """
+
+    def __init__(self, content: IO[bytes], codec: str):
+        if not is_supported(codec):
+            raise CompressionError(f"Compression codec {codec} is not supported")
+        self.codec = codec
+        self._content = content
+        if codec == ZSTD:
+            self._reader = zstandard.ZstdDecompressor().stream_reader(content)  # type: ignore[reportOptionalMemberAccess]
+        else:
+            self._reader = gzip.GzipFile(fileobj=content, mode="rb")
+
+    def readable(self) -> bool:
+        """Return True, the stream is readable."""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """Read decompressed bytes into the buffer and return their number, 0 at the end."""
+        try:
+            return self._reader.readinto(buffer)
+        except _DECOMPRESSION_ERRORS as e:
+            raise CompressionError(f"Failed to decompress {self.codec} content: {e}")
+
+    def close(self) -> None:
+        """Close the stream and the compressed stream."""
+        if not self.closed:
+            self._reader.close()
+            self._content.close()
+        super().close()
+
+
+def compress(content: bytes, codec: str, level: int = DEFAULT_LEVEL) -> bytes:
+    """Compress content held in memory."""
+    compressor = _compressor(codec, level)
+    return compressor.compress(content) + compressor.flush()
+
+
+def decompress(content: bytes, codec: str) -> bytes:
+    """Decompress content held in memory."""
+    if not is_supported(codec):
+        raise CompressionError(f"Compression codec {codec} is not supported")
+    try:
+        if codec == ZSTD:
+            return zstandard.ZstdDecompressor().decompressobj().decompress(content)  # type: ignore[reportOptionalMemberAccess]
+        return gzip.decompress(content)
+    except _DECOMPRESSION_ERRORS as e:
+        raise CompressionError(f"Failed to decompress {codec} content: {e}")
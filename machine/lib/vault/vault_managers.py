@@ -28,14 +28,18 @@ Feature managers should not:
 - Depend on each other unless the features explicitly require the dependency.
 """
 
-from dataclasses import dataclass
+import asyncio
+import hashlib
+import io
 import json
 import logging
 import os
+import time
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timedelta, timezone
 from enum import Enum, auto
-from typing import FrozenSet, MutableMapping, TextIO
+from typing import IO, Any, Callable, FrozenSet, Iterable, MutableMapping, TextIO
 
 from charms.certificate_transfer_interface.v1.certificate_transfer import (
     CertificateTransferProvides,
@@ -44,6 +48,7 @@ from charms.data_platform_libs.v0.s3 import S3Requirer
 from charms.tls_certificates_interface.v4.tls_certificates import (
     Certificate,
     CertificateRequestAttributes,
+    CertificateSigningRequest,
     PrivateKey,
     ProviderCertificate,
     RequirerCertificateRequest,
@@ -55,7 +60,7 @@ from charms.tls_certificates_interface.v4.tls_certificates import (
     generate_csr,
     generate_private_key,
 )
-from charms.vault_k8s.v0.vault_kv import VaultKvProvides
+from charms.vault_k8s.v0.vault_kv import KVRequest, VaultKvProvides
 from ops import CharmBase, EventBase, Object, Relation
 from ops.pebble import PathError
 
@@ -71,14 +76,42 @@ from vault.vault_autounseal import (
     VaultAutounsealProvides,
     VaultAutounsealRequires,
 )
+from vault.vault_chunking import ChunkingError, ChunkStore, Manifest
 from vault.vault_client import (
+    DEFAULT_MAX_CONCURRENCY,
     AppRole,
+    AsyncVaultClient,
+    PKIRoleFlags,
     SecretsBackend,
     Token,
+    TokenDetails,
     VaultClient,
     VaultClientError,
 )
-from vault.vault_s3 import S3, S3Error
+from vault.vault_client import Certificate as VaultCertificate
+from vault.vault_compression import (
+    DEFAULT_LEVEL,
+    CompressingReader,
+    CompressionError,
+    DecompressingReader,
+    preferred_codec,
+)
+from vault.vault_reconciler import (
+    Approle,
+    ConfigEntry,
+    DesiredState,
+    Mount,
+    Policy,
+    VaultReconciler,
+)
+from vault.vault_s3 import (
+    DEFAULT_PART_SIZE,
+    DEFAULT_TRANSFER_CONCURRENCY,
+    S3,
+    ObjectDetails,
+    S3Error,
+    UploadReport,
+)
 
 SEND_CA_CERT_RELATION_NAME = "send-ca-cert"
 TLS_CERTIFICATE_ACCESS_RELATION_NAME = "tls-certificates-access"
@@ -105,6 +138,28 @@ path "sys/internal/ui/mounts/{mount}" {{
 }}
 """
 
+KV_SHARED_POLICY = """# Allows the KV requirer to manage the secrets under its prefix of the shared mount
+path "{mount}/data/{prefix}/*" {{
+  capabilities = ["create", "read", "update", "delete", "list"]
+}}
+path "{mount}/metadata/{prefix}/*" {{
+  capabilities = ["read", "delete", "list"]
+}}
+path "{mount}/delete/{prefix}/*" {{
+  capabilities = ["update"]
+}}
+path "{mount}/undelete/{prefix}/*" {{
+  capabilities = ["update"]
+}}
+path "{mount}/destroy/{prefix}/*" {{
+  capabilities = ["update"]
+}}
+path "sys/internal/ui/mounts/{mount}" {{
+  capabilities = ["read"]
+}}
+"""
+
+
 class LogAdapter(logging.LoggerAdapter):
     """Adapter for the logger to prepend a prefix to all log lines."""
 
@@ -593,8 +648,12 @@ class Naming:
     autounseal_key_prefix: str = ""
     autounseal_policy_prefix: str = "charm-autounseal-"
     backup_s3_key_prefix: str = "vault-backup-"
+    backup_s3_timestamp_format: str = "%Y-%m-%d-%H-%M-%S"
+    # The catalog must not share the prefix of the backups, or it would be listed as a backup
+    backup_catalog_s3_key: str = "vault-catalog.json"
     kv_mount_prefix: str = "charm-"
     kv_secret_prefix: str = "vault-kv-"
+    kv_shared_mount_path: str = "charm-kv"
 
     @classmethod
     def autounseal_key_name(cls, relation_id: int) -> str:
@@ -614,9 +673,27 @@ class Naming:
     @classmethod
     def backup_s3_key_name(cls, model_name: str) -> str:
         """Return the key name for the S3 backend."""
-        timestamp = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        timestamp = datetime.now().strftime(cls.backup_s3_timestamp_format)
         return f"{cls.backup_s3_key_prefix}{model_name}-{timestamp}"
 
+    @classmethod
+    def parse_backup_s3_key_name(cls, key: str) -> tuple[str, datetime] | None:
+        """Return the model name and the creation time of a backup from its key name.
+
+        The timestamp of the key is in the local time of the unit which
+        created the backup, and is returned in UTC.
+        """
+        name = key.removeprefix(cls.backup_s3_key_prefix)
+        # The timestamp has a fixed width, and model names may contain dashes
+        model_name, timestamp = name[:-20], name[-19:]
+        if name == key or not model_name or name[-20:-19] != "-":
+            return None
+        try:
+            created_at = datetime.strptime(timestamp, cls.backup_s3_timestamp_format)
+        except ValueError:
+            return None
+        return model_name, created_at.astimezone(timezone.utc)
+
     @classmethod
     def kv_secret_label(cls, unit_name: str) -> str:
         """Return the secret label for the KV backend."""
@@ -640,6 +717,21 @@ class Naming:
         unit_name_dash = unit_name.replace("/", "-")
         return f"{mount_path}-{unit_name_dash}"
 
+    @classmethod
+    def kv_shared_path_prefix(cls, app_name: str, mount_suffix: str) -> str:
+        """Return the path prefix of the application in the shared KV mount."""
+        return f"{app_name}-{mount_suffix}"
+
+    @classmethod
+    def kv_shared_policy_name(cls, app_name: str, mount_suffix: str) -> str:
+        """Return the policy name of the application for the shared KV mount."""
+        return f"{cls.kv_shared_mount_path}-{app_name}-{mount_suffix}"
+
+    @classmethod
+    def kv_shared_role_name(cls, app_name: str, mount_suffix: str) -> str:
+        """Return the role name of the application for the shared KV mount."""
+        return f"{cls.kv_shared_mount_path}-{app_name}-{mount_suffix}"
+
 
 class _PKIUtils:
     """Encapsulates some common util functions among PKIManager and ACMEManager."""
@@ -717,6 +809,11 @@ class _PKIUtils:
         certificate_validity_seconds = certificate_validity.total_seconds()
         return certificate_validity_seconds > current_ttl
 
+    def role_flags_differ(self, role: str, role_flags: PKIRoleFlags) -> bool:
+        """Return whether an existing role has storage settings other than the given ones."""
+        current_flags = self._vault_client.get_pki_role_flags(role=role, mount=self._mount_point)
+        return current_flags is not None and current_flags != role_flags
+
 
 @dataclass
 class AutounsealConfigurationDetails:
@@ -729,6 +826,20 @@ class AutounsealConfigurationDetails:
     ca_cert_path: str
 
 
+def destroy_role_secret_ids(
+    vault_client: VaultClient, role_name: str, accessors: list[str]
+) -> None:
+    """Destroy the secret IDs of an AppRole that new credentials replaced.
+
+    A failure is only logged, since the new credentials are already in use.
+    """
+    for accessor in accessors:
+        try:
+            vault_client.destroy_role_secret_id_accessor(role_name, accessor)
+        except VaultClientError as e:
+            logger.warning("Failed to destroy superseded secret ID of %s: %s", role_name, e)
+
+
 class AutounsealProviderManager:
     """Encapsulates the auto-unseal functionality.
 
@@ -861,6 +972,7 @@ class AutounsealProviderManager:
             policies=[policy_name],
             token_period="60s",
         )
+        superseded_accessors = self._client.list_role_secret_id_accessors(approle_name)
         secret_id = self._client.generate_role_secret_id(approle_name)
         self._provides.set_autounseal_data(
             relation,
@@ -871,6 +983,7 @@ class AutounsealProviderManager:
             secret_id,
             self._ca_cert,
         )
+        destroy_role_secret_ids(self._client, approle_name, superseded_accessors)
         return key_name, role_id, secret_id
 
     def _get_existing_keys(self) -> list[str]:
@@ -943,6 +1056,335 @@ class AutounsealRequirerManager:
         return external_vault.token
 
 
+class AppRoleTokenManager:
+    """Reuses the token obtained from the charm's AppRole login across hooks.
+
+    Every AppRole login issues a new token, which is a write to Vault's storage.
+    Instead of logging in on every hook, the token is stored in a unit secret
+    along with its accessor, expiry and a fingerprint of the AppRole
+    credentials it was issued for. The token is reused as is until it is close
+    to expiring, at which point it is renewed if possible, or replaced by a new
+    login otherwise. Changing the AppRole credentials invalidates the cached
+    token, and so does Vault rejecting it, for instance because it was revoked
+    or a snapshot was restored.
+    """
+
+    TOKEN_SECRET_LABEL = "vault-approle-token"
+    RENEWAL_MARGIN = timedelta(minutes=10)
+
+    def __init__(self, charm: CharmBase):
+        self._juju_facade = JujuFacade(charm)
+
+    def authenticate(self, vault_client: VaultClient, approle: AppRole) -> bool:
+        """Authenticate the Vault client, reusing the cached token when possible.
+
+        Args:
+            vault_client: The Vault client to authenticate.
+            approle: The AppRole credentials used if a new token is required.
+
+        Returns:
+            bool: Whether the Vault client was authenticated.
+        """
+        fingerprint = self._get_approle_fingerprint(approle)
+        cached_token = self._get_cached_token(fingerprint)
+        if cached_token and not cached_token.expires_within(self.RENEWAL_MARGIN):
+            vault_client.use_token(
+                cached_token, on_rejected=lambda: self._login(vault_client, approle, fingerprint)
+            )
+            return True
+        if cached_token and cached_token.renewable:
+            vault_client.use_token(cached_token)
+            renewed_token = vault_client.renew_token()
+            if renewed_token and not renewed_token.expires_within(self.RENEWAL_MARGIN):
+                self._cache_token(renewed_token, fingerprint)
+                return True
+        return self._login(vault_client, approle, fingerprint)
+
+    def invalidate(self) -> None:
+        """Remove the cached token, forcing a new login on the next authentication."""
+        self._juju_facade.remove_secret(self.TOKEN_SECRET_LABEL)
+
+    def _login(self, vault_client: VaultClient, approle: AppRole, fingerprint: str) -> bool:
+        """Log in with the AppRole and cache the new token."""
+        if not vault_client.authenticate(approle):
+            return False
+        if vault_client.token_details:
+            self._cache_token(vault_client.token_details, fingerprint)
+        return True
+
+    def _get_cached_token(self, fingerprint: str) -> TokenDetails | None:
+        try:
+            content = self._juju_facade.get_latest_secret_content(label=self.TOKEN_SECRET_LABEL)
+        except FacadeError:
+            return None
+        if content.get("approle-fingerprint") != fingerprint:
+            logger.info("AppRole credentials changed, discarding cached token")
+            return None
+        try:
+            return TokenDetails(
+                token=content["token"],
+                accessor=content["accessor"],
+                expiry=datetime.fromisoformat(content["expiry"]),
+                renewable=content["renewable"] == "true",
+            )
+        except (KeyError, ValueError) as e:
+            logger.warning("Ignoring invalid cached token: %s", e)
+            return None
+
+    def _cache_token(self, token_details: TokenDetails, fingerprint: str) -> None:
+        try:
+            self._juju_facade.set_unit_secret_content(
+                {
+                    "token": token_details.token,
+                    "accessor": token_details.accessor,
+                    "expiry": token_details.expiry.isoformat(),
+                    "renewable": "true" if token_details.renewable else "false",
+                    "approle-fingerprint": fingerprint,
+                },
+                label=self.TOKEN_SECRET_LABEL,
+            )
+        except FacadeError as e:
+            logger.warning("Failed to cache Vault token: %s", e)
+
+    @staticmethod
+    def _get_approle_fingerprint(approle: AppRole) -> str:
+        return hashlib.sha256(f"{approle.role_id}:{approle.secret_id}".encode()).hexdigest()
+
+
+class TidyManager:
+    """Periodically cleans up the secret IDs and tokens that Vault keeps in storage.
+
+    Vault only removes expired approle secret IDs and the leftovers of expired
+    tokens from its storage when asked to tidy. The leader starts both tidy
+    operations at most once every `TIDY_INTERVAL`, and records when it last
+    did in the application databag of the peer relation, so that the
+    interval is respected across leadership changes.
+
+    Vault tidies in the background without reporting what it removed, so the
+    secret IDs of the approles created by the charm are counted at each tidy
+    and compared with the count recorded at the previous one.
+    """
+
+    LAST_TIDY_KEY = "last-tidy"
+    SECRET_IDS_KEY = "tidy-secret-ids"
+    TIDY_INTERVAL = timedelta(hours=24)
+    # The charm policy only allows listing the secret IDs of these approles
+    COUNTED_ROLE_PREFIX = "charm-"
+
+    def __init__(self, charm: CharmBase, vault_client: VaultClient, peer_relation_name: str):
+        self._juju_facade = JujuFacade(charm)
+        self._vault_client = vault_client
+        self._peer_relation_name = peer_relation_name
+
+    def is_due(self) -> bool:
+        """Return whether the interval since the last tidy has elapsed."""
+        try:
+            last_tidy = self._juju_facade.get_app_relation_data(name=self._peer_relation_name).get(
+                self.LAST_TIDY_KEY
+            )
+        except FacadeError:
+            return False
+        if not last_tidy:
+            return True
+        try:
+            elapsed = datetime.now().timestamp() - float(last_tidy)
+        except ValueError:
+            return True
+        return elapsed >= self.TIDY_INTERVAL.total_seconds()
+
+    def run(self) -> list[str]:
+        """Start the tidy operations, if this unit is the leader and a tidy is due.
+
+        Returns:
+            A description of what was cleaned up, empty if nothing was done.
+        """
+        if not self._juju_facade.is_leader or not self.is_due():
+            return []
+        secret_ids = self._count_secret_ids()
+        report = [self._describe_secret_ids(secret_ids)]
+        tidy_operations = {
+            "expired approle secret IDs": self._vault_client.tidy_approle_secret_ids,
+            "expired tokens": self._vault_client.tidy_tokens,
+        }
+        for description, tidy in tidy_operations.items():
+            try:
+                warnings = tidy()
+            except VaultClientError as e:
+                logger.warning("Failed to tidy %s: %s", description, e)
+                continue
+            report.append(f"tidied {description}")
+            for warning in warnings:
+                logger.debug("Vault warning while tidying %s: %s", description, warning)
+        try:
+            self._juju_facade.set_app_relation_data(
+                {
+                    self.LAST_TIDY_KEY: str(datetime.now().timestamp()),
+                    self.SECRET_IDS_KEY: str(secret_ids),
+                },
+                name=self._peer_relation_name,
+            )
+        except FacadeError as e:
+            logger.warning("Failed to record the time of the last tidy: %s", e)
+        return report
+
+    def _count_secret_ids(self) -> int:
+        """Count the secret IDs of the approles created by the charm."""
+        return sum(
+            len(self._vault_client.list_role_secret_id_accessors(role))
+            for role in self._vault_client.list("auth/approle/role")
+            if role.startswith(self.COUNTED_ROLE_PREFIX)
+        )
+
+    def _describe_secret_ids(self, secret_ids: int) -> str:
+        """Describe how the number of secret IDs changed since the last tidy."""
+        try:
+            previous = int(
+                self._juju_facade.get_app_relation_data(name=self._peer_relation_name)[
+                    self.SECRET_IDS_KEY
+                ]
+            )
+        except (FacadeError, KeyError, ValueError):
+            return f"{secret_ids} approle secret IDs"
+        return (
+            f"{secret_ids} approle secret IDs, {previous - secret_ids} fewer than at the last tidy"
+        )
+
+
+class _IssuedCertificateIndex:
+    """The certificates signed for the vault-pki relation, by CSR.
+
+    The index is kept in an application Juju secret owned by the leader, so
+    that a certificate which is still valid can be published again without
+    signing its CSR again when it goes missing from the relation data. Unlike
+    the peer relation data, the secret is not replicated to the other units
+    on every change. Certificates issued with `no_store` cannot be read back
+    from Vault, so each entry holds the serial number, the expiry and the
+    PEM of a certificate. The CA and the chain are the same for all the
+    certificates of an issuer, so they are stored once per issuer. Without a
+    secret label, the index is always empty.
+
+    Entries are dropped when their certificate expires or their CSR is no
+    longer requested, and at most `MAX_CERTIFICATES` entries are kept, those
+    that expire last, so that the secret stays small.
+    """
+
+    SECRET_LABEL_PREFIX = "pki-issued-certificates"
+    CONTENT_KEY = "index"
+    MAX_CERTIFICATES = 100
+
+    def __init__(self, juju_facade: JujuFacade, secret_label: str | None):
+        self._juju_facade = juju_facade
+        self._secret_label = secret_label
+        self._issuers: dict[str, dict[str, Any]] = {}
+        self._certificates: dict[str, dict[str, Any]] = {}
+        self._changed = False
+
+    def load(self) -> None:
+        """Load the index from its secret, dropping the expired certificates."""
+        if not self._secret_label:
+            return
+        try:
+            index = json.loads(
+                self._juju_facade.get_latest_secret_content(label=self._secret_label).get(
+                    self.CONTENT_KEY, "{}"
+                )
+            )
+        except FacadeError:
+            return
+        except json.JSONDecodeError:
+            logger.warning("Invalid issued certificate index, discarding it")
+            self._changed = True
+            return
+        self._issuers = index.get("issuers", {})
+        self._certificates = index.get("certificates", {})
+        now = datetime.now().timestamp()
+        for csr_hash, entry in list(self._certificates.items()):
+            if entry["expiry"] <= now:
+                del self._certificates[csr_hash]
+                self._changed = True
+
+    def get(self, csr: CertificateSigningRequest, ca: Certificate) -> VaultCertificate | None:
+        """Return the certificate issued for the CSR by the given CA, if any."""
+        entry = self._certificates.get(csr.get_sha256_hex())
+        if not entry:
+            return None
+        issuer = self._issuers.get(entry["issuer"])
+        if not issuer or Certificate.from_string(issuer["ca"]) != ca:
+            return None
+        return VaultCertificate(
+            certificate=entry["certificate"],
+            ca=issuer["ca"],
+            chain=issuer["chain"],
+            serial_number=entry["serial"],
+        )
+
+    def add(
+        self,
+        csr: CertificateSigningRequest,
+        certificate: VaultCertificate,
+        expiry_time: datetime,
+    ) -> None:
+        """Record the certificate issued for the CSR."""
+        issuer_hash = hashlib.sha256(certificate.ca.encode()).hexdigest()
+        entry = {
+            "serial": certificate.serial_number,
+            "expiry": expiry_time.timestamp(),
+            "certificate": certificate.certificate,
+            "issuer": issuer_hash,
+        }
+        if self._certificates.get(csr.get_sha256_hex()) == entry:
+            return
+        self._issuers[issuer_hash] = {"ca": certificate.ca, "chain": certificate.chain}
+        self._certificates[csr.get_sha256_hex()] = entry
+        self._changed = True
+
+    def retain(self, csrs: Iterable[CertificateSigningRequest]) -> None:
+        """Forget the certificates of the CSRs that are no longer requested."""
+        requested = {csr.get_sha256_hex() for csr in csrs}
+        for csr_hash in list(self._certificates):
+            if csr_hash not in requested:
+                del self._certificates[csr_hash]
+                self._changed = True
+
+    def clear(self) -> None:
+        """Forget all the certificates, when they are revoked."""
+        self._issuers = {}
+        self._certificates = {}
+        self._changed = True
+
+    def save(self) -> None:
+        """Write the index to its secret, if it changed."""
+        if not self._secret_label or not self._changed:
+            return
+        if len(self._certificates) > self.MAX_CERTIFICATES:
+            logger.debug(
+                "Dropping %d certificates expiring first from the index",
+                len(self._certificates) - self.MAX_CERTIFICATES,
+            )
+            self._certificates = dict(
+                sorted(
+                    self._certificates.items(), key=lambda item: item[1]["expiry"], reverse=True
+                )[: self.MAX_CERTIFICATES]
+            )
+        used_issuers = {entry["issuer"] for entry in self._certificates.values()}
+        index = {
+            "issuers": {
+                issuer_hash: issuer
+                for issuer_hash, issuer in self._issuers.items()
+                if issuer_hash in used_issuers
+            },
+            "certificates": self._certificates,
+        }
+        try:
+            self._juju_facade.set_app_secret_content(
+                {self.CONTENT_KEY: json.dumps(index)}, label=self._secret_label
+            )
+        except FacadeError as e:
+            logger.warning("Failed to save the issued certificate index: %s", e)
+            return
+        self._changed = False
+
+
 class PKIManager:
     """Encapsulates the business logic for managing PKI certificates in Vault from a Charm."""
 
@@ -955,6 +1397,9 @@ class PKIManager:
         role_name: str,
         vault_pki: TLSCertificatesProvidesV4,
         tls_certificates_pki: TLSCertificatesRequiresV4,
+        max_concurrent_signings: int = DEFAULT_MAX_CONCURRENCY,
+        keep_issued_certificates: bool = False,
+        role_flags: PKIRoleFlags = PKIRoleFlags(),
     ):
         """Create a new PKIManager object.
 
@@ -968,6 +1413,13 @@ class PKIManager:
             role_name: The role name for the PKI backend
             vault_pki: The vault_pki provider relation helper library
             tls_certificates_pki: The tls_certificates_pki requirer relation helper library
+            max_concurrent_signings: The maximum number of certificate signing
+                requests sent to Vault at the same time when syncing
+            keep_issued_certificates: Whether to keep an index of the issued
+                certificates in a Juju secret. Without it, the certificates
+                missing from the relation data are always signed again.
+            role_flags: Whether the certificates issued with the role are
+                stored and leased by Vault
         """
         self._vault_client = vault_client
         self._juju_facade = JujuFacade(charm)
@@ -977,6 +1429,14 @@ class PKIManager:
         self._tls_certificates_pki = tls_certificates_pki
         self._certificate_request_attributes = certificate_request_attributes
         self._pki_utils = _PKIUtils(vault_client, mount_point)
+        self._max_concurrent_signings = max(1, max_concurrent_signings)
+        self._issued_certificates = _IssuedCertificateIndex(
+            self._juju_facade,
+            f"{_IssuedCertificateIndex.SECRET_LABEL_PREFIX}-{mount_point}"
+            if keep_issued_certificates
+            else None,
+        )
+        self._role_flags = role_flags
 
     def _get_pki_intermediate_ca_from_relation(
         self,
@@ -1012,8 +1472,13 @@ class PKIManager:
         if not self._juju_facade.relation_exists(TLS_CERTIFICATES_PKI_RELATION_NAME):
             logger.debug("No PKI relation exists: `%s`", TLS_CERTIFICATES_PKI_RELATION_NAME)
             return
-        self._vault_client.enable_secrets_engine(SecretsBackend.PKI, self._mount_point)
-        logger.info("Enabled PKI secrets engine at %s", self._mount_point)
+        try:
+            VaultReconciler(self._vault_client).reconcile(
+                DesiredState(mounts=[Mount(self._mount_point, SecretsBackend.PKI)])
+            )
+        except VaultClientError as e:
+            logger.error("Failed to enable the PKI backend: %s", e)
+            return
 
         certificate_from_provider, private_key = self._get_pki_intermediate_ca_from_relation()
         if not certificate_from_provider or not private_key:
@@ -1026,6 +1491,16 @@ class PKIManager:
             current_ttl = self._vault_client.get_role_max_ttl(
                 role=self._role_name, mount=self._mount_point
             )
+            if current_ttl and self._pki_utils.role_flags_differ(
+                self._role_name, self._role_flags
+            ):
+                self._vault_client.create_or_update_pki_charm_role(
+                    allowed_domains=self._certificate_request_attributes.common_name,
+                    mount=self._mount_point,
+                    role=self._role_name,
+                    max_ttl=f"{current_ttl}s",
+                    role_flags=self._role_flags,
+                )
             if current_ttl and not self._pki_utils.intermediate_ca_exceeds_role_ttl(
                 vault_service_ca_certificate, current_ttl
             ):
@@ -1037,6 +1512,8 @@ class PKIManager:
             logger.debug("CA certificate already set in the PKI secrets engine")
             return
         self._vault_pki.revoke_all_certificates()
+        self._issued_certificates.clear()
+        self._issued_certificates.save()
         self._vault_client.import_ca_certificate_and_key(
             certificate=str(certificate_from_provider.certificate),
             private_key=str(private_key),
@@ -1045,18 +1522,22 @@ class PKIManager:
         issued_certificates_validity = self._pki_utils.calculate_certificates_ttl(
             certificate_from_provider.certificate
         )
-        if not self._vault_client.is_common_name_allowed_in_pki_role(
-            role=self._role_name,
-            mount=self._mount_point,
-            common_name=self._certificate_request_attributes.common_name,
-        ) or issued_certificates_validity != self._vault_client.get_role_max_ttl(
-            role=self._role_name, mount=self._mount_point
+        if (
+            not self._vault_client.is_common_name_allowed_in_pki_role(
+                role=self._role_name,
+                mount=self._mount_point,
+                common_name=self._certificate_request_attributes.common_name,
+            )
+            or issued_certificates_validity
+            != self._vault_client.get_role_max_ttl(role=self._role_name, mount=self._mount_point)
+            or self._pki_utils.role_flags_differ(self._role_name, self._role_flags)
         ):
             self._vault_client.create_or_update_pki_charm_role(
                 allowed_domains=self._certificate_request_attributes.common_name,
                 mount=self._mount_point,
                 role=self._role_name,
                 max_ttl=f"{issued_certificates_validity}s",
+                role_flags=self._role_flags,
             )
         self.make_latest_pki_issuer_default()
 
@@ -1067,56 +1548,161 @@ class PKIManager:
     def sync(self):
         """Sync the state of the PKI backend with the TLS certificates relations.
 
-        Issues certificates for all outstanding requests.
+        Issues certificates for all outstanding requests. The certificates
+        still valid in the index of issued certificates are published again
+        as they are, and those of the CSRs no longer requested are dropped
+        from the index. For the others, the role, the TTL and the intermediate CA
+        are looked up once for all the requests, the requests are signed
+        concurrently and recorded in the index. The certificates are written
+        to each relation in a single update.
         """
         if not self._juju_facade.is_leader:
             logger.debug("Only leader unit can handle a vault-pki request")
             return
+        self._issued_certificates.load()
+        self._issued_certificates.retain(
+            request.certificate_signing_request
+            for request in self._vault_pki.get_certificate_requests()
+        )
+        self._issued_certificates.save()
         if not self._juju_facade.relation_exists(TLS_CERTIFICATES_PKI_RELATION_NAME):
             logger.debug("TLS Certificates PKI relation not created")
             return
         outstanding_pki_requests = self._vault_pki.get_outstanding_certificate_requests()
-        for pki_request in outstanding_pki_requests:
-            self._generate_pki_certificate_for_requirer(
-                requirer_csr=pki_request,
+        if not outstanding_pki_requests:
+            return
+        provider_certificate, _ = self._get_pki_intermediate_ca_from_relation()
+        if not provider_certificate:
+            return
+        issued, unsigned_requests = self._find_issued_certificates(
+            outstanding_pki_requests, provider_certificate.certificate
+        )
+        if unsigned_requests:
+            issued.extend(self._sign_outstanding_requests(unsigned_requests, provider_certificate))
+        provider_certificates = []
+        for requirer_csr, certificate in issued:
+            if not certificate:
+                logger.debug("Failed to sign the certificate")
+                continue
+            signed_certificate = Certificate.from_string(certificate.certificate)
+            self._issued_certificates.add(
+                requirer_csr.certificate_signing_request,
+                certificate,
+                signed_certificate.expiry_time,
+            )
+            provider_certificates.append(
+                ProviderCertificate(
+                    relation_id=requirer_csr.relation_id,
+                    certificate=signed_certificate,
+                    certificate_signing_request=requirer_csr.certificate_signing_request,
+                    ca=Certificate.from_string(certificate.ca),
+                    chain=[Certificate.from_string(cert) for cert in certificate.chain],
+                )
             )
+        if provider_certificates:
+            self._vault_pki.set_relation_certificates(provider_certificates)
+        self._issued_certificates.save()
+
+    def _find_issued_certificates(
+        self, requirer_csrs: list[RequirerCertificateRequest], ca: Certificate
+    ) -> tuple[
+        list[tuple[RequirerCertificateRequest, VaultCertificate | None]],
+        list[RequirerCertificateRequest],
+    ]:
+        """Split the requests between those with a valid certificate in the index and the others.
 
-    def _generate_pki_certificate_for_requirer(self, requirer_csr: RequirerCertificateRequest):
+        Returns:
+            The requests with their certificate from the index, and the
+            requests that must be signed.
+        """
+        issued: list[tuple[RequirerCertificateRequest, VaultCertificate | None]] = []
+        unsigned_requests = []
+        for requirer_csr in requirer_csrs:
+            certificate = self._issued_certificates.get(
+                requirer_csr.certificate_signing_request, ca
+            )
+            if certificate:
+                issued.append((requirer_csr, certificate))
+            else:
+                unsigned_requests.append(requirer_csr)
+        if issued:
+            logger.info("Publishing %d certificates from the index again", len(issued))
+        return issued, unsigned_requests
+
+    def _sign_outstanding_requests(
+        self,
+        requirer_csrs: list[RequirerCertificateRequest],
+        provider_certificate: ProviderCertificate,
+    ) -> list[tuple[RequirerCertificateRequest, VaultCertificate | None]]:
+        """Sign the requests with the PKI role, for the TTL allowed by the intermediate CA."""
         if not self._vault_client.is_pki_role_created(
             role=self._role_name, mount=self._mount_point
         ):
             logger.debug("PKI role not created")
-            return
-        provider_certificate, _ = self._get_pki_intermediate_ca_from_relation()
-        if not provider_certificate:
-            return
+            return []
         allowed_cert_validity = self._pki_utils.calculate_certificates_ttl(
             provider_certificate.certificate
         )
-        certificate = self._vault_client.sign_pki_certificate_signing_request(
-            mount=self._mount_point,
-            role=self._role_name,
-            csr=str(requirer_csr.certificate_signing_request),
-            common_name=requirer_csr.certificate_signing_request.common_name,
-            ttl=f"{allowed_cert_validity}s",
+        certificates = asyncio.run(
+            self._sign_certificate_requests(requirer_csrs, ttl=f"{allowed_cert_validity}s")
         )
-        if not certificate:
-            logger.debug("Failed to sign the certificate")
-            return
-        provider_certificate = ProviderCertificate(
-            relation_id=requirer_csr.relation_id,
-            certificate=Certificate.from_string(certificate.certificate),
-            certificate_signing_request=requirer_csr.certificate_signing_request,
-            ca=Certificate.from_string(certificate.ca),
-            chain=[Certificate.from_string(cert) for cert in certificate.chain],
+        return list(zip(requirer_csrs, certificates))
+
+    async def _sign_certificate_requests(
+        self, requirer_csrs: list[RequirerCertificateRequest], ttl: str
+    ) -> list[VaultCertificate | None]:
+        """Sign the certificate signing requests concurrently.
+
+        The relation data is only written once all the requests are signed,
+        since the Juju model must not be used from several threads.
+        """
+        async_vault_client = AsyncVaultClient(
+            self._vault_client, max_concurrency=self._max_concurrent_signings
         )
-        self._vault_pki.set_relation_certificate(
-            provider_certificate=provider_certificate,
+        return await asyncio.gather(
+            *(
+                async_vault_client.sign_pki_certificate_signing_request(
+                    mount=self._mount_point,
+                    role=self._role_name,
+                    csr=str(requirer_csr.certificate_signing_request),
+                    common_name=requirer_csr.certificate_signing_request.common_name,
+                    ttl=ttl,
+                )
+                for requirer_csr in requirer_csrs
+            )
         )
 
 
 class KVManager:
-    """Encapsulates the business logic for managing KV credentials for requirer Charms."""
+    """Encapsulates the business logic for managing KV credentials for requirer Charms.
+
+    Checking that a unit's credentials still match its egress subnets means
+    reading its role secret from Vault. When given a mapping to keep them in,
+    the manager records a fingerprint of the role name, the CIDRs and the
+    secret ID held in the unit's Juju secret each time a unit's credentials
+    are verified, and only reads from Vault again once the fingerprint
+    changes, for instance because the secret ID was replaced, or the
+    verification is older than `ROLE_VERIFICATION_INTERVAL`.
+
+    By default, each requirer application gets its own KV mount, and each
+    unit its own policy and approle. With `shared_mount`, new relations are
+    instead served from a single KV mount where each application is confined
+    to its own path prefix, with one policy and one approle per application
+    and a secret ID bound to the egress subnets of each unit. Relations that
+    were already served keep the layout they were published with, so the
+    credentials that requirers hold remain valid.
+
+    With `batch_tokens`, the approles issue batch tokens, which Vault does not
+    persist, so that requirer logins do not write to its storage. Batch
+    tokens cannot be renewed or revoked and expire with their TTL, which
+    the manager never relies on.
+
+    When the credentials of a unit are re-created because its egress subnets
+    changed, the secret ID they replace is destroyed, so that the approle
+    backend does not accumulate secret IDs that nothing uses.
+    """
+
+    ROLE_VERIFICATION_INTERVAL = timedelta(hours=6)
 
     def __init__(
         self,
@@ -1124,11 +1710,18 @@ class KVManager:
         vault_client: VaultClient,
         vault_kv: VaultKvProvides,
         ca_cert: str,
+        verified_roles: MutableMapping[str, Any] | None = None,
+        shared_mount: bool = False,
+        batch_tokens: bool = False,
     ):
         self._vault_client = vault_client
         self._juju_facade = JujuFacade(charm)
         self._vault_kv = vault_kv
         self._ca_cert = ca_cert
+        self._verified_roles = verified_roles
+        self._shared_mount = shared_mount
+        self._batch_tokens = batch_tokens
+        self._superseded_accessors: dict[str, tuple[str, str]] = {}
 
     def generate_credentials_for_requirer(
         self,
@@ -1142,11 +1735,8 @@ class KVManager:
     ):
         """Generate KV credentials for the requirer, and store the credentials in the relation.
 
-        This method ensures that the approle and policy are created or updated,
-        and that the approle secret ID is generated and stored in a Juju secret.
-
-        The Juju secret ID is then passed to the requirer, along with other
-        necessary information to access the KV backend.
+        This is a shorthand for `generate_credentials_for_requirers` with a
+        single request.
 
         Args:
             relation: The relation of the requirer
@@ -1158,104 +1748,209 @@ class KVManager:
             vault_url: The URL of the Vault server that the requirer can access
                 over this relation.
         """
+        self.generate_credentials_for_requirers(
+            relation=relation,
+            kv_requests=[
+                KVRequest(
+                    relation=relation,
+                    app_name=app_name,
+                    unit_name=unit_name,
+                    mount_suffix=mount_suffix,
+                    egress_subnets=egress_subnets,
+                    nonce=nonce,
+                )
+            ],
+            vault_url=vault_url,
+        )
+
+    def generate_credentials_for_requirers(
+        self,
+        relation: Relation,
+        kv_requests: list[KVRequest],
+        vault_url: str,
+    ):
+        """Generate KV credentials for the units of a requirer, and store them in the relation.
+
+        This method ensures that the approle and policy of each unit are
+        created or updated, and that an approle secret ID is generated and
+        stored in a Juju secret. Vault is only called for the units whose
+        credentials are missing or no longer match their egress subnets.
+
+        The Juju secret IDs are then passed to the requirer with a single
+        update of the relation data, along with other necessary information
+        to access the KV backend.
+
+        Args:
+            relation: The relation of the requirer
+            kv_requests: The requests of the requirer units, all from this relation
+            vault_url: The URL of the Vault server that the requirer can access
+                over this relation.
+        """
         if not self._juju_facade.is_leader:
             logger.debug("Only leader unit can handle a vault-kv request")
             return
-        mount = Naming.kv_mount_path(app_name, mount_suffix)
-        self._vault_client.enable_secrets_engine(SecretsBackend.KV_V2, mount)
-        secret_id = self._ensure_unit_credentials(
-            relation=relation,
-            unit_name=unit_name,
-            mount=mount,
-            nonce=nonce,
-            egress_subnets=egress_subnets,
+        if not kv_requests:
+            return
+        mount, path_prefix = self._get_kv_layout(relation, kv_requests[0])
+        VaultReconciler(self._vault_client).reconcile(
+            DesiredState(mounts=[Mount(mount, SecretsBackend.KV_V2)])
+        )
+        current_credentials = self._vault_kv.get_credentials(relation)
+        credentials: dict[str, str] = {}
+        outdated_requests: list[KVRequest] = []
+        for kv_request in kv_requests:
+            juju_secret_label = Naming.kv_secret_label(unit_name=kv_request.unit_name)
+            credentials_juju_secret_id = current_credentials.get(kv_request.nonce)
+            if not self._is_vault_kv_role_configured(
+                label=juju_secret_label,
+                egress_subnets=kv_request.egress_subnets,
+                role_name=self._get_kv_role_name(mount, path_prefix, kv_request),
+                credentials_juju_secret_id=credentials_juju_secret_id,
+            ):
+                outdated_requests.append(kv_request)
+                continue
+            logger.debug("Vault KV role of %s already configured", kv_request.unit_name)
+            if not credentials_juju_secret_id:
+                credentials_juju_secret_id = self._juju_facade.get_secret(
+                    label=juju_secret_label
+                ).id
+            if credentials_juju_secret_id:
+                credentials[kv_request.nonce] = credentials_juju_secret_id
+        credentials.update(
+            self._create_unit_credentials(
+                relation=relation,
+                mount=mount,
+                path_prefix=path_prefix,
+                kv_requests=outdated_requests,
+            )
         )
-        self._vault_kv.set_kv_data(
+        self._vault_kv.set_kv_data_for_units(
             relation=relation,
             mount=mount,
             ca_certificate=self._ca_cert,
             vault_url=vault_url,
-            nonce=nonce,
-            credentials_juju_secret_id=secret_id,
+            credentials=credentials,
+            path_prefix=path_prefix,
         )
-        self._remove_stale_nonce(relation=relation, nonce=nonce)
 
-    def _remove_stale_nonce(self, relation: Relation, nonce: str) -> None:
-        """Remove stale nonce.
+    def _get_kv_layout(self, relation: Relation, kv_request: KVRequest) -> tuple[str, str | None]:
+        """Return the mount and path prefix used to serve the relation.
 
-        If the nonce is not present in the credentials, it is stale and should be removed.
+        A relation that already has credentials keeps the layout it was
+        published with, whatever the current mode is. Otherwise, the layout
+        follows the mode of the manager.
 
-        Args:
-            relation: the reltaion from which to check the credentials for the nonce
-            nonce: the one to remove if stale
+        Returns:
+            The mount path and, if the mount is shared, the path prefix of the
+            requirer application in it.
         """
-        credential_nonces = self._vault_kv.get_credentials(relation).keys()
-        if nonce not in set(credential_nonces):
-            self._vault_kv.remove_unit_credentials(relation, nonce=nonce)
+        own_mount = Naming.kv_mount_path(kv_request.app_name, kv_request.mount_suffix)
+        shared_prefix = Naming.kv_shared_path_prefix(kv_request.app_name, kv_request.mount_suffix)
+        if self._vault_kv.get_credentials(relation):
+            published_mount = self._vault_kv.get_mount(relation)
+            published_prefix = self._vault_kv.get_path_prefix(relation)
+            if published_mount == own_mount and not published_prefix:
+                return own_mount, None
+            if published_mount == Naming.kv_shared_mount_path and published_prefix:
+                return Naming.kv_shared_mount_path, shared_prefix
+        if self._shared_mount:
+            return Naming.kv_shared_mount_path, shared_prefix
+        return own_mount, None
 
-    def _ensure_unit_credentials(
+    @staticmethod
+    def _get_kv_role_name(mount: str, path_prefix: str | None, kv_request: KVRequest) -> str:
+        """Return the name of the approle of a unit, shared by its application if the mount is."""
+        if path_prefix:
+            return Naming.kv_shared_role_name(kv_request.app_name, kv_request.mount_suffix)
+        return Naming.kv_role_name(mount, kv_request.unit_name)
+
+    def _create_unit_credentials(
         self,
         relation: Relation,
-        unit_name: str,
         mount: str,
-        nonce: str,
-        egress_subnets: list[str],
-    ) -> str:
-        """Ensure a unit has credentials to access the vault-kv mount.
+        path_prefix: str | None,
+        kv_requests: list[KVRequest],
+    ) -> dict[str, str]:
+        """Create credentials for units to access the vault-kv mount.
 
-        If the credentials are already configured for the provided egress
-        subnets, the existing Juju secret ID which contains the approle secret
-        ID is returned.
+        The Vault policies and approles of the units are reconciled together,
+        which only writes the ones that differ from what Vault already has. A
+        Vault secret ID is then generated for each unit and stored in a Juju
+        secret granted to the relation.
 
-        Otherwise, the necessary Vault policy and approle are created or
-        updated as necessary.  A Vault secret ID is then generated for the
-        approle and stored in a Juju secret. The secret is granted to the
-        associate relation, and the ID of the Juju secret is returned.
+        When the mount is shared, the units of the application share a policy
+        and an approle. The approle does not bind its tokens to any subnet, so
+        each secret ID binds both the login and the tokens it issues to the
+        egress subnets of its unit instead.
 
         Returns:
-            The ID of the Juju secret containing the approle secret ID.
+            The ID of the Juju secret containing the approle secret ID of each
+            unit, keyed by the nonce of the unit.
         """
-        policy_name = Naming.kv_policy_name(mount, unit_name)
-        role_name = Naming.kv_role_name(mount, unit_name)
-
-        juju_secret_label = Naming.kv_secret_label(unit_name=unit_name)
-        current_credentials = self._vault_kv.get_credentials(relation)
-        credentials_juju_secret_id = current_credentials.get(nonce, None)
-
-        if self._is_vault_kv_role_configured(
-            label=juju_secret_label,
-            egress_subnets=egress_subnets,
-            role_name=role_name,
-            credentials_juju_secret_id=credentials_juju_secret_id,
-        ):
-            logger.info("Vault KV role already configured for the provided egress subnets")
-            return credentials_juju_secret_id
-        self._vault_client.create_or_update_policy(policy_name, KV_POLICY.format(mount=mount))
-        role_id = self._vault_client.create_or_update_approle(
-            role_name,
-            policies=[policy_name],
-            cidrs=egress_subnets,
-            token_ttl="1h",
-            token_max_ttl="1h",
-        )
-        role_secret_id = self._vault_client.generate_role_secret_id(role_name, egress_subnets)
-        secret = self._juju_facade.set_app_secret_content(
-            content={"role-id": role_id, "role-secret-id": role_secret_id},
-            label=juju_secret_label,
+        if not kv_requests:
+            return {}
+        policies: dict[str, Policy] = {}
+        approles: dict[str, Approle] = {}
+        for kv_request in kv_requests:
+            role_name = self._get_kv_role_name(mount, path_prefix, kv_request)
+            if path_prefix:
+                policy_name = Naming.kv_shared_policy_name(
+                    kv_request.app_name, kv_request.mount_suffix
+                )
+                policy_content = KV_SHARED_POLICY.format(mount=mount, prefix=path_prefix)
+                cidrs = None
+            else:
+                policy_name = Naming.kv_policy_name(mount, kv_request.unit_name)
+                policy_content = KV_POLICY.format(mount=mount)
+                cidrs = kv_request.egress_subnets
+            policies[policy_name] = Policy(policy_name, policy_content)
+            approles[role_name] = Approle(
+                role_name,
+                policies=[policy_name],
+                cidrs=cidrs,
+                token_ttl="1h",
+                token_max_ttl="1h",
+                token_type="batch" if self._batch_tokens else "default",
+            )
+        result = VaultReconciler(self._vault_client).reconcile(
+            DesiredState(policies=list(policies.values()), approles=list(approles.values()))
         )
-        self._juju_facade.grant_secret(relation, secret=secret)
-        if not secret.id:
-            raise ValueError(
-                f"Unexpected error, just created secret {juju_secret_label!r} has no id"
+        credentials = {}
+        for kv_request in kv_requests:
+            role_name = self._get_kv_role_name(mount, path_prefix, kv_request)
+            juju_secret_label = Naming.kv_secret_label(unit_name=kv_request.unit_name)
+            self._forget_role_verification(juju_secret_label)
+            role_secret_id = self._vault_client.generate_role_secret_id(
+                role_name,
+                kv_request.egress_subnets,
+                token_bound_cidrs=kv_request.egress_subnets if path_prefix else None,
+            )
+            secret = self._juju_facade.set_app_secret_content(
+                content={"role-id": result.role_ids[role_name], "role-secret-id": role_secret_id},
+                label=juju_secret_label,
             )
-        return secret.id
+            self._juju_facade.grant_secret(relation, secret=secret)
+            if not secret.id:
+                raise ValueError(
+                    f"Unexpected error, just created secret {juju_secret_label!r} has no id"
+                )
+            credentials[kv_request.nonce] = secret.id
+            self._destroy_superseded_secret_id(juju_secret_label)
+        return credentials
+
+    def _destroy_superseded_secret_id(self, label: str) -> None:
+        """Destroy the secret ID that the credentials of the secret with this label replaced."""
+        if not (superseded := self._superseded_accessors.pop(label, None)):
+            return
+        role_name, accessor = superseded
+        destroy_role_secret_ids(self._vault_client, role_name, [accessor])
 
     def _is_vault_kv_role_configured(
         self,
         label: str,
         egress_subnets: list[str],
         role_name: str,
-        credentials_juju_secret_id: str,
+        credentials_juju_secret_id: str | None,
     ) -> bool:
         """Check if the Vault role is already configured for the provided egress subnets.
 
@@ -1278,20 +1973,231 @@ class KVManager:
             return False
         if not role_secret_id:
             return False
-        role_data = self._vault_client.read_role_secret(role_name, role_secret_id)
-        if egress_subnets == role_data["cidr_list"]:
+        if self._role_verification_is_current(label, role_name, egress_subnets, role_secret_id):
             return True
-        return False
+        role_data = self._vault_client.read_role_secret(role_name, role_secret_id)
+        if egress_subnets != role_data["cidr_list"]:
+            if accessor := role_data.get("secret_id_accessor"):
+                self._superseded_accessors[label] = (role_name, accessor)
+            return False
+        self._record_role_verification(label, role_name, egress_subnets, role_secret_id)
+        return True
+
+    def _role_verification_is_current(
+        self, label: str, role_name: str, egress_subnets: list[str], role_secret_id: str
+    ) -> bool:
+        """Return whether the role was recently verified for the same egress subnets and secret ID."""
+        if self._verified_roles is None or not (verification := self._verified_roles.get(label)):
+            return False
+        fingerprint = self._get_role_fingerprint(role_name, egress_subnets, role_secret_id)
+        if fingerprint != verification["fingerprint"]:
+            return False
+        verified_at = datetime.fromtimestamp(verification["verified-at"])
+        return datetime.now() - verified_at < self.ROLE_VERIFICATION_INTERVAL
+
+    def _record_role_verification(
+        self, label: str, role_name: str, egress_subnets: list[str], role_secret_id: str
+    ) -> None:
+        if self._verified_roles is None:
+            return
+        self._verified_roles[label] = {
+            "fingerprint": self._get_role_fingerprint(role_name, egress_subnets, role_secret_id),
+            "verified-at": datetime.now().timestamp(),
+        }
+
+    def _forget_role_verification(self, label: str) -> None:
+        if self._verified_roles is not None:
+            self._verified_roles.pop(label, None)
 
     @staticmethod
-    def remove_unit_credentials(juju_facade: JujuFacade, unit_name: str) -> None:
+    def _get_role_fingerprint(role_name: str, cidrs: list[str], role_secret_id: str) -> str:
+        # Only a digest of the secret ID is kept in the fingerprint
+        secret_id_digest = hashlib.sha256(role_secret_id.encode()).hexdigest()
+        content = json.dumps([role_name, sorted(cidrs), secret_id_digest])
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    @staticmethod
+    def remove_unit_credentials(
+        juju_facade: JujuFacade,
+        unit_name: str,
+        verified_roles: MutableMapping[str, Any] | None = None,
+    ) -> None:
         """Remove any KV credentials associated with the given unit.
 
         Args:
             juju_facade: The JujuFacade object to use for removing the secret
             unit_name: The name of the unit for which to remove the secret
+            verified_roles: The verifications recorded by the KVManager, if any
+        """
+        label = Naming.kv_secret_label(unit_name=unit_name)
+        juju_facade.remove_secret(label)
+        if verified_roles is not None:
+            verified_roles.pop(label, None)
+
+
+@dataclass(frozen=True)
+class BackupDetails:
+    """The description of a backup stored in S3.
+
+    Attributes:
+        key: The S3 key of the backup.
+        size: The size of the backup in S3, in bytes.
+        original_size: The size of the snapshot before compression, in bytes,
+            or None if it is unknown.
+        compression: The codec the snapshot is compressed with, or None if
+            it is not compressed.
+        deduplicated: Whether the backup is a manifest of chunks shared with
+            other backups, in which case its size is the size of the manifest.
+        created_at: When the backup was created, in UTC.
+        model: The name of the model of the backed up Vault.
+        checksum: The SHA-256 digest of the snapshot, before compression.
+        duration: The time the upload of the backup took, in seconds.
+        vault_version: The version of the Vault the snapshot was taken from.
+        node: The unit which created the backup.
+
+    The creation time and the model are read from the key of the backup,
+    and the details after them are only known for backups created since the
+    backup catalog was introduced.
+    """
+
+    key: str
+    size: int
+    original_size: int | None
+    compression: str | None
+    deduplicated: bool = False
+    created_at: datetime | None = None
+    model: str | None = None
+    checksum: str | None = None
+    duration: float | None = None
+    vault_version: str | None = None
+    node: str | None = None
+
+
+class _HashingReader(io.RawIOBase):
+    """A read-only stream computing the SHA-256 digest of the stream it reads."""
+
+    def __init__(self, content: IO[bytes]):
+        self._content = content
+        self._digest = hashlib.sha256()
+
+    def readable(self) -> bool:
+        """Return True, the stream is readable."""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """Read bytes into the buffer and return their number, 0 at the end."""
+        data = self._content.read(len(buffer))
+        buffer[: len(data)] = data
+        self._digest.update(data)
+        return len(data)
+
+    def hexdigest(self) -> str:
+        """Return the digest of the bytes read so far."""
+        return self._digest.hexdigest()
+
+
+class _BackupCatalog:
+    """The description of the backups in a bucket, kept in an object of the bucket.
+
+    Listing the backups from the catalog takes a single request, whatever the
+    number of backups. The catalog is updated with a conditional write on
+    the ETag it was read with, so that the object is replaced at once and an
+    update made in the meantime is read again rather than overwritten. The
+    catalog can be rebuilt from the objects in the bucket, which only gives
+    the details that S3 holds about each backup.
+    """
+
+    VERSION = 1
+    UPDATE_ATTEMPTS = 3
+
+    def __init__(self, s3: S3, bucket_name: str):
+        self._s3 = s3
+        self._bucket_name = bucket_name
+
+    def load(self) -> list[BackupDetails] | None:
+        """Return the backups in the catalog, or None if it is missing or invalid.
+
+        Raises:
+            S3Error: If the catalog could not be read.
+        """
+        return self._read()[0]
+
+    def add(self, backup: BackupDetails) -> None:
+        """Add a backup to the catalog, replacing any entry with the same key.
+
+        Raises:
+            S3Error: If the catalog could not be updated.
+        """
+        self._update(
+            lambda backups: (
+                [entry for entry in backups or [] if entry.key != backup.key] + [backup]
+            )
+        )
+
+    def rebuild(self, scanned: list[BackupDetails]) -> list[BackupDetails]:
+        """Replace the catalog with the backups found in the bucket.
+
+        The entries of the backups still in the bucket are kept from the
+        catalog, if it can be read, since they hold more details.
+
+        Raises:
+            S3Error: If the catalog could not be updated.
         """
-        juju_facade.remove_secret(Naming.kv_secret_label(unit_name=unit_name))
+
+        def merge(backups: list[BackupDetails] | None) -> list[BackupDetails]:
+            cataloged = {entry.key: entry for entry in backups or []}
+            return [cataloged.get(backup.key, backup) for backup in scanned]
+
+        return self._update(merge)
+
+    def _read(self) -> tuple[list[BackupDetails] | None, str | None]:
+        """Read the catalog and its ETag, the backups being None if it is missing or invalid."""
+        catalog = self._s3.get_bytes_and_etag(self._bucket_name, Naming.backup_catalog_s3_key)
+        if not catalog:
+            return None, None
+        content, etag = catalog
+        try:
+            data = json.loads(content)
+            if data["version"] != self.VERSION:
+                raise ValueError(f"version {data['version']} is not supported")
+            backups = [self._load_entry(entry) for entry in data["backups"]]
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning("Invalid backup catalog: %s", e)
+            return None, etag
+        return backups, etag
+
+    def _update(
+        self, update: Callable[[list[BackupDetails] | None], list[BackupDetails]]
+    ) -> list[BackupDetails]:
+        """Read the catalog, update its backups and write it back, until it is unchanged."""
+        for _ in range(self.UPDATE_ATTEMPTS):
+            backups, etag = self._read()
+            updated = sorted(
+                update(backups),
+                key=lambda entry: entry.created_at or datetime.min.replace(tzinfo=timezone.utc),
+            )
+            content = json.dumps(
+                {"version": self.VERSION, "backups": [self._dump_entry(b) for b in updated]}
+            ).encode()
+            if self._s3.put_bytes_if_match(
+                self._bucket_name, Naming.backup_catalog_s3_key, content, etag
+            ):
+                return updated
+            logger.info("The backup catalog changed while it was updated, retrying")
+        raise S3Error("The backup catalog kept changing while it was updated")
+
+    @staticmethod
+    def _dump_entry(backup: BackupDetails) -> dict[str, Any]:
+        entry = asdict(backup)
+        entry["created_at"] = backup.created_at.isoformat() if backup.created_at else None
+        return entry
+
+    @staticmethod
+    def _load_entry(entry: dict[str, Any]) -> BackupDetails:
+        created_at = entry.get("created_at")
+        return BackupDetails(
+            **{**entry, "created_at": datetime.fromisoformat(created_at) if created_at else None}
+        )
 
 
 class BackupManager:
@@ -1302,6 +2208,13 @@ class BackupManager:
     """
 
     REQUIRED_S3_PARAMETERS = ["bucket", "access-key", "secret-key", "endpoint"]
+    # The codec of compressed backups is stored in their metadata when they
+    # are uploaded, and their size before compression in a tag afterwards
+    COMPRESSION_METADATA_KEY = "compression"
+    ORIGINAL_SIZE_TAG = "original-size"
+    # Deduplicated backups are manifests of chunks, marked in their metadata
+    FORMAT_METADATA_KEY = "format"
+    CHUNKED_FORMAT = "chunked"
 
     def __init__(
         self,
@@ -1314,13 +2227,37 @@ class BackupManager:
         self._s3_requirer = s3_requirer
         self._relation_name = relation_name
 
-    def create_backup(self, vault_client: VaultClient) -> str:
+    def create_backup(
+        self,
+        vault_client: VaultClient,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_concurrency: int = DEFAULT_TRANSFER_CONCURRENCY,
+        compress: bool = False,
+        compression_level: int = DEFAULT_LEVEL,
+        deduplicate: bool = False,
+    ) -> UploadReport:
         """Create a backup of the Vault data.
 
-        Stores the backup in the S3 bucket provided by the S3 relation.
+        Streams the snapshot from Vault to the S3 bucket provided by the S3
+        relation, in parts uploaded concurrently, without holding the whole
+        snapshot in memory. When `compress` is set, the snapshot is compressed
+        as it is streamed, with zstd if available and gzip otherwise.
+
+        When `deduplicate` is set, the snapshot is instead split into
+        content-defined chunks, each stored once in the bucket, and the
+        backup is a manifest listing the chunks. The chunks are compressed
+        one by one, so that compression does not prevent deduplication.
+
+        Args:
+            vault_client: The Vault client to take the snapshot with
+            part_size: The size of the parts of the upload, in bytes
+            max_concurrency: The maximum number of parts or chunks uploaded at the same time
+            compress: Whether to compress the snapshot
+            compression_level: The compression level, clamped to the range of the codec
+            deduplicate: Whether to store the snapshot as deduplicated chunks
 
         Returns:
-            The S3 key of the backup.
+            The S3 key, the size and the duration of the upload of the backup.
         """
         self._validate_s3_prerequisites()
 
@@ -1341,25 +2278,184 @@ class BackupManager:
             raise ManagerError("Failed to create S3 bucket")
         backup_key = Naming.backup_s3_key_name(self._charm.model.name)
 
-        response = vault_client.create_snapshot()
-        content_uploaded = s3.upload_content(
-            content=response.raw,  # type: ignore[reportArgumentType]
-            bucket_name=s3_parameters["bucket"],
+        try:
+            response = vault_client.create_snapshot()
+        except VaultClientError as e:
+            logger.error("Failed to create snapshot: %s", e)
+            raise ManagerError("Failed to create snapshot")
+        snapshot = _HashingReader(response.raw)  # type: ignore[reportArgumentType]
+        codec = preferred_codec() if compress else None
+        try:
+            if deduplicate:
+                report, original_size = self._upload_chunked_snapshot(
+                    s3,
+                    s3_parameters["bucket"],
+                    backup_key,
+                    snapshot,
+                    codec,
+                    compression_level,
+                    max_concurrency,
+                )
+            else:
+                report, original_size = self._upload_snapshot(
+                    s3,
+                    s3_parameters["bucket"],
+                    backup_key,
+                    snapshot,
+                    codec,
+                    compression_level,
+                    part_size,
+                    max_concurrency,
+                )
+        except (S3Error, CompressionError, ChunkingError) as e:
+            logger.error("Failed to upload backup: %s", e)
+            raise ManagerError("Failed to upload backup to S3 bucket")
+        finally:
+            response.close()
+        if original_size is not None:
+            self._tag_original_size(s3, s3_parameters["bucket"], backup_key, original_size)
+        logger.info(
+            "Backup uploaded to S3 bucket %s (%d bytes in %.1fs)",
+            s3_parameters["bucket"],
+            report.size,
+            report.duration,
+        )
+        self._add_to_catalog(
+            s3, s3_parameters["bucket"], vault_client, report, original_size, snapshot.hexdigest()
+        )
+        return report
+
+    def _upload_snapshot(
+        self,
+        s3: S3,
+        bucket_name: str,
+        backup_key: str,
+        snapshot: IO[bytes],
+        codec: str | None,
+        compression_level: int,
+        part_size: int,
+        max_concurrency: int,
+    ) -> tuple[UploadReport, int | None]:
+        """Upload the snapshot as one object, compressed with the codec if any.
+
+        Returns:
+            The report of the upload, and the size of the snapshot if it was compressed.
+        """
+        compressor = CompressingReader(snapshot, codec, compression_level) if codec else None
+        report = s3.upload_stream(
+            content=compressor or snapshot,
+            bucket_name=bucket_name,
             key=backup_key,
+            part_size=part_size,
+            max_concurrency=max_concurrency,
+            metadata={self.COMPRESSION_METADATA_KEY: codec} if codec else {},
         )
-        if not content_uploaded:
-            raise ManagerError("Failed to upload backup to S3 bucket")
-        logger.info("Backup uploaded to S3 bucket %s", s3_parameters["bucket"])
-        return backup_key
+        return report, compressor.original_size if compressor else None
+
+    def _upload_chunked_snapshot(
+        self,
+        s3: S3,
+        bucket_name: str,
+        backup_key: str,
+        snapshot: IO[bytes],
+        codec: str | None,
+        compression_level: int,
+        max_concurrency: int,
+    ) -> tuple[UploadReport, int]:
+        """Upload the chunks of the snapshot missing from the bucket, and then its manifest.
+
+        Returns:
+            The report of the upload of the new chunks and of the manifest, and
+            the size of the snapshot.
+        """
+        start = time.monotonic()
+        upload = ChunkStore(s3, bucket_name, max_concurrency).upload(
+            snapshot, compression=codec, level=compression_level
+        )
+        manifest = upload.manifest.dumps()
+        metadata = {self.FORMAT_METADATA_KEY: self.CHUNKED_FORMAT}
+        if codec:
+            metadata[self.COMPRESSION_METADATA_KEY] = codec
+        s3.put_bytes(bucket_name=bucket_name, key=backup_key, content=manifest, metadata=metadata)
+        report = UploadReport(
+            key=backup_key,
+            size=upload.uploaded_size + len(manifest),
+            parts=upload.uploaded_chunks + 1,
+            duration=time.monotonic() - start,
+        )
+        return report, upload.manifest.size
+
+    def _add_to_catalog(
+        self,
+        s3: S3,
+        bucket_name: str,
+        vault_client: VaultClient,
+        report: UploadReport,
+        original_size: int | None,
+        checksum: str,
+    ) -> None:
+        """Add the backup to the backup catalog.
+
+        The backup can be restored without its entry, and rebuilding the
+        catalog adds it back, so failing to add it is not an error.
+        """
+        try:
+            obj = s3.get_object_details(bucket_name=bucket_name, object_key=report.key)
+            if not obj:
+                raise S3Error(f"Backup {report.key} not found")
+            backup = self._backup_details(obj)
+            _BackupCatalog(s3, bucket_name).add(
+                replace(
+                    backup,
+                    original_size=backup.original_size if original_size is None else original_size,
+                    checksum=checksum,
+                    duration=report.duration,
+                    vault_version=vault_client.status().version,
+                    node=self._charm.unit.name,
+                )
+            )
+        except S3Error as e:
+            logger.warning("Failed to add the backup to the backup catalog: %s", e)
 
-    def list_backups(self) -> list[str]:
-        """List all the backups available in the S3 bucket.
+    def _tag_original_size(
+        self, s3: S3, bucket_name: str, backup_key: str, original_size: int
+    ) -> None:
+        """Record the size of the snapshot in a tag of the backup, when S3 holds a different size.
 
-        Backups are identified by the key prefix from
-        ``Naming.backup_s3_key_prefix``.
+        The backup can be restored without the tag, so failing to set it is not an error.
+        """
+        try:
+            s3.set_object_tags(
+                bucket_name=bucket_name,
+                object_key=backup_key,
+                tags={self.ORIGINAL_SIZE_TAG: str(original_size)},
+            )
+        except S3Error as e:
+            logger.warning("Failed to record the original size of the backup: %s", e)
+
+    def list_backups(
+        self,
+        limit: int | None = None,
+        since: datetime | None = None,
+        model: str | None = None,
+        rebuild: bool = False,
+    ) -> list[BackupDetails]:
+        """List the backups available in the S3 bucket, from the most recent.
+
+        The backups are read from the backup catalog. If the catalog is
+        missing or invalid, or if `rebuild` is set, the catalog is rebuilt
+        from the objects with the key prefix from
+        ``Naming.backup_s3_key_prefix``, which takes a request per backup.
+
+        Args:
+            limit: The maximum number of backups to return, all if None
+            since: Only return the backups created at or after this time, in
+                UTC if it has no time zone
+            model: Only return the backups of this model
+            rebuild: Whether to rebuild the catalog from the objects in the bucket
 
         Returns:
-            A list of backup keys with the prefix.
+            The details of the backups.
         """
         self._validate_s3_prerequisites()
 
@@ -1375,20 +2471,75 @@ class BackupManager:
         except S3Error:
             raise ManagerError("Failed to create S3 session")
 
+        catalog = _BackupCatalog(s3, s3_parameters["bucket"])
         try:
-            backup_ids = s3.get_object_key_list(
-                bucket_name=s3_parameters["bucket"], prefix=Naming.backup_s3_key_prefix
-            )
+            backups = None if rebuild else catalog.load()
+            if backups is None:
+                logger.info("Rebuilding the backup catalog from the objects in the bucket")
+                backups = catalog.rebuild(self._scan_backups(s3, s3_parameters["bucket"]))
         except S3Error as e:
             raise ManagerError(f"Failed to list backups in S3 bucket: {e}")
-        return backup_ids
+        if since and not since.tzinfo:
+            since = since.replace(tzinfo=timezone.utc)
+        backups = [
+            backup
+            for backup in reversed(backups)
+            if (not model or backup.model == model)
+            and (not since or (backup.created_at and backup.created_at >= since))
+        ]
+        return backups[:limit] if limit is not None else backups
+
+    def _scan_backups(self, s3: S3, bucket_name: str) -> list[BackupDetails]:
+        """Describe the backups found in the bucket, with a request per backup."""
+        backup_ids = s3.get_object_key_list(
+            bucket_name=bucket_name, prefix=Naming.backup_s3_key_prefix
+        )
+        objects = [
+            s3.get_object_details(bucket_name=bucket_name, object_key=backup_id)
+            for backup_id in backup_ids
+        ]
+        return [self._backup_details(obj) for obj in objects if obj]
+
+    def _backup_details(self, obj: ObjectDetails) -> BackupDetails:
+        """Describe the backup stored in the S3 object."""
+        compression = obj.metadata.get(self.COMPRESSION_METADATA_KEY)
+        deduplicated = obj.metadata.get(self.FORMAT_METADATA_KEY) == self.CHUNKED_FORMAT
+        original_size = obj.size if not (compression or deduplicated) else None
+        if original_size is None and (tag := obj.tags.get(self.ORIGINAL_SIZE_TAG, "")).isdigit():
+            original_size = int(tag)
+        model, created_at = Naming.parse_backup_s3_key_name(obj.key) or (None, None)
+        return BackupDetails(
+            key=obj.key,
+            size=obj.size,
+            original_size=original_size,
+            compression=compression,
+            deduplicated=deduplicated,
+            created_at=created_at,
+            model=model,
+        )
 
-    def restore_backup(self, vault_client: VaultClient, backup_key: str) -> None:
+    def restore_backup(
+        self,
+        vault_client: VaultClient,
+        backup_key: str,
+        max_concurrency: int = DEFAULT_TRANSFER_CONCURRENCY,
+        spool_dir: str | None = None,
+    ) -> None:
         """Restore the Vault data from the backup using the ``vault_client`` provided.
 
+        The snapshot is downloaded from S3 with concurrent ranged requests into
+        a spool, verified against the size and the ETag of the backup, and
+        then streamed to Vault, decompressed on the fly if it was compressed.
+        For a deduplicated backup, the spool holds its manifest, and the
+        chunks it lists are downloaded concurrently and reassembled in a
+        second spool, verified against their digests.
+
         Args:
             vault_client: The Vault client to use for restoring the snapshot
             backup_key: The S3 key of the backup to restore
+            max_concurrency: The maximum number of parts or chunks downloaded at the same time
+            spool_dir: The directory of the spools that do not fit in memory,
+                the default temporary directory if None
         """
         self._validate_s3_prerequisites()
 
@@ -1405,19 +2556,36 @@ class BackupManager:
             raise ManagerError("Failed to create S3 session")
 
         try:
-            snapshot = s3.get_content(
+            backup = s3.download_to_spool(
                 bucket_name=s3_parameters["bucket"],
                 object_key=backup_key,
+                max_concurrency=max_concurrency,
+                spool_dir=spool_dir,
             )
         except S3Error as e:
             raise ManagerError(f"Failed to retrieve snapshot from S3: {e}")
-        if not snapshot:
+        if not backup:
             raise ManagerError("Snapshot not found in S3 bucket")
 
+        snapshot = backup.content
         try:
-            vault_client.restore_snapshot(snapshot=snapshot)
+            if backup.metadata.get(self.FORMAT_METADATA_KEY) == self.CHUNKED_FORMAT:
+                manifest = Manifest.loads(backup.content.read())
+                snapshot = ChunkStore(
+                    s3, s3_parameters["bucket"], max_concurrency
+                ).download_to_spool(manifest, spool_dir=spool_dir)
+            elif codec := backup.metadata.get(self.COMPRESSION_METADATA_KEY):
+                snapshot = DecompressingReader(backup.content, codec)
+            vault_client.restore_snapshot(snapshot=snapshot)  # type: ignore[reportArgumentType]
+        except (S3Error, ChunkingError) as e:
+            raise ManagerError(f"Failed to retrieve snapshot from S3: {e}")
+        except CompressionError as e:
+            raise ManagerError(f"Failed to decompress snapshot: {e}")
         except VaultClientError as e:
             raise ManagerError(f"Failed to restore snapshot: {e}")
+        finally:
+            snapshot.close()
+            backup.content.close()
 
     def _validate_s3_prerequisites(self) -> str | None:
         """Validate the S3 pre-requisites are met.
@@ -1522,6 +2690,7 @@ class ACMEManager:
         certificate_request_attributes: CertificateRequestAttributes,
         role_name: str,
         vault_address: str,
+        role_flags: PKIRoleFlags = PKIRoleFlags(),
     ):
         self._charm = charm
         self._juju_facade = JujuFacade(charm)
@@ -1531,6 +2700,7 @@ class ACMEManager:
         self._certificate_request_attributes = certificate_request_attributes
         self._role_name = role_name
         self._vault_address = vault_address
+        self._role_flags = role_flags
         self._pki_utils = _PKIUtils(vault_client, mount_point)
 
     def _get_acme_intermediate_ca_from_relation(
@@ -1588,16 +2758,50 @@ class ACMEManager:
         max_ttl = self._pki_utils.calculate_certificates_ttl(certificate_from_provider.certificate)
         if max_ttl != self._vault_client.get_role_max_ttl(
             role=self._role_name, mount=self._mount_point
-        ):
+        ) or self._pki_utils.role_flags_differ(self._role_name, self._role_flags):
             self._vault_client.create_or_update_acme_role(
                 role=self._role_name,
                 max_ttl=f"{max_ttl}s",
                 mount=self._mount_point,
+                role_flags=self._role_flags,
             )
 
-    def _enable_acme(self) -> None:
-        """Configure ACME to be enabled in Vault."""
-        self._vault_client.write(path=f"{self._mount_point}/config/acme", data={"enabled": True})
+    def _configure_acme_role_flags(self) -> None:
+        """Update the storage settings of the ACME role, keeping its TTL."""
+        if not self._pki_utils.role_flags_differ(self._role_name, self._role_flags):
+            return
+        max_ttl = self._vault_client.get_role_max_ttl(
+            role=self._role_name, mount=self._mount_point
+        )
+        if not max_ttl:
+            return
+        self._vault_client.create_or_update_acme_role(
+            role=self._role_name,
+            max_ttl=f"{max_ttl}s",
+            mount=self._mount_point,
+            role_flags=self._role_flags,
+        )
+
+    def _get_acme_config_entries(self) -> list[ConfigEntry]:
+        """Return the configuration of the PKI mount needed to serve ACME."""
+        return [
+            ConfigEntry(
+                path=f"sys/mounts/{self._mount_point}/tune",
+                data={"allowed_response_headers": ["Location", "Replay-Nonce", "Link"]},
+            ),
+            ConfigEntry(
+                path=f"{self._mount_point}/config/urls",
+                data={
+                    "issuing_certificates": [f"{self._vault_address}/v1/pki/ca"],
+                    "crl_distribution_points": [f"{self._vault_address}/v1/pki/crl"],
+                },
+            ),
+            ConfigEntry(
+                path=f"{self._mount_point}/config/cluster",
+                data={"path": f"{self._vault_address}/v1/{self._mount_point}"},
+            ),
+            ConfigEntry(path=f"{self._mount_point}/config/acme", data={"enabled": True}),
+        ]
 
     def make_latest_acme_issuer_default(self):
         """Make the latest issuer the default issuer."""
@@ -1614,26 +2818,21 @@ class ACMEManager:
                 TLS_CERTIFICATES_ACME_RELATION_NAME,
             )
             return
-        self._vault_client.enable_secrets_engine(SecretsBackend.PKI, self._mount_point)
+        reconciler = VaultReconciler(self._vault_client)
+        try:
+            reconciler.reconcile(
+                DesiredState(mounts=[Mount(self._mount_point, SecretsBackend.PKI)])
+            )
+        except VaultClientError as e:
+            logger.error("Failed to enable the ACME backend: %s", e)
+            return
 
         try:
             self._configure_intermediate_ca_certificate()
         except ManagerError:
+            self._configure_acme_role_flags()
             return
 
         self._configure_acme_role()
-
-        self._vault_client.allow_acme_headers(
-            mount=self._mount_point,
-        )
-        self._vault_client.set_urls(
-            issuing_certificates=[f"{self._vault_address}/v1/pki/ca"],
-            crl_distribution_points=[f"{self._vault_address}/v1/pki/crl"],
-            mount=self._mount_point,
-        )
-        self._vault_client.write(
-            path=f"{self._mount_point}/config/cluster",
-            data={"path": f"{self._vault_address}/v1/{self._mount_point}"},
-        )
-        self._enable_acme()
+        reconciler.reconcile(DesiredState(config_entries=self._get_acme_config_entries()))
         self.make_latest_acme_issuer_default()
@@ -14,8 +14,14 @@ Add the following dependencies to the charm's requirements.txt file:
 
 """
 
+import hashlib
 import logging
-from typing import IO, List, MutableMapping, cast
+import re
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import IO, Any, Callable, List, MutableMapping, TypeVar, cast
 
 import boto3
 from botocore.config import Config
@@ -40,6 +46,24 @@ logger = LogAdapter(logging.getLogger(__name__), {})
 
 AWS_DEFAULT_REGION = "us-east-1"
 
+MiB = 1024 * 1024
+# S3 rejects multipart uploads with parts smaller than 5 MiB, except for the last one
+MIN_PART_SIZE = 5 * MiB
+DEFAULT_PART_SIZE = 64 * MiB
+DEFAULT_TRANSFER_CONCURRENCY = 4
+# Each part being transferred holds one of the pooled connections
+MAX_TRANSFER_CONCURRENCY = 16
+PART_ATTEMPTS = 3
+PART_BACKOFF = 1.0
+# The part size of multipart uploads, kept in the object metadata to verify the ETag
+PART_SIZE_METADATA_KEY = "part-size"
+# Downloaded objects larger than this are spooled to a temporary file
+SPOOL_MAX_MEMORY = 64 * MiB
+
+_ETAG_PATTERN = re.compile(r'^"?([0-9a-f]{32})(?:-(\d+))?"?$')
+
+_T = TypeVar("_T")
+
 
 class S3Error(Exception):
     """Base class for S3 errors."""
@@ -47,6 +71,99 @@ class S3Error(Exception):
     pass
 
 
+@dataclass(frozen=True)
+class UploadReport:
+    """Summary of an upload to S3.
+
+    Attributes:
+        key: The key of the uploaded object.
+        size: The number of bytes uploaded.
+        parts: The number of parts the object was uploaded in.
+        duration: The time the upload took, in seconds.
+    """
+
+    key: str
+    size: int
+    parts: int
+    duration: float
+
+    @property
+    def throughput(self) -> float:
+        """The average upload rate, in bytes per second."""
+        return self.size / self.duration if self.duration > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class DownloadedObject:
+    """An object downloaded from S3.
+
+    Attributes:
+        content: The content of the object, positioned at its start.
+        size: The size of the object, in bytes.
+        metadata: The user-defined metadata of the object.
+    """
+
+    content: IO[bytes]
+    size: int
+    metadata: dict[str, str]
+
+
+@dataclass(frozen=True)
+class ObjectDetails:
+    """The description of an object stored in S3.
+
+    Attributes:
+        key: The key of the object.
+        size: The size of the object, in bytes.
+        metadata: The user-defined metadata of the object.
+        tags: The tags of the object.
+    """
+
+    key: str
+    size: int
+    metadata: dict[str, str]
+    tags: dict[str, str]
+
+
+def _read_part(content: IO[bytes], size: int) -> bytes:
+    """Read `size` bytes from the content, or less at the end of the content.
+
+    Streams may return fewer bytes than requested before their end, so this
+    reads until the part is complete.
+    """
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = content.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def _expected_etag(content: IO[bytes], part_size: int | None) -> str:
+    """Compute the ETag S3 gives to the content, for unencrypted objects.
+
+    The ETag of an object uploaded at once is the MD5 of its content. The
+    ETag of an object uploaded in parts is the MD5 of the MD5s of the parts,
+    followed by the number of parts.
+    """
+    content.seek(0)
+    if part_size is None:
+        digest = hashlib.md5(usedforsecurity=False)
+        while chunk := content.read(MiB):
+            digest.update(chunk)
+        content.seek(0)
+        return digest.hexdigest()
+    part_digests = []
+    while part := content.read(part_size):
+        part_digests.append(hashlib.md5(part, usedforsecurity=False).digest())
+    content.seek(0)
+    digest = hashlib.md5(b"".join(part_digests), usedforsecurity=False).hexdigest()
+    return f"{digest}-{len(part_digests)}"
+
+
 class S3:
     """A class representing an S3 session allowing S3 operations."""
 
@@ -71,6 +188,7 @@ class S3:
                 retries={
                     "max_attempts": 1,
                 },
+                max_pool_connections=MAX_TRANSFER_CONCURRENCY,
             )
             self.s3 = self.session.resource("s3", endpoint_url=self.endpoint, config=custom_config)
         except (ClientError, BotoCoreError, ValueError) as e:
@@ -148,6 +266,525 @@ class S3:
             logger.error("Error uploading content to bucket %s: %s", bucket_name, e)
             return False
 
+    def upload_stream(
+        self,
+        content: IO[bytes],
+        bucket_name: str,
+        key: str,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_concurrency: int = DEFAULT_TRANSFER_CONCURRENCY,
+        metadata: dict[str, str] | None = None,
+    ) -> UploadReport:
+        """Upload a stream to the provided S3 bucket, in parts uploaded concurrently.
+
+        The content is read one part at a time, and at most `max_concurrency`
+        parts are uploaded at the same time, so that at most
+        `max_concurrency + 1` parts are held in memory whatever the size of
+        the content. Each part is attempted `PART_ATTEMPTS` times. If
+        a part cannot be uploaded, or the content cannot be read, the
+        multipart upload is aborted, so that S3 does not keep the parts
+        already uploaded. Content that fits in one part is uploaded with a
+        single request.
+
+        Args:
+            content: File like object containing the content to upload.
+            bucket_name: S3 bucket name.
+            key: S3 object key.
+            part_size: The size of the parts, in bytes, at least `MIN_PART_SIZE`.
+            max_concurrency: The maximum number of parts uploaded at the same
+                time, at most `MAX_TRANSFER_CONCURRENCY`.
+            metadata: The user-defined metadata to store with the object.
+
+        Returns:
+            UploadReport: The size, the number of parts and the duration of the upload.
+
+        Raises:
+            S3Error: If the content could not be read or uploaded.
+        """
+        part_size = max(part_size, MIN_PART_SIZE)
+        max_concurrency = min(max(max_concurrency, 1), MAX_TRANSFER_CONCURRENCY)
+        metadata = metadata or {}
+        client = self.s3.meta.client
+        start = time.monotonic()
+        try:
+            first_part = _read_part(content, part_size)
+        except Exception as e:
+            logger.error("Error reading the content of %s: %s", key, e)
+            raise S3Error(f"Error reading the content of {key}: {e}") from e
+        if len(first_part) < part_size:
+            try:
+                client.put_object(Bucket=bucket_name, Key=key, Body=first_part, Metadata=metadata)
+            except (BotoCoreError, ClientError) as e:
+                logger.error("Error uploading content to bucket %s: %s", bucket_name, e)
+                raise S3Error(f"Error uploading {key} to bucket {bucket_name}: {e}")
+            return UploadReport(
+                key=key, size=len(first_part), parts=1, duration=time.monotonic() - start
+            )
+        try:
+            upload_id = client.create_multipart_upload(
+                Bucket=bucket_name,
+                Key=key,
+                Metadata={**metadata, PART_SIZE_METADATA_KEY: str(part_size)},
+            )["UploadId"]
+        except (BotoCoreError, ClientError) as e:
+            logger.error("Error starting the upload to bucket %s: %s", bucket_name, e)
+            raise S3Error(f"Error starting the upload of {key} to bucket {bucket_name}: {e}")
+        try:
+            size, etags = self._upload_parts(
+                content, first_part, bucket_name, key, upload_id, part_size, max_concurrency
+            )
+            client.complete_multipart_upload(
+                Bucket=bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={
+                    "Parts": [
+                        {"PartNumber": number, "ETag": etag}
+                        for number, etag in sorted(etags.items())
+                    ]
+                },
+            )
+        except Exception as e:
+            # Reading the content can fail with any error of its source
+            logger.error("Error uploading content to bucket %s, aborting: %s", bucket_name, e)
+            try:
+                client.abort_multipart_upload(Bucket=bucket_name, Key=key, UploadId=upload_id)
+            except (BotoCoreError, ClientError) as abort_error:
+                logger.warning("Failed to abort the upload of %s: %s", key, abort_error)
+            raise S3Error(f"Error uploading {key} to bucket {bucket_name}: {e}") from e
+        report = UploadReport(
+            key=key, size=size, parts=len(etags), duration=time.monotonic() - start
+        )
+        logger.info(
+            "Uploaded %s (%d bytes in %d parts) in %.1fs",
+            key,
+            report.size,
+            report.parts,
+            report.duration,
+        )
+        return report
+
+    def _upload_parts(
+        self,
+        content: IO[bytes],
+        first_part: bytes,
+        bucket_name: str,
+        key: str,
+        upload_id: str,
+        part_size: int,
+        max_concurrency: int,
+    ) -> tuple[int, dict[int, str]]:
+        """Upload the parts of the content concurrently.
+
+        Returns:
+            The number of bytes uploaded, and the ETag of each part by part number.
+        """
+        etags: dict[int, str] = {}
+        size = 0
+        part = first_part
+        part_number = 1
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            in_flight: dict[Future[str], int] = {}
+            try:
+                while part:
+                    if len(in_flight) >= max_concurrency:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            etags[in_flight.pop(future)] = future.result()
+                    in_flight[
+                        executor.submit(
+                            self._upload_part, part, bucket_name, key, upload_id, part_number
+                        )
+                    ] = part_number
+                    size += len(part)
+                    part_number += 1
+                    part = _read_part(content, part_size)
+                for future, number in in_flight.items():
+                    etags[number] = future.result()
+            except BaseException:
+                for future in in_flight:
+                    future.cancel()
+                raise
+        return size, etags
+
+    def _upload_part(
+        self, part: bytes, bucket_name: str, key: str, upload_id: str, part_number: int
+    ) -> str:
+        """Upload one part, retrying with a backoff, and return its ETag."""
+        return self._retry_part(
+            f"upload part {part_number} of {key}",
+            lambda: self.s3.meta.client.upload_part(
+                Bucket=bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=part,
+            )["ETag"],
+        )
+
+    def _retry_part(self, description: str, transfer: Callable[[], _T]) -> _T:
+        """Run the transfer of a part, attempting it up to `PART_ATTEMPTS` times."""
+        attempt = 1
+        while True:
+            try:
+                return transfer()
+            except (BotoCoreError, ClientError) as e:
+                if attempt == PART_ATTEMPTS:
+                    raise
+                logger.warning(
+                    "Failed to %s (attempt %d/%d): %s", description, attempt, PART_ATTEMPTS, e
+                )
+                time.sleep(PART_BACKOFF * 2 ** (attempt - 1))
+                attempt += 1
+
+    def download_to_spool(
+        self,
+        bucket_name: str,
+        object_key: str,
+        part_size: int = DEFAULT_PART_SIZE,
+        max_concurrency: int = DEFAULT_TRANSFER_CONCURRENCY,
+        spool_dir: str | None = None,
+    ) -> DownloadedObject | None:
+        """Download an object with concurrent ranged requests, into a spool.
+
+        The object is downloaded in parts of `part_size` bytes, or of the part
+        size it was uploaded with by `upload_stream`, with at most
+        `max_concurrency` parts requested at the same time. Each part is
+        attempted `PART_ATTEMPTS` times. The parts are written to a spool kept
+        in memory up to `SPOOL_MAX_MEMORY` bytes, and in a temporary file in
+        `spool_dir` beyond. The size of the spool is then checked against
+        the size of the object, and its MD5 against the ETag of the object,
+        unless the object is encrypted with a key S3 does not derive the ETag
+        from, or was uploaded in parts of an unknown size.
+
+        Args:
+            bucket_name: S3 bucket name.
+            object_key: S3 object key.
+            part_size: The size of the ranges requested, in bytes, for objects
+                without a recorded part size.
+            max_concurrency: The maximum number of ranges requested at the
+                same time, at most `MAX_TRANSFER_CONCURRENCY`.
+            spool_dir: The directory of the temporary file, the default
+                temporary directory if None.
+
+        Returns:
+            The spool, the size and the metadata of the object, or None if the
+            object does not exist.
+
+        Raises:
+            S3Error: If the object could not be downloaded or does not match its size or ETag.
+        """
+        client = self.s3.meta.client
+        try:
+            head = client.head_object(Bucket=bucket_name, Key=object_key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NoSuchBucket"):  # type: ignore[reportTypedDictNotRequiredAccess]
+                logger.error("Object %s does not exist.", object_key)
+                return None
+            raise S3Error(f"Error getting object {object_key} from bucket {bucket_name}: {e}")
+        except BotoCoreError as e:
+            raise S3Error(f"Error getting object {object_key} from bucket {bucket_name}: {e}")
+        size = head["ContentLength"]
+        metadata = head.get("Metadata", {})
+        recorded_part_size = metadata.get(PART_SIZE_METADATA_KEY)
+        if recorded_part_size and recorded_part_size.isdigit():
+            part_size = int(recorded_part_size)
+        part_size = max(part_size, MIN_PART_SIZE)
+        max_concurrency = min(max(max_concurrency, 1), MAX_TRANSFER_CONCURRENCY)
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY, dir=spool_dir)
+        try:
+            written = self._download_parts(
+                spool, bucket_name, object_key, size, part_size, max_concurrency
+            )
+            if written != size:
+                raise S3Error(f"Downloaded {written} bytes of {object_key}, expected {size}")
+            self._verify_etag(spool, head, recorded_part_size)
+        except (BotoCoreError, ClientError, OSError) as e:
+            spool.close()
+            raise S3Error(f"Error getting object {object_key} from bucket {bucket_name}: {e}")
+        except S3Error:
+            spool.close()
+            raise
+        spool.seek(0)
+        return DownloadedObject(content=cast(IO[bytes], spool), size=size, metadata=metadata)
+
+    def _download_parts(
+        self,
+        spool: IO[bytes],
+        bucket_name: str,
+        object_key: str,
+        size: int,
+        part_size: int,
+        max_concurrency: int,
+    ) -> int:
+        """Download the ranges of the object concurrently and write them to the spool.
+
+        Returns:
+            The number of bytes written.
+        """
+        written = 0
+        ranges = iter(range(0, size, part_size))
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            in_flight: dict[Future[bytes], int] = {}
+            try:
+                for start in ranges:
+                    if len(in_flight) >= max_concurrency:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            written += self._write_part(spool, in_flight.pop(future), future)
+                    end = min(start + part_size, size) - 1
+                    future = executor.submit(
+                        self._retry_part,
+                        f"download bytes {start}-{end} of {object_key}",
+                        lambda start=start, end=end: self.s3.meta.client.get_object(
+                            Bucket=bucket_name, Key=object_key, Range=f"bytes={start}-{end}"
+                        )["Body"].read(),
+                    )
+                    in_flight[future] = start
+                for future, start in in_flight.items():
+                    written += self._write_part(spool, start, future)
+            except BaseException:
+                for future in in_flight:
+                    future.cancel()
+                raise
+        return written
+
+    @staticmethod
+    def _write_part(spool: IO[bytes], start: int, future: Future[bytes]) -> int:
+        """Write a downloaded part at its offset in the spool and return its size."""
+        part = future.result()
+        spool.seek(start)
+        spool.write(part)
+        return len(part)
+
+    @staticmethod
+    def _verify_etag(spool: IO[bytes], head: Any, recorded_part_size: str | None) -> None:
+        """Check the spool against the ETag of the object, when it is an MD5 digest."""
+        match = _ETAG_PATTERN.match(head.get("ETag", ""))
+        if not match or head.get("SSECustomerAlgorithm") or head.get("SSEKMSKeyId"):
+            logger.warning("The ETag of the object is not a digest, not verifying its content")
+            return
+        part_size = None
+        if match.group(2):
+            if not (recorded_part_size and recorded_part_size.isdigit()):
+                logger.warning("The part size of the object is unknown, not verifying its content")
+                return
+            part_size = int(recorded_part_size)
+        expected = _expected_etag(spool, part_size)
+        if expected != match.group(0).strip('"'):
+            raise S3Error(f"Downloaded content does not match the ETag ({expected})")
+
+    def put_bytes(
+        self,
+        bucket_name: str,
+        key: str,
+        content: bytes,
+        metadata: dict[str, str] | None = None,
+    ) -> None:
+        """Upload content held in memory with a single request.
+
+        The request is attempted `PART_ATTEMPTS` times.
+
+        Args:
+            bucket_name: S3 bucket name.
+            key: S3 object key.
+            content: The content of the object.
+            metadata: The user-defined metadata to store with the object.
+
+        Raises:
+            S3Error: If the content could not be uploaded.
+        """
+        try:
+            self._retry_part(
+                f"upload {key}",
+                lambda: self.s3.meta.client.put_object(
+                    Bucket=bucket_name, Key=key, Body=content, Metadata=metadata or {}
+                ),
+            )
+        except (BotoCoreError, ClientError) as e:
+            logger.error("Error uploading content to bucket %s: %s", bucket_name, e)
+            raise S3Error(f"Error uploading {key} to bucket {bucket_name}: {e}")
+
+    def get_bytes(self, bucket_name: str, object_key: str) -> bytes:
+        """Download the content of an object into memory with a single request.
+
+        The request is attempted `PART_ATTEMPTS` times.
+
+        Args:
+            bucket_name: S3 bucket name.
+            object_key: S3 object key.
+
+        Returns:
+            The content of the object.
+
+        Raises:
+            S3Error: If the object does not exist or could not be downloaded.
+        """
+        try:
+            return self._retry_part(
+                f"download {object_key}",
+                lambda: self.s3.meta.client.get_object(Bucket=bucket_name, Key=object_key)[
+                    "Body"
+                ].read(),
+            )
+        except (BotoCoreError, ClientError) as e:
+            logger.error("Error getting object %s from bucket %s: %s", object_key, bucket_name, e)
+            raise S3Error(f"Error getting object {object_key} from bucket {bucket_name}: {e}")
+
+    def get_bytes_and_etag(self, bucket_name: str, object_key: str) -> tuple[bytes, str] | None:
+        """Download the content of an object into memory, with the ETag of that content.
+
+        The ETag can be passed to `put_bytes_if_match` to replace the object
+        only if it has not changed since.
+
+        Args:
+            bucket_name: S3 bucket name.
+            object_key: S3 object key.
+
+        Returns:
+            The content and the ETag of the object, or None if the object does not exist.
+
+        Raises:
+            S3Error: If the object could not be downloaded.
+        """
+        try:
+            response = self.s3.meta.client.get_object(Bucket=bucket_name, Key=object_key)
+            return response["Body"].read(), response["ETag"]
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NoSuchBucket"):  # type: ignore[reportTypedDictNotRequiredAccess]
+                return None
+            logger.error("Error getting object %s from bucket %s: %s", object_key, bucket_name, e)
+            raise S3Error(f"Error getting object {object_key} from bucket {bucket_name}: {e}")
+        except BotoCoreError as e:
+            logger.error("Error getting object %s from bucket %s: %s", object_key, bucket_name, e)
+            raise S3Error(f"Error getting object {object_key} from bucket {bucket_name}: {e}")
+
+    def put_bytes_if_match(
+        self, bucket_name: str, key: str, content: bytes, etag: str | None
+    ) -> bool:
+        """Replace an object only if it has not changed since it was read.
+
+        The object is written with a conditional request: if its ETag is
+        still `etag`, or if it still does not exist when `etag` is None. S3
+        servers that do not implement conditional writes get an unconditional
+        write instead.
+
+        Args:
+            bucket_name: S3 bucket name.
+            key: S3 object key.
+            content: The new content of the object.
+            etag: The ETag the object was read with, or None if it did not exist.
+
+        Returns:
+            True if the object was written, False if it changed in the meantime.
+
+        Raises:
+            S3Error: If the object could not be written.
+        """
+        client = self.s3.meta.client
+        try:
+            if etag:
+                client.put_object(Bucket=bucket_name, Key=key, Body=content, IfMatch=etag)
+            else:
+                client.put_object(Bucket=bucket_name, Key=key, Body=content, IfNoneMatch="*")
+            return True
+        except ClientError as e:
+            code = e.response["Error"]["Code"]  # type: ignore[reportTypedDictNotRequiredAccess]
+            if code in ("PreconditionFailed", "ConditionalRequestConflict"):
+                return False
+            if code != "NotImplemented":
+                logger.error("Error uploading content to bucket %s: %s", bucket_name, e)
+                raise S3Error(f"Error uploading {key} to bucket {bucket_name}: {e}")
+            logger.warning(
+                "Conditional writes are not supported, replacing %s unconditionally", key
+            )
+        except BotoCoreError as e:
+            logger.error("Error uploading content to bucket %s: %s", bucket_name, e)
+            raise S3Error(f"Error uploading {key} to bucket {bucket_name}: {e}")
+        self.put_bytes(bucket_name=bucket_name, key=key, content=content)
+        return True
+
+    def set_object_tags(self, bucket_name: str, object_key: str, tags: dict[str, str]) -> None:
+        """Replace the tags of an object.
+
+        Unlike the metadata, the tags can be set once the object is uploaded.
+
+        Args:
+            bucket_name: S3 bucket name.
+            object_key: S3 object key.
+            tags: The tags of the object.
+
+        Raises:
+            S3Error: If the tags could not be set.
+        """
+        try:
+            self.s3.meta.client.put_object_tagging(
+                Bucket=bucket_name,
+                Key=object_key,
+                Tagging={"TagSet": [{"Key": key, "Value": value} for key, value in tags.items()]},
+            )
+        except (BotoCoreError, ClientError) as e:
+            logger.error("Error tagging object %s in bucket %s: %s", object_key, bucket_name, e)
+            raise S3Error(f"Error tagging object {object_key} in bucket {bucket_name}: {e}")
+
+    def get_object_details(self, bucket_name: str, object_key: str) -> ObjectDetails | None:
+        """Get the size, the metadata and the tags of an object.
+
+        Objects whose tags cannot be read, for instance because the S3 server
+        does not support tagging, are described without tags.
+
+        Args:
+            bucket_name: S3 bucket name.
+            object_key: S3 object key.
+
+        Returns:
+            The details of the object, or None if the object does not exist.
+
+        Raises:
+            S3Error: If the object could not be described.
+        """
+        client = self.s3.meta.client
+        try:
+            head = client.head_object(Bucket=bucket_name, Key=object_key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NoSuchBucket"):  # type: ignore[reportTypedDictNotRequiredAccess]
+                logger.error("Object %s does not exist.", object_key)
+                return None
+            raise S3Error(f"Error getting object {object_key} from bucket {bucket_name}: {e}")
+        except BotoCoreError as e:
+            raise S3Error(f"Error getting object {object_key} from bucket {bucket_name}: {e}")
+        try:
+            tag_set = client.get_object_tagging(Bucket=bucket_name, Key=object_key)["TagSet"]
+        except (BotoCoreError, ClientError) as e:
+            logger.warning("Failed to get the tags of object %s: %s", object_key, e)
+            tag_set = []
+        return ObjectDetails(
+            key=object_key,
+            size=head["ContentLength"],
+            metadata=head.get("Metadata", {}),
+            tags={tag["Key"]: tag["Value"] for tag in tag_set},
+        )
+
+    def object_exists(self, bucket_name: str, object_key: str) -> bool:
+        """Return whether an object exists, with a single HEAD request.
+
+        Args:
+            bucket_name: S3 bucket name.
+            object_key: S3 object key.
+
+        Raises:
+            S3Error: If the object could not be looked up.
+        """
+        try:
+            self.s3.meta.client.head_object(Bucket=bucket_name, Key=object_key)
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):  # type: ignore[reportTypedDictNotRequiredAccess]
+                return False
+            raise S3Error(f"Error looking up object {object_key} in bucket {bucket_name}: {e}")
+        except BotoCoreError as e:
+            raise S3Error(f"Error looking up object {object_key} in bucket {bucket_name}: {e}")
+        return True
+
     def get_object_key_list(self, bucket_name: str, prefix: str) -> List[str]:
         """Get list of object key in an S3 bucket.
 
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# Copyright 2025 Canonical Ltd.
+# Licensed under the Apache2.0. See LICENSE file in charm source for details.
+
+"""Library for running a charm's reconcile once per Juju dispatch.
+
+A single dispatch can emit several events that all lead to the same
+reconcile: deferred events are re-emitted before the Juju event, and charm
+libraries emit their own custom events while handling it. Observing each of
+these events with the reconcile handler runs the full reconcile back to back.
+
+The `ReconcileScheduler` observes these events instead. Each one marks the
+charm as needing a reconcile, and the reconcile runs once, before the charm's
+status is collected at the end of the dispatch. The events that triggered it
+are passed to the reconcile so that it can do targeted work for them.
+
+## Usage
+
+The scheduler must be created before the charm observes `collect_unit_status`,
+so that the status reflects the outcome of the reconcile:
+
+    self.reconcile_scheduler = ReconcileScheduler(
+        self,
+        events=[self.on.config_changed, self.on.update_status],
+        reconcile=self._configure,
+    )
+    self.framework.observe(self.on.collect_unit_status, self._on_collect_status)
+"""
+
+import logging
+from typing import Callable, Iterable, List, MutableMapping
+
+from ops.charm import CharmBase
+from ops.framework import BoundEvent, EventBase, Object
+
+
+class LogAdapter(logging.LoggerAdapter):
+    """Adapter for the logger to prepend a prefix to all log lines."""
+
+    prefix = "vault_scheduler"
+
+    def process(self, msg: str, kwargs: MutableMapping) -> tuple[str, MutableMapping]:
+        """Decides the format for the prepended text."""
+        return f"[{self.prefix}] {msg}", kwargs
+
+
+logger = LogAdapter(logging.getLogger(__name__), {})
+
+
+class ReconcileScheduler(Object):
+    """Coalesces the events of a dispatch into a single call to the reconcile."""
+
+    def __init__(
+        self,
+        charm: CharmBase,
+        events: Iterable[BoundEvent],
+        reconcile: Callable[[List[EventBase]], None],
+    ):
+        super().__init__(charm, "reconcile-scheduler")
+        self._reconcile = reconcile
+        self._triggers: List[EventBase] = []
+        for event in events:
+            self.framework.observe(event, self._on_trigger)
+        self.framework.observe(charm.on.collect_app_status, self._on_end_of_dispatch)
+        self.framework.observe(charm.on.collect_unit_status, self._on_end_of_dispatch)
+        self.framework.observe(self.framework.on.pre_commit, self._on_end_of_dispatch)
+
+    @property
+    def is_dirty(self) -> bool:
+        """Return whether an event has requested a reconcile that has not run yet."""
+        return bool(self._triggers)
+
+    def _on_trigger(self, event: EventBase) -> None:
+        """Mark the charm as needing a reconcile."""
+        logger.debug("Reconcile requested by %s", event.handle.kind)
+        self._triggers.append(event)
+
+    def _on_end_of_dispatch(self, _: EventBase) -> None:
+        """Run the reconcile once for all the events that requested it."""
+        if not self._triggers:
+            return
+        triggers, self._triggers = self._triggers, []
+        logger.info(
+            "Reconciling once for %d event(s): %s",
+            len(triggers),
+            ", ".join(sorted({trigger.handle.kind for trigger in triggers})),
+        )
+        self._reconcile(triggers)
@@ -8,7 +8,9 @@
 import json
 import logging
 import socket
+import time
 from contextlib import contextmanager
+from dataclasses import asdict
 from datetime import datetime
 from typing import Any, Dict, List
 
@@ -23,16 +25,28 @@ from charms.tls_certificates_interface.v4.tls_certificates import (
 )
 from charms.traefik_k8s.v2.ingress import IngressPerAppRequirer
 from charms.vault_k8s.v0.vault_kv import (
+    KVRequest,
+    NewVaultKvClientAttachedEvent,
     VaultKvClientDetachedEvent,
     VaultKvProvides,
 )
 from ops import ActionEvent, BlockedStatus, ErrorStatus
-from ops.charm import CharmBase, CollectStatusEvent, RemoveEvent
+from ops.charm import (
+    CharmBase,
+    CollectStatusEvent,
+    ConfigChangedEvent,
+    LeaderElectedEvent,
+    RemoveEvent,
+    UpdateStatusEvent,
+    UpgradeCharmEvent,
+)
+from ops.framework import EventBase, StoredState
 from ops.main import main
 from ops.model import ActiveStatus, MaintenanceStatus, Relation, WaitingStatus
 from vault.juju_facade import (
     JujuFacade,
     NoSuchSecretError,
+    NoSuchStorageError,
     SecretRemovedError,
 )
 from vault.vault_autounseal import (
@@ -42,11 +56,16 @@ from vault.vault_autounseal import (
 from vault.vault_client import (
     AppRole,
     AuditDeviceType,
+    PeerCircuitBreaker,
+    PKIRoleFlags,
+    RequestBudget,
     SecretsBackend,
     Token,
     VaultClient,
     VaultClientError,
+    VaultReadCache,
 )
+from vault.vault_compression import DEFAULT_LEVEL as DEFAULT_COMPRESSION_LEVEL
 from vault.vault_helpers import (
     common_name_config_is_valid,
     config_file_content_matches,
@@ -56,6 +75,7 @@ from vault.vault_helpers import (
 from vault.vault_managers import (
     TLS_CERTIFICATES_ACME_RELATION_NAME,
     ACMEManager,
+    AppRoleTokenManager,
     AutounsealConfigurationDetails,
     AutounsealProviderManager,
     AutounsealRequirerManager,
@@ -65,9 +85,13 @@ from vault.vault_managers import (
     ManagerError,
     PKIManager,
     RaftManager,
+    TidyManager,
     TLSManager,
     VaultCertsError,
+    destroy_role_secret_ids,
 )
+from vault.vault_s3 import MiB
+from vault.vault_scheduler import ReconcileScheduler
 
 from machine import Machine
 
@@ -77,6 +101,8 @@ AUTOUNSEAL_MOUNT_PATH = "charm-autounseal"
 AUTOUNSEAL_PROVIDES_RELATION_NAME = "vault-autounseal-provides"
 AUTOUNSEAL_REQUIRES_RELATION_NAME = "vault-autounseal-requires"
 BACKUP_KEY_PREFIX = "vault-backup"
+# Storage on which the restored backups are held
+BACKUP_SPOOL_STORAGE_NAME = "vault"
 CONFIG_TEMPLATE_DIR_PATH = "src/templates/"
 CONFIG_TEMPLATE_NAME = "vault.hcl.j2"
 KV_RELATION_NAME = "vault-kv"
@@ -85,6 +111,7 @@ MACHINE_TLS_FILE_DIRECTORY_PATH = "/var/snap/vault/common/certs"
 METRICS_ALERT_RULES_PATH = "./src/prometheus_alert_rules"
 PEER_RELATION_NAME = "vault-peers"
 PKI_RELATION_NAME = "vault-pki"
+PKI_ROLE_FLAGS_KEY = "pki_role_flags"
 REQUIRED_S3_PARAMETERS = ["bucket", "access-key", "secret-key", "endpoint"]
 S3_RELATION_NAME = "s3-parameters"
 TLS_CERTIFICATES_PKI_RELATION_NAME = "tls-certificates-pki"
@@ -100,6 +127,10 @@ VAULT_PKI_ROLE = "charm-pki"
 ACME_MOUNT = "charm-acme"
 ACME_ROLE_NAME = "charm-acme"
 VAULT_PORT = 8200
+# Interval between full syncs of every vault-kv relation, in seconds
+VAULT_KV_SWEEP_INTERVAL = 3600
+# Time budget for the requests sent to Vault in a single dispatch, in seconds
+VAULT_REQUEST_BUDGET = 180
 VAULT_SNAP_CHANNEL = "1.17/stable"
 VAULT_SNAP_NAME = "vault"
 VAULT_SNAP_REVISION = "2354"
@@ -110,9 +141,21 @@ INGRESS_RELATION_NAME = "ingress"
 class VaultOperatorCharm(CharmBase):
     """Machine Charm for Vault."""
 
+    _stored = StoredState()
+
     def __init__(self, *args: Any):
         super().__init__(*args)
         self.juju_facade = JujuFacade(self)
+        self._stored.set_default(
+            vault_peer_circuits={},
+            vault_kv_last_sweep=0.0,
+            vault_kv_pending_requests={},
+            vault_kv_verified_roles={},
+        )
+        PeerCircuitBreaker.load(self._stored.vault_peer_circuits, local_url=self._api_address)
+        RequestBudget.set(VAULT_REQUEST_BUDGET)
+        VaultReadCache.enable()
+        self.framework.observe(self.framework.on.pre_commit, self._on_pre_commit)
         self.machine = Machine()
         self._cos_agent = COSAgentProvider(
             self,
@@ -162,8 +205,6 @@ class VaultOperatorCharm(CharmBase):
             refresh_events=[self.on.config_changed],
         )
         self.s3_requirer = S3Requirer(self, S3_RELATION_NAME)
-        self.framework.observe(self.on.collect_unit_status, self._on_collect_status)
-        self.framework.observe(self.on.remove, self._on_remove)
         self.vault_autounseal_provides = VaultAutounsealProvides(
             self, AUTOUNSEAL_PROVIDES_RELATION_NAME
         )
@@ -172,6 +213,8 @@ class VaultOperatorCharm(CharmBase):
         )
         configure_events = [
             self.on.config_changed,
+            self.on.leader_elected,
+            self.on.upgrade_charm,
             self.on[PEER_RELATION_NAME].relation_created,
             self.on[PEER_RELATION_NAME].relation_changed,
             self.on.install,
@@ -184,8 +227,11 @@ class VaultOperatorCharm(CharmBase):
             self.on.tls_certificates_pki_relation_joined,
             self.vault_kv.on.new_vault_kv_client_attached,
         ]
-        for event in configure_events:
-            self.framework.observe(event, self._configure)
+        self.reconcile_scheduler = ReconcileScheduler(
+            self, events=configure_events, reconcile=self._configure
+        )
+        self.framework.observe(self.on.collect_unit_status, self._on_collect_status)
+        self.framework.observe(self.on.remove, self._on_remove)
         self.framework.observe(
             self.vault_kv.on.vault_kv_client_detached, self._on_vault_kv_client_detached
         )
@@ -198,30 +244,30 @@ class VaultOperatorCharm(CharmBase):
         self.framework.observe(self.on.restore_backup_action, self._on_restore_backup_action)
 
     def _on_vault_kv_client_detached(self, event: VaultKvClientDetachedEvent):
-        KVManager.remove_unit_credentials(self.juju_facade, event.unit_name)
+        KVManager.remove_unit_credentials(
+            self.juju_facade, event.unit_name, self._stored.vault_kv_verified_roles
+        )
 
     def _get_active_vault_client(self) -> VaultClient | None:
         """Return a client for the _active_ vault service.
 
         This may not be the Vault service running on this unit.
         """
-        for address in self._get_peer_relation_node_api_addresses():
-            try:
-                vault = VaultClient(
-                    address, ca_cert_path=self.tls.get_tls_file_path_in_charm(File.CA)
-                )
-            except VaultCertsError as e:
-                logger.warning("Failed to get Vault client: %s", e)
-                continue
-            if vault.is_active():
-                if not vault.is_api_available():
-                    return None
-                if not (approle := self._get_vault_approle_secret()):
-                    return None
-                if not vault.authenticate(approle):
-                    return None
-                return vault
-        return None
+        try:
+            ca_cert_path = self.tls.get_tls_file_path_in_charm(File.CA)
+        except VaultCertsError as e:
+            logger.warning("Failed to get Vault client: %s", e)
+            return None
+        vault = VaultClient.find_active(self._get_peer_relation_node_api_addresses(), ca_cert_path)
+        if not vault:
+            return None
+        if not vault.is_api_available():
+            return None
+        if not (approle := self._get_vault_approle_secret()):
+            return None
+        if not AppRoleTokenManager(self).authenticate(vault, approle):
+            return None
+        return vault
 
     def _get_authenticated_vault_client(self) -> VaultClient | None:
         """Return an authenticate vault client.
@@ -241,7 +287,7 @@ class VaultOperatorCharm(CharmBase):
         approle = self._get_vault_approle_secret()
         if not approle:
             return None
-        if not vault.authenticate(approle):
+        if not AppRoleTokenManager(self).authenticate(vault, approle):
             return None
         if not vault.is_active_or_standby():
             return None
@@ -362,13 +408,20 @@ class VaultOperatorCharm(CharmBase):
                 policies=[VAULT_CHARM_POLICY_NAME, VAULT_DEFAULT_POLICY_NAME],
                 token_ttl="1h",
                 token_max_ttl="1h",
+                token_type=(
+                    "batch"
+                    if self.juju_facade.get_bool_config("charm_batch_tokens")
+                    else "default"
+                ),
             )
+            superseded_accessors = vault.list_role_secret_id_accessors("charm")
             vault_secret_id = vault.generate_role_secret_id(name="charm")
             self.juju_facade.set_app_secret_content(
                 content={"role-id": role_id, "secret-id": vault_secret_id},
                 label=VAULT_CHARM_APPROLE_SECRET_LABEL,
                 description="The authentication details for the charm's access to vault.",
             )
+            destroy_role_secret_ids(vault, "charm", superseded_accessors)
             event.set_results(
                 {"result": "Charm authorized successfully. You may now remove the secret."}
             )
@@ -406,6 +459,10 @@ class VaultOperatorCharm(CharmBase):
             ca_cert_path=self.tls.get_tls_file_path_in_charm(File.CA),
         )
 
+    def _on_pre_commit(self, _: EventBase) -> None:
+        """Keep the state of the Vault nodes' circuit breakers for the next dispatches."""
+        self._stored.vault_peer_circuits = PeerCircuitBreaker.dump()
+
     def _on_collect_status(self, event: CollectStatusEvent):  # noqa: C901
         """Handle the collect status event."""
         if self.juju_facade.relation_exists(
@@ -481,15 +538,19 @@ class VaultOperatorCharm(CharmBase):
                 BlockedStatus("Please authorize charm (see `authorize-charm` action)")
             )
             return
-        event.add_status(ActiveStatus())
+        event.add_status(ActiveStatus(self._get_pki_role_flags_status_message()))
 
-    def _configure(self, _):  # noqa: C901
-        """Handle Vault installation.
+    def _configure(self, triggers: List[EventBase]) -> None:  # noqa: C901
+        """Handle Vault installation, once per dispatch.
 
         This includes:
           - Installing the Vault snap
           - Generating the Vault config file
+
+        Args:
+            triggers: The events of this dispatch that requested the reconcile.
         """
+        self._queue_vault_kv_requests(triggers)
         self._create_backend_directory()
         self._create_certs_directory()
         try:
@@ -521,9 +582,11 @@ class VaultOperatorCharm(CharmBase):
             return
         self._configure_pki_secrets_engine(vault)
         self._configure_acme_server(vault)
+        self._record_pki_role_flags(vault)
         self._sync_vault_autounseal(vault)
-        self._sync_vault_kv(vault)
+        self._sync_vault_kv(vault, triggers)
         self._sync_vault_pki(vault)
+        self._tidy_vault(vault, triggers)
 
         if not self._api_address or not self.tls.tls_file_available_in_charm(File.CA):
             return
@@ -550,36 +613,89 @@ class VaultOperatorCharm(CharmBase):
         Args:
             event: ActionEvent
         """
+        # Transferring the snapshot takes as long as its size requires
+        RequestBudget.set(None)
         vault_client = self._get_authenticated_vault_client()
         if not vault_client:
             event.fail(message="Failed to initialize Vault client.")
             return
         try:
             manager = BackupManager(self, self.s3_requirer, S3_RELATION_NAME)
-            backup_key = manager.create_backup(vault_client)
+            report = manager.create_backup(
+                vault_client,
+                part_size=(self.juju_facade.get_int_config("backup_upload_part_size") or 0) * MiB,
+                max_concurrency=self.juju_facade.get_int_config("backup_upload_concurrency") or 1,
+                compress=bool(self.juju_facade.get_bool_config("backup_compression")),
+                compression_level=self.juju_facade.get_int_config("backup_compression_level")
+                or DEFAULT_COMPRESSION_LEVEL,
+                deduplicate=bool(self.juju_facade.get_bool_config("backup_deduplication")),
+            )
         except ManagerError as e:
             logger.error("Failed to create backup: %s", e)
             event.fail(message=f"Failed to create backup: {e}")
             return
-        event.set_results({"backup-id": backup_key})
+        event.set_results(
+            {
+                "backup-id": report.key,
+                "size": str(report.size),
+                "duration": f"{report.duration:.1f}s",
+                "throughput": f"{report.throughput / MiB:.1f} MiB/s",
+            }
+        )
 
     def _on_list_backups_action(self, event: ActionEvent) -> None:
         """Handle the list-backups action.
 
-        Lists all backups stored in S3 bucket.
+        Lists the backups stored in S3 bucket, from the backup catalog.
 
         Args:
             event: ActionEvent
         """
+        since = None
+        if since_param := event.params.get("since"):
+            try:
+                since = datetime.fromisoformat(since_param)
+            except ValueError:
+                event.fail(message=f"Invalid since parameter: {since_param}")
+                return
         try:
             manager = BackupManager(self, self.s3_requirer, S3_RELATION_NAME)
-            backup_ids = manager.list_backups()
+            backups = manager.list_backups(
+                limit=event.params.get("limit"),
+                since=since,
+                model=event.params.get("model"),
+                rebuild=event.params.get("rebuild-catalog", False),
+            )
         except ManagerError as e:
             logger.error("Failed to list backups: %s", e)
             event.fail(message=f"Failed to list backups: {e}")
             return
 
-        event.set_results({"backup-ids": json.dumps(backup_ids)})
+        event.set_results(
+            {
+                "backup-ids": json.dumps([backup.key for backup in backups]),
+                "backups": json.dumps(
+                    [
+                        {
+                            "id": backup.key,
+                            "size": backup.size,
+                            "original-size": backup.original_size,
+                            "compression": backup.compression,
+                            "deduplicated": backup.deduplicated,
+                            "created-at": (
+                                backup.created_at.isoformat() if backup.created_at else None
+                            ),
+                            "model": backup.model,
+                            "checksum": backup.checksum,
+                            "duration": backup.duration,
+                            "vault-version": backup.vault_version,
+                            "node": backup.node,
+                        }
+                        for backup in backups
+                    ]
+                ),
+            }
+        )
 
     def _on_restore_backup_action(self, event: ActionEvent) -> None:
         """Handle the restore-backup action.
@@ -589,6 +705,8 @@ class VaultOperatorCharm(CharmBase):
         Args:
             event: ActionEvent
         """
+        # Transferring the snapshot takes as long as its size requires
+        RequestBudget.set(None)
         vault_client = self._get_active_vault_client()
         if not vault_client:
             event.fail(message="Failed to initialize an active Vault client.")
@@ -597,13 +715,21 @@ class VaultOperatorCharm(CharmBase):
         # This should be enforced by Juju/charmcraft.yaml, but we assert here
         # to make the typechecker happy
         assert isinstance(key, str)
+        download_concurrency = self.juju_facade.get_int_config("backup_download_concurrency")
         try:
             manager = BackupManager(self, self.s3_requirer, S3_RELATION_NAME)
-            manager.restore_backup(vault_client, key)
+            manager.restore_backup(
+                vault_client,
+                key,
+                max_concurrency=download_concurrency or 1,
+                spool_dir=self._get_backup_spool_dir(),
+            )
         except ManagerError as e:
             logger.error("Failed to restore backup: %s", e)
             event.fail(message=f"Failed to restore backup: {e}")
             return
+        # Tokens issued before the restore are not in the restored storage
+        AppRoleTokenManager(self).invalidate()
 
         event.set_results({"restored": event.params.get("backup-id")})
 
@@ -612,6 +738,17 @@ class VaultOperatorCharm(CharmBase):
         service = self.machine.get_service(process=VAULT_SNAP_NAME)
         return False if not service else service.is_running()
 
+    def _get_backup_spool_dir(self) -> str | None:
+        """Return the directory of the charm's storage to spool restored backups in.
+
+        Snapshots can be larger than the default temporary directory, so they
+        are spooled on a storage sized for them when it is attached.
+        """
+        try:
+            return str(self.juju_facade.get_storage_location(BACKUP_SPOOL_STORAGE_NAME))
+        except NoSuchStorageError:
+            return None
+
     def _delete_vault_data(self) -> None:
         """Delete Vault's data."""
         try:
@@ -699,8 +836,73 @@ class VaultOperatorCharm(CharmBase):
         ingress_address = self.juju_facade.get_ingress_address(relation=relation)
         return f"https://{ingress_address}:{VAULT_PORT}"
 
-    def _sync_vault_kv(self, vault: VaultClient) -> None:
-        """Goes through all the vault-kv relations and sends necessary KV information."""
+    def _queue_vault_kv_requests(self, triggers: List[EventBase]) -> None:
+        """Keep the vault-kv requests carried by the triggers until they are synced.
+
+        The requests are kept in the stored state, so that they are still synced
+        in a later dispatch if Vault can't be configured in this one.
+        """
+        if not self.juju_facade.is_leader:
+            return
+        for trigger in triggers:
+            if not isinstance(trigger, NewVaultKvClientAttachedEvent):
+                continue
+            self._stored.vault_kv_pending_requests[
+                f"{trigger.relation_id}/{trigger.unit_name}"
+            ] = {
+                "relation_id": trigger.relation_id,
+                "app_name": trigger.app_name,
+                "unit_name": trigger.unit_name,
+                "mount_suffix": trigger.mount_suffix,
+                "egress_subnets": trigger.egress_subnets,
+                "nonce": trigger.nonce,
+            }
+
+    def _get_pending_vault_kv_requests(self) -> List[KVRequest]:
+        """Return the queued vault-kv requests whose relation is still active."""
+        kv_requests = []
+        for pending in self._stored.vault_kv_pending_requests.values():
+            relation = self.juju_facade.get_active_relation(
+                KV_RELATION_NAME, pending["relation_id"]
+            )
+            if not relation:
+                continue
+            kv_requests.append(
+                KVRequest(
+                    relation=relation,
+                    app_name=pending["app_name"],
+                    unit_name=pending["unit_name"],
+                    mount_suffix=pending["mount_suffix"],
+                    egress_subnets=list(pending["egress_subnets"]),
+                    nonce=pending["nonce"],
+                )
+            )
+        return kv_requests
+
+    def _vault_kv_sweep_is_due(self, triggers: List[EventBase]) -> bool:
+        """Return whether all the vault-kv requests should be synced.
+
+        Only the units named by vault-kv events are synced, unless the sweep
+        interval has passed or the reconcile was triggered by an event that
+        may change the credentials of every requirer: a configuration change,
+        an upgrade, or this unit becoming the leader. Other events, such as
+        the peer relation changing, do not affect the vault-kv requirers.
+        """
+        if time.time() - self._stored.vault_kv_last_sweep >= VAULT_KV_SWEEP_INTERVAL:
+            return True
+        return any(
+            isinstance(trigger, (ConfigChangedEvent, LeaderElectedEvent, UpgradeCharmEvent))
+            for trigger in triggers
+        )
+
+    def _sync_vault_kv(self, vault: VaultClient, triggers: List[EventBase]) -> None:
+        """Send the necessary KV information to the vault-kv requirers.
+
+        The units named by the vault-kv events of the dispatch are synced, and
+        every unit of every vault-kv relation is synced when a sweep is due.
+        The queued requests of the relations that could not be synced are kept
+        for the next reconcile.
+        """
         if not self.juju_facade.is_leader:
             logger.debug("Only leader unit can handle a vault-kv request")
             return
@@ -708,22 +910,45 @@ class VaultOperatorCharm(CharmBase):
         if not ca_certificate:
             logger.debug("Vault CA certificate not available")
             return
-        manager = KVManager(self, vault, self.vault_kv, ca_certificate)
+        manager = KVManager(
+            self,
+            vault,
+            self.vault_kv,
+            ca_certificate,
+            verified_roles=self._stored.vault_kv_verified_roles,
+            shared_mount=bool(self.juju_facade.get_bool_config("kv_shared_mount")),
+            batch_tokens=bool(self.juju_facade.get_bool_config("kv_batch_tokens")),
+        )
 
-        kv_requests = self.vault_kv.get_kv_requests()
+        sweep = self._vault_kv_sweep_is_due(triggers)
+        if sweep:
+            kv_requests = self.vault_kv.get_kv_requests()
+        else:
+            kv_requests = self._get_pending_vault_kv_requests()
+        kv_requests_by_relation: Dict[int, List[KVRequest]] = {}
         for kv_request in kv_requests:
-            if not (vault_url := self._get_relation_api_address(kv_request.relation)):
-                logger.debug("Failed to get Vault URL for relation %s", kv_request.relation.id)
+            kv_requests_by_relation.setdefault(kv_request.relation.id, []).append(kv_request)
+        skipped_relation_ids = set()
+        for relation_kv_requests in kv_requests_by_relation.values():
+            relation = relation_kv_requests[0].relation
+            if not (vault_url := self._get_relation_api_address(relation)):
+                logger.debug("Failed to get Vault URL for relation %s", relation.id)
+                skipped_relation_ids.add(relation.id)
                 continue
-            manager.generate_credentials_for_requirer(
-                relation=kv_request.relation,
-                app_name=kv_request.app_name,
-                unit_name=kv_request.unit_name,
-                mount_suffix=kv_request.mount_suffix,
-                egress_subnets=kv_request.egress_subnets,
-                nonce=kv_request.nonce,
+            manager.generate_credentials_for_requirers(
+                relation=relation,
+                kv_requests=relation_kv_requests,
                 vault_url=vault_url,
             )
+        pending_requests = self._stored.vault_kv_pending_requests
+        for key in [
+            key
+            for key, pending in pending_requests.items()
+            if pending["relation_id"] not in skipped_relation_ids
+        ]:
+            del pending_requests[key]
+        if sweep:
+            self._stored.vault_kv_last_sweep = time.time()
 
     def _get_certificate_request(self, common_name: str) -> CertificateRequestAttributes:
         return CertificateRequestAttributes(
@@ -731,6 +956,53 @@ class VaultOperatorCharm(CharmBase):
             is_ca=True,
         )
 
+    def _get_pki_role_flags(self) -> PKIRoleFlags:
+        return PKIRoleFlags(
+            no_store=bool(self.juju_facade.get_bool_config("pki_roles_no_store")),
+            generate_lease=bool(self.juju_facade.get_bool_config("pki_roles_generate_lease")),
+        )
+
+    def _record_pki_role_flags(self, vault: VaultClient) -> None:
+        """Record the non default settings of the PKI and ACME roles in the peer relation.
+
+        The settings are read back from the roles in Vault once the leader has
+        configured them, so that every unit can report them in its status
+        without querying Vault.
+        """
+        if not self.unit.is_leader():
+            return
+        enabled: list[str] = []
+        for relation_name, mount, role in (
+            (TLS_CERTIFICATES_PKI_RELATION_NAME, VAULT_PKI_MOUNT, VAULT_PKI_ROLE),
+            (TLS_CERTIFICATES_ACME_RELATION_NAME, ACME_MOUNT, ACME_ROLE_NAME),
+        ):
+            if not self.juju_facade.relation_exists(relation_name):
+                continue
+            try:
+                role_flags = vault.get_pki_role_flags(role=role, mount=mount)
+            except VaultClientError as e:
+                logger.warning("Failed to read the settings of the %s role: %s", role, e)
+                return
+            if not role_flags:
+                continue
+            enabled += [
+                name for name, value in asdict(role_flags).items() if value and name not in enabled
+            ]
+        recorded = self.juju_facade.get_app_relation_data(name=PEER_RELATION_NAME)
+        if recorded.get(PKI_ROLE_FLAGS_KEY, "") == ",".join(enabled):
+            return
+        self.juju_facade.set_app_relation_data(
+            data={PKI_ROLE_FLAGS_KEY: ",".join(enabled)},
+            name=PEER_RELATION_NAME,
+        )
+
+    def _get_pki_role_flags_status_message(self) -> str:
+        """Return the PKI and ACME role settings recorded by the leader, for the status message."""
+        recorded = self.juju_facade.get_app_relation_data(name=PEER_RELATION_NAME)
+        if not (enabled := recorded.get(PKI_ROLE_FLAGS_KEY, "")):
+            return ""
+        return f"PKI roles: {', '.join(enabled.split(','))}"
+
     def _sync_vault_pki(self, vault_client: VaultClient) -> None:
         """Goes through all the vault-pki relations and sends necessary TLS certificate."""
         common_name = self.juju_facade.get_string_config("common_name")
@@ -744,9 +1016,21 @@ class VaultOperatorCharm(CharmBase):
             VAULT_PKI_ROLE,
             self.vault_pki,
             tls_certificates_pki=self.tls_certificates_pki,
+            keep_issued_certificates=True,
         )
         manager.sync()
 
+    def _tidy_vault(self, vault_client: VaultClient, triggers: List[EventBase]) -> None:
+        """Clean up the expired secret IDs and tokens in Vault, when due.
+
+        The tidy is only considered on update-status, and is throttled by the
+        `TidyManager` through the peer relation.
+        """
+        if not any(isinstance(trigger, UpdateStatusEvent) for trigger in triggers):
+            return
+        if report := TidyManager(self, vault_client, PEER_RELATION_NAME).run():
+            logger.info("Vault tidy: %s", ", ".join(report))
+
     def _configure_pki_secrets_engine(self, vault: VaultClient) -> None:  # noqa: C901
         """Configure the PKI secrets engine."""
         common_name = self.juju_facade.get_string_config("common_name")
@@ -761,6 +1045,8 @@ class VaultOperatorCharm(CharmBase):
             VAULT_PKI_ROLE,
             self.vault_pki,
             tls_certificates_pki=self.tls_certificates_pki,
+            keep_issued_certificates=True,
+            role_flags=self._get_pki_role_flags(),
         )
         manager.configure()
 
@@ -776,6 +1062,7 @@ class VaultOperatorCharm(CharmBase):
             tls_certificates_acme=self.tls_certificates_acme,
             certificate_request_attributes=self._get_certificate_request(common_name),
             role_name=ACME_ROLE_NAME,
+            role_flags=self._get_pki_role_flags(),
             vault_address=f"https://{self._ingress_address}:{VAULT_PORT}",
         )
         manager.configure()
@@ -21,6 +21,14 @@ path "auth/approle/role/" {
   capabilities = ["list"]
 }
 
+# Allow cleaning up expired approle secret IDs and the leftovers of expired tokens
+path "auth/approle/tidy/secret-id" {
+  capabilities = ["update"]
+}
+path "auth/token/tidy" {
+  capabilities = ["update"]
+}
+
 # Allow charm- prefixes secrets backends to be mounted and managed
 path "sys/mounts/charm-*" {
   capabilities = ["create", "read", "update", "delete", "sudo"]
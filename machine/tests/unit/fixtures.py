@@ -10,6 +10,7 @@ from charms.data_platform_libs.v0.s3 import S3Requirer
 from vault.vault_client import VaultClient
 from vault.vault_managers import (
     ACMEManager,
+    AppRoleTokenManager,
     AutounsealProviderManager,
     AutounsealRequirerManager,
     BackupManager,
@@ -29,9 +30,10 @@ class VaultCharmFixtures:
             self.mock_tls = stack.enter_context(
                 patch("charm.TLSManager", autospec=TLSManager)
             ).return_value
-            self.mock_vault = stack.enter_context(
-                patch("charm.VaultClient", autospec=VaultClient)
-            ).return_value
+            mock_vault = stack.enter_context(patch("charm.VaultClient", autospec=VaultClient))
+            self.mock_vault = mock_vault.return_value
+            mock_vault.find_active.return_value = self.mock_vault
+            self.mock_vault.get_pki_role_flags.return_value = None
             self.mock_vault_autounseal_provider_manager = stack.enter_context(
                 patch("charm.AutounsealProviderManager", autospec=AutounsealProviderManager)
             ).return_value
@@ -57,6 +59,13 @@ class VaultCharmFixtures:
             self.mock_raft_manager = stack.enter_context(
                 patch("charm.RaftManager", autospec=RaftManager)
             ).return_value
+            self.mock_approle_token_manager = stack.enter_context(
+                patch("charm.AppRoleTokenManager", autospec=AppRoleTokenManager)
+            ).return_value
+            # Without a cached token, authentication falls through to the client
+            self.mock_approle_token_manager.authenticate.side_effect = lambda vault, approle: (
+                vault.authenticate(approle)
+            )
 
             self.mock_socket_fqdn = stack.enter_context(patch("socket.getfqdn"))
             self.mock_get_requirer_assigned_certificate = stack.enter_context(
@@ -68,8 +77,8 @@ class VaultCharmFixtures:
             self.mock_pki_provider_get_outstanding_certificate_requests = stack.enter_context(
                 patch("charm.TLSCertificatesProvidesV4.get_outstanding_certificate_requests")
             )
-            self.mock_pki_provider_set_relation_certificate = stack.enter_context(
-                patch("charm.TLSCertificatesProvidesV4.set_relation_certificate")
+            self.mock_pki_provider_set_relation_certificates = stack.enter_context(
+                patch("charm.TLSCertificatesProvidesV4.set_relation_certificates")
             )
             self.mock_autounseal_provides_get_relations_without_credentials = stack.enter_context(
                 patch("charm.VaultAutounsealProvides.get_relations_without_credentials")
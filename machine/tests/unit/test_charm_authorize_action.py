@@ -141,6 +141,7 @@ class TestCharmAuthorizeAction(VaultCharmFixtures):
             policies=["charm-access", "default"],
             token_ttl="1h",
             token_max_ttl="1h",
+            token_type="default",
         )
         assert self.ctx.action_results == {
             "result": "Charm authorized successfully. You may now remove the secret."
@@ -508,3 +508,51 @@ class TestCharmCollectUnitStatus(VaultCharmFixtures):
         state_out = self.ctx.run(self.ctx.on.collect_unit_status(), state_in)
 
         assert state_out.unit_status == ActiveStatus()
+
+    def test_given_pki_role_flags_recorded_when_collect_unit_status_then_flags_in_status_message(
+        self,
+    ):
+        self.mock_snap_cache.return_value = {
+            "vault": MagicMock(
+                spec=Snap, revision="1.17/stable", services={"vaultd": {"active": True}}
+            )
+        }
+        self.mock_tls.configure_mock(
+            **{
+                "tls_file_pushed_to_workload.return_value": True,
+                "tls_file_available_in_charm.return_value": True,
+            },
+        )
+        self.mock_vault.configure_mock(
+            **{
+                "is_api_available.return_value": True,
+                "is_initialized.return_value": True,
+                "is_seal_type_transit.return_value": False,
+                "is_sealed.return_value": False,
+                "needs_migration.return_value": False,
+            },
+        )
+        peer_relation = testing.PeerRelation(
+            endpoint="vault-peers",
+            local_app_data={"pki_role_flags": "no_store"},
+            peers_data={
+                1: {"node_api_address": "1.2.3.4"},
+                2: {"node_api_address": "1.2.3.5"},
+            },
+        )
+        approle_secret = testing.Secret(
+            label="vault-approle-auth-details",
+            tracked_content={
+                "role-id": "existing role id",
+                "secret-id": "existing secret id",
+            },
+        )
+        state_in = testing.State(
+            relations=[peer_relation], planned_units=3, secrets=[approle_secret]
+        )
+
+        state_out = self.ctx.run(self.ctx.on.collect_unit_status(), state_in)
+
+        assert state_out.unit_status == ActiveStatus("PKI roles: no_store")
+        self.mock_vault.authenticate.assert_not_called()
+        self.mock_vault.get_pki_role_flags.assert_not_called()
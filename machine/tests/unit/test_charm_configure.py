@@ -10,7 +10,7 @@ from unittest.mock import MagicMock, patch
 import hcl
 import ops.testing as testing
 from charms.operator_libs_linux.v2.snap import Snap
-from vault.vault_client import AppRole
+from vault.vault_client import AppRole, PKIRoleFlags
 
 from lib.vault.vault_autounseal import AutounsealDetails
 from tests.unit.certificates import (
@@ -166,6 +166,55 @@ class TestCharmConfigure(VaultCharmFixtures):
 
         self.mock_pki_manager.configure.assert_called_once()
 
+    def test_given_pki_role_configured_when_configure_then_role_flags_recorded_in_peer_relation(
+        self,
+    ):
+        self.mock_vault.configure_mock(
+            **{
+                "is_api_available.return_value": True,
+                "authenticate.return_value": True,
+                "is_initialized.return_value": True,
+                "is_sealed.return_value": False,
+                "is_active_or_standby.return_value": True,
+                "get_pki_role_flags.return_value": PKIRoleFlags(
+                    no_store=True, generate_lease=False
+                ),
+            },
+        )
+        self.mock_autounseal_requires_get_details.return_value = None
+        self.mock_machine.pull.return_value = StringIO("")
+        peer_relation = testing.PeerRelation(
+            endpoint="vault-peers",
+        )
+        pki_relation = testing.Relation(
+            endpoint="tls-certificates-pki",
+            interface="tls-certificates",
+        )
+        approle_secret = testing.Secret(
+            label="vault-approle-auth-details",
+            tracked_content={"role-id": "role id", "secret-id": "secret id"},
+        )
+        state_in = testing.State(
+            unit_status=testing.ActiveStatus(),
+            leader=True,
+            secrets=[approle_secret],
+            relations=[peer_relation, pki_relation],
+            config={"common_name": "myhostname.com", "pki_roles_no_store": True},
+            networks={
+                testing.Network(
+                    "vault-peers",
+                    bind_addresses=[testing.BindAddress([testing.Address("1.2.1.2")])],
+                )
+            },
+        )
+
+        state_out = self.ctx.run(self.ctx.on.config_changed(), state_in)
+
+        self.mock_vault.get_pki_role_flags.assert_called_with(role="charm-pki", mount="charm-pki")
+        assert state_out.get_relation(peer_relation.id).local_app_data == {
+            "pki_role_flags": "no_store"
+        }
+
     # ACME
     def test_given_certificate_available_when_configure_then_acme_server_is_configured(
         self,
@@ -386,7 +435,7 @@ class TestCharmConfigure(VaultCharmFixtures):
 
     # KV
 
-    def test_given_kv_request_when_configure_then_generate_credentials_for_requirer(
+    def test_given_kv_request_when_configure_then_generate_credentials_for_requirers(
         self,
     ):
         self.mock_machine.pull.return_value = StringIO("")
@@ -433,11 +482,12 @@ class TestCharmConfigure(VaultCharmFixtures):
 
         self.ctx.run(self.ctx.on.config_changed(), state_in)
 
-        kwargs = self.mock_kv_manager.generate_credentials_for_requirer.call_args_list[0].kwargs
+        kwargs = self.mock_kv_manager.generate_credentials_for_requirers.call_args_list[0].kwargs
         assert kwargs["relation"].id == kv_relation.id
-        assert kwargs["app_name"] == "vault-kv"
-        assert kwargs["unit_name"] == "vault-kv/0"
-        assert kwargs["mount_suffix"] == "remote-suffix"
-        assert kwargs["egress_subnets"] == ["2.2.2.0/24"]
-        assert kwargs["nonce"] == "123123"
         assert kwargs["vault_url"] == "https://192.0.2.0:8200"
+        [kv_request] = kwargs["kv_requests"]
+        assert kv_request.app_name == "vault-kv"
+        assert kv_request.unit_name == "vault-kv/0"
+        assert kv_request.mount_suffix == "remote-suffix"
+        assert kv_request.egress_subnets == ["2.2.2.0/24"]
+        assert kv_request.nonce == "123123"